@@ -0,0 +1,262 @@
+"""
+End-to-end throughput and latency benchmark for shutter() and shutter_many().
+
+Runs fully offline: Jina, Tavily and OpenRouter calls go to the stand-in in
+mock_upstreams.py (started in a child process, so its CPU and memory don't
+count), and target pages are served by the same stand-in. Config, caches
+and the offenders database live in a temporary HOME. By default the result
+cache and domain reputation are off and rate limits are lifted, so every
+request pays the full fetch -> canary -> extraction pipeline.
+
+For each API and concurrency level it reports requests/sec, errors,
+p50/p95/p99 of total latency and of every phase in ShutterResponse.timings,
+and peak RSS. --output writes the results as JSON; --baseline compares
+against a previous run and exits 1 when throughput or p95 latency regress
+by more than --max-regression.
+
+Usage:
+    uv run python benchmarks/bench_shutter.py [--requests 100] [--concurrency 1,8,32]
+        [--api shutter,shutter_many] [--latency-ms 50] [--llm-latency-ms 150]
+        [--error-rate 0.0] [--page-kb 20] [--fetch-strategy sequential]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_upstreams import config_from_args, env_for, start_in_process
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(values: list[float]) -> dict:
+    """p50/p95/p99 of a list of milliseconds."""
+    return {f"p{pct}": round(percentile(values, pct), 2) for pct in PERCENTILES}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def write_config(home: Path, args: argparse.Namespace) -> None:
+    """Write the benchmark's config.toml into the temporary HOME."""
+    config_dir = home / ".shutter"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    rate_limits = (
+        ""
+        if args.rate_limits
+        else "\n[breaker.rate_limits]\njina = 0\ntavily = 0\nopenrouter = 0\n"
+    )
+    (config_dir / "config.toml").write_text(
+        f"[cache]\nenabled = {str(args.cache).lower()}\n\n"
+        f"[reputation]\nenabled = {str(args.reputation).lower()}\n\n"
+        f'[fetch]\nstrategy = "{args.fetch_strategy}"\n'
+        f"{rate_limits}"
+    )
+
+
+async def run_scenario(api: str, concurrency: int, urls: list[str], query: str) -> dict:
+    """Drive one API at one concurrency level over urls."""
+    from grove_shutter import breaker, core
+    from grove_shutter.models import ShutterRequest
+
+    breaker.reset_breakers()
+    responses = []
+    start = time.perf_counter()
+
+    if api == "shutter":
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(url: str):
+            async with limit:
+                return await core.shutter(url, query)
+
+        responses = await asyncio.gather(*(one(url) for url in urls))
+    elif api == "shutter_many":
+        requests = [ShutterRequest(url=url, query=query) for url in urls]
+        async for response in core.shutter_many(
+            requests, concurrency=concurrency, per_domain=concurrency
+        ):
+            responses.append(response)
+    else:
+        raise ValueError(f"Unknown api: {api}")
+
+    elapsed = time.perf_counter() - start
+
+    phases: dict[str, list[float]] = {}
+    for response in responses:
+        for phase, ms in response.timings.items():
+            phases.setdefault(phase, []).append(ms)
+        if response.fetch_ms is not None:
+            phases.setdefault("fetch", []).append(response.fetch_ms)
+
+    errors = sum(
+        1 for r in responses
+        if r.prompt_injection is not None and not r.prompt_injection.detected
+    )
+    return {
+        "api": api,
+        "concurrency": concurrency,
+        "requests": len(responses),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(responses) / elapsed, 2),
+        "latency_ms": summarize([r.latency_ms or 0.0 for r in responses]),
+        "phases": {phase: summarize(values) for phase, values in sorted(phases.items())},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def print_results(results: dict) -> None:
+    """Print scenario and phase tables."""
+    print(
+        f"{'scenario':<20} {'req/s':>9} {'errors':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MB':>8}"
+    )
+    print("-" * 75)
+    for name, s in results["scenarios"].items():
+        lat = s["latency_ms"]
+        print(
+            f"{name:<20} {s['rps']:>9.1f} {s['errors']:>7} {lat['p50']:>9.1f} "
+            f"{lat['p95']:>9.1f} {lat['p99']:>9.1f} {s['peak_rss_mb']:>8.1f}"
+        )
+
+    for name, s in results["scenarios"].items():
+        print()
+        print(f"{name + ' phases':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        print("-" * 56)
+        for phase, p in s["phases"].items():
+            print(f"{phase:<26} {p['p50']:>9.1f} {p['p95']:>9.1f} {p['p99']:>9.1f}")
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Compare throughput and p95 latency against a baseline.
+
+    Returns:
+        One message per regressed metric (empty if none)
+    """
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results["scenarios"].get(name)
+        if current is None:
+            continue
+        if current["rps"] < base["rps"] * (1 - max_regression):
+            regressions.append(f"{name}: {current['rps']:.1f} req/s vs baseline {base['rps']:.1f}")
+        if current["latency_ms"]["p95"] > base["latency_ms"]["p95"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p95 {current['latency_ms']['p95']:.1f} ms "
+                f"vs baseline {base['latency_ms']['p95']:.1f}"
+            )
+    return regressions
+
+
+async def run_all(args: argparse.Namespace, port: int) -> dict:
+    """Run every scenario against the stand-in on port."""
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "latency_ms": args.latency_ms,
+            "llm_latency_ms": args.llm_latency_ms,
+            "error_rate": args.error_rate,
+            "page_kb": args.page_kb,
+            "fetch_strategy": args.fetch_strategy,
+        },
+        "scenarios": {},
+    }
+
+    base = f"http://127.0.0.1:{port}/page"
+    for api in args.api.split(","):
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            name = f"{api}@c{concurrency}"
+            urls = [f"{base}/{name}-{i}" for i in range(args.requests)]
+            results["scenarios"][name] = await run_scenario(api, concurrency, urls, args.query)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument(
+        "--concurrency", default="1,8,32", help="Comma-separated concurrency levels"
+    )
+    parser.add_argument("--api", default="shutter,shutter_many", help="APIs to drive")
+    parser.add_argument("--query", default="What are the pricing plans?")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Jina/Tavily latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=150.0, help="OpenRouter latency")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of upstream calls answered 503"
+    )
+    parser.add_argument("--page-kb", type=int, default=20)
+    parser.add_argument("--fetch-strategy", default="sequential", choices=("sequential", "hedged"))
+    parser.add_argument("--cache", action="store_true", help="Leave the result cache on")
+    parser.add_argument("--reputation", action="store_true", help="Leave domain reputation on")
+    parser.add_argument(
+        "--rate-limits", action="store_true", help="Keep default upstream rate limits"
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument(
+        "--baseline", type=Path, help="Baseline results JSON to compare against"
+    )
+    parser.add_argument(
+        "--max-regression", type=float, default=0.25, help="Allowed fractional regression"
+    )
+    args = parser.parse_args()
+
+    process, port = start_in_process(config_from_args(args))
+    try:
+        with tempfile.TemporaryDirectory(prefix="shutter-bench-") as home:
+            # Must happen before grove_shutter is imported: paths derive from HOME
+            os.environ["HOME"] = home
+            os.environ.update(env_for(port))
+            os.environ.update({"OPENROUTER_API_KEY": "bench", "TAVILY_API_KEY": "bench"})
+            for name in ("SHUTTER_DRY_RUN", "SHUTTER_NO_CACHE"):
+                os.environ.pop(name, None)
+            write_config(Path(home), args)
+
+            results = asyncio.run(run_all(args, port))
+    finally:
+        process.terminate()
+        process.join()
+
+    print_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.max_regression)
+        if regressions:
+            print(f"\nRegressions beyond {args.max_regression:.0%} of {args.baseline}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.max_regression:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Offline stand-in for the services shutter calls, for benchmarks.
+
+One asyncio HTTP/1.1 server (stdlib only, keep-alive) emulates:
+
+- GET  /page/<id>                  - a target page (HTML) for direct fetches
+- GET  /jina/<url>                 - r.jina.ai reader (markdown of the page)
+- POST /tavily/extract             - Tavily extract ({"urls": [...]})
+- POST /openrouter/chat/completions - OpenRouter chat completions, including
+                                      SSE streaming ("stream": true)
+
+Each service has its own latency, jitter and error rate (errors are 503s).
+Page text is generated per id, so distinct ids are distinct pages of roughly
+page_kb kilobytes. Point shutter at the stand-in with:
+
+    SHUTTER_JINA_URL=http://127.0.0.1:<port>/jina
+    SHUTTER_TAVILY_URL=http://127.0.0.1:<port>/tavily
+    SHUTTER_OPENROUTER_URL=http://127.0.0.1:<port>/openrouter
+
+Usage:
+    uv run python benchmarks/mock_upstreams.py [--port 8765] [--latency-ms 50]
+        [--error-rate 0.0] [--page-kb 20]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+WORDS = (
+    "pricing plan team storage support annual monthly seats billing invoice "
+    "enterprise starter usage limit feature export access security audit "
+    "install guide release notes version upgrade migrate config setting "
+    "account project dashboard report schedule backup region latency uptime"
+).split()
+
+REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+@dataclass
+class ServiceProfile:
+    """Latency and failure behavior of one emulated service."""
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+
+
+@dataclass
+class MockConfig:
+    """Behavior of the whole stand-in."""
+
+    jina: ServiceProfile = field(default_factory=ServiceProfile)
+    tavily: ServiceProfile = field(default_factory=ServiceProfile)
+    openrouter: ServiceProfile = field(
+        default_factory=lambda: ServiceProfile(latency_ms=150.0, jitter_ms=40.0)
+    )
+    pages: ServiceProfile = field(
+        default_factory=lambda: ServiceProfile(latency_ms=20.0, jitter_ms=5.0)
+    )
+    page_kb: int = 20
+    stream_chunks: int = 8
+
+
+@lru_cache(maxsize=1024)
+def page_text(page_id: str, page_kb: int) -> str:
+    """Deterministic prose for a page id, roughly page_kb kilobytes."""
+    rng = random.Random(page_id)
+    paragraphs = []
+    size = 0
+    while size < page_kb * 1024:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+        paragraph = " ".join(sentence for _ in range(6))
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return f"Page {page_id}\n\n" + "\n\n".join(paragraphs)
+
+
+def page_html(page_id: str, page_kb: int) -> str:
+    """The page as HTML (what a direct fetch sees)."""
+    body = "".join(f"<p>{p}</p>" for p in page_text(page_id, page_kb).split("\n\n"))
+    return (
+        f"<html><head><title>Page {page_id}</title></head>"
+        f"<body><article>{body}</article></body></html>"
+    )
+
+
+def page_id_from_url(url: str) -> str:
+    """Page id of a target URL (its last path segment)."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "index"
+
+
+def chat_completion(request: dict) -> Tuple[str, dict]:
+    """Canned completion text and usage for a chat request."""
+    prompt = "".join(m.get("content", "") for m in request.get("messages", []))
+    if request.get("max_tokens", 0) <= 100:
+        text = "The page lists plans, seats and billing options for teams."  # Canary
+    else:
+        text = (
+            "Plans: Starter $10/mo per seat, Team $25/mo per seat, Enterprise on request. "
+            "Annual billing saves 20%."
+        )
+    usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4}
+    return text, usage
+
+
+class MockUpstreams:
+    """The stand-in server. Use serve() in an event loop, or start_in_process()."""
+
+    def __init__(self, config: MockConfig, seed: int = 1):
+        self.config = config
+        self.rng = random.Random(seed)
+
+    async def _delay(self, profile: ServiceProfile) -> bool:
+        """Sleep for the service latency; return True if this call should fail."""
+        latency = max(0.0, self.rng.gauss(profile.latency_ms, profile.jitter_ms))
+        await asyncio.sleep(latency / 1000)
+        return self.rng.random() < profile.error_rate
+
+    async def handle(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        """Route one request to (status, content type, body)."""
+        path = target.split("?", 1)[0]
+        config = self.config
+
+        if path.startswith("/page/") and method == "GET":
+            if await self._delay(config.pages):
+                return 503, "text/plain", b"unavailable"
+            return 200, "text/html", page_html(path[len("/page/"):], config.page_kb).encode()
+
+        if path.startswith("/jina/") and method == "GET":
+            if await self._delay(config.jina):
+                return 503, "text/plain", b"unavailable"
+            url = unquote(target[len("/jina/"):])
+            return 200, "text/plain", page_text(page_id_from_url(url), config.page_kb).encode()
+
+        if path == "/tavily/extract" and method == "POST":
+            if await self._delay(config.tavily):
+                return 503, "application/json", b'{"error": "unavailable"}'
+            urls = json.loads(body or b"{}").get("urls", [])
+            results = [
+                {"url": url, "raw_content": page_text(page_id_from_url(url), config.page_kb)}
+                for url in urls
+            ]
+            return 200, "application/json", json.dumps({"results": results}).encode()
+
+        if path == "/openrouter/chat/completions" and method == "POST":
+            if await self._delay(config.openrouter):
+                return 503, "application/json", b'{"error": {"message": "unavailable"}}'
+            request = json.loads(body or b"{}")
+            text, usage = chat_completion(request)
+            if request.get("stream"):
+                return 200, "text/event-stream", self._sse(text, usage)
+            response = {
+                "choices": [{"message": {"role": "assistant", "content": text}}],
+                "usage": usage,
+            }
+            return 200, "application/json", json.dumps(response).encode()
+
+        status = 405 if path.startswith(("/tavily", "/openrouter")) else 404
+        return status, "text/plain", b"no route"
+
+    def _sse(self, text: str, usage: dict) -> bytes:
+        """Completion as an OpenRouter-style SSE stream."""
+        step = max(1, len(text) // self.config.stream_chunks)
+        events = [
+            {"choices": [{"delta": {"content": text[i:i + step]}}]}
+            for i in range(0, len(text), step)
+        ]
+        events.append({"choices": [], "usage": usage})
+        lines = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+        return "".join(lines).encode()
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, content_type, payload = await self.handle(method, target, body)
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    "\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ready: Optional[multiprocessing.Queue] = None,
+    ) -> None:
+        """
+        Serve until cancelled.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            ready: Queue that receives the bound port once listening
+        """
+        server = await asyncio.start_server(self._connection, host, port, backlog=1024)
+        bound = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.put(bound)
+        else:
+            print(f"Mock upstreams listening on http://{host}:{bound}")
+        async with server:
+            await server.serve_forever()
+
+
+def _run(config: MockConfig, seed: int, ready: multiprocessing.Queue) -> None:
+    """Child process entry point."""
+    try:
+        asyncio.run(MockUpstreams(config, seed).serve(ready=ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def start_in_process(config: MockConfig, seed: int = 1) -> Tuple[multiprocessing.Process, int]:
+    """
+    Start the stand-in in a child process, so its CPU time and memory don't
+    count against the process being measured.
+
+    Returns:
+        (process, port); terminate the process when done
+    """
+    ready: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run, args=(config, seed, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=10)
+
+
+def env_for(port: int) -> dict[str, str]:
+    """Environment variables pointing shutter at a stand-in on port."""
+    base = f"http://127.0.0.1:{port}"
+    return {
+        "SHUTTER_JINA_URL": f"{base}/jina",
+        "SHUTTER_TAVILY_URL": f"{base}/tavily",
+        "SHUTTER_OPENROUTER_URL": f"{base}/openrouter",
+    }
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    """MockConfig from the shared --latency-ms/--llm-latency-ms/--error-rate/--page-kb flags."""
+    jitter = args.latency_ms / 5
+    return MockConfig(
+        jina=ServiceProfile(args.latency_ms, jitter, args.error_rate),
+        tavily=ServiceProfile(args.latency_ms, jitter, args.error_rate),
+        openrouter=ServiceProfile(args.llm_latency_ms, args.llm_latency_ms / 4, args.error_rate),
+        pages=ServiceProfile(args.latency_ms / 2, jitter / 2, args.error_rate),
+        page_kb=args.page_kb,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Jina/Tavily latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=150.0, help="OpenRouter latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    for name, value in env_for(args.port).items():
+        print(f"export {name}={value}")
+    asyncio.run(MockUpstreams(config).serve(port=args.port))
+
+
+if __name__ == "__main__":
+    main()
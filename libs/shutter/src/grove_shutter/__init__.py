@@ -3,7 +3,8 @@ Shutter - Web Content Distillation Service
 Open. Capture. Close.
 """
 
-from grove_shutter.core import shutter
+from grove_shutter.core import shutter, shutter_many, shutter_stream
+from grove_shutter.models import ShutterRequest, ShutterResponse
 
 __version__ = "0.1.0"
-__all__ = ["shutter"]
+__all__ = ["shutter", "shutter_many", "shutter_stream", "ShutterRequest", "ShutterResponse"]
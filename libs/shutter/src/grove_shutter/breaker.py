@@ -0,0 +1,394 @@
+"""
+Per-upstream rate limiting and circuit breaking.
+
+Every call to a shared upstream (Jina, Tavily, OpenRouter) runs inside
+guard(upstream), which:
+
+1. Rejects the call instantly with UpstreamUnavailableError while the upstream's
+   circuit is open, so callers fall through to the next backend instead of
+   waiting out a full timeout.
+2. Takes a token from the upstream's token bucket, waiting briefly if the
+   configured request rate is exceeded.
+3. Records the outcome. Errors (timeouts, connection failures, 5xx, 429)
+   and slow calls count against the upstream.
+
+Circuit states:
+- "closed"    - calls flow; once the failure rate over the rolling window
+                crosses the threshold, the circuit opens
+- "open"      - calls are rejected until open_seconds have passed (or the
+                Retry-After of a 429 response)
+- "half_open" - a single probe call is let through; success closes the
+                circuit, failure reopens it
+
+Direct page fetches ("basic") are not guarded: their failures describe the
+target site, not a shared service. State is per process; transitions and
+rejections are counted in metrics.py.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+
+from grove_shutter import metrics
+from grove_shutter.config import BreakerSettings, get_breaker_settings, get_config_version
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Longest Retry-After (seconds) honoured from a 429 response
+MAX_RETRY_AFTER = 300
+
+# Breakers by upstream, created lazily from get_breaker_settings()
+_breakers: dict[str, "CircuitBreaker"] = {}
+
+# Config version the breakers were last configured with
+_breakers_config_version: Optional[int] = None
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when a call is rejected by an open circuit or the rate limiter."""
+
+    def __init__(self, upstream: str, reason: str):
+        self.upstream = upstream
+        self.reason = reason
+        super().__init__(f"{upstream} unavailable: {reason}")
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter that never blocks the event loop.
+
+    Calls reserve a token up front; when the bucket is empty the reservation
+    goes negative and the caller is told how long to sleep, so concurrent
+    callers queue in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Tokens added per second (0 disables limiting)
+            burst: Bucket capacity
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._clock = clock
+        self._updated = clock()
+
+    def reserve(self, max_wait: float) -> float:
+        """
+        Reserve one token.
+
+        Args:
+            max_wait: Longest acceptable wait in seconds
+
+        Returns:
+            Seconds to wait before making the call (0 when a token is free)
+
+        Raises:
+            ValueError: If the wait would exceed max_wait (nothing is reserved)
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if wait > max_wait:
+            raise ValueError(f"rate limited ({wait:.1f}s wait)")
+        self.tokens -= 1
+        return wait
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit plus token bucket for one upstream."""
+
+    def __init__(
+        self,
+        upstream: str,
+        settings: BreakerSettings,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            upstream: Upstream name (used in errors and metric labels)
+            settings: Dict from get_breaker_settings()
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.upstream = upstream
+        self.state = CLOSED
+        self.rejected = 0
+        self.bucket = TokenBucket(0.0, 1.0, clock)  # unlimited until configure()
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=settings["window"])  # True = failure
+        self._opened_until = 0.0
+        self._probing = False
+        self.configure(settings)
+
+    def configure(self, settings: BreakerSettings) -> None:
+        """
+        Apply (possibly changed) settings, keeping circuit state and history.
+
+        Args:
+            settings: Dict from get_breaker_settings()
+        """
+        self.failure_rate = settings["failure_rate"]
+        self.min_calls = settings["min_calls"]
+        self.open_seconds = settings["open_seconds"]
+        self.slow_call_s = settings["slow_call_ms"] / 1000
+        self.max_wait_s = settings["max_wait_ms"] / 1000
+
+        if self._outcomes.maxlen != settings["window"]:
+            self._outcomes = deque(self._outcomes, maxlen=settings["window"])
+
+        rate = settings["rate_limits"].get(self.upstream, 0.0)
+        burst = rate * settings["burst_seconds"]
+        if (self.bucket.rate, self.bucket.burst) != (rate, max(1.0, burst)):
+            self.bucket = TokenBucket(rate, burst, self._clock)
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it while the circuit is open.
+
+        Raises:
+            UpstreamUnavailableError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        if self.state == OPEN:
+            remaining = self._opened_until - self._clock()
+            if remaining > 0:
+                self.reject("open")
+                raise UpstreamUnavailableError(
+                    self.upstream, f"circuit open (retry in {remaining:.0f}s)"
+                )
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probing:
+                self.reject("open")
+                raise UpstreamUnavailableError(self.upstream, "circuit half-open (probe in flight)")
+            self._probing = True
+
+    def record(self, failed: bool, retry_after: Optional[float] = None) -> None:
+        """
+        Record a finished call.
+
+        Args:
+            failed: Whether the call counts as a failure (error or too slow)
+            retry_after: Seconds the upstream asked us to wait (429), which
+                opens the circuit for that long regardless of failure rate
+        """
+        if self.state == OPEN:
+            return  # Straggler admitted before the circuit opened
+
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open(retry_after)
+            else:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            return
+
+        self._outcomes.append(failed)
+        if retry_after is not None:
+            self._open(retry_after)
+        elif (
+            len(self._outcomes) >= self.min_calls
+            and self.current_failure_rate() >= self.failure_rate
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. cancelled)."""
+        if self.state == HALF_OPEN:
+            self._probing = False
+
+    def current_failure_rate(self) -> float:
+        """Failure fraction over the rolling window."""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def stats(self) -> dict:
+        """
+        Get state and counters for this upstream.
+
+        Returns:
+            Dict with 'state', 'failure_rate', 'calls' (window size used),
+            'rejected' and 'retry_in_s' (0 unless open)
+        """
+        retry_in = max(0.0, self._opened_until - self._clock()) if self.state == OPEN else 0.0
+        return {
+            "state": self.state,
+            "failure_rate": self.current_failure_rate(),
+            "calls": len(self._outcomes),
+            "rejected": self.rejected,
+            "retry_in_s": retry_in,
+        }
+
+    def _open(self, duration: Optional[float] = None) -> None:
+        """Open the circuit for duration seconds (default open_seconds)."""
+        if duration is None:
+            duration = self.open_seconds
+        self._opened_until = self._clock() + duration
+        self._outcomes.clear()
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        """Change state, counting the transition."""
+        if state != self.state:
+            self.state = state
+            metrics.inc("shutter_breaker_transitions_total", upstream=self.upstream, state=state)
+
+    def reject(self, reason: str) -> None:
+        """Count a rejected call."""
+        self.rejected += 1
+        metrics.inc("shutter_breaker_rejections_total", upstream=self.upstream, reason=reason)
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Get (or lazily create) the breaker for an upstream.
+
+    When config.toml has changed since the breakers were configured, every
+    breaker picks up the new [breaker] settings without losing its state.
+    """
+    global _breakers_config_version
+
+    version = get_config_version()
+    if version != _breakers_config_version:
+        settings = get_breaker_settings()
+        for existing in _breakers.values():
+            existing.configure(settings)
+        _breakers_config_version = version
+
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        breaker = _breakers[upstream] = CircuitBreaker(upstream, get_breaker_settings())
+    return breaker
+
+
+def get_breaker_stats() -> dict:
+    """
+    Get breaker state for every guarded upstream used in this process.
+
+    Returns:
+        Dict of upstream -> CircuitBreaker.stats()
+    """
+    return {upstream: breaker.stats() for upstream, breaker in _breakers.items()}
+
+
+def reset_breakers() -> None:
+    """Close all circuits and forget their history (config is re-read on next use)."""
+    _breakers.clear()
+
+
+def is_failure(error: BaseException) -> bool:
+    """
+    Whether an exception says the upstream itself is unhealthy.
+
+    Timeouts, connection errors, 5xx and 429 count; other 4xx responses are
+    about the request or the target page and do not.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Retry-After of a 429 response in seconds, if any."""
+    if not isinstance(error, httpx.HTTPStatusError) or error.response.status_code != 429:
+        return None
+    value = error.response.headers.get("retry-after", "")
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        return None  # HTTP-date form or missing: use the failure rate instead
+
+
+class CallTimer:
+    """
+    Time spent in one guarded call, minus the time it was paused.
+
+    Streaming callers yield to their consumer from inside guard(); wrapping
+    each yield in paused() keeps a slow consumer from counting as a slow
+    upstream.
+    """
+
+    def __init__(self) -> None:
+        self._elapsed = 0.0
+        self._resumed = time.perf_counter()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Stop the clock for the duration of the block."""
+        self._elapsed += time.perf_counter() - self._resumed
+        try:
+            yield
+        finally:
+            self._resumed = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Seconds timed so far."""
+        return self._elapsed + time.perf_counter() - self._resumed
+
+
+@asynccontextmanager
+async def guard(upstream: str) -> AsyncIterator[CallTimer]:
+    """
+    Run one upstream call under its circuit breaker and rate limit.
+
+    Example:
+        async with guard("jina"), upstream_client("jina") as client:
+            response = await client.get(jina_url)
+
+    Args:
+        upstream: Upstream name ("jina", "tavily", "openrouter")
+
+    Yields:
+        CallTimer for the call; time inside its paused() blocks doesn't count
+        toward [breaker] slow_call_ms
+
+    Raises:
+        UpstreamUnavailableError: If the circuit is open or the rate-limit wait
+            would exceed [breaker] max_wait_ms
+    """
+    breaker = get_breaker(upstream)
+    breaker.before_call()
+
+    try:
+        wait = breaker.bucket.reserve(breaker.max_wait_s)
+    except ValueError as e:
+        breaker.release()
+        breaker.reject("rate_limited")
+        raise UpstreamUnavailableError(upstream, str(e))
+    if wait:
+        metrics.observe("shutter_rate_limit_wait_ms", wait * 1000, upstream=upstream)
+        try:
+            await asyncio.sleep(wait)
+        except BaseException:
+            breaker.release()
+            raise
+
+    timer = CallTimer()
+    try:
+        yield timer
+    except Exception as e:
+        breaker.record(is_failure(e), retry_after_seconds(e))
+        raise
+    except BaseException:
+        breaker.release()  # Cancelled or generator closed: no verdict
+        raise
+    else:
+        breaker.record(timer.elapsed() > breaker.slow_call_s)
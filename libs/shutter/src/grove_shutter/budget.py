@@ -0,0 +1,291 @@
+"""
+Token budgeting for extraction prompts.
+
+Long pages are split into paragraph chunks, ranked against the query with
+BM25, and the most relevant chunks are kept (in page order) until the token
+budget is spent. Token counts use a fast local estimate that approximates BPE
+tokenizers without loading one: short words are one token, long words and
+digit runs split into pieces, and every punctuation mark or non-ASCII
+character counts on its own.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Optional
+
+
+# Approximate BPE pieces: up to 6 ASCII letters, up to 3 digits, or any
+# other single non-space character
+_TOKEN_RE = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|[^\sA-Za-z\d]")
+
+# Terms used for BM25 scoring (lowercased words and numbers)
+_TERM_RE = re.compile(r"\w+")
+
+# Paragraph boundaries: blank lines
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+# Marker inserted where non-selected chunks were dropped
+GAP_MARKER = "[...]"
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate token count
+    """
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
+
+
+def split_chunks(content: str, chunk_tokens: int = 400) -> list[str]:
+    """
+    Split content into paragraph-aligned chunks of roughly chunk_tokens.
+
+    Consecutive short paragraphs are merged; a paragraph longer than the
+    target is split on line breaks, then on whitespace, and anything still
+    too long (e.g. text without spaces) at token boundaries.
+
+    Args:
+        content: Page content
+        chunk_tokens: Target tokens per chunk
+
+    Returns:
+        List of chunks in page order
+    """
+    pieces = []
+    for paragraph in _PARAGRAPH_RE.split(content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= chunk_tokens:
+            pieces.append(paragraph)
+        else:
+            pieces.extend(_split_long(paragraph, chunk_tokens))
+
+    chunks = []
+    current: list[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _split_long(paragraph: str, chunk_tokens: int) -> list[str]:
+    """Split an oversized paragraph on lines, then words, then mid-word."""
+    units = paragraph.splitlines()
+    separator = "\n"
+    if len(units) <= 1:
+        units = paragraph.split()
+        separator = " "
+    if len(units) <= 1:
+        return _hard_split(paragraph, chunk_tokens)
+
+    # Lines or words that are still too long are split further
+    units = [
+        part
+        for unit in units
+        for part in (
+            _split_long(unit, chunk_tokens) if estimate_tokens(unit) > chunk_tokens else [unit]
+        )
+    ]
+
+    parts = []
+    current: list[str] = []
+    current_tokens = 0
+    for unit in units:
+        tokens = estimate_tokens(unit)
+        if current and current_tokens + tokens > chunk_tokens:
+            parts.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        parts.append(separator.join(current))
+    return parts
+
+
+def _hard_split(text: str, chunk_tokens: int) -> list[str]:
+    """Split text into pieces of chunk_tokens estimated tokens, ignoring whitespace."""
+    parts = []
+    start = 0
+    for count, match in enumerate(_TOKEN_RE.finditer(text), 1):
+        if count % chunk_tokens == 0:
+            parts.append(text[start:match.end()])
+            start = match.end()
+    if text[start:].strip():
+        parts.append(text[start:])
+    return [part.strip() for part in parts]
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """Prefix of text holding at most max_tokens estimated tokens."""
+    if max_tokens <= 0:
+        return ""
+    for count, match in enumerate(_TOKEN_RE.finditer(text), 1):
+        if count == max_tokens:
+            return text[:match.end()]
+    return text
+
+
+def bm25_scores(chunks: list[str], query: str) -> list[float]:
+    """
+    Score chunks against a query with Okapi BM25.
+
+    Args:
+        chunks: Candidate chunks
+        query: Extraction query
+
+    Returns:
+        One score per chunk (0.0 when no query term occurs)
+    """
+    query_terms = set(_TERM_RE.findall(query.lower()))
+    docs = [Counter(_TERM_RE.findall(chunk.lower())) for chunk in chunks]
+    if not docs or not query_terms:
+        return [0.0] * len(chunks)
+
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(docs) or 1.0
+
+    idf = {}
+    for term in query_terms:
+        df = sum(1 for doc in docs if term in doc)
+        idf[term] = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+        for term in query_terms:
+            tf = doc.get(term, 0)
+            if tf:
+                score += idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def select_content(
+    content: str,
+    query: str,
+    budget: int,
+    chunk_tokens: int = 400,
+    extended_query: Optional[str] = None,
+) -> str:
+    """
+    Trim content to a token budget, keeping the chunks most relevant to the query.
+
+    Content within budget is returned unchanged. Otherwise the first chunk
+    (usually title and lead) is always kept, cut to the budget if it alone
+    exceeds it, remaining chunks are added by BM25 score until the budget is
+    spent, and the result is reassembled in page order with GAP_MARKER where
+    content was dropped.
+
+    Args:
+        content: Page content
+        query: Extraction query used for ranking
+        budget: Maximum estimated tokens of content to keep
+        chunk_tokens: Target tokens per chunk
+        extended_query: Additional extraction instructions (also used for ranking)
+
+    Returns:
+        Content of at most roughly `budget` estimated tokens
+    """
+    if estimate_tokens(content) <= budget:
+        return content
+
+    chunks = split_chunks(content, chunk_tokens)
+    ranking_query = f"{query} {extended_query or ''}"
+    scores = bm25_scores(chunks, ranking_query)
+
+    # Lead chunk first, then by descending score; ties keep page order
+    order = [0] + sorted(range(1, len(chunks)), key=lambda i: (-scores[i], i))
+
+    # Never send nothing: an oversized lead is cut down rather than dropped
+    lead_cut = estimate_tokens(chunks[0]) > budget
+    if lead_cut:
+        chunks[0] = _truncate_tokens(chunks[0], budget)
+
+    selected = set()
+    used = 0
+    for index in order:
+        tokens = estimate_tokens(chunks[index])
+        if used + tokens > budget:
+            continue
+        selected.add(index)
+        used += tokens
+
+    parts = []
+    previous = -1
+    for index in sorted(selected):
+        if index != previous + 1 or (index == 1 and lead_cut):
+            parts.append(GAP_MARKER)
+        parts.append(chunks[index])
+        previous = index
+    if previous != len(chunks) - 1 or (previous == 0 and lead_cut):
+        parts.append(GAP_MARKER)
+    return "\n\n".join(parts)
+
+
+def group_chunks(
+    content: str,
+    query: str,
+    window_tokens: int,
+    max_windows: int,
+    chunk_tokens: int = 400,
+    extended_query: Optional[str] = None,
+) -> list[str]:
+    """
+    Group chunks into windows for map-reduce extraction.
+
+    Consecutive chunks are packed into windows of at most window_tokens.
+    Windows are ranked by their best chunk's BM25 score; windows with no
+    query term are dropped unless nothing matches at all, and at most
+    max_windows are returned in page order.
+
+    Args:
+        content: Page content
+        query: Extraction query used for ranking
+        window_tokens: Maximum estimated tokens per window
+        max_windows: Maximum number of windows to return
+        chunk_tokens: Target tokens per chunk
+        extended_query: Additional extraction instructions (also used for ranking)
+
+    Returns:
+        List of window texts in page order
+    """
+    chunks = split_chunks(content, chunk_tokens)
+    scores = bm25_scores(chunks, f"{query} {extended_query or ''}")
+
+    windows: list[tuple[float, int, str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    best = 0.0
+    for chunk, score in zip(chunks, scores):
+        tokens = estimate_tokens(chunk)
+        if current and current_tokens + tokens > window_tokens:
+            windows.append((best, len(windows), "\n\n".join(current)))
+            current, current_tokens, best = [], 0, 0.0
+        current.append(chunk)
+        current_tokens += tokens
+        best = max(best, score)
+    if current:
+        windows.append((best, len(windows), "\n\n".join(current)))
+
+    relevant = [w for w in windows if w[0] > 0] or windows
+    top = sorted(relevant, key=lambda w: (-w[0], w[1]))[:max_windows]
+    return [text for _, _, text in sorted(top, key=lambda w: w[1])]
@@ -0,0 +1,557 @@
+"""
+SQLite caches - fetched page content and LLM results.
+
+Fetch cache: entries are keyed on canonical URL (see normalize_url) and record which fetch
+backend produced them. Fresh entries (younger than the configured TTL) are
+served directly; stale entries from the basic httpx backend are revalidated
+with ETag/Last-Modified before refetching. Total size is bounded by a byte
+budget with least-recently-used eviction.
+
+Result cache: canary "clean" verdicts are keyed on sha256(content) alone, so
+already-vetted content skips Phase 1 for any query. Extractions are keyed on
+sha256(content) + normalized query + model tier + max_tokens (+ extended
+query). Extraction runs at temperature 0, so reuse is safe.
+
+Like database.py, one long-lived connection (WAL mode) is shared by the
+process and the schema is created once per connection. store_fetch() keeps a
+running total of cached bytes, so the SUM(size) scan only runs when an
+eviction is actually due.
+
+All SQL isolated in this file. Application code uses function-based interface.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from grove_shutter.config import ensure_config_dir
+from grove_shutter.models import CachedExtraction, CachedFetch
+
+
+CACHE_PATH = Path.home() / ".shutter" / "cache.db"
+
+# Ports dropped during normalization
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that never change page content, dropped during normalization
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "igshid", "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok",
+    "ref_src", "spm",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+_lock = threading.RLock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[Path] = None
+_schema_ready = False
+
+# Running total of fetch_cache sizes, or None until first computed. Writes
+# from other processes aren't seen here; evict_fetch_cache() re-syncs it
+_fetch_bytes: Optional[int] = None
+
+# In-process hit/miss counters for the result cache
+_stats = {
+    "canary_hits": 0,
+    "canary_misses": 0,
+    "extraction_hits": 0,
+    "extraction_misses": 0,
+}
+
+
+def _get_connection() -> sqlite3.Connection:
+    """
+    Get the shared cache connection, opening it if needed.
+
+    The connection is reopened if CACHE_PATH has changed since it was opened.
+    Callers must hold _lock while using it.
+    """
+    global _conn, _conn_path, _schema_ready, _fetch_bytes
+
+    if _conn is not None and _conn_path == CACHE_PATH:
+        return _conn
+
+    close_cache()
+    ensure_config_dir()
+    conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    _conn = conn
+    _conn_path = CACHE_PATH
+    _schema_ready = False
+    _fetch_bytes = None
+    return conn
+
+
+def close_cache() -> None:
+    """Close the shared cache connection."""
+    global _conn, _conn_path, _schema_ready, _fetch_bytes
+
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
+        _conn_path = None
+        _schema_ready = False
+        _fetch_bytes = None
+
+
+def init_cache() -> None:
+    """Initialize cache database and create tables if needed."""
+    global _schema_ready
+
+    with _lock:
+        conn = _get_connection()
+        if _schema_ready:
+            return
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetch_cache (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fetch_cache_access ON fetch_cache (last_access)"
+        )
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS canary_verdicts (
+                content_hash TEXT PRIMARY KEY,
+                verified_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS extractions (
+                result_key TEXT PRIMARY KEY,
+                extracted TEXT NOT NULL,
+                tokens_input INTEGER NOT NULL,
+                tokens_output INTEGER NOT NULL,
+                model_used TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        _schema_ready = True
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalize URL into a cache key.
+
+    Lowercases scheme and host, drops a leading "www.", default ports and
+    fragments, and uses "/" for an empty path. http and https map to the
+    same key (https) unless an explicit non-default port is given. Tracking
+    parameters (utm_*, fbclid, gclid, ...) are removed and the remaining
+    query parameters sorted, so links that differ only in campaign tags or
+    parameter order share one cache entry.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL string, or the stripped URL itself if it can't be
+        parsed (e.g. a non-numeric or out-of-range port); fetching it then
+        fails with the usual fetch error
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    netloc = host
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{host}:{port}"
+    elif scheme == "http":
+        scheme = "https"
+
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = urlencode(sorted(params))
+
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def get_cached_fetch(url: str) -> Optional[CachedFetch]:
+    """
+    Look up cached content for a URL and mark it as recently used.
+
+    Freshness is not checked here; callers compare fetched_at against the TTL.
+
+    Args:
+        url: URL to look up (normalized internally)
+
+    Returns:
+        CachedFetch or None if not cached
+    """
+    init_cache()
+    key = normalize_url(url)
+
+    with _lock:
+        conn = _get_connection()
+        row = conn.execute(
+            "SELECT * FROM fetch_cache WHERE url_key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        conn.execute(
+            "UPDATE fetch_cache SET last_access = ? WHERE url_key = ?",
+            (time.time(), key)
+        )
+        conn.commit()
+
+    return CachedFetch(
+        url=row["url"],
+        content=row["content"],
+        backend=row["backend"],
+        fetched_at=row["fetched_at"],
+        etag=row["etag"],
+        last_modified=row["last_modified"],
+    )
+
+
+def store_fetch(
+    url: str,
+    content: str,
+    backend: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> None:
+    """
+    Store fetched content, replacing any existing entry for the URL.
+
+    Blocking; async callers run it with asyncio.to_thread() since pages can
+    be large.
+
+    Args:
+        url: URL that was fetched
+        content: Extracted page content
+        backend: Fetch backend that produced the content (jina/tavily/basic)
+        etag: ETag response header (basic backend only)
+        last_modified: Last-Modified response header (basic backend only)
+        max_bytes: If set, evict least-recently-used entries down to this budget
+            once the running size total exceeds it
+    """
+    global _fetch_bytes
+
+    init_cache()
+    key = normalize_url(url)
+    size = len(content.encode("utf-8"))
+    now = time.time()
+
+    with _lock:
+        conn = _get_connection()
+        if _fetch_bytes is None:
+            _fetch_bytes = _total_size(conn)
+        old = conn.execute("SELECT size FROM fetch_cache WHERE url_key = ?", (key,)).fetchone()
+
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO fetch_cache
+                (url_key, url, content, backend, etag, last_modified, fetched_at, last_access, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, url, content, backend, etag, last_modified, now, now, size)
+        )
+        conn.commit()
+        _fetch_bytes += size - (old["size"] if old else 0)
+
+        if max_bytes is not None and _fetch_bytes > max_bytes:
+            evict_fetch_cache(max_bytes)
+
+
+def mark_revalidated(url: str) -> None:
+    """
+    Reset an entry's freshness after a 304 Not Modified revalidation.
+
+    Args:
+        url: URL that was revalidated
+    """
+    init_cache()
+    now = time.time()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "UPDATE fetch_cache SET fetched_at = ?, last_access = ? WHERE url_key = ?",
+            (now, now, normalize_url(url))
+        )
+        conn.commit()
+
+
+def _total_size(conn: sqlite3.Connection) -> int:
+    """Sum of fetch_cache entry sizes (full scan)."""
+    total: int = conn.execute("SELECT COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()[0]
+    return total
+
+
+def evict_fetch_cache(max_bytes: int) -> int:
+    """
+    Evict least-recently-used entries until total size fits the byte budget.
+
+    Recomputes the total from the table, which also re-syncs the running
+    total kept by store_fetch().
+
+    Args:
+        max_bytes: Total size budget in bytes
+
+    Returns:
+        Number of entries evicted
+    """
+    global _fetch_bytes
+
+    init_cache()
+
+    with _lock:
+        conn = _get_connection()
+        total = _total_size(conn)
+        if total <= max_bytes:
+            _fetch_bytes = total
+            return 0
+
+        evicted = []
+        rows = conn.execute("SELECT url_key, size FROM fetch_cache ORDER BY last_access ASC")
+        for row in rows:
+            if total <= max_bytes:
+                break
+            evicted.append((row["url_key"],))
+            total -= row["size"]
+
+        conn.executemany("DELETE FROM fetch_cache WHERE url_key = ?", evicted)
+        conn.commit()
+        _fetch_bytes = total
+        return len(evicted)
+
+
+def fetch_cache_size() -> int:
+    """
+    Get total size of cached content.
+
+    Returns:
+        Total size in bytes
+    """
+    init_cache()
+
+    with _lock:
+        return _total_size(_get_connection())
+
+
+def hash_content(content: str) -> str:
+    """Get sha256 hex digest of page content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query for cache keys: lowercase with collapsed whitespace."""
+    return " ".join(query.lower().split())
+
+
+def extraction_key(
+    content_hash: str,
+    query: str,
+    model: str,
+    max_tokens: int,
+    extended_query: Optional[str] = None,
+) -> str:
+    """
+    Build the result cache key for an extraction.
+
+    Args:
+        content_hash: sha256 of page content (see hash_content)
+        query: Extraction query (normalized internally)
+        model: Model tier
+        max_tokens: Maximum output tokens
+        extended_query: Additional extraction instructions
+
+    Returns:
+        Hex digest identifying this extraction
+    """
+    parts = [
+        content_hash,
+        normalize_query(query),
+        model.lower(),
+        str(max_tokens),
+        normalize_query(extended_query or ""),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def is_content_vetted(content_hash: str, ttl: float) -> bool:
+    """
+    Check whether content already passed the canary within the TTL.
+
+    Args:
+        content_hash: sha256 of page content
+        ttl: Maximum verdict age in seconds
+
+    Returns:
+        True if a clean verdict is cached and fresh
+    """
+    init_cache()
+
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT verified_at FROM canary_verdicts WHERE content_hash = ?",
+            (content_hash,)
+        ).fetchone()
+
+    if row is not None and time.time() - row["verified_at"] < ttl:
+        _stats["canary_hits"] += 1
+        return True
+
+    _stats["canary_misses"] += 1
+    return False
+
+
+def store_clean_verdict(content_hash: str) -> None:
+    """
+    Record that content passed the canary check.
+
+    Only clean verdicts are cached; detections go to the offenders list.
+
+    Args:
+        content_hash: sha256 of page content
+    """
+    init_cache()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO canary_verdicts (content_hash, verified_at) VALUES (?, ?)",
+            (content_hash, time.time())
+        )
+        conn.commit()
+
+
+def get_cached_extraction(result_key: str, ttl: float) -> Optional[CachedExtraction]:
+    """
+    Look up a cached extraction result.
+
+    Args:
+        result_key: Key from extraction_key()
+        ttl: Maximum result age in seconds
+
+    Returns:
+        CachedExtraction or None on miss/expiry
+    """
+    init_cache()
+
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT * FROM extractions WHERE result_key = ?",
+            (result_key,)
+        ).fetchone()
+
+    if row is None or time.time() - row["created_at"] >= ttl:
+        _stats["extraction_misses"] += 1
+        return None
+
+    _stats["extraction_hits"] += 1
+    return CachedExtraction(
+        extracted=row["extracted"],
+        tokens_input=row["tokens_input"],
+        tokens_output=row["tokens_output"],
+        model_used=row["model_used"],
+        created_at=row["created_at"],
+    )
+
+
+def store_extraction(
+    result_key: str,
+    extracted: str,
+    tokens_input: int,
+    tokens_output: int,
+    model_used: str,
+) -> None:
+    """
+    Store an extraction result.
+
+    Args:
+        result_key: Key from extraction_key()
+        extracted: Extracted text
+        tokens_input: Prompt tokens billed for the original call
+        tokens_output: Completion tokens billed for the original call
+        model_used: OpenRouter model identifier
+    """
+    init_cache()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO extractions
+                (result_key, extracted, tokens_input, tokens_output, model_used, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (result_key, extracted, tokens_input, tokens_output, model_used, time.time())
+        )
+        conn.commit()
+
+
+def get_cache_stats() -> dict:
+    """
+    Get in-process result cache hit/miss counters.
+
+    Returns:
+        Dict of counter name -> count
+    """
+    return dict(_stats)
+
+
+def reset_cache_stats() -> None:
+    """Reset result cache hit/miss counters to zero."""
+    for key in _stats:
+        _stats[key] = 0
+
+
+def clear_result_cache() -> None:
+    """Clear cached canary verdicts and extractions."""
+    init_cache()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute("DELETE FROM canary_verdicts")
+        conn.execute("DELETE FROM extractions")
+        conn.commit()
+
+
+def clear_fetch_cache() -> None:
+    """
+    Clear all cached fetches.
+
+    Useful for testing or forcing fresh fetches.
+    """
+    global _fetch_bytes
+
+    init_cache()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute("DELETE FROM fetch_cache")
+        conn.commit()
+        _fetch_bytes = 0
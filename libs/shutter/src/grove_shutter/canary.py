@@ -7,12 +7,14 @@ Two-phase detection:
 """
 
 import re
-from typing import Optional, Tuple
-
-import httpx
+from dataclasses import dataclass
+from typing import Collection, Optional, Tuple
 
+from grove_shutter.breaker import guard
 from grove_shutter.config import get_api_key, get_canary_settings, is_dry_run
+from grove_shutter.metrics import phase_timer
 from grove_shutter.models import PromptInjectionDetails
+from grove_shutter.pool import upstream_client, upstream_url
 
 
 # Regex patterns for common prompt injection attempts
@@ -67,6 +69,12 @@ INDICATOR_WEIGHTS = {
 # Can be overridden in config.toml [canary] block_threshold
 BLOCK_THRESHOLD = 0.6
 
+# Pages longer than this (in characters) are scanned in overlapping windows
+# with early exit instead of all at once
+CHUNKED_SCAN_THRESHOLD = 1_000_000
+CHUNK_SIZE = 256 * 1024
+CHUNK_OVERLAP = 1024  # Longest match guaranteed to be caught across a boundary
+
 
 def get_block_threshold() -> float:
     """Get block threshold from config, with fallback to default."""
@@ -74,6 +82,172 @@ def get_block_threshold() -> float:
     return settings.get("block_threshold", BLOCK_THRESHOLD)
 
 
+def _required_literal(pattern: str) -> str:
+    """
+    Find the longest literal run that every match of a pattern must contain.
+
+    Only top-level literals count: anything inside a group, character class,
+    or followed by an optional quantifier is skipped, and patterns with a
+    top-level alternation have no required literal.
+
+    Args:
+        pattern: Regex pattern from INJECTION_PATTERNS
+
+    Returns:
+        Required literal substring, or "" if none can be derived
+    """
+    runs: list[str] = []
+    run = ""
+    depth = 0
+    last_was_literal = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        literal = None
+
+        if ch == "\\":
+            escaped = pattern[i + 1]
+            literal = None if escaped.isalnum() else escaped  # \s, \d, ... are classes
+            i += 2
+        elif ch == "[":
+            i = pattern.index("]", i + 1) + 1
+        elif ch in "?*{":
+            # Previous atom is optional, so it can't be part of a required run
+            if run and last_was_literal:
+                run = run[:-1]
+            if ch == "{":
+                i = pattern.index("}", i) + 1
+            else:
+                i += 1
+        elif ch == "|" and depth == 0:
+            return ""
+        else:
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif ch not in ".^$+|":
+                literal = ch
+            i += 1
+
+        if literal is not None and depth == 0:
+            run += literal
+            last_was_literal = True
+        else:
+            last_was_literal = False
+            # Any other atom (class, group, quantifier) ends the current run
+            if run:
+                runs.append(run)
+            run = ""
+    if run:
+        runs.append(run)
+
+    return max(runs, key=len, default="")
+
+
+def _split_leading_alternation(pattern: str) -> list[str]:
+    """
+    Split a leading group of literal alternatives into separate patterns.
+
+    "(developer|admin|system)\\s+mode" becomes one pattern per word. Python's
+    re can then use a fast literal-prefix search for each, instead of trying
+    the branch at every position. Only applied when the alternatives start
+    with distinct characters, so at most one can match at a given position
+    and the leftmost match across the split patterns is identical to the
+    original's.
+
+    Args:
+        pattern: Regex pattern from INJECTION_PATTERNS
+
+    Returns:
+        List of equivalent patterns (just [pattern] if not splittable)
+    """
+    match = re.fullmatch(r"\(((?:[a-z]+\|)+[a-z]+)\)(.*)", pattern)
+    if not match or "\\" + "1" in match.group(2):
+        return [pattern]
+
+    alternatives = match.group(1).split("|")
+    if len({alt[0] for alt in alternatives}) != len(alternatives):
+        return [pattern]
+
+    return [alt + match.group(2) for alt in alternatives]
+
+
+def _compile_heuristics() -> list[Tuple[str, list[re.Pattern], str, float]]:
+    """
+    Precompile INJECTION_PATTERNS into scanner entries.
+
+    Returns:
+        List of (required_literal, compiled_patterns, injection_type, base_confidence)
+    """
+    return [
+        (
+            _required_literal(pattern),
+            [re.compile(p) for p in _split_leading_alternation(pattern)],
+            injection_type,
+            base_confidence,
+        )
+        for pattern, injection_type, base_confidence in INJECTION_PATTERNS
+    ]
+
+
+def _compile_unicode_scanner() -> re.Pattern:
+    """Compile SUSPICIOUS_UNICODE_RANGES into a single character-class regex."""
+    ranges = "".join(
+        f"{re.escape(chr(start))}-{re.escape(chr(end))}"
+        for start, end, _, _ in SUSPICIOUS_UNICODE_RANGES
+    )
+    return re.compile(f"[{ranges}]")
+
+
+# Precompiled scanners (built once at import instead of per call)
+_HEURISTIC_SCANNER = _compile_heuristics()
+_UNICODE_SCANNER = _compile_unicode_scanner()
+
+
+def _scan_patterns(
+    content: str,
+    window_lower: str,
+    offset: int,
+    skip: Collection[int] = (),
+) -> list[Tuple[int, Tuple[str, str, float]]]:
+    """
+    Scan one lowercased window of content with the precompiled patterns.
+
+    Args:
+        content: Full page content (snippets are cut from here)
+        window_lower: Lowercased slice of content starting at offset
+        offset: Position of the window within content
+        skip: Pattern indices already matched (not scanned again)
+
+    Returns:
+        List of (pattern_index, (injection_type, snippet, confidence))
+    """
+    results = []
+
+    for index, (required, patterns, injection_type, base_confidence) in enumerate(
+        _HEURISTIC_SCANNER
+    ):
+        if index in skip or (required and required not in window_lower):
+            continue
+
+        # Leftmost match across the (possibly split) pattern
+        match = None
+        for compiled in patterns:
+            candidate = compiled.search(window_lower)
+            if candidate and (match is None or candidate.start() < match.start()):
+                match = candidate
+
+        if match:
+            # Extract snippet around the match
+            start = max(0, offset + match.start() - 20)
+            end = min(len(content), offset + match.end() + 20)
+            snippet = content[start:end]
+            results.append((index, (injection_type, snippet, base_confidence)))
+
+    return results
+
+
 def check_heuristics(content: str) -> list[Tuple[str, str, float]]:
     """
     Run free heuristic checks for prompt injection patterns.
@@ -81,46 +255,71 @@ def check_heuristics(content: str) -> list[Tuple[str, str, float]]:
     Returns ALL matches with their confidence scores, enabling
     multi-pattern boosting in the aggregation step.
 
+    Patterns are precompiled, and each one is skipped outright when its
+    required literal (e.g. "prompt" for prompt_leak) is absent from the page,
+    which is a C-speed substring check. Results are identical to running
+    re.search for every pattern in INJECTION_PATTERNS order.
+
     Args:
         content: Page content to analyze
 
     Returns:
         List of (injection_type, snippet, confidence) tuples
     """
-    content_lower = content.lower()
-    matches = []
+    return [match for _, match in _scan_patterns(content, content.lower(), 0)]
 
-    # Check all regex patterns
-    for pattern, injection_type, base_confidence in INJECTION_PATTERNS:
-        match = re.search(pattern, content_lower)
-        if match:
-            # Extract snippet around the match
-            start = max(0, match.start() - 20)
-            end = min(len(content), match.end() + 20)
-            snippet = content[start:end]
-            matches.append((injection_type, snippet, base_confidence))
 
-    return matches
+def _find_unicode(
+    content: str, pos: int = 0, endpos: Optional[int] = None
+) -> Optional[Tuple[str, str, float]]:
+    """Find the first suspicious Unicode character in content[pos:endpos]."""
+    match = _UNICODE_SCANNER.search(content, pos, len(content) if endpos is None else endpos)
+    if match is None:
+        return None
+
+    code = ord(match.group())
+    for start, end, char_type, confidence in SUSPICIOUS_UNICODE_RANGES:
+        if start <= code <= end:
+            snippet = f"[Hidden {char_type} at position {match.start()}]"
+            return (f"hidden_unicode_{char_type}", snippet, confidence)
+
+    return None
 
 
 def check_unicode(content: str) -> Optional[Tuple[str, str, float]]:
     """
     Check for suspicious Unicode characters that could hide instructions.
 
+    Uses one precompiled character class covering SUSPICIOUS_UNICODE_RANGES,
+    so the scan runs in C and stops at the first suspicious character. Pure
+    ASCII pages (all ranges are non-ASCII) are cleared without scanning.
+
     Args:
         content: Page content to analyze
 
     Returns:
         Tuple of (injection_type, snippet, confidence) if suspicious, None if clean
     """
-    for char in content:
-        code = ord(char)
-        for start, end, char_type, confidence in SUSPICIOUS_UNICODE_RANGES:
-            if start <= code <= end:
-                # Find position for context
-                idx = content.index(char)
-                snippet = f"[Hidden {char_type} at position {idx}]"
-                return (f"hidden_unicode_{char_type}", snippet, confidence)
+    if content.isascii():
+        return None
+
+    return _find_unicode(content)
+
+
+def _find_base64(
+    content: str, pos: int = 0, endpos: Optional[int] = None
+) -> Optional[Tuple[str, str, float]]:
+    """Find the first long Base64 run in content[pos:endpos]."""
+    endpos = len(content) if endpos is None else endpos
+    for found in BASE64_PATTERN.finditer(content, pos, endpos):
+        match = found.group()
+        length = len(match)
+        # Only flag very long base64 strings (likely payloads, not images)
+        if length > 100:
+            # Confidence scales with length: 100 chars = 0.60, 600 chars = 0.95
+            confidence = min(0.95, 0.60 + (length - 100) / 500)
+            snippet = match[:50] + "..." + match[-10:]
+            return ("base64_payload", snippet, confidence)
 
     return None
 
@@ -137,17 +336,78 @@ def check_base64(content: str) -> Optional[Tuple[str, str, float]]:
     Returns:
         Tuple of (injection_type, snippet, confidence) if suspicious, None if clean
     """
-    matches = BASE64_PATTERN.findall(content)
-    for match in matches:
-        length = len(match)
-        # Only flag very long base64 strings (likely payloads, not images)
-        if length > 100:
-            # Confidence scales with length: 100 chars = 0.60, 600 chars = 0.95
-            confidence = min(0.95, 0.60 + (length - 100) / 500)
-            snippet = match[:50] + "..." + match[-10:]
-            return ("base64_payload", snippet, confidence)
+    return _find_base64(content)
+
+
+def check_heuristics_chunked(
+    content: str,
+    block_threshold: float,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> Tuple[
+    list[Tuple[str, str, float]],
+    Optional[Tuple[str, str, float]],
+    Optional[Tuple[str, str, float]],
+]:
+    """
+    Run all heuristic checks over content in overlapping windows.
 
-    return None
+    Used for very large pages. Only one lowercased window is held at a time
+    (instead of a lowercased copy of the whole page), and scanning stops as
+    soon as the aggregated confidence reaches block_threshold. Windows
+    overlap so patterns straddling a boundary are still caught, as long as
+    the match is shorter than the overlap.
+
+    Args:
+        content: Page content to analyze
+        block_threshold: Confidence at which scanning stops early
+        chunk_size: Window size in characters
+        overlap: Characters shared between consecutive windows
+
+    Returns:
+        Tuple of (heuristic_matches, unicode_result, base64_result), in the
+        same shapes as check_heuristics/check_unicode/check_base64
+    """
+    if overlap >= chunk_size:
+        raise ValueError("overlap must be smaller than chunk_size")
+
+    found: dict[int, Tuple[str, str, float]] = {}
+    unicode_result = None
+    base64_result = None
+    scan_unicode = not content.isascii()
+
+    step = chunk_size - overlap
+    for start in range(0, max(len(content), 1), step):
+        end = min(len(content), start + chunk_size)
+        changed = False
+
+        window_lower = content[start:end].lower()
+        for index, match in _scan_patterns(content, window_lower, start, found):
+            found[index] = match
+            changed = True
+        del window_lower
+
+        if unicode_result is None and scan_unicode:
+            unicode_result = _find_unicode(content, start, end)
+            changed = changed or unicode_result is not None
+        if base64_result is None:
+            base64_result = _find_base64(content, start, end)
+            changed = changed or base64_result is not None
+
+        # Confidence only grows as signals are added, so re-check on change
+        if changed:
+            heuristic_matches = [found[index] for index in sorted(found)]
+            confidence, _, _, _ = aggregate_confidence(
+                heuristic_matches, unicode_result, base64_result
+            )
+            if confidence >= block_threshold:
+                break
+
+        if end >= len(content):
+            break
+
+    heuristic_matches = [found[index] for index in sorted(found)]
+    return heuristic_matches, unicode_result, base64_result
 
 
 def aggregate_confidence(
@@ -223,7 +483,9 @@ def aggregate_confidence(
     return (max_confidence, primary_type, primary_snippet, signals)
 
 
-async def run_canary_llm(content: str, query: str) -> Optional[PromptInjectionDetails]:
+async def run_canary_llm(
+    content: str, query: str
+) -> Tuple[str, Optional[PromptInjectionDetails]]:
     """
     Run minimal LLM extraction and analyze output for injection indicators.
 
@@ -234,16 +496,18 @@ async def run_canary_llm(content: str, query: str) -> Optional[PromptInjectionDe
         query: User's extraction query
 
     Returns:
-        PromptInjectionDetails if injection detected, None if clean
+        Tuple of (outcome, details): (LLM_FLAGGED, PromptInjectionDetails) if
+        the output shows injection, (LLM_CLEAN, None) if it doesn't, and
+        (LLM_NOT_RUN, None) if no check happened
     """
     if is_dry_run():
         # In dry-run mode, skip LLM check
-        return None
+        return LLM_NOT_RUN, None
 
     api_key = get_api_key("openrouter")
     if not api_key:
         # Can't run LLM check without API key
-        return None
+        return LLM_NOT_RUN, None
 
     # Build minimal canary prompt
     # Truncate content to reduce cost
@@ -259,9 +523,10 @@ async def run_canary_llm(content: str, query: str) -> Optional[PromptInjectionDe
 Respond in 50 words or less based only on the content above."""
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
+        async with guard("openrouter"), upstream_client("openrouter") as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                upstream_url("openrouter", "chat/completions"),
+                timeout=30,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                     "HTTP-Referer": "https://github.com/AutumnsGrove/Shutter",
@@ -280,14 +545,15 @@ Respond in 50 words or less based only on the content above."""
             # Extract the response text
             if "choices" in result and len(result["choices"]) > 0:
                 output = result["choices"][0]["message"]["content"]
-                return analyze_canary_output(output, query)
+                details = analyze_canary_output(output, query)
+                return (LLM_FLAGGED if details else LLM_CLEAN), details
 
     except Exception:
-        # If canary LLM fails, we can't detect - but don't block
-        # The main extraction will still run
+        # If canary LLM fails (or OpenRouter's circuit is open), we can't
+        # detect - but don't block. The main extraction will still run
         pass
 
-    return None
+    return LLM_NOT_RUN, None
 
 
 def analyze_canary_output(output: str, original_query: str) -> Optional[PromptInjectionDetails]:
@@ -413,7 +679,103 @@ def analyze_canary_output(output: str, original_query: str) -> Optional[PromptIn
     return None
 
 
-async def canary_check(content: str, query: str) -> Optional[PromptInjectionDetails]:
+# Heuristic confidence below which the canary LLM check runs
+LLM_CHECK_THRESHOLD = 0.3
+
+# Canary LLM outcomes (see run_canary_llm)
+LLM_CLEAN = "clean"  # Ran, and its output showed no sign of injection
+LLM_FLAGGED = "flagged"  # Ran, and its output showed signs of injection
+LLM_NOT_RUN = "not_run"  # Dry run, no API key, upstream error or open circuit
+
+
+@dataclass
+class CanaryVerdict:
+    """Outcome of canary_verdict()"""
+    injection: Optional[PromptInjectionDetails] = None  # Set when the page is blocked
+    llm: Optional[str] = None  # LLM_* outcome, or None if the heuristics decided alone
+
+    @property
+    def vetted(self) -> bool:
+        """Whether a completed check passed the page (safe to remember as clean)."""
+        return self.injection is None and self.llm in (None, LLM_CLEAN)
+
+
+def canary_heuristics(
+    content: str,
+    block_threshold: Optional[float] = None,
+) -> Tuple[float, Optional[str], Optional[str], list[str]]:
+    """
+    Run the free heuristic checks and aggregate their signals.
+
+    Pages over CHUNKED_SCAN_THRESHOLD characters are scanned in overlapping
+    windows that stop as soon as the block threshold is reached.
+
+    Args:
+        content: Fetched page content
+        block_threshold: Threshold for early exit (defaults to config)
+
+    Returns:
+        Tuple of (confidence, primary_type, primary_snippet, signals), as
+        from aggregate_confidence()
+    """
+    if block_threshold is None:
+        block_threshold = get_block_threshold()
+
+    # Very large pages are scanned in windows and stop at the first block
+    if len(content) > CHUNKED_SCAN_THRESHOLD:
+        heuristic_matches, unicode_result, base64_result = check_heuristics_chunked(
+            content, block_threshold
+        )
+    else:
+        heuristic_matches = check_heuristics(content)
+        unicode_result = check_unicode(content)
+        base64_result = check_base64(content)
+
+    return aggregate_confidence(heuristic_matches, unicode_result, base64_result)
+
+
+def needs_llm_check(heuristics: Tuple[float, Optional[str], Optional[str], list[str]]) -> bool:
+    """
+    Check whether canary_verdict() would call the canary LLM for these heuristics.
+
+    Args:
+        heuristics: Result of canary_heuristics()
+
+    Returns:
+        True if heuristics are inconclusive (confidence below LLM_CHECK_THRESHOLD)
+    """
+    return heuristics[0] < LLM_CHECK_THRESHOLD
+
+
+async def canary_check(
+    content: str,
+    query: str,
+    heuristics: Optional[Tuple[float, Optional[str], Optional[str], list[str]]] = None,
+) -> Optional[PromptInjectionDetails]:
+    """
+    Run minimal extraction to detect prompt injection patterns.
+
+    See canary_verdict() for the threshold behavior. A page let through
+    without a completed LLM check also returns None here; use
+    canary_verdict() to tell it apart from a clean one.
+
+    Args:
+        content: Fetched page content
+        query: User's extraction query
+        heuristics: Precomputed canary_heuristics() result, if the caller
+            already ran them
+
+    Returns:
+        PromptInjectionDetails if injection detected, None otherwise
+    """
+    return (await canary_verdict(content, query, heuristics)).injection
+
+
+async def canary_verdict(
+    content: str,
+    query: str,
+    heuristics: Optional[Tuple[float, Optional[str], Optional[str], list[str]]] = None,
+) -> CanaryVerdict:
     """
     Run minimal extraction to detect prompt injection patterns.
 
@@ -424,54 +786,64 @@ async def canary_check(content: str, query: str) -> Optional[PromptInjectionDeta
     - confidence < 0.3: Run LLM check for additional validation
     - confidence 0.3-threshold: Could be used for soft warnings (future)
 
+    Pages over CHUNKED_SCAN_THRESHOLD characters are scanned in overlapping
+    windows that stop as soon as the block threshold is reached, keeping
+    memory bounded and rejecting large hostile pages early.
+
     Args:
         content: Fetched page content
         query: User's extraction query
+        heuristics: Precomputed canary_heuristics() result, if the caller
+            already ran them
 
     Returns:
-        PromptInjectionDetails if injection detected, None otherwise
+        CanaryVerdict: injection set if detected; llm records whether the
+        canary LLM ran and what it found (LLM_NOT_RUN means the page was let
+        through unchecked, not that it is clean)
     """
     # Get configurable threshold
     block_threshold = get_block_threshold()
 
     # Phase 1: Free heuristic checks - collect all signals
-    heuristic_matches = check_heuristics(content)
-    unicode_result = check_unicode(content)
-    base64_result = check_base64(content)
-
-    # Aggregate all heuristic signals
-    confidence, primary_type, primary_snippet, signals = aggregate_confidence(
-        heuristic_matches, unicode_result, base64_result
-    )
+    if heuristics is None:
+        heuristics = canary_heuristics(content, block_threshold)
+    confidence, primary_type, primary_snippet, signals = heuristics
 
     # If high confidence from heuristics alone, skip LLM check
     if confidence >= block_threshold and primary_type and primary_snippet:
-        return PromptInjectionDetails(
+        return CanaryVerdict(injection=PromptInjectionDetails(
             detected=True,
             type=primary_type,
             snippet=primary_snippet,
             domain_flagged=confidence >= 0.7,
             confidence=confidence,
             signals=signals,
-        )
+        ))
 
     # Phase 2: Cheap LLM check (only if heuristics inconclusive)
-    if confidence < 0.3:
-        llm_result = await run_canary_llm(content, query)
-        if llm_result:
-            # Combine LLM confidence with any weak heuristic signals
-            combined_confidence = max(confidence + 0.2, llm_result.confidence)
-            combined_signals = signals + llm_result.signals
-
-            if combined_confidence >= block_threshold:
-                return PromptInjectionDetails(
+    if confidence >= LLM_CHECK_THRESHOLD:
+        # Low-confidence heuristics alone - allow extraction
+        return CanaryVerdict()
+
+    with phase_timer("canary.llm"):
+        outcome, llm_result = await run_canary_llm(content, query)
+    if llm_result:
+        # Combine LLM confidence with any weak heuristic signals
+        combined_confidence = max(confidence + 0.2, llm_result.confidence)
+        combined_signals = signals + llm_result.signals
+
+        if combined_confidence >= block_threshold:
+            return CanaryVerdict(
+                injection=PromptInjectionDetails(
                     detected=True,
                     type=llm_result.type,
                     snippet=llm_result.snippet,
                     domain_flagged=combined_confidence >= 0.7,
                     confidence=combined_confidence,
                     signals=combined_signals,
-                )
+                ),
+                llm=outcome,
+            )
 
-    # Clean or low-confidence - allow extraction
-    return None
+    # Clean, weakly flagged or unchecked - allow extraction
+    return CanaryVerdict(llm=outcome)
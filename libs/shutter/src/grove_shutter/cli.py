@@ -7,13 +7,30 @@ import json
 import os
 import sys
 from dataclasses import asdict
+from pathlib import Path
 from typing import Optional
 
 import typer
 
+from grove_shutter.cache import clear_fetch_cache, clear_result_cache
 from grove_shutter.config import setup_config
-from grove_shutter.core import shutter
-from grove_shutter.database import clear_offenders, list_offenders
+from grove_shutter.core import shutter, shutter_many, shutter_stream
+from grove_shutter.database import (
+    clear_offenders,
+    export_offenders_snapshot,
+    list_offenders,
+    offenders_from_rows,
+)
+from grove_shutter.metrics import (
+    clear_saved_metrics,
+    get_metrics,
+    load_metrics,
+    merge_metrics,
+    render_prometheus,
+    save_metrics,
+)
+from grove_shutter.models import ShutterRequest
+from grove_shutter.snapshot import SNAPSHOT_PATH, SnapshotError, import_snapshot
 
 
 def _serialize_response(obj):
@@ -52,6 +69,199 @@ def run_extraction(
     # Convert to dict and output as JSON
     result_dict = asdict(result)
     print(json.dumps(result_dict, indent=2, default=_serialize_response))
+    save_metrics()
+
+
+def run_stream(
+    url: str,
+    query: str,
+    model: str = "fast",
+    max_tokens: int = 500,
+    extended_query: Optional[str] = None,
+    dry_run: bool = False,
+    timeout: int = 30000,
+) -> None:
+    """
+    Run a streaming extraction.
+
+    Text is written to stdout as it arrives; the final response (usage and
+    timings, without the already-printed text) goes to stderr as JSON so
+    stdout stays plain text. When nothing was streamed (blocked, errors,
+    cache hits) the full response is printed to stdout as usual.
+    """
+    if dry_run:
+        os.environ["SHUTTER_DRY_RUN"] = "1"
+
+    async def _run() -> None:
+        streamed = False
+        async for item in shutter_stream(
+            url=url,
+            query=query,
+            model=model,
+            max_tokens=max_tokens,
+            extended_query=extended_query,
+            timeout=timeout,
+        ):
+            if isinstance(item, str):
+                streamed = True
+                sys.stdout.write(item)
+                sys.stdout.flush()
+                continue
+
+            result_dict = asdict(item)
+            if streamed:
+                print()
+                result_dict.pop("extracted")
+                print(json.dumps(result_dict, default=_serialize_response), file=sys.stderr)
+            else:
+                print(json.dumps(result_dict, indent=2, default=_serialize_response))
+
+    asyncio.run(_run())
+    save_metrics()
+
+
+def load_batch_requests(
+    path: str,
+    model: str = "fast",
+    max_tokens: int = 500,
+    extended_query: Optional[str] = None,
+    timeout: int = 30000,
+) -> list[ShutterRequest]:
+    """
+    Load batch requests from a JSONL file.
+
+    Each line is a JSON object with ShutterRequest fields. "url" and "query"
+    are required; other fields fall back to the CLI defaults. Blank lines are
+    skipped.
+
+    Raises:
+        ValueError: If a line is not valid JSON or is missing required fields
+    """
+    requests = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({e.msg})")
+            if not isinstance(data, dict) or "url" not in data or "query" not in data:
+                raise ValueError(f"{path}:{line_no}: each line needs 'url' and 'query'")
+
+            requests.append(ShutterRequest(
+                url=data["url"],
+                query=data["query"],
+                model=data.get("model", model),
+                max_tokens=int(data.get("max_tokens", max_tokens)),
+                extended_query=data.get("extended_query", extended_query),
+                timeout=int(data.get("timeout", timeout)),
+            ))
+    return requests
+
+
+def run_batch(
+    requests: list[ShutterRequest],
+    concurrency: int = 8,
+    per_domain: int = 2,
+    dry_run: bool = False,
+) -> None:
+    """Run a batch extraction, printing one JSON line per result as it completes."""
+    if dry_run:
+        os.environ["SHUTTER_DRY_RUN"] = "1"
+
+    async def _run() -> None:
+        async for result in shutter_many(requests, concurrency=concurrency, per_domain=per_domain):
+            print(json.dumps(asdict(result), default=_serialize_response), flush=True)
+
+    asyncio.run(_run())
+    save_metrics()
+
+
+def export_metrics(fmt: str = "json", output: Optional[str] = None) -> None:
+    """
+    Print or write accumulated metrics (~/.shutter/metrics.json plus this process).
+
+    Args:
+        fmt: "json" or "prometheus"
+        output: File to write instead of printing
+    """
+    snapshot = merge_metrics(load_metrics(), get_metrics())
+    if fmt == "prometheus":
+        text = render_prometheus(snapshot)
+    else:
+        text = json.dumps(snapshot, indent=2) + "\n"
+
+    if output:
+        with open(output, "w") as f:
+            f.write(text)
+        print(f"Metrics written to: {output}")
+    else:
+        print(text, end="")
+
+
+def load_d1_rows(path: str) -> list[dict]:
+    """
+    Load offenders rows exported from Cloudflare D1.
+
+    Accepts the output of `wrangler d1 execute ... --json` (a list of result
+    sets with "results") or a plain JSON list of rows.
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    rows = []
+    for item in data if isinstance(data, list) else [data]:
+        if isinstance(item, dict) and "results" in item:
+            rows.extend(item["results"])
+        else:
+            rows.append(item)
+    return rows
+
+
+def run_offenders_command(args: list[str]) -> None:
+    """Handle `shutter offenders export-snapshot|import-snapshot`."""
+    command = args[0]
+
+    if command == "export-snapshot":
+        path = None
+        extra = []
+        i = 1
+        while i < len(args):
+            if args[i] == "--merge-d1" and i + 1 < len(args):
+                try:
+                    extra = offenders_from_rows(load_d1_rows(args[i + 1]))
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Error: could not read D1 rows: {e}")
+                    sys.exit(1)
+                i += 2
+            elif not args[i].startswith("-") and path is None:
+                path = args[i]
+                i += 1
+            else:
+                print(f"Unknown option: {args[i]}")
+                sys.exit(1)
+
+        count = export_offenders_snapshot(Path(path) if path else None, extra)
+        print(f"Exported {count} domain(s) to: {path or SNAPSHOT_PATH}")
+        return
+
+    if command == "import-snapshot":
+        if len(args) < 2:
+            print("Error: snapshot file argument is required.")
+            sys.exit(1)
+        try:
+            count = import_snapshot(Path(args[1]))
+        except SnapshotError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Installed snapshot with {count} domain(s) at: {SNAPSHOT_PATH}")
+        return
+
+    print(f"Unknown offenders command: {command}")
+    print_help()
+    sys.exit(1)
 
 
 def main():
@@ -64,6 +274,10 @@ def main():
             setup_config()
             return
 
+        if args[0] == "offenders" and len(args) >= 2:
+            run_offenders_command(args[1:])
+            return
+
         if args[0] == "offenders":
             offenders = list_offenders()
             if not offenders:
@@ -84,6 +298,17 @@ def main():
             print("Offenders list cleared.")
             return
 
+        if args[0] == "clear-cache":
+            clear_fetch_cache()
+            clear_result_cache()
+            print("Fetch and result caches cleared.")
+            return
+
+        if args[0] == "clear-metrics":
+            clear_saved_metrics()
+            print("Metrics cleared.")
+            return
+
         if args[0] in ("--help", "-h"):
             print_help()
             return
@@ -96,6 +321,13 @@ def main():
     extended_query = None
     dry_run = False
     timeout = 30000
+    batch_path = None
+    concurrency = 8
+    per_domain = 2
+    stream = False
+    metrics = False
+    metrics_format = "json"
+    metrics_output = None
 
     i = 0
     while i < len(args):
@@ -116,9 +348,33 @@ def main():
         elif arg == "--dry-run":
             dry_run = True
             i += 1
+        elif arg == "--stream":
+            stream = True
+            i += 1
+        elif arg == "--metrics":
+            metrics = True
+            i += 1
+        elif arg == "--format" and i + 1 < len(args):
+            metrics_format = args[i + 1].lower()
+            i += 2
+        elif arg == "--output" and i + 1 < len(args):
+            metrics_output = args[i + 1]
+            i += 2
+        elif arg == "--no-cache":
+            os.environ["SHUTTER_NO_CACHE"] = "1"
+            i += 1
         elif arg == "--timeout" and i + 1 < len(args):
             timeout = int(args[i + 1])
             i += 2
+        elif arg == "--batch" and i + 1 < len(args):
+            batch_path = args[i + 1]
+            i += 2
+        elif arg == "--concurrency" and i + 1 < len(args):
+            concurrency = int(args[i + 1])
+            i += 2
+        elif arg == "--per-domain" and i + 1 < len(args):
+            per_domain = int(args[i + 1])
+            i += 2
         elif arg in ("--help", "-h"):
             print_help()
             return
@@ -130,6 +386,30 @@ def main():
             print_help()
             sys.exit(1)
 
+    if metrics:
+        if metrics_format not in ("json", "prometheus"):
+            print(f"Error: unknown metrics format: {metrics_format}")
+            sys.exit(1)
+        export_metrics(metrics_format, metrics_output)
+        return
+
+    # Batch mode: requests come from a JSONL file
+    if batch_path is not None:
+        try:
+            requests = load_batch_requests(
+                batch_path,
+                model=model,
+                max_tokens=max_tokens,
+                extended_query=extended_query,
+                timeout=timeout,
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        run_batch(requests, concurrency=concurrency, per_domain=per_domain, dry_run=dry_run)
+        return
+
     # Validate required arguments
     if url is None:
         print("Error: URL argument is required.")
@@ -144,7 +424,8 @@ def main():
         sys.exit(1)
 
     # Run extraction
-    run_extraction(
+    run = run_stream if stream else run_extraction
+    run(
         url=url,
         query=query,
         model=model,
@@ -162,9 +443,18 @@ Open. Capture. Close.
 
 Usage:
   shutter URL --query QUERY [OPTIONS]
+  shutter --batch FILE.jsonl [OPTIONS]
+  shutter --metrics [--format json|prometheus] [--output FILE]
   shutter setup          Interactive configuration setup
   shutter offenders      Show domains in offenders list
+  shutter offenders export-snapshot [FILE] [--merge-d1 ROWS.json]
+                         Write the offenders list as a binary snapshot
+                         [default: ~/.shutter/offenders.snap]
+  shutter offenders import-snapshot FILE
+                         Validate and install a snapshot for all workers
   shutter clear-offenders    Clear offenders list
+  shutter clear-cache    Clear cached fetches, canary verdicts and extractions
+  shutter clear-metrics  Clear accumulated metrics (~/.shutter/metrics.json)
 
 Options:
   -q, --query TEXT       What to extract from the page (required)
@@ -172,13 +462,24 @@ Options:
   -t, --max-tokens INT   Maximum output tokens [default: 500]
   -e, --extended TEXT    Additional extraction instructions
   --dry-run              Use mock responses (no API calls)
+  --stream               Print extracted text as it is generated (usage/timings JSON on stderr)
+  --no-cache             Bypass the fetch and result caches (~/.shutter/cache.db)
   --timeout INT          Fetch timeout in milliseconds [default: 30000]
+  --batch FILE           Run every request in a JSONL file (one {"url", "query", ...} per line)
+  --concurrency INT      Batch: max requests in flight [default: 8]
+  --per-domain INT       Batch: max requests in flight per domain [default: 2]
+  --metrics              Print accumulated phase timings and counters
+  --format FORMAT        Metrics: json or prometheus [default: json]
+  --output FILE          Metrics: write to FILE instead of stdout
   -h, --help             Show this message
 
 Examples:
   shutter "https://example.com" --query "What is this page about?"
   shutter "https://example.com/pricing" -q "Extract pricing tiers" -m accurate
   shutter "https://example.com" -q "Extract features" --dry-run
+  shutter "https://example.com/docs" -q "Summarize the install steps" --stream
+  shutter --batch urls.jsonl --concurrency 16
+  shutter --metrics --format prometheus --output shutter.prom
 """)
 
 
@@ -1,11 +1,17 @@
 """
 Configuration management - TOML config file, secrets.json, and environment variables.
+
+Both files are parsed once and cached for the life of the process. Every
+lookup stats the files and reparses only when a path, mtime or size has
+changed, so settings are cheap to read on the hot path and edits are picked
+up by long-running batches without a restart (see get_config_version()).
+Environment variables are always read live.
 """
 
 import json
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, TypedDict
 
 import tomli
 
@@ -14,12 +20,156 @@ CONFIG_DIR = Path.home() / ".shutter"
 CONFIG_PATH = CONFIG_DIR / "config.toml"
 SECRETS_PATH = Path.cwd() / "secrets.json"
 
+# Valid [fetch] strategy values
+FETCH_STRATEGIES = ("sequential", "hedged")
+
+# path -> ((path, mtime_ns, size), parsed contents)
+_file_cache: dict[str, tuple[Optional[tuple], dict]] = {}
+
+# Bumped whenever a cached file is (re)loaded
+_config_version = 0
+
+
+class CanarySettings(TypedDict):
+    block_threshold: float
+    weight_overrides: dict[str, float]
+
+
+class CacheSettings(TypedDict):
+    enabled: bool
+    fetch_ttl: int
+    max_bytes: int
+    result_ttl: int
+    near_duplicates: bool
+    simhash_distance: int
+    fingerprint_entries: int
+
+
+class FetchSettings(TypedDict):
+    strategy: str
+    hedge_delay_ms: int
+    adaptive_hedge: bool
+    html_executor: str
+    html_workers: int
+    max_html_chars: int
+
+
+class ExtractionSettings(TypedDict):
+    mode: str
+    max_input_tokens: int
+    chunk_tokens: int
+    map_max_windows: int
+    speculative_tiers: list[str]
+
+
+class OffendersSettings(TypedDict):
+    snapshot_only: bool
+
+
+class ReputationSettings(TypedDict):
+    enabled: bool
+    min_clean_verdicts: int
+    min_distinct_content: int
+    max_heuristic_confidence: float
+    max_age_days: float
+
+
+class BreakerSettings(TypedDict):
+    failure_rate: float
+    min_calls: int
+    window: int
+    open_seconds: float
+    slow_call_ms: int
+    max_wait_ms: int
+    burst_seconds: float
+    rate_limits: dict[str, float]
+
 
 def ensure_config_dir() -> None:
     """Create ~/.shutter/ directory if it doesn't exist."""
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _file_signature(path: Path) -> Optional[tuple]:
+    """(path, mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _load_cached(path: Path, parse: Callable[[Path], dict]) -> dict:
+    """
+    Parse a config file, reusing the cached result while it is unchanged.
+
+    Args:
+        path: File to load
+        parse: Parser called with the path when the file is new or changed
+
+    Returns:
+        Parsed contents ({} if the file doesn't exist). Treat as read-only.
+    """
+    global _config_version
+
+    signature = _file_signature(path)
+    cached = _file_cache.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    contents = parse(path) if signature is not None else {}
+    _file_cache[str(path)] = (signature, contents)
+    _config_version += 1
+    return contents
+
+
+def _parse_toml(path: Path) -> dict:
+    """Parse a TOML file."""
+    with open(path, "rb") as f:
+        contents: dict = tomli.load(f)
+    return contents
+
+
+def _parse_secrets(path: Path) -> dict:
+    """Parse secrets.json, dropping its comment field."""
+    with open(path) as f:
+        secrets: dict = json.load(f)
+    secrets.pop("comment", None)
+    return secrets
+
+
+def load_toml_config() -> dict:
+    """
+    Get the parsed ~/.shutter/config.toml (cached until the file changes).
+
+    Returns:
+        Raw TOML sections ({} if the file doesn't exist). Treat as read-only.
+    """
+    return _load_cached(CONFIG_PATH, _parse_toml)
+
+
+def get_config_version() -> int:
+    """
+    Get a counter that changes whenever a config file is reloaded.
+
+    Long-lived objects built from settings (e.g. circuit breakers) compare
+    this against the version they were built with to pick up edits.
+
+    Returns:
+        Current config version
+    """
+    load_toml_config()
+    _load_cached(SECRETS_PATH, _parse_secrets)
+    return _config_version
+
+
+def clear_config_cache() -> None:
+    """Forget cached config files so the next lookup rereads them."""
+    global _config_version
+    _file_cache.clear()
+    _config_version += 1
+
+
 def load_config() -> dict:
     """
     Load configuration from multiple sources.
@@ -29,24 +179,19 @@ def load_config() -> dict:
     2. secrets.json in project root (dev mode)
     3. ~/.shutter/config.toml (user config)
 
+    Both files come from the process-wide cache and are only reread
+    after they change on disk.
+
     Returns:
         Merged configuration dictionary
     """
     config = {}
 
     # Load from ~/.shutter/config.toml if exists
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "rb") as f:
-            toml_config = tomli.load(f)
-            config.update(_flatten_config(toml_config))
+    config.update(_flatten_config(load_toml_config()))
 
     # Load from secrets.json if exists (dev mode)
-    if SECRETS_PATH.exists():
-        with open(SECRETS_PATH) as f:
-            secrets = json.load(f)
-            # Remove comment field if present
-            secrets.pop("comment", None)
-            config.update(secrets)
+    config.update(_load_cached(SECRETS_PATH, _parse_secrets))
 
     return config
 
@@ -105,7 +250,7 @@ def get_api_key(service: str) -> Optional[str]:
     config = load_config()
     config_key = key_map.get(service_lower)
     if config_key and config_key in config:
-        value = config[config_key]
+        value: Optional[str] = config[config_key]
         # Skip placeholder values
         if value and not value.startswith("sk-or-v1-your-") and not value.startswith("tvly-your-"):
             return value
@@ -125,7 +270,7 @@ def is_dry_run() -> bool:
     return os.getenv("SHUTTER_DRY_RUN", "").lower() in ("1", "true", "yes")
 
 
-def get_canary_settings() -> dict:
+def get_canary_settings() -> CanarySettings:
     """
     Get canary detection settings from config.
 
@@ -146,16 +291,14 @@ def get_canary_settings() -> dict:
     Returns:
         Dict with 'block_threshold' and 'weight_overrides'
     """
-    settings = {
+    settings: CanarySettings = {
         "block_threshold": 0.6,  # Default
         "weight_overrides": {},  # Type -> confidence overrides
     }
 
     # Load from config file
-    if CONFIG_PATH.exists():
-        with open(CONFIG_PATH, "rb") as f:
-            toml_config = tomli.load(f)
-
+    toml_config = load_toml_config()
+    if toml_config:
         # Get [canary] section
         if "canary" in toml_config:
             canary = toml_config["canary"]
@@ -171,6 +314,342 @@ def get_canary_settings() -> dict:
     return settings
 
 
+def get_reputation_settings() -> ReputationSettings:
+    """
+    Get domain reputation policy from config.
+
+    Domains with enough clean canary history skip the canary LLM when the
+    free heuristics score at most max_heuristic_confidence. The heuristics
+    always run.
+
+    Off unless enabled: on hosts where anyone can publish (github.com,
+    medium.com) an attacker can earn a domain's trust with clean pages and
+    then serve an injection only the LLM would catch.
+
+    Users can configure:
+    - [reputation] enabled (default false)
+    - [reputation] min_clean_verdicts: clean LLM verdicts required (default 5)
+    - [reputation] min_distinct_content: distinct pages among them (default 3)
+    - [reputation] max_heuristic_confidence: highest heuristic score that may
+      skip the LLM (default 0.0, i.e. no signals at all)
+    - [reputation] max_age_days: trust lapses this long after the last clean
+      verdict (default 30)
+
+    Example config.toml:
+    ```toml
+    [reputation]
+    enabled = true
+    min_clean_verdicts = 10
+    max_heuristic_confidence = 0.1
+    ```
+
+    Returns:
+        Dict with 'enabled', 'min_clean_verdicts', 'min_distinct_content',
+        'max_heuristic_confidence' and 'max_age_days'
+    """
+    settings: ReputationSettings = {
+        "enabled": False,
+        "min_clean_verdicts": 5,
+        "min_distinct_content": 3,
+        "max_heuristic_confidence": 0.0,
+        "max_age_days": 30.0,
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if "reputation" in toml_config:
+        reputation = toml_config["reputation"]
+        if "enabled" in reputation:
+            settings["enabled"] = bool(reputation["enabled"])
+        if "min_clean_verdicts" in reputation:
+            settings["min_clean_verdicts"] = max(1, int(reputation["min_clean_verdicts"]))
+        if "min_distinct_content" in reputation:
+            settings["min_distinct_content"] = max(1, int(reputation["min_distinct_content"]))
+        if "max_heuristic_confidence" in reputation:
+            settings["max_heuristic_confidence"] = float(reputation["max_heuristic_confidence"])
+        if "max_age_days" in reputation:
+            settings["max_age_days"] = float(reputation["max_age_days"])
+
+    return settings
+
+
+def get_cache_settings() -> CacheSettings:
+    """
+    Get fetch and result cache settings from config.
+
+    Users can configure:
+    - [cache] enabled (default true)
+    - [cache] fetch_ttl in seconds (default 3600)
+    - [cache] max_bytes total on-disk budget (default 256 MB)
+    - [cache] result_ttl in seconds for canary verdicts and extractions (default 86400)
+    - [cache] near_duplicates: reuse results of near-identical pages (default true)
+    - [cache] simhash_distance: max differing fingerprint bits for a near duplicate (default 3)
+    - [cache] fingerprint_entries: in-memory near-duplicate index size (default 10000)
+
+    Set SHUTTER_NO_CACHE=1 to disable caching regardless of config.
+
+    Example config.toml:
+    ```toml
+    [cache]
+    fetch_ttl = 600
+    max_bytes = 104857600  # 100 MB
+    ```
+
+    Returns:
+        Dict with 'enabled', 'fetch_ttl', 'max_bytes', 'result_ttl',
+        'near_duplicates', 'simhash_distance' and 'fingerprint_entries'
+    """
+    settings: CacheSettings = {
+        "enabled": True,
+        "fetch_ttl": 3600,
+        "max_bytes": 256 * 1024 * 1024,
+        "result_ttl": 86400,
+        "near_duplicates": True,
+        "simhash_distance": 3,
+        "fingerprint_entries": 10000,
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if toml_config:
+        if "cache" in toml_config:
+            cache = toml_config["cache"]
+            if "enabled" in cache:
+                settings["enabled"] = bool(cache["enabled"])
+            if "fetch_ttl" in cache:
+                settings["fetch_ttl"] = int(cache["fetch_ttl"])
+            if "max_bytes" in cache:
+                settings["max_bytes"] = int(cache["max_bytes"])
+            if "result_ttl" in cache:
+                settings["result_ttl"] = int(cache["result_ttl"])
+            if "near_duplicates" in cache:
+                settings["near_duplicates"] = bool(cache["near_duplicates"])
+            if "simhash_distance" in cache:
+                settings["simhash_distance"] = max(0, min(15, int(cache["simhash_distance"])))
+            if "fingerprint_entries" in cache:
+                settings["fingerprint_entries"] = max(1, int(cache["fingerprint_entries"]))
+
+    if os.getenv("SHUTTER_NO_CACHE", "").lower() in ("1", "true", "yes"):
+        settings["enabled"] = False
+
+    return settings
+
+
+def get_fetch_settings() -> FetchSettings:
+    """
+    Get fetch strategy settings from config.
+
+    Users can configure:
+    - [fetch] strategy: "sequential" (default) or "hedged"
+    - [fetch] hedge_delay_ms: delay before the basic fetch starts racing Jina (default 1500)
+    - [fetch] adaptive_hedge: derive the delay from observed Jina p95 latency (default true)
+    - [fetch] html_executor: where trafilatura runs - "thread" (default), "process" or "inline"
+    - [fetch] html_workers: executor worker count (default 4)
+    - [fetch] max_html_chars: HTML beyond this is truncated before extraction (default 5,000,000)
+
+    Example config.toml:
+    ```toml
+    [fetch]
+    strategy = "hedged"
+    hedge_delay_ms = 1000
+    ```
+
+    Returns:
+        Dict with 'strategy', 'hedge_delay_ms', 'adaptive_hedge', 'html_executor',
+        'html_workers' and 'max_html_chars'
+
+    Raises:
+        ValueError: If [fetch] strategy is not one of FETCH_STRATEGIES
+    """
+    settings: FetchSettings = {
+        "strategy": "sequential",
+        "hedge_delay_ms": 1500,
+        "adaptive_hedge": True,
+        "html_executor": "thread",
+        "html_workers": 4,
+        "max_html_chars": 5_000_000,
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if toml_config:
+        if "fetch" in toml_config:
+            fetch = toml_config["fetch"]
+            if "strategy" in fetch:
+                settings["strategy"] = str(fetch["strategy"]).lower()
+                if settings["strategy"] not in FETCH_STRATEGIES:
+                    raise ValueError(
+                        f"Unknown [fetch] strategy: {fetch['strategy']!r} "
+                        f"(expected one of {', '.join(FETCH_STRATEGIES)})"
+                    )
+            if "hedge_delay_ms" in fetch:
+                settings["hedge_delay_ms"] = int(fetch["hedge_delay_ms"])
+            if "adaptive_hedge" in fetch:
+                settings["adaptive_hedge"] = bool(fetch["adaptive_hedge"])
+            if "html_executor" in fetch:
+                settings["html_executor"] = str(fetch["html_executor"]).lower()
+            if "html_workers" in fetch:
+                settings["html_workers"] = max(1, int(fetch["html_workers"]))
+            if "max_html_chars" in fetch:
+                settings["max_html_chars"] = int(fetch["max_html_chars"])
+
+    return settings
+
+
+def get_extraction_settings() -> ExtractionSettings:
+    """
+    Get extraction token budget settings from config.
+
+    Users can configure:
+    - [extraction] mode: "select" (default) keeps the most query-relevant
+      chunks that fit the budget; "map_reduce" extracts from chunk windows
+      concurrently and merges the answers
+    - [extraction] max_input_tokens: content token budget per prompt (default 24000),
+      always capped by the model tier's context window
+    - [extraction] chunk_tokens: paragraph chunk size for ranking (default 400)
+    - [extraction] map_max_windows: most windows extracted in map_reduce mode (default 6)
+    - [extraction] speculative_tiers: model tiers whose extraction starts alongside
+      the canary LLM check instead of after it (default none)
+
+    Example config.toml:
+    ```toml
+    [extraction]
+    mode = "map_reduce"
+    max_input_tokens = 8000
+    speculative_tiers = ["fast"]
+    ```
+
+    Returns:
+        Dict with 'mode', 'max_input_tokens', 'chunk_tokens', 'map_max_windows'
+        and 'speculative_tiers'
+    """
+    settings: ExtractionSettings = {
+        "mode": "select",
+        "max_input_tokens": 24000,
+        "chunk_tokens": 400,
+        "map_max_windows": 6,
+        "speculative_tiers": [],
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if toml_config:
+        if "extraction" in toml_config:
+            extraction = toml_config["extraction"]
+            if "mode" in extraction:
+                settings["mode"] = str(extraction["mode"]).lower()
+            if "max_input_tokens" in extraction:
+                settings["max_input_tokens"] = int(extraction["max_input_tokens"])
+            if "chunk_tokens" in extraction:
+                settings["chunk_tokens"] = max(1, int(extraction["chunk_tokens"]))
+            if "map_max_windows" in extraction:
+                settings["map_max_windows"] = max(1, int(extraction["map_max_windows"]))
+            if "speculative_tiers" in extraction:
+                settings["speculative_tiers"] = [
+                    str(tier).lower() for tier in extraction["speculative_tiers"]
+                ]
+
+    return settings
+
+
+def get_offenders_settings() -> OffendersSettings:
+    """
+    Get offenders list settings from config.
+
+    Users can configure:
+    - [offenders] snapshot_only: when an offenders snapshot is installed, use it
+      as the only blocklist and skip SQLite lookups (default false)
+
+    Example config.toml:
+    ```toml
+    [offenders]
+    snapshot_only = true
+    ```
+
+    Returns:
+        Dict with 'snapshot_only'
+    """
+    settings: OffendersSettings = {
+        "snapshot_only": False,
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if "offenders" in toml_config:
+        offenders = toml_config["offenders"]
+        if "snapshot_only" in offenders:
+            settings["snapshot_only"] = bool(offenders["snapshot_only"])
+
+    return settings
+
+
+def get_breaker_settings() -> BreakerSettings:
+    """
+    Get upstream circuit breaker and rate limit settings from config.
+
+    Users can configure:
+    - [breaker] failure_rate: failure fraction that opens a circuit (default 0.5)
+    - [breaker] min_calls: calls in the window before the rate is judged (default 5)
+    - [breaker] window: rolling window of calls per upstream (default 20)
+    - [breaker] open_seconds: how long an open circuit rejects calls (default 30)
+    - [breaker] slow_call_ms: successful calls slower than this count as failures (default 30000)
+    - [breaker] max_wait_ms: longest rate-limit wait before a call is rejected (default 5000)
+    - [breaker] burst_seconds: token bucket capacity in seconds of rate (default 2)
+    - [breaker.rate_limits] requests per second per upstream (0 = unlimited)
+
+    Example config.toml:
+    ```toml
+    [breaker]
+    open_seconds = 60
+
+    [breaker.rate_limits]
+    jina = 0.33  # Keyless Jina: 20 requests/minute
+    ```
+
+    Returns:
+        Dict with 'failure_rate', 'min_calls', 'window', 'open_seconds',
+        'slow_call_ms', 'max_wait_ms', 'burst_seconds' and 'rate_limits'
+    """
+    settings: BreakerSettings = {
+        "failure_rate": 0.5,
+        "min_calls": 5,
+        "window": 20,
+        "open_seconds": 30.0,
+        "slow_call_ms": 30000,
+        "max_wait_ms": 5000,
+        "burst_seconds": 2.0,
+        "rate_limits": {"jina": 10.0, "tavily": 5.0, "openrouter": 20.0},
+    }
+
+    # Load from config file
+    toml_config = load_toml_config()
+    if toml_config:
+        if "breaker" in toml_config:
+            breaker = toml_config["breaker"]
+            if "failure_rate" in breaker:
+                settings["failure_rate"] = float(breaker["failure_rate"])
+            if "min_calls" in breaker:
+                settings["min_calls"] = max(1, int(breaker["min_calls"]))
+            if "window" in breaker:
+                settings["window"] = max(1, int(breaker["window"]))
+            if "open_seconds" in breaker:
+                settings["open_seconds"] = float(breaker["open_seconds"])
+            if "slow_call_ms" in breaker:
+                settings["slow_call_ms"] = int(breaker["slow_call_ms"])
+            if "max_wait_ms" in breaker:
+                settings["max_wait_ms"] = int(breaker["max_wait_ms"])
+            if "burst_seconds" in breaker:
+                settings["burst_seconds"] = float(breaker["burst_seconds"])
+
+            # Get [breaker.rate_limits] section
+            if "rate_limits" in breaker:
+                settings["rate_limits"].update(
+                    {k: float(v) for k, v in breaker["rate_limits"].items()}
+                )
+
+    return settings
+
+
 def setup_config() -> None:
     """
     Interactive configuration setup on first run.
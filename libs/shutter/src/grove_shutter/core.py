@@ -2,54 +2,273 @@
 Core shutter() function - main entry point for the distillation service.
 """
 
-from typing import Optional
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple, Union
 
-from grove_shutter.canary import canary_check
-from grove_shutter.config import is_dry_run
-from grove_shutter.database import add_offender, get_offender, should_skip_fetch
-from grove_shutter.extraction import extract_content
+from grove_shutter import cache
+from grove_shutter.budget import estimate_tokens
+from grove_shutter.canary import (
+    LLM_CLEAN,
+    CanaryVerdict,
+    canary_verdict,
+    canary_heuristics,
+    needs_llm_check,
+)
+from grove_shutter.config import (
+    get_cache_settings,
+    get_extraction_settings,
+    get_reputation_settings,
+    is_dry_run,
+)
+from grove_shutter.database import (
+    add_offender,
+    domain_is_trusted,
+    get_offender,
+    get_reputation,
+    record_clean_verdict,
+    should_skip_fetch,
+)
+from grove_shutter.extraction import extract_content, extract_content_stream, get_content_budget
 from grove_shutter.fetch import FetchError, extract_domain, fetch_url
-from grove_shutter.models import PromptInjectionDetails, ShutterResponse
+from grove_shutter.fingerprint import get_fingerprint_index, simhash
+from grove_shutter.metrics import inc, observe, phase_timer, record_phase, request_timings
+from grove_shutter.models import (
+    CachedExtraction,
+    PromptInjectionDetails,
+    ShutterRequest,
+    ShutterResponse,
+)
+from grove_shutter.pool import ClientPool
+from grove_shutter.singleflight import SingleFlight
+from grove_shutter.snapshot import snapshot_lookup
 
 
-async def shutter(
-    url: str,
-    query: str,
-    model: str = "fast",
-    max_tokens: int = 500,
-    extended_query: Optional[str] = None,
-    timeout: int = 30000,
+# In-process coalescing of concurrent identical work (see singleflight.py)
+_fetch_flight = SingleFlight("fetch")
+_canary_flight = SingleFlight("canary")
+_extract_flight = SingleFlight("extraction")
+
+# Speculative extraction outcomes (see get_speculation_stats)
+_speculation_stats = {
+    "launched": 0,
+    "used": 0,
+    "discarded": 0,
+    "wasted_tokens_input": 0,
+    "wasted_tokens_output": 0,
+}
+
+# Canary LLM checks considered for a reputation skip (see get_reputation_stats)
+_reputation_stats = {
+    "checks": 0,
+    "skips": 0,
+}
+
+
+def _error_response(url: str, error_type: str, snippet: str) -> ShutterResponse:
+    """Build a response for a non-injection failure (fetch/config/extraction)."""
+    return ShutterResponse(
+        url=url,
+        extracted=None,
+        tokens_input=0,
+        tokens_output=0,
+        model_used="",
+        prompt_injection=PromptInjectionDetails(
+            detected=False,
+            type=error_type,
+            snippet=snippet,
+            domain_flagged=False,
+        ),
+    )
+
+
+def _use_result_cache() -> bool:
+    """Whether results are cached (never in dry-run, so mock output isn't stored)."""
+    return get_cache_settings()["enabled"] and not is_dry_run()
+
+
+def _finish_request(
+    response: ShutterResponse,
+    model: str,
+    start: float,
+    timings: dict,
 ) -> ShutterResponse:
+    """Attach total latency and phase timings, and count the request."""
+    response.latency_ms = _elapsed_ms(start)
+    response.timings = dict(timings)
+
+    if response.cached:
+        outcome = "cached"
+    elif response.prompt_injection is None:
+        outcome = "ok"
+    elif response.prompt_injection.detected:
+        outcome = "blocked"
+    else:
+        outcome = response.prompt_injection.type  # fetch_error, extraction_error, ...
+
+    tier = model.lower()
+    inc("shutter_requests_total", tier=tier, outcome=outcome)
+    observe("shutter_request_duration_ms", response.latency_ms, tier=tier)
+    return response
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+@dataclass
+class _Prepared:
+    """Outcome of the steps before Phase 2 (see _prepare)."""
+    response: Optional[ShutterResponse] = None  # Set when finished without a new extraction
+    content: str = ""
+    result_key: str = ""  # Identifies the extraction (see cache.extraction_key)
+    fetch_ms: Optional[float] = None
+    speculative: Optional[asyncio.Task] = None  # Extraction started alongside the canary
+
+
+async def _extract(
+    content: str,
+    query: str,
+    model: str,
+    max_tokens: int,
+    extended_query: Optional[str],
+    store_key: Optional[str] = None,
+) -> Tuple[str, int, int, str]:
+    """Run extract_content, storing the result under store_key if given."""
+    with phase_timer("extraction", tier=model.lower()):
+        result = await extract_content(
+            content=content,
+            query=query,
+            model=model,
+            max_tokens=max_tokens,
+            extended_query=extended_query,
+        )
+    if store_key:
+        cache.store_extraction(store_key, *result)
+    return result
+
+
+async def _discard_speculation(task: asyncio.Task, estimated_input: int) -> Tuple[int, int]:
     """
-    Fetch and distill web content through LLM extraction.
+    Drop a speculative extraction after the canary blocked the page.
 
-    This is the main entry point for Shutter. It orchestrates:
-    1. Offenders list check (skip known bad domains)
-    2. URL fetching with HTML extraction
-    3. Canary check for prompt injection detection
-    4. Full LLM extraction (only if Canary passes)
+    Returns:
+        Tokens (input, output) spent on it: actual usage if it had finished,
+        estimated_input if it was cancelled mid-request, zero if it failed
+    """
+    if task.done() and not task.cancelled() and task.exception() is None:
+        _, tokens_in, tokens_out, _ = task.result()
+    else:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        failed = task.done() and not task.cancelled()
+        tokens_in, tokens_out = (0, 0) if failed else (estimated_input, 0)
+
+    _speculation_stats["discarded"] += 1
+    _speculation_stats["wasted_tokens_input"] += tokens_in
+    _speculation_stats["wasted_tokens_output"] += tokens_out
+    return tokens_in, tokens_out
 
-    Args:
-        url: URL to fetch
-        query: What to extract from the page
-        model: Model preference (fast/accurate/research/code)
-        max_tokens: Maximum output tokens
-        extended_query: Additional extraction instructions
-        timeout: Fetch timeout in milliseconds
+
+def get_speculation_stats() -> dict:
+    """
+    Get speculative extraction counters for this process.
 
     Returns:
-        ShutterResponse with extracted content or prompt injection details
+        Dict with 'launched', 'used', 'discarded' and the tokens spent on
+        discarded extractions ('wasted_tokens_input', 'wasted_tokens_output')
+    """
+    return dict(_speculation_stats)
+
+
+def reset_speculation_stats() -> None:
+    """Reset speculative extraction counters to zero."""
+    for key in _speculation_stats:
+        _speculation_stats[key] = 0
+
+
+def get_reputation_stats() -> dict:
+    """
+    Get domain reputation fast-path counters for this process.
+
+    Returns:
+        Dict with 'checks' (pages that would have needed the canary LLM),
+        'skips' (of those, skipped on domain reputation) and 'skip_rate'
+    """
+    checks = _reputation_stats["checks"]
+    return {
+        **_reputation_stats,
+        "skip_rate": _reputation_stats["skips"] / checks if checks else 0.0,
+    }
+
+
+def reset_reputation_stats() -> None:
+    """Reset domain reputation counters to zero."""
+    for key in _reputation_stats:
+        _reputation_stats[key] = 0
+
+
+def _reputation_skip(domain: str, heuristics: Tuple) -> bool:
+    """
+    Whether the canary LLM can be skipped on the domain's clean history.
+
+    Only consulted when the LLM would otherwise run; the heuristics must
+    also score at most [reputation] max_heuristic_confidence.
+    """
+    settings = get_reputation_settings()
+    if not settings["enabled"]:
+        return False
+
+    trusted = (
+        heuristics[0] <= settings["max_heuristic_confidence"]
+        and domain_is_trusted(get_reputation(domain), settings)
+    )
+    _reputation_stats["checks"] += 1
+    _reputation_stats["skips"] += trusted
+    inc("shutter_reputation_checks_total", outcome="skipped" if trusted else "ran")
+    return trusted
+
+
+async def _prepare(
+    url: str,
+    query: str,
+    model: str,
+    max_tokens: int,
+    extended_query: Optional[str],
+    timeout: int,
+    speculate: bool = False,
+) -> _Prepared:
+    """
+    Run everything before Phase 2: offenders check, fetch, canary, result cache.
+
+    Concurrent calls for the same normalized URL share one fetch, and
+    concurrent calls on identical content share one canary verdict. Content
+    whose SimHash is close to an already-vetted page skips the canary LLM
+    (the heuristics still run) and reuses that page's cached extractions
+    (see fingerprint.py). Domains with enough clean LLM verdicts also skip
+    the canary LLM when the heuristics find nothing (see
+    database.domain_is_trusted()).
+
+    With speculate=True and the model tier listed in [extraction]
+    speculative_tiers, the extraction starts alongside the canary LLM check
+    (once the free heuristics pass) and is returned in _Prepared.speculative
+    if the page comes back clean; otherwise it is cancelled or discarded and
+    its cost reported on the blocked response.
     """
     # Extract domain for offenders tracking
     domain = extract_domain(url)
 
     # Step 1: Check offenders list
-    if should_skip_fetch(domain):
-        offender = get_offender(domain)
+    with phase_timer("offenders"):
+        skip = should_skip_fetch(domain)
+    if skip:
+        offender = get_offender(domain) or snapshot_lookup(domain)
         detection_count = offender.detection_count if offender else 3
         max_conf = offender.max_confidence if offender else 1.0
 
-        return ShutterResponse(
+        return _Prepared(response=ShutterResponse(
             url=url,
             extracted=None,
             tokens_input=0,
@@ -63,100 +282,275 @@ async def shutter(
                 confidence=max_conf,
                 signals=[f"blocked_count:{detection_count}"],
             ),
-        )
+        ))
 
     # Step 2: Fetch content
+    fetch_start = time.perf_counter()
     try:
-        content = await fetch_url(url, timeout)
+        content = await _fetch_flight.do(
+            cache.normalize_url(url), lambda: fetch_url(url, timeout)
+        )
     except FetchError as e:
-        return ShutterResponse(
-            url=url,
-            extracted=None,
-            tokens_input=0,
-            tokens_output=0,
-            model_used="",
-            prompt_injection=PromptInjectionDetails(
-                detected=False,
-                type="fetch_error",
-                snippet=str(e),
-                domain_flagged=False,
-            ),
+        return _Prepared(
+            response=_error_response(url, "fetch_error", str(e)),
+            fetch_ms=_elapsed_ms(fetch_start),
+        )
+    except ValueError as e:
+        # Configuration error (bad [fetch] settings)
+        return _Prepared(
+            response=_error_response(url, "config_error", str(e)),
+            fetch_ms=_elapsed_ms(fetch_start),
         )
+    fetch_ms = _elapsed_ms(fetch_start)
 
     # Check if we got any content
     if not content or len(content.strip()) == 0:
-        return ShutterResponse(
-            url=url,
-            extracted=None,
-            tokens_input=0,
-            tokens_output=0,
-            model_used="",
-            prompt_injection=PromptInjectionDetails(
-                detected=False,
-                type="empty_content",
-                snippet="Page returned no extractable content",
-                domain_flagged=False,
-            ),
+        return _Prepared(
+            response=_error_response(url, "empty_content", "Page returned no extractable content"),
+            fetch_ms=fetch_ms,
         )
 
-    # Step 3: Run Canary check (unless in dry-run mode)
-    if not is_dry_run():
-        injection = await canary_check(content, query)
-        if injection:
-            # Add to offenders list with confidence
-            add_offender(domain, injection.type, injection.confidence)
+    cache_settings = get_cache_settings()
+    use_result_cache = _use_result_cache()
+    content_hash = cache.hash_content(content)
+    result_ttl = cache_settings["result_ttl"]
+    result_key = cache.extraction_key(content_hash, query, model, max_tokens, extended_query)
+    prepared = _Prepared(content=content, result_key=result_key, fetch_ms=fetch_ms)
+
+    # Near-identical pages (mirrors, timestamp-only changes) can reuse the
+    # verdict and extractions of a page the canary LLM passed. Looked up
+    # lazily, at most once per request.
+    fingerprint = None
+    if use_result_cache and cache_settings["near_duplicates"]:
+        with phase_timer("fingerprint"):
+            fingerprint = simhash(content)
+    near: list[Optional[str]] = []
+
+    def near_duplicate() -> Optional[str]:
+        if fingerprint is None:
+            return None
+        if not near:
+            match = get_fingerprint_index().find(fingerprint)
+            near.append(match if match != content_hash else None)
+        return near[0]
+
+    # (cached extraction, whether it came from a near duplicate), looked up
+    # at most once: before speculating, or at step 4a
+    lookup: list[Tuple[Optional[CachedExtraction], bool]] = []
 
-            # Count content tokens approximately (1 token ≈ 4 chars)
-            tokens_input = len(content) // 4
+    def cached_extraction() -> Tuple[Optional[CachedExtraction], bool]:
+        if not lookup:
+            cached, from_near = None, False
+            if use_result_cache:
+                cached = cache.get_cached_extraction(result_key, result_ttl)
+            near_hash = near_duplicate()
+            if not cached and near_hash is not None:
+                near_key = cache.extraction_key(
+                    near_hash, query, model, max_tokens, extended_query
+                )
+                cached = cache.get_cached_extraction(near_key, result_ttl)
+                from_near = cached is not None
+            lookup.append((cached, from_near))
+        return lookup[0]
 
-            return ShutterResponse(
+    # Step 3: Run Canary check (unless in dry-run mode or content already vetted)
+    if not is_dry_run() and not (
+        use_result_cache and cache.is_content_vetted(content_hash, result_ttl)
+    ):
+        # Free heuristics first; they decide whether the canary LLM runs at all
+        with phase_timer("canary.heuristics"):
+            heuristics = canary_heuristics(content)
+
+        # A near duplicate of vetted content only needs the free heuristics
+        near_hash = near_duplicate() if needs_llm_check(heuristics) else None
+        near_vetted = near_hash is not None and cache.is_content_vetted(near_hash, result_ttl)
+        if near_vetted:
+            # Borrowed, not earned: nothing is persisted for this page
+            inc("shutter_near_duplicate_hits_total", reuse="canary")
+
+        # Domains with a clean track record skip it when heuristics find nothing
+        skip_llm = near_vetted or (
+            needs_llm_check(heuristics) and _reputation_skip(domain, heuristics)
+        )
+
+        speculative = None
+        if (
+            speculate
+            and not skip_llm
+            and needs_llm_check(heuristics)
+            and model.lower() in get_extraction_settings()["speculative_tiers"]
+            and cached_extraction()[0] is None
+        ):
+            speculative = asyncio.create_task(_extract_flight.do(
+                result_key,
+                lambda: _extract(content, query, model, max_tokens, extended_query),
+            ))
+            _speculation_stats["launched"] += 1
+
+        async def run_canary() -> Tuple[CanaryVerdict, set[str]]:
+            verdict = await canary_verdict(content, query, heuristics)
+            if verdict.llm == LLM_CLEAN and not verdict.injection and fingerprint is not None:
+                # The canary LLM vouched for this page (a failed or skipped
+                # LLM call vouches for nothing); only such pages anchor
+                # near-duplicate reuse
+                get_fingerprint_index().add(fingerprint, content_hash)
+            if use_result_cache and verdict.vetted:
+                # Only remember verdicts from a check that actually completed
+                cache.store_clean_verdict(content_hash)
+            # Domains that have recorded this verdict (see below)
+            return verdict, set()
+
+        # Concurrent callers with identical content and query share one
+        # verdict (the canary prompt depends on the query)
+        try:
+            if skip_llm:
+                verdict = CanaryVerdict()
+            else:
+                verdict, recorded = await _canary_flight.do((content_hash, query), run_canary)
+                # Callers may come from different domains (mirrors); each
+                # domain records the shared verdict once
+                if domain not in recorded:
+                    recorded.add(domain)
+                    if verdict.injection:
+                        add_offender(
+                            domain, verdict.injection.type, verdict.injection.confidence
+                        )
+                    elif verdict.llm == LLM_CLEAN:
+                        record_clean_verdict(domain, content_hash)
+        except BaseException:
+            if speculative:
+                speculative.cancel()
+            raise
+
+        injection = verdict.injection
+        if injection:
+            # Estimate content tokens (nothing was billed for extraction)
+            tokens_input, tokens_output = estimate_tokens(content), 0
+            if speculative:
+                # Report what the discarded speculative extraction cost
+                tokens_input, tokens_output = await _discard_speculation(
+                    speculative,
+                    min(tokens_input, get_content_budget(model, max_tokens, query, extended_query)),
+                )
+
+            prepared.response = ShutterResponse(
                 url=url,
                 extracted=None,
                 tokens_input=tokens_input,
-                tokens_output=0,
+                tokens_output=tokens_output,
                 model_used="",
                 prompt_injection=injection,
+                fetch_ms=fetch_ms,
             )
+            return prepared
 
-    # Step 4: Full extraction (Phase 2)
-    try:
-        extracted, tokens_in, tokens_out, model_used = await extract_content(
-            content=content,
-            query=query,
-            model=model,
-            max_tokens=max_tokens,
-            extended_query=extended_query,
+        if speculative:
+            _speculation_stats["used"] += 1
+            prepared.speculative = speculative
+            return prepared
+
+    # Step 4a: Reuse a cached extraction when possible
+    if not use_result_cache:
+        return prepared
+
+    cached, from_near = cached_extraction()
+    if from_near:
+        inc("shutter_near_duplicate_hits_total", reuse="extraction")
+    if cached:
+        prepared.response = ShutterResponse(
+            url=url,
+            extracted=cached.extracted,
+            tokens_input=cached.tokens_input,
+            tokens_output=cached.tokens_output,
+            model_used=cached.model_used,
+            prompt_injection=None,
+            cached=True,
+            fetch_ms=fetch_ms,
         )
+
+    return prepared
+
+
+async def shutter(
+    url: str,
+    query: str,
+    model: str = "fast",
+    max_tokens: int = 500,
+    extended_query: Optional[str] = None,
+    timeout: int = 30000,
+) -> ShutterResponse:
+    """
+    Fetch and distill web content through LLM extraction.
+
+    This is the main entry point for Shutter. It orchestrates:
+    1. Offenders list check (skip known bad domains)
+    2. URL fetching with HTML extraction
+    3. Canary check for prompt injection detection
+    4. Full LLM extraction (only if Canary passes)
+
+    Clean canary verdicts and extraction results are cached by content hash
+    (see cache.py), so repeated calls on identical content skip the LLM.
+
+    Tiers listed in [extraction] speculative_tiers run step 4 concurrently
+    with the canary LLM check; the extraction is only returned if the page
+    is clean. Blocked responses then report the tokens the discarded
+    extraction cost (see get_speculation_stats()).
+
+    Args:
+        url: URL to fetch
+        query: What to extract from the page
+        model: Model preference (fast/accurate/research/code)
+        max_tokens: Maximum output tokens
+        extended_query: Additional extraction instructions
+        timeout: Fetch timeout in milliseconds
+
+    Returns:
+        ShutterResponse with extracted content or prompt injection details
+    """
+    start = time.perf_counter()
+    with request_timings() as timings:
+        response = await _shutter(url, query, model, max_tokens, extended_query, timeout)
+    return _finish_request(response, model, start, timings)
+
+
+async def _shutter(
+    url: str,
+    query: str,
+    model: str,
+    max_tokens: int,
+    extended_query: Optional[str],
+    timeout: int,
+) -> ShutterResponse:
+    """Body of shutter(); timings and request metrics are added by the caller."""
+    prepared = await _prepare(
+        url, query, model, max_tokens, extended_query, timeout, speculate=True
+    )
+    if prepared.response:
+        return prepared.response
+
+    # Step 4b: Full extraction (Phase 2), shared by concurrent identical calls
+    try:
+        if prepared.speculative:
+            # Already running since the canary started; stored now the page is clean
+            result = await prepared.speculative
+            if _use_result_cache():
+                cache.store_extraction(prepared.result_key, *result)
+        else:
+            store_key = prepared.result_key if _use_result_cache() else None
+            result = await _extract_flight.do(
+                prepared.result_key,
+                lambda: _extract(
+                    prepared.content, query, model, max_tokens, extended_query, store_key
+                ),
+            )
     except ValueError as e:
         # Configuration error (no API key)
-        return ShutterResponse(
-            url=url,
-            extracted=None,
-            tokens_input=0,
-            tokens_output=0,
-            model_used="",
-            prompt_injection=PromptInjectionDetails(
-                detected=False,
-                type="config_error",
-                snippet=str(e),
-                domain_flagged=False,
-            ),
-        )
+        return _error_response(url, "config_error", str(e))
     except RuntimeError as e:
         # Extraction error
-        return ShutterResponse(
-            url=url,
-            extracted=None,
-            tokens_input=0,
-            tokens_output=0,
-            model_used="",
-            prompt_injection=PromptInjectionDetails(
-                detected=False,
-                type="extraction_error",
-                snippet=str(e),
-                domain_flagged=False,
-            ),
-        )
+        return _error_response(url, "extraction_error", str(e))
+
+    extracted, tokens_in, tokens_out, model_used = result
 
     # Step 5: Return successful extraction
     return ShutterResponse(
@@ -166,4 +560,160 @@ async def shutter(
         tokens_output=tokens_out,
         model_used=model_used,
         prompt_injection=None,
+        fetch_ms=prepared.fetch_ms,
     )
+
+
+async def shutter_stream(
+    url: str,
+    query: str,
+    model: str = "fast",
+    max_tokens: int = 500,
+    extended_query: Optional[str] = None,
+    timeout: int = 30000,
+) -> AsyncIterator[Union[str, ShutterResponse]]:
+    """
+    Like shutter(), but stream the extraction as it is generated.
+
+    Fetch, canary and cache checks run exactly as in shutter(). The
+    extraction is then streamed from OpenRouter: each text delta is yielded
+    as a str as soon as it arrives, and the final item is always a
+    ShutterResponse with the full text, token usage and timings
+    (fetch_ms, ttft_ms, latency_ms). Requests that finish without a new
+    extraction (blocked, errors, cache hits) yield only the response.
+
+    Example:
+        async for item in shutter_stream(url, query):
+            if isinstance(item, str):
+                print(item, end="", flush=True)
+            else:
+                response = item
+
+    Args:
+        url: URL to fetch
+        query: What to extract from the page
+        model: Model preference (fast/accurate/research/code)
+        max_tokens: Maximum output tokens
+        extended_query: Additional extraction instructions
+        timeout: Fetch timeout in milliseconds
+
+    Yields:
+        Text deltas (str), then one ShutterResponse
+    """
+    start = time.perf_counter()
+    with request_timings() as timings:
+        prepared = await _prepare(url, query, model, max_tokens, extended_query, timeout)
+    if prepared.response:
+        yield _finish_request(prepared.response, model, start, timings)
+        return
+
+    extraction_start = time.perf_counter()
+    ttft_ms = None
+    result = None
+    error: Optional[ShutterResponse]
+    try:
+        async for item in extract_content_stream(
+            content=prepared.content,
+            query=query,
+            model=model,
+            max_tokens=max_tokens,
+            extended_query=extended_query,
+        ):
+            if isinstance(item, str):
+                if ttft_ms is None:
+                    ttft_ms = _elapsed_ms(extraction_start)
+                yield item
+            else:
+                result = item
+    except ValueError as e:
+        error = _error_response(url, "config_error", str(e))
+    except RuntimeError as e:
+        error = _error_response(url, "extraction_error", str(e))
+    else:
+        error = None
+
+    # Not a phase_timer: the context can't span the yields above
+    extraction_ms = _elapsed_ms(extraction_start)
+    record_phase("extraction", extraction_ms, tier=model.lower())
+    timings["extraction"] = timings.get("extraction", 0.0) + extraction_ms
+    if error is not None or result is None:
+        if error is None:
+            error = _error_response(url, "extraction_error", "Extraction returned no result")
+        yield _finish_request(error, model, start, timings)
+        return
+
+    extracted, tokens_in, tokens_out, model_used = result
+    if _use_result_cache():
+        cache.store_extraction(prepared.result_key, extracted, tokens_in, tokens_out, model_used)
+
+    response = ShutterResponse(
+        url=url,
+        extracted=extracted,
+        tokens_input=tokens_in,
+        tokens_output=tokens_out,
+        model_used=model_used,
+        prompt_injection=None,
+        fetch_ms=prepared.fetch_ms,
+        ttft_ms=ttft_ms,
+    )
+    yield _finish_request(response, model, start, timings)
+
+
+async def shutter_many(
+    requests: list[ShutterRequest],
+    concurrency: int = 8,
+    per_domain: int = 2,
+) -> AsyncIterator[ShutterResponse]:
+    """
+    Run shutter() over many requests with shared connection pools.
+
+    All requests share one pooled keep-alive client per upstream (Jina,
+    OpenRouter, direct fetches), so TCP+TLS handshakes are paid once per
+    batch instead of once per URL. Concurrency is capped globally and per
+    domain to stay polite to individual sites.
+
+    Results are yielded as they finish (completion order, not input order);
+    use ShutterResponse.url to match them back to requests. Breaking out of
+    the iteration cancels any requests still in flight.
+
+    Args:
+        requests: Requests to process
+        concurrency: Maximum requests in flight across the whole batch
+        per_domain: Maximum requests in flight per domain
+
+    Yields:
+        ShutterResponse for each request, as soon as it completes
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if per_domain < 1:
+        raise ValueError("per_domain must be at least 1")
+
+    global_limit = asyncio.Semaphore(concurrency)
+    domain_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def run_one(request: ShutterRequest) -> ShutterResponse:
+        domain = extract_domain(request.url)
+        domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(per_domain))
+        # Take the domain slot first so requests queued behind a busy domain
+        # don't hold global slots other domains could use
+        async with domain_limit, global_limit:
+            return await shutter(
+                url=request.url,
+                query=request.query,
+                model=request.model,
+                max_tokens=request.max_tokens,
+                extended_query=request.extended_query,
+                timeout=request.timeout,
+            )
+
+    async with ClientPool():
+        tasks = [asyncio.create_task(run_one(request)) for request in requests]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,34 +1,143 @@
 """
 SQLite offenders list - local persistent storage of domains with detected injections.
 
+The same database holds domain reputation: clean canary verdict counts per
+domain. Domains with enough clean history (see domain_is_trusted()) skip the
+canary LLM when the free heuristics find nothing; any detection on the
+domain wipes its reputation.
+
+One long-lived connection (WAL mode) is shared by the process, and lookups
+go through an in-memory domain -> Offender cache, so the should_skip_fetch()
+check on every request is usually a dict lookup. The cache is invalidated on
+add_offender()/clear_offenders(), and when another process commits to the
+database (detected via PRAGMA data_version, checked at most once a second).
+
+When an offenders snapshot is installed (see snapshot.py), should_skip_fetch()
+checks it first; with [offenders] snapshot_only = true it never touches SQLite
+for lookups, which suits many workers sharing one exported blocklist.
+
 All SQL isolated in this file. Application code uses function-based interface.
 """
 
 import json
 import sqlite3
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from grove_shutter.config import ensure_config_dir
-from grove_shutter.models import Offender
+from grove_shutter import snapshot
+from grove_shutter.config import ReputationSettings, ensure_config_dir, get_offenders_settings
+from grove_shutter.models import DomainReputation, Offender
 
 
 DB_PATH = Path.home() / ".shutter" / "offenders.db"
 
+# Maximum domains held in the in-memory lookup cache before it is reset
+OFFENDER_CACHE_MAX = 50_000
+
+# Seconds between PRAGMA data_version checks for writes from other processes
+VERSION_CHECK_INTERVAL = 1.0
+
+_lock = threading.RLock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[Path] = None
+_schema_ready = False
+_data_version: Optional[int] = None
+_version_checked_at = 0.0
+
+# Distinct content hash prefixes remembered per domain reputation
+REPUTATION_HASHES_MAX = 32
+
+# Characters of sha256(content) stored per remembered hash
+REPUTATION_HASH_CHARS = 16
+
+# domain -> Offender, or None for "known not an offender"
+_offender_cache: dict[str, Optional[Offender]] = {}
+
+# domain -> DomainReputation, or None for "no clean history"
+_reputation_cache: dict[str, Optional[DomainReputation]] = {}
+
 
 def _get_connection() -> sqlite3.Connection:
-    """Get database connection, creating DB if needed."""
+    """
+    Get the shared database connection, opening it if needed.
+
+    The connection is reopened if DB_PATH has changed since it was opened.
+    Callers must hold _lock while using it.
+    """
+    global _conn, _conn_path, _schema_ready, _data_version
+
+    if _conn is not None and _conn_path == DB_PATH:
+        return _conn
+
+    close_db()
     ensure_config_dir()
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    _conn = conn
+    _conn_path = DB_PATH
+    _schema_ready = False
+    _data_version = None
     return conn
 
 
+def close_db() -> None:
+    """Close the shared connection and drop the in-memory cache."""
+    global _conn, _conn_path, _schema_ready
+
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
+        _conn_path = None
+        _schema_ready = False
+        _offender_cache.clear()
+        _reputation_cache.clear()
+
+
+def _check_external_writes(conn: sqlite3.Connection) -> None:
+    """Drop the cache if another connection has committed since the last check."""
+    global _data_version, _version_checked_at
+
+    now = time.monotonic()
+    if _data_version is not None and now - _version_checked_at < VERSION_CHECK_INTERVAL:
+        return
+
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if _data_version is not None and version != _data_version:
+        _offender_cache.clear()
+        _reputation_cache.clear()
+    _data_version = version
+    _version_checked_at = now
+
+
+def _row_to_offender(row: sqlite3.Row) -> Offender:
+    """Convert an offenders row to an Offender dataclass."""
+    return Offender(
+        domain=row["domain"],
+        first_seen=datetime.fromisoformat(row["first_seen"]),
+        last_seen=datetime.fromisoformat(row["last_seen"]),
+        detection_count=row["detection_count"],
+        injection_types=json.loads(row["injection_types"]),
+        avg_confidence=row["avg_confidence"] or 0.0,
+        max_confidence=row["max_confidence"] or 0.0,
+    )
+
+
 def init_db() -> None:
     """Initialize offenders database and create tables if needed."""
-    conn = _get_connection()
-    try:
+    global _schema_ready
+
+    with _lock:
+        conn = _get_connection()
+        if _schema_ready:
+            return
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS offenders (
                 domain TEXT PRIMARY KEY,
@@ -50,9 +159,18 @@ def init_db() -> None:
         if "max_confidence" not in columns:
             conn.execute("ALTER TABLE offenders ADD COLUMN max_confidence REAL NOT NULL DEFAULT 0.0")
 
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reputation (
+                domain TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                clean_count INTEGER NOT NULL DEFAULT 1,
+                content_hashes TEXT NOT NULL
+            )
+        """)
+
         conn.commit()
-    finally:
-        conn.close()
+        _schema_ready = True
 
 
 def add_offender(domain: str, injection_type: str, confidence: float = 1.0) -> None:
@@ -69,10 +187,11 @@ def add_offender(domain: str, injection_type: str, confidence: float = 1.0) -> N
         confidence: Detection confidence score (0.0-1.0)
     """
     init_db()  # Ensure table exists
-    conn = _get_connection()
     now = datetime.now(timezone.utc).isoformat()
 
-    try:
+    with _lock:
+        conn = _get_connection()
+
         # Check if domain exists
         cursor = conn.execute(
             "SELECT detection_count, injection_types, avg_confidence, max_confidence FROM offenders WHERE domain = ?",
@@ -112,15 +231,21 @@ def add_offender(domain: str, injection_type: str, confidence: float = 1.0) -> N
                 (domain, now, now, json.dumps([injection_type]), confidence, confidence)
             )
 
+        # A detection wipes any clean history
+        conn.execute("DELETE FROM reputation WHERE domain = ?", (domain,))
+
         conn.commit()
-    finally:
-        conn.close()
+        _offender_cache.pop(domain, None)
+        _reputation_cache.pop(domain, None)
 
 
 def get_offender(domain: str) -> Optional[Offender]:
     """
     Retrieve offender record by domain.
 
+    Served from the in-memory cache when possible; misses (including
+    "not an offender") are cached too.
+
     Args:
         domain: Domain name to look up
 
@@ -128,28 +253,26 @@ def get_offender(domain: str) -> Optional[Offender]:
         Offender dataclass or None if not found
     """
     init_db()
-    conn = _get_connection()
 
-    try:
+    with _lock:
+        conn = _get_connection()
+        _check_external_writes(conn)
+
+        if domain in _offender_cache:
+            return _offender_cache[domain]
+
         cursor = conn.execute(
             "SELECT * FROM offenders WHERE domain = ?",
             (domain,)
         )
         row = cursor.fetchone()
+        offender = _row_to_offender(row) if row else None
 
-        if row:
-            return Offender(
-                domain=row["domain"],
-                first_seen=datetime.fromisoformat(row["first_seen"]),
-                last_seen=datetime.fromisoformat(row["last_seen"]),
-                detection_count=row["detection_count"],
-                injection_types=json.loads(row["injection_types"]),
-                avg_confidence=row["avg_confidence"] or 0.0,
-                max_confidence=row["max_confidence"] or 0.0,
-            )
-        return None
-    finally:
-        conn.close()
+        if len(_offender_cache) >= OFFENDER_CACHE_MAX:
+            _offender_cache.clear()
+        _offender_cache[domain] = offender
+
+        return offender
 
 
 def list_offenders() -> List[Offender]:
@@ -160,38 +283,26 @@ def list_offenders() -> List[Offender]:
         List of Offender dataclasses, ordered by detection_count descending
     """
     init_db()
-    conn = _get_connection()
 
-    try:
+    with _lock:
+        conn = _get_connection()
         cursor = conn.execute(
             "SELECT * FROM offenders ORDER BY detection_count DESC"
         )
         rows = cursor.fetchall()
 
-        return [
-            Offender(
-                domain=row["domain"],
-                first_seen=datetime.fromisoformat(row["first_seen"]),
-                last_seen=datetime.fromisoformat(row["last_seen"]),
-                detection_count=row["detection_count"],
-                injection_types=json.loads(row["injection_types"]),
-                avg_confidence=row["avg_confidence"] or 0.0,
-                max_confidence=row["max_confidence"] or 0.0,
-            )
-            for row in rows
-        ]
-    finally:
-        conn.close()
+    return [_row_to_offender(row) for row in rows]
 
 
 def should_skip_fetch(domain: str) -> bool:
     """
     Check if domain should be skipped entirely based on detection history.
 
-    Skip criteria (any of):
-    - detection_count >= 3 (original threshold)
-    - max_confidence >= 0.90 (single very high-confidence detection)
-    - avg_confidence >= 0.80 AND detection_count >= 2 (consistently suspicious)
+    The offenders snapshot (if installed) is checked first; unless
+    [offenders] snapshot_only is set, domains it doesn't block are then
+    checked against the local database.
+
+    Skip criteria: see offender_is_blocked().
 
     Args:
         domain: Domain name to check
@@ -199,10 +310,31 @@ def should_skip_fetch(domain: str) -> bool:
     Returns:
         True if domain should be skipped
     """
-    offender = get_offender(domain)
-    if offender is None:
+    entry = snapshot.snapshot_lookup(domain)
+    if entry is not None and entry.blocked:
+        return True
+    if get_offenders_settings()["snapshot_only"] and snapshot.get_snapshot() is not None:
         return False
 
+    offender = get_offender(domain)
+    return offender is not None and offender_is_blocked(offender)
+
+
+def offender_is_blocked(offender: Offender) -> bool:
+    """
+    Decide whether an offender's history is bad enough to skip fetching.
+
+    Skip criteria (any of):
+    - detection_count >= 3 (original threshold)
+    - max_confidence >= 0.90 (single very high-confidence detection)
+    - avg_confidence >= 0.80 AND detection_count >= 2 (consistently suspicious)
+
+    Args:
+        offender: Offender record
+
+    Returns:
+        True if the domain should be skipped
+    """
     # Original count-based threshold
     if offender.detection_count >= 3:
         return True
@@ -218,6 +350,239 @@ def should_skip_fetch(domain: str) -> bool:
     return False
 
 
+def _row_to_reputation(row: sqlite3.Row) -> DomainReputation:
+    """Convert a reputation row to a DomainReputation dataclass."""
+    return DomainReputation(
+        domain=row["domain"],
+        first_seen=datetime.fromisoformat(row["first_seen"]),
+        last_seen=datetime.fromisoformat(row["last_seen"]),
+        clean_count=row["clean_count"],
+        content_hashes=json.loads(row["content_hashes"]),
+    )
+
+
+def record_clean_verdict(domain: str, content_hash: str) -> None:
+    """
+    Record a clean canary LLM verdict for a domain.
+
+    Increments clean_count, updates last_seen and remembers the content
+    hash (up to REPUTATION_HASHES_MAX distinct pages per domain).
+
+    Args:
+        domain: Domain name
+        content_hash: sha256 of the vetted content (see cache.hash_content)
+    """
+    init_db()
+    now = datetime.now(timezone.utc).isoformat()
+    prefix = content_hash[:REPUTATION_HASH_CHARS]
+
+    with _lock:
+        conn = _get_connection()
+
+        cursor = conn.execute(
+            "SELECT clean_count, content_hashes FROM reputation WHERE domain = ?",
+            (domain,)
+        )
+        row = cursor.fetchone()
+
+        if row:
+            hashes = json.loads(row["content_hashes"])
+            if prefix not in hashes and len(hashes) < REPUTATION_HASHES_MAX:
+                hashes.append(prefix)
+            conn.execute(
+                """
+                UPDATE reputation
+                SET last_seen = ?, clean_count = ?, content_hashes = ?
+                WHERE domain = ?
+                """,
+                (now, row["clean_count"] + 1, json.dumps(hashes), domain)
+            )
+        else:
+            conn.execute(
+                """
+                INSERT INTO reputation (domain, first_seen, last_seen, clean_count, content_hashes)
+                VALUES (?, ?, ?, 1, ?)
+                """,
+                (domain, now, now, json.dumps([prefix]))
+            )
+
+        conn.commit()
+        _reputation_cache.pop(domain, None)
+
+
+def get_reputation(domain: str) -> Optional[DomainReputation]:
+    """
+    Retrieve a domain's clean history.
+
+    Served from the in-memory cache when possible, like get_offender().
+
+    Args:
+        domain: Domain name to look up
+
+    Returns:
+        DomainReputation or None if the domain has no clean verdicts
+    """
+    init_db()
+
+    with _lock:
+        conn = _get_connection()
+        _check_external_writes(conn)
+
+        if domain in _reputation_cache:
+            return _reputation_cache[domain]
+
+        cursor = conn.execute(
+            "SELECT * FROM reputation WHERE domain = ?",
+            (domain,)
+        )
+        row = cursor.fetchone()
+        reputation = _row_to_reputation(row) if row else None
+
+        if len(_reputation_cache) >= OFFENDER_CACHE_MAX:
+            _reputation_cache.clear()
+        _reputation_cache[domain] = reputation
+
+        return reputation
+
+
+def list_reputation() -> List[DomainReputation]:
+    """
+    List all domains with clean history.
+
+    Returns:
+        List of DomainReputation dataclasses, ordered by clean_count descending
+    """
+    init_db()
+
+    with _lock:
+        conn = _get_connection()
+        cursor = conn.execute(
+            "SELECT * FROM reputation ORDER BY clean_count DESC"
+        )
+        rows = cursor.fetchall()
+
+    return [_row_to_reputation(row) for row in rows]
+
+
+def domain_is_trusted(reputation: Optional[DomainReputation], settings: ReputationSettings) -> bool:
+    """
+    Decide whether a domain's clean history lets it skip the canary LLM.
+
+    Trust criteria (all of):
+    - clean_count >= min_clean_verdicts
+    - distinct_content >= min_distinct_content (one page vetted many times
+      says little about the rest of the site)
+    - last clean verdict within max_age_days
+
+    Args:
+        reputation: Result of get_reputation()
+        settings: Result of config.get_reputation_settings()
+
+    Returns:
+        True if the canary LLM may be skipped for this domain
+    """
+    if reputation is None or not settings["enabled"]:
+        return False
+    if reputation.clean_count < settings["min_clean_verdicts"]:
+        return False
+    if reputation.distinct_content < settings["min_distinct_content"]:
+        return False
+
+    age = datetime.now(timezone.utc) - reputation.last_seen
+    return age.total_seconds() <= settings["max_age_days"] * 86400
+
+
+def clear_reputation() -> None:
+    """Clear all domain reputation (every domain goes back to full canary checks)."""
+    init_db()
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute("DELETE FROM reputation")
+        conn.commit()
+        _reputation_cache.clear()
+
+
+def export_offenders_snapshot(
+    path: Optional[Path] = None,
+    extra: Iterable[Offender] = (),
+) -> int:
+    """
+    Export the offenders table to a snapshot file (see snapshot.py).
+
+    Args:
+        path: Destination (defaults to snapshot.SNAPSHOT_PATH, which installs
+            it for every worker on this host)
+        extra: Additional offenders to merge in (e.g. rows from the
+            Cloudflare D1 table); for a domain present in both, the higher
+            count and confidences win
+
+    Returns:
+        Number of domains in the snapshot
+    """
+    merged: dict[str, Offender] = {}
+    for offender in [*list_offenders(), *extra]:
+        domain = offender.domain.lower()
+        existing = merged.get(domain)
+        if existing is not None:
+            offender = Offender(
+                domain=domain,
+                first_seen=min(existing.first_seen, offender.first_seen),
+                last_seen=max(existing.last_seen, offender.last_seen),
+                detection_count=max(existing.detection_count, offender.detection_count),
+                injection_types=sorted(
+                    set(existing.injection_types) | set(offender.injection_types)
+                ),
+                avg_confidence=max(existing.avg_confidence, offender.avg_confidence),
+                max_confidence=max(existing.max_confidence, offender.max_confidence),
+            )
+        merged[domain] = offender
+
+    entries = (
+        (
+            domain,
+            snapshot.SnapshotEntry(
+                blocked=offender_is_blocked(offender),
+                detection_count=offender.detection_count,
+                max_confidence=offender.max_confidence,
+                avg_confidence=offender.avg_confidence,
+            ),
+        )
+        for domain, offender in merged.items()
+    )
+    count = snapshot.write_snapshot(entries, path)
+    snapshot.reset_snapshot()
+    return count
+
+
+def offenders_from_rows(rows: Iterable[dict]) -> List[Offender]:
+    """
+    Build Offender records from exported table rows.
+
+    Accepts rows shaped like the offenders table (as printed by
+    `wrangler d1 execute --json`), with injection_types as a JSON string or list.
+
+    Args:
+        rows: Row dicts
+
+    Returns:
+        List of Offender dataclasses
+    """
+    offenders = []
+    for row in rows:
+        types = row.get("injection_types") or "[]"
+        offenders.append(Offender(
+            domain=row["domain"],
+            first_seen=datetime.fromisoformat(row["first_seen"]),
+            last_seen=datetime.fromisoformat(row["last_seen"]),
+            detection_count=int(row.get("detection_count", 1)),
+            injection_types=json.loads(types) if isinstance(types, str) else list(types),
+            avg_confidence=float(row.get("avg_confidence") or 0.0),
+            max_confidence=float(row.get("max_confidence") or 0.0),
+        ))
+    return offenders
+
+
 def clear_offenders() -> None:
     """
     Clear all offenders from database.
@@ -225,10 +590,9 @@ def clear_offenders() -> None:
     Useful for testing or resetting the offenders list.
     """
     init_db()
-    conn = _get_connection()
 
-    try:
+    with _lock:
+        conn = _get_connection()
         conn.execute("DELETE FROM offenders")
         conn.commit()
-    finally:
-        conn.close()
+        _offender_cache.clear()
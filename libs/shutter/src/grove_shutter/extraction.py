@@ -1,21 +1,49 @@
 """
 Full extraction logic (Phase 2) - runs only if Canary passes.
+
+Page content is fitted to a token budget before prompting (see budget.py):
+either the most query-relevant chunks are kept ("select" mode), or chunk
+windows are extracted concurrently and the partial answers merged
+("map_reduce" mode).
 """
 
-from typing import Optional, Tuple
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional, Tuple, Union
 
 import httpx
 
-from grove_shutter.config import get_api_key, is_dry_run
+from grove_shutter.breaker import UpstreamUnavailableError, guard
+from grove_shutter.budget import estimate_tokens, group_chunks, select_content
+from grove_shutter.config import (
+    ExtractionSettings,
+    get_api_key,
+    get_extraction_settings,
+    is_dry_run,
+)
+from grove_shutter.pool import upstream_client, upstream_url
 
 
 # Mock response for dry-run mode
-MOCK_RESPONSE = {
+MOCK_RESPONSE: dict[str, Any] = {
     "extracted": "[DRY RUN] Mock extraction result. In production, this would contain the actual extracted content from the web page based on your query.",
     "tokens_input": 1000,
     "tokens_output": 50,
 }
 
+# Context window (tokens) per model tier
+TIER_CONTEXT_WINDOWS = {
+    "fast": 131072,
+    "accurate": 163840,
+    "research": 131072,
+    "code": 196608,
+}
+
+# Tokens reserved for the prompt template around the content
+PROMPT_OVERHEAD_TOKENS = 200
+
+NOT_FOUND = "Not found in page content."
+
 
 def get_model_for_tier(tier: str) -> str:
     """
@@ -36,6 +64,52 @@ def get_model_for_tier(tier: str) -> str:
     return model_map.get(tier.lower(), model_map["fast"])
 
 
+def get_context_window_for_tier(tier: str) -> int:
+    """
+    Get the context window for a model tier.
+
+    Args:
+        tier: One of fast/accurate/research/code
+
+    Returns:
+        Context window in tokens (unknown tiers use fast)
+    """
+    return TIER_CONTEXT_WINDOWS.get(tier.lower(), TIER_CONTEXT_WINDOWS["fast"])
+
+
+def get_content_budget(
+    tier: str,
+    max_tokens: int,
+    query: str,
+    extended_query: Optional[str] = None,
+    settings: Optional[ExtractionSettings] = None,
+) -> int:
+    """
+    Get the content token budget for one extraction prompt.
+
+    The smaller of [extraction] max_input_tokens and what remains of the
+    tier's context window after the query, template and output tokens.
+
+    Args:
+        tier: Model tier
+        max_tokens: Maximum output tokens
+        query: Extraction query
+        extended_query: Additional extraction instructions
+        settings: Result of get_extraction_settings() (loaded if omitted)
+
+    Returns:
+        Content budget in estimated tokens (at least 1)
+    """
+    settings = settings or get_extraction_settings()
+    remaining = (
+        get_context_window_for_tier(tier)
+        - max_tokens
+        - estimate_tokens(f"{query} {extended_query or ''}")
+        - PROMPT_OVERHEAD_TOKENS
+    )
+    return max(1, min(settings["max_input_tokens"], remaining))
+
+
 def build_extraction_prompt(
     content: str,
     query: str,
@@ -75,6 +149,46 @@ Respond concisely based only on the content above. If the requested information
     return prompt
 
 
+def build_merge_prompt(
+    partials: list[str],
+    query: str,
+    extended_query: Optional[str] = None,
+) -> str:
+    """
+    Build the reduce prompt that merges per-section answers (map_reduce mode).
+
+    Args:
+        partials: Answers extracted from individual page sections, in page order
+        query: What to extract
+        extended_query: Additional extraction instructions
+
+    Returns:
+        Complete prompt string
+    """
+    sections = "\n\n".join(
+        f"Section {i} answer:\n{partial}" for i, partial in enumerate(partials, 1)
+    )
+    prompt = f"""Answers extracted from different sections of one web page:
+---
+{sections}
+---
+
+{query}"""
+
+    if extended_query:
+        prompt += f"""
+
+Additional extraction guidance:
+{extended_query}"""
+
+    prompt += (
+        "\n\nCombine the section answers into one concise response, removing duplicates. "
+        "Use only information from the answers above.\n"
+    )
+
+    return prompt
+
+
 async def extract_content(
     content: str,
     query: str,
@@ -111,30 +225,189 @@ async def extract_content(
             model_used,
         )
 
-    # Get API key
+    api_key = _require_api_key()
+
+    # Get model
+    model_used = get_model_for_tier(model)
+
+    # Fit content to the token budget
+    settings = get_extraction_settings()
+    budget = get_content_budget(model, max_tokens, query, extended_query, settings)
+
+    if settings["mode"] not in ("select", "map_reduce"):
+        raise ValueError(f"Unknown extraction mode: {settings['mode']}")
+    if settings["mode"] == "map_reduce" and estimate_tokens(content) > budget:
+        return await _extract_map_reduce(
+            content, query, model_used, max_tokens, extended_query, api_key, budget, settings
+        )
+
+    content = select_content(
+        content, query, budget, settings["chunk_tokens"], extended_query
+    )
+    prompt = build_extraction_prompt(content, query, extended_query)
+    extracted, tokens_input, tokens_output = await _call_openrouter(
+        api_key, model_used, prompt, max_tokens
+    )
+    return (extracted, tokens_input, tokens_output, model_used)
+
+
+async def extract_content_stream(
+    content: str,
+    query: str,
+    model: str = "fast",
+    max_tokens: int = 500,
+    extended_query: Optional[str] = None,
+) -> AsyncIterator[Union[str, Tuple[str, int, int, str]]]:
+    """
+    Run full LLM extraction, streaming the output as it is generated.
+
+    Same budgeting as extract_content(). In map_reduce mode the partial
+    extractions run unstreamed and the merged answer is yielded as one delta.
+
+    Args:
+        content: Fetched page content
+        query: What to extract
+        model: Model preference (fast/accurate/research/code)
+        max_tokens: Maximum output tokens
+        extended_query: Additional extraction instructions
+
+    Yields:
+        Text deltas (str), then one tuple of
+        (extracted_text, tokens_input, tokens_output, model_used)
+
+    Raises:
+        ValueError: If no API key is configured
+        RuntimeError: If extraction fails
+    """
+    model_used = get_model_for_tier(model)
+
+    # Handle dry-run mode: stream the mock response word by word
+    if is_dry_run():
+        for word in MOCK_RESPONSE["extracted"].split(" "):
+            yield word + " "
+        yield (
+            MOCK_RESPONSE["extracted"],
+            MOCK_RESPONSE["tokens_input"],
+            MOCK_RESPONSE["tokens_output"],
+            model_used,
+        )
+        return
+
+    api_key = _require_api_key()
+
+    settings = get_extraction_settings()
+    budget = get_content_budget(model, max_tokens, query, extended_query, settings)
+
+    if settings["mode"] not in ("select", "map_reduce"):
+        raise ValueError(f"Unknown extraction mode: {settings['mode']}")
+    if settings["mode"] == "map_reduce" and estimate_tokens(content) > budget:
+        result = await _extract_map_reduce(
+            content, query, model_used, max_tokens, extended_query, api_key, budget, settings
+        )
+        yield result[0]
+        yield result
+        return
+
+    content = select_content(
+        content, query, budget, settings["chunk_tokens"], extended_query
+    )
+    prompt = build_extraction_prompt(content, query, extended_query)
+    async for item in _stream_openrouter(api_key, model_used, prompt, max_tokens):
+        if isinstance(item, str):
+            yield item
+        else:
+            yield (*item, model_used)
+
+
+def _require_api_key() -> str:
+    """Get the OpenRouter API key or raise a configuration error."""
     api_key = get_api_key("openrouter")
     if not api_key:
         raise ValueError(
             "OpenRouter API key not configured. "
             "Set OPENROUTER_API_KEY env var or run 'shutter --setup'"
         )
+    return api_key
 
-    # Build prompt
-    prompt = build_extraction_prompt(content, query, extended_query)
 
-    # Get model
-    model_used = get_model_for_tier(model)
+async def _extract_map_reduce(
+    content: str,
+    query: str,
+    model_used: str,
+    max_tokens: int,
+    extended_query: Optional[str],
+    api_key: str,
+    budget: int,
+    settings: ExtractionSettings,
+) -> Tuple[str, int, int, str]:
+    """
+    Extract from relevant chunk windows concurrently, then merge the answers.
 
+    Windows answering "not found" are dropped before the merge; a single
+    remaining answer is returned without a reduce call. Token counts are
+    summed across every call.
+    """
+    windows = group_chunks(
+        content,
+        query,
+        budget,
+        settings["map_max_windows"],
+        settings["chunk_tokens"],
+        extended_query,
+    )
+    results = await asyncio.gather(
+        *(
+            _call_openrouter(
+                api_key, model_used, build_extraction_prompt(w, query, extended_query), max_tokens
+            )
+            for w in windows
+        ),
+        return_exceptions=True,
+    )
+
+    succeeded = [r for r in results if not isinstance(r, BaseException)]
+    if not succeeded:
+        failures = [r for r in results if isinstance(r, BaseException)]
+        raise failures[0]
+
+    tokens_input = sum(r[1] for r in succeeded)
+    tokens_output = sum(r[2] for r in succeeded)
+    partials = [r[0] for r in succeeded if NOT_FOUND.lower() not in r[0].lower()]
+
+    if not partials:
+        return (NOT_FOUND, tokens_input, tokens_output, model_used)
+    if len(partials) == 1:
+        return (partials[0], tokens_input, tokens_output, model_used)
+
+    merged, merge_in, merge_out = await _call_openrouter(
+        api_key, model_used, build_merge_prompt(partials, query, extended_query), max_tokens
+    )
+    return (merged, tokens_input + merge_in, tokens_output + merge_out, model_used)
+
+
+async def _call_openrouter(
+    api_key: str,
+    model_used: str,
+    prompt: str,
+    max_tokens: int,
+) -> Tuple[str, int, int]:
+    """
+    Send one extraction prompt to OpenRouter.
+
+    Returns:
+        Tuple of (extracted_text, tokens_input, tokens_output)
+
+    Raises:
+        RuntimeError: If the request fails, OpenRouter's circuit is open, or
+            the response has no choices
+    """
     # Call OpenRouter
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
+        async with guard("openrouter"), upstream_client("openrouter") as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "HTTP-Referer": "https://github.com/AutumnsGrove/Shutter",
-                    "X-Title": "Shutter Content Extraction",
-                },
+                upstream_url("openrouter", "chat/completions"),
+                timeout=60,
+                headers=_openrouter_headers(api_key),
                 json={
                     "model": model_used,
                     "messages": [{"role": "user", "content": prompt}],
@@ -149,6 +422,8 @@ async def extract_content(
         raise RuntimeError("OpenRouter request timed out")
     except httpx.HTTPStatusError as e:
         raise RuntimeError(f"OpenRouter API error: {e.response.status_code}")
+    except UpstreamUnavailableError as e:
+        raise RuntimeError(str(e))
     except Exception as e:
         raise RuntimeError(f"Extraction failed: {str(e)}")
 
@@ -163,4 +438,94 @@ async def extract_content(
     tokens_input = usage.get("prompt_tokens", 0)
     tokens_output = usage.get("completion_tokens", 0)
 
-    return (extracted, tokens_input, tokens_output, model_used)
+    return (extracted, tokens_input, tokens_output)
+
+
+def _openrouter_headers(api_key: str) -> dict:
+    """Request headers for OpenRouter chat completions."""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "HTTP-Referer": "https://github.com/AutumnsGrove/Shutter",
+        "X-Title": "Shutter Content Extraction",
+    }
+
+
+async def _stream_openrouter(
+    api_key: str,
+    model_used: str,
+    prompt: str,
+    max_tokens: int,
+) -> AsyncIterator[Union[str, Tuple[str, int, int]]]:
+    """
+    Send one extraction prompt to OpenRouter with SSE streaming.
+
+    Yields:
+        Text deltas (str), then one tuple of (extracted_text, tokens_input, tokens_output)
+
+    Raises:
+        RuntimeError: If the request fails, the stream reports an error, or
+            no content arrives
+    """
+    parts = []
+    usage = {}
+
+    try:
+        async with guard("openrouter") as timer, upstream_client("openrouter") as client:
+            async with client.stream(
+                "POST",
+                upstream_url("openrouter", "chat/completions"),
+                timeout=60,
+                headers=_openrouter_headers(api_key),
+                json={
+                    "model": model_used,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": max_tokens,
+                    "temperature": 0,  # Critical for consistent extraction
+                    "stream": True,
+                    "stream_options": {"include_usage": True},
+                },
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    # Skip SSE comments (": OPENROUTER PROCESSING") and blank keep-alives
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        error = chunk["error"]
+                        message = error.get("message", error) if isinstance(error, dict) else error
+                        raise RuntimeError(f"OpenRouter stream error: {message}")
+
+                    for choice in chunk.get("choices", []):
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            parts.append(delta)
+                            # The consumer's time isn't OpenRouter's
+                            with timer.paused():
+                                yield delta
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+
+    except httpx.TimeoutException:
+        raise RuntimeError("OpenRouter request timed out")
+    except httpx.HTTPStatusError as e:
+        raise RuntimeError(f"OpenRouter API error: {e.response.status_code}")
+    except RuntimeError:
+        raise
+    except UpstreamUnavailableError as e:
+        raise RuntimeError(str(e))
+    except Exception as e:
+        raise RuntimeError(f"Extraction failed: {str(e)}")
+
+    if not parts:
+        raise RuntimeError("OpenRouter returned empty response")
+
+    yield (
+        "".join(parts),
+        usage.get("prompt_tokens", 0),
+        usage.get("completion_tokens", 0),
+    )
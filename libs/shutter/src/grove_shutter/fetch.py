@@ -5,13 +5,87 @@ Fetch priority chain:
 1. Jina Reader (free, renders JS)
 2. Tavily (if API key available, renders JS)
 3. Basic httpx + trafilatura (no JS rendering)
+
+Successful fetches are stored in the fetch cache (see cache.py). Fresh
+entries skip the chain entirely; stale entries from the basic backend are
+revalidated with ETag/Last-Modified first.
+
+With the opt-in "hedged" strategy ([fetch] strategy = "hedged"), Jina starts
+immediately and the basic fetch races it after a short hedge delay; the first
+usable result wins and the other attempt is cancelled. The delay adapts to
+Jina's observed p95 latency.
+
+Jina and Tavily calls run under per-upstream circuit breakers (see
+breaker.py): while a backend's circuit is open it is skipped instantly and
+the chain moves on to the next backend.
 """
 
+import asyncio
+import time
+import weakref
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Optional, Tuple, TypeVar
+
 import httpx
 import trafilatura
-from typing import Optional
 
-from grove_shutter.config import get_api_key
+from grove_shutter import cache, metrics
+from grove_shutter.breaker import UpstreamUnavailableError, guard
+from grove_shutter.config import (
+    FetchSettings,
+    get_api_key,
+    get_cache_settings,
+    get_fetch_settings,
+)
+from grove_shutter.pool import ClientPool, get_active_pool, upstream_client, upstream_url
+
+
+# (content, backend, etag, last_modified)
+FetchResult = Tuple[str, str, Optional[str], Optional[str]]
+
+FETCH_BACKENDS = ("jina", "tavily", "basic")
+
+# Minimum characters for a fetch result to count as real content
+MIN_CONTENT_LENGTH = 100
+
+# Rolling latency samples per backend (seconds) for stats and hedge adaptation
+LATENCY_WINDOW = 200
+_latencies: dict[str, deque] = {b: deque(maxlen=LATENCY_WINDOW) for b in FETCH_BACKENDS}
+_attempts: Counter = Counter()
+_failures: Counter = Counter()
+_wins: Counter = Counter()
+
+# Longest latency sample recorded (seconds); failed attempts are recorded
+# too, and a hung one shouldn't dominate the window
+LATENCY_SAMPLE_CAP = 60.0
+
+# Adaptive hedge delay needs this many Jina samples, and stays between
+# HEDGE_MIN_DELAY_MS and HEDGE_MAX_DELAY_FACTOR times the configured delay
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_MS = 100
+HEDGE_MAX_DELAY_FACTOR = 4
+
+T = TypeVar("T")
+
+
+# Tavily extract accepts up to 20 URLs per request
+TAVILY_MAX_BATCH = 20
+
+# How long concurrent Tavily fetches wait to be batched together (seconds)
+TAVILY_BATCH_WINDOW = 0.05
+
+# Per-document trafilatura extraction times (seconds) and truncation count
+_html_times: deque = deque(maxlen=LATENCY_WINDOW)
+_html_truncated = 0
+
+# Lazily created HTML extraction executor: (kind, workers, executor)
+_html_executor: Optional[Tuple[str, int, Executor]] = None
+
+# One batcher per active ClientPool (batch workloads only)
+_tavily_batchers: "weakref.WeakKeyDictionary[ClientPool, TavilyBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class FetchError(Exception):
@@ -23,15 +97,137 @@ class FetchError(Exception):
         super().__init__(f"Failed to fetch {url}: {reason}")
 
 
-async def fetch_url(url: str, timeout: int = 30000) -> str:
+def _percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def get_fetch_stats() -> dict:
+    """
+    Get per-backend fetch stats for this process.
+
+    Returns:
+        Dict of backend -> {attempts, failures, wins, win_rate, p50_ms, p95_ms},
+        plus "html_extract" -> {documents, truncated, p50_ms, p95_ms, max_ms}
+    """
+    total_wins = sum(_wins.values())
+    stats = {}
+    for backend in FETCH_BACKENDS:
+        samples = list(_latencies[backend])
+        stats[backend] = {
+            "attempts": _attempts[backend],
+            "failures": _failures[backend],
+            "wins": _wins[backend],
+            "win_rate": _wins[backend] / total_wins if total_wins else 0.0,
+            "p50_ms": _percentile(samples, 0.50) * 1000 if samples else None,
+            "p95_ms": _percentile(samples, 0.95) * 1000 if samples else None,
+        }
+
+    samples = list(_html_times)
+    stats["html_extract"] = {
+        "documents": len(samples),
+        "truncated": _html_truncated,
+        "p50_ms": _percentile(samples, 0.50) * 1000 if samples else None,
+        "p95_ms": _percentile(samples, 0.95) * 1000 if samples else None,
+        "max_ms": max(samples) * 1000 if samples else None,
+    }
+    return stats
+
+
+def reset_fetch_stats() -> None:
+    """Reset per-backend fetch stats."""
+    global _html_truncated
+    for samples in _latencies.values():
+        samples.clear()
+    _html_times.clear()
+    _html_truncated = 0
+    _attempts.clear()
+    _failures.clear()
+    _wins.clear()
+
+
+def get_hedge_delay(settings: Optional[FetchSettings] = None) -> float:
+    """
+    Get the current hedge delay in seconds.
+
+    Uses the configured [fetch] hedge_delay_ms until enough Jina samples have
+    been seen; with adaptive_hedge enabled it then tracks Jina's p95 latency
+    (at least HEDGE_MIN_DELAY_MS, at most HEDGE_MAX_DELAY_FACTOR times the
+    configured delay), so the basic fetch only starts once Jina is slower
+    than usual - including on a backend that is always slower than the
+    configured delay.
+
+    Args:
+        settings: Result of get_fetch_settings() (loaded if omitted)
+
+    Returns:
+        Delay in seconds
+    """
+    settings = settings or get_fetch_settings()
+    configured_ms = settings["hedge_delay_ms"]
+
+    samples = list(_latencies["jina"])
+    if not settings["adaptive_hedge"] or len(samples) < HEDGE_MIN_SAMPLES:
+        return configured_ms / 1000
+
+    p95_ms = _percentile(samples, 0.95) * 1000
+    max_ms = configured_ms * HEDGE_MAX_DELAY_FACTOR
+    return max(HEDGE_MIN_DELAY_MS, min(max_ms, p95_ms)) / 1000
+
+
+async def _attempt(backend: str, call: Awaitable[T]) -> T:
+    """
+    Await one backend call, recording attempt, latency and failure.
+
+    Calls rejected by the backend's circuit breaker are counted only as
+    "skipped" - they never reached the backend. Failed attempts still
+    record their elapsed time (capped at LATENCY_SAMPLE_CAP), so a backend
+    that is slow to fail shows up in its percentiles. Cancelled attempts
+    (losers of a hedged race) record no latency sample: they were cut off,
+    and counting them would pull p95 below the backend's real latency.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        result = await call
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except UpstreamUnavailableError:
+        outcome = "skipped"
+        raise
+    except Exception:
+        outcome = "error"
+        _failures[backend] += 1
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.inc("shutter_fetch_attempts_total", backend=backend, outcome=outcome)
+        if outcome != "skipped":
+            _attempts[backend] += 1
+            metrics.record_phase(f"fetch.{backend}", elapsed * 1000)
+        if outcome in ("ok", "error"):
+            _latencies[backend].append(min(elapsed, LATENCY_SAMPLE_CAP))
+    return result
+
+
+async def fetch_url(
+    url: str,
+    timeout: int = 30000,
+    use_cache: bool = True,
+    strategy: Optional[str] = None,
+) -> str:
     """
     Fetch URL content with smart fallback chain.
 
-    Priority: Jina Reader → Tavily → Basic httpx
+    Priority: fetch cache → Jina Reader → Tavily → Basic httpx
 
     Args:
         url: URL to fetch
         timeout: Timeout in milliseconds
+        use_cache: Read from and write to the fetch cache (if enabled in config)
+        strategy: "sequential" or "hedged" (defaults to [fetch] strategy)
 
     Returns:
         Extracted text content (markdown-like format)
@@ -39,29 +235,77 @@ async def fetch_url(url: str, timeout: int = 30000) -> str:
     Raises:
         FetchError: If all fetch methods fail
     """
+    settings = get_cache_settings()
+    use_cache = use_cache and settings["enabled"]
+
+    if use_cache:
+        cached = cache.get_cached_fetch(url)
+        if cached:
+            if time.time() - cached.fetched_at < settings["fetch_ttl"]:
+                return cached.content
+
+            # Stale basic entry: cheap conditional GET before the full chain
+            if cached.backend == "basic" and (cached.etag or cached.last_modified):
+                try:
+                    content, etag, last_modified = await fetch_basic_conditional(
+                        url, timeout, etag=cached.etag, last_modified=cached.last_modified
+                    )
+                    if content is None:
+                        cache.mark_revalidated(url)
+                        return cached.content
+                    await asyncio.to_thread(
+                        cache.store_fetch,
+                        url, content, "basic", etag, last_modified, settings["max_bytes"],
+                    )
+                    return content
+                except Exception:
+                    pass  # Fall through to the full chain
+
+    fetch_settings = get_fetch_settings()
+    strategy = (strategy or fetch_settings["strategy"]).lower()
+
+    if strategy == "hedged":
+        content, backend, etag, last_modified = await _fetch_hedged(url, timeout, fetch_settings)
+    elif strategy == "sequential":
+        content, backend, etag, last_modified = await _fetch_sequential(url, timeout)
+    else:
+        raise ValueError(f"Unknown fetch strategy: {strategy}")
+
+    _wins[backend] += 1
+    if use_cache:
+        await asyncio.to_thread(
+            cache.store_fetch, url, content, backend, etag, last_modified, settings["max_bytes"]
+        )
+    return content
+
+
+async def _fetch_sequential(url: str, timeout: int) -> FetchResult:
+    """Try Jina, Tavily, then basic httpx strictly in order."""
     errors = []
 
     # Try Jina Reader first (free, renders JS)
     try:
-        content = await fetch_with_jina(url, timeout)
-        if content and len(content.strip()) > 100:  # Sanity check for real content
-            return content
+        content = await _attempt("jina", fetch_with_jina(url, timeout))
+        if content and len(content.strip()) > MIN_CONTENT_LENGTH:  # Sanity check for real content
+            return (content, "jina", None, None)
     except Exception as e:
         errors.append(f"Jina: {e}")
 
     # Try Tavily next (if key available, renders JS)
     try:
-        content = await fetch_with_tavily(url)
-        if content and len(content.strip()) > 100:
-            return content
+        content = await _fetch_tavily_if_configured(url, timeout)
+        if content and len(content.strip()) > MIN_CONTENT_LENGTH:
+            return (content, "tavily", None, None)
     except Exception as e:
         errors.append(f"Tavily: {e}")
 
     # Fall back to basic httpx + trafilatura
     try:
-        content = await fetch_basic(url, timeout)
-        if content:
-            return content
+        page, etag, last_modified = await _attempt(
+            "basic", fetch_basic_conditional(url, timeout)
+        )
+        if page:
+            return (page, "basic", etag, last_modified)
     except Exception as e:
         errors.append(f"Basic: {e}")
 
@@ -69,6 +313,78 @@ async def fetch_url(url: str, timeout: int = 30000) -> str:
     raise FetchError(url, f"All fetch methods failed: {'; '.join(errors)}")
 
 
+async def _fetch_hedged(url: str, timeout: int, settings: FetchSettings) -> FetchResult:
+    """
+    Race Jina against a delayed basic fetch; fall back to Tavily if both fail.
+
+    The basic fetch starts after the hedge delay, or immediately if Jina
+    fails first. The first result passing the content sanity check wins and
+    the other attempt is cancelled.
+    """
+    errors = []
+    delay = get_hedge_delay(settings)
+    jina_failed = asyncio.Event()
+
+    async def run_jina() -> FetchResult:
+        try:
+            content = await _attempt("jina", fetch_with_jina(url, timeout))
+        except Exception:
+            jina_failed.set()
+            raise
+        if not content or len(content.strip()) <= MIN_CONTENT_LENGTH:
+            jina_failed.set()
+            raise ValueError("content too short")
+        return (content, "jina", None, None)
+
+    async def run_basic() -> FetchResult:
+        try:
+            await asyncio.wait_for(jina_failed.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass  # Jina is slow - start hedging
+        content, etag, last_modified = await _attempt(
+            "basic", fetch_basic_conditional(url, timeout)
+        )
+        if not content or len(content.strip()) <= MIN_CONTENT_LENGTH:
+            raise ValueError("content too short")
+        return (content, "basic", etag, last_modified)
+
+    tasks = {
+        asyncio.create_task(run_jina()): "Jina",
+        asyncio.create_task(run_basic()): "Basic",
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    return task.result()
+                except Exception as e:
+                    errors.append(f"{tasks[task]}: {e}")
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    # Neither raced backend produced content - try Tavily as a last resort
+    try:
+        content = await _fetch_tavily_if_configured(url, timeout)
+        if content and len(content.strip()) > MIN_CONTENT_LENGTH:
+            return (content, "tavily", None, None)
+    except Exception as e:
+        errors.append(f"Tavily: {e}")
+
+    raise FetchError(url, f"All fetch methods failed: {'; '.join(errors)}")
+
+
+async def _fetch_tavily_if_configured(url: str, timeout: int) -> str:
+    """Fetch with Tavily, only counting an attempt when a key is configured."""
+    if not get_api_key("tavily"):
+        raise ValueError("No Tavily API key configured")
+    return await _attempt("tavily", fetch_with_tavily(url, timeout))
+
+
 async def fetch_with_jina(url: str, timeout: int = 30000) -> str:
     """
     Fetch URL using Jina Reader API (renders JavaScript).
@@ -84,27 +400,28 @@ async def fetch_with_jina(url: str, timeout: int = 30000) -> str:
         Rendered and extracted content as markdown
     """
     timeout_seconds = timeout / 1000
-    jina_url = f"https://r.jina.ai/{url}"
-
-    async with httpx.AsyncClient(
-        timeout=timeout_seconds,
-        follow_redirects=True,
-        headers={
-            "User-Agent": "Shutter/0.1 (Web Content Distillation Service)",
-            "Accept": "text/plain",  # Jina returns markdown with this
-        }
-    ) as client:
-        response = await client.get(jina_url)
+    jina_url = upstream_url("jina", url)
+
+    async with guard("jina"), upstream_client("jina") as client:
+        response = await client.get(
+            jina_url,
+            timeout=timeout_seconds,
+            headers={"Accept": "text/plain"},  # Jina returns markdown with this
+        )
         response.raise_for_status()
         return response.text
 
 
-async def fetch_with_tavily(url: str) -> str:
+async def fetch_with_tavily(url: str, timeout: int = 30000) -> str:
     """
-    Fetch using Tavily SDK for JavaScript-rendered content.
+    Fetch using the Tavily extract API for JavaScript-rendered content.
+
+    Inside an active ClientPool (shutter_many), concurrent calls are batched
+    into shared extract requests; otherwise a single-URL request is sent.
 
     Args:
         url: URL to fetch
+        timeout: Timeout in milliseconds
 
     Returns:
         Extracted page content
@@ -117,19 +434,160 @@ async def fetch_with_tavily(url: str) -> str:
     if not tavily_key:
         raise ValueError("No Tavily API key configured")
 
-    from tavily import TavilyClient
+    pool = get_active_pool()
+    if pool is not None:
+        batcher = _tavily_batchers.get(pool)
+        if batcher is None:
+            batcher = _tavily_batchers[pool] = TavilyBatcher(tavily_key, timeout)
+        return await batcher.extract(url, timeout)
 
-    client = TavilyClient(api_key=tavily_key)
+    results = await tavily_extract([url], tavily_key, timeout)
+    content = results.get(cache.normalize_url(url))
+    if content:
+        return content
 
-    # Use Tavily extract for single URL
-    result = client.extract(urls=[url])
+    raise ValueError("Tavily returned no content")
 
-    if result and "results" in result and len(result["results"]) > 0:
-        content = result["results"][0].get("raw_content", "")
-        if content:
-            return content
 
-    raise ValueError("Tavily returned no content")
+async def tavily_extract(urls: list[str], api_key: str, timeout: int = 30000) -> dict[str, str]:
+    """
+    Call the Tavily extract endpoint for one or more URLs.
+
+    Uses the pooled "tavily" client when a ClientPool is active, so the call
+    never blocks the event loop.
+
+    Args:
+        urls: URLs to extract (at most TAVILY_MAX_BATCH)
+        api_key: Tavily API key
+        timeout: Timeout in milliseconds
+
+    Returns:
+        Dict of normalized requested URL -> raw content for URLs Tavily
+        extracted. URLs Tavily failed on are omitted.
+
+    Raises:
+        httpx.HTTPError: If the request itself fails
+        UpstreamUnavailableError: If Tavily's circuit is open
+    """
+    async with guard("tavily"), upstream_client("tavily") as client:
+        response = await client.post(
+            upstream_url("tavily", "extract"),
+            json={"urls": urls},
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout / 1000,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+    # Tavily reports the final URL after redirects, so a result that matches
+    # no requested URL is paired by position with the requests left over
+    # once failures are removed (results come back in request order).
+    unmatched = [cache.normalize_url(url) for url in urls]
+    results = {}
+    leftovers = []
+    for item in data.get("results", []):
+        content = item.get("raw_content")
+        if not content:
+            continue
+        reported = item.get("original_url") or item.get("url")
+        url = cache.normalize_url(reported) if reported else None
+        if url in unmatched:
+            unmatched.remove(url)
+            results[url] = content
+        else:
+            leftovers.append(content)
+
+    failed = {
+        cache.normalize_url(item["url"])
+        for item in data.get("failed_results", [])
+        if item.get("url")
+    }
+    unmatched = [url for url in unmatched if url not in failed]
+    if len(leftovers) == len(unmatched):
+        results.update(zip(unmatched, leftovers))
+    return results
+
+
+class TavilyBatcher:
+    """
+    Coalesce concurrent Tavily fetches into batched extract requests.
+
+    Requests arriving within TAVILY_BATCH_WINDOW of each other share one
+    extract call (up to TAVILY_MAX_BATCH URLs), sent with the longest timeout
+    among them. Each caller still gets its own result or error.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 30000,
+        window: float = TAVILY_BATCH_WINDOW,
+        max_batch: int = TAVILY_MAX_BATCH,
+    ):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[str, list[asyncio.Future[str]]] = {}
+        self._pending_timeout = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def extract(self, url: str, timeout: Optional[int] = None) -> str:
+        """
+        Queue a URL for the next batch and wait for its content.
+
+        Args:
+            url: URL to fetch
+            timeout: This caller's timeout in milliseconds (default: the batcher's)
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        self._pending.setdefault(cache.normalize_url(url), []).append(future)
+        self._pending_timeout = max(self._pending_timeout, timeout or self.timeout)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Send everything queued so far as one extract request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        timeout, self._pending_timeout = self._pending_timeout, 0
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run(batch, timeout))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, list[asyncio.Future[str]]], timeout: int) -> None:
+        """Run one extract request and resolve each waiting caller."""
+        try:
+            results = await tavily_extract(list(batch), self.api_key, timeout)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for url, futures in batch.items():
+            content = results.get(url)
+            for future in futures:
+                if future.done():
+                    continue  # Caller was cancelled (e.g. lost a hedge race)
+                if content:
+                    future.set_result(content)
+                else:
+                    future.set_exception(ValueError("Tavily returned no content"))
 
 
 async def fetch_basic(url: str, timeout: int = 30000) -> str:
@@ -143,20 +601,50 @@ async def fetch_basic(url: str, timeout: int = 30000) -> str:
     Returns:
         Extracted text content
 
+    Raises:
+        FetchError: If fetching or extraction fails
+    """
+    content, _, _ = await fetch_basic_conditional(url, timeout)
+    if content is None:  # Only a conditional request can come back 304
+        raise FetchError(url, "Unexpected 304 Not Modified")
+    return content
+
+
+async def fetch_basic_conditional(
+    url: str,
+    timeout: int = 30000,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Basic fetch with optional ETag/Last-Modified conditional revalidation.
+
+    Args:
+        url: URL to fetch
+        timeout: Timeout in milliseconds
+        etag: Cached ETag to send as If-None-Match
+        last_modified: Cached Last-Modified to send as If-Modified-Since
+
+    Returns:
+        Tuple of (content, etag, last_modified). content is None when the
+        server answered 304 Not Modified.
+
     Raises:
         FetchError: If fetching or extraction fails
     """
     timeout_seconds = timeout / 1000
 
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        async with httpx.AsyncClient(
-            timeout=timeout_seconds,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "Shutter/0.1 (Web Content Distillation Service)"
-            }
-        ) as client:
-            response = await client.get(url)
+        async with upstream_client("basic") as client:
+            response = await client.get(url, timeout=timeout_seconds, headers=headers)
+            if response.status_code == 304 and headers:
+                return (None, etag, last_modified)
             response.raise_for_status()
             html = response.text
     except httpx.TimeoutException:
@@ -166,12 +654,16 @@ async def fetch_basic(url: str, timeout: int = 30000) -> str:
     except httpx.RequestError as e:
         raise FetchError(url, str(e))
 
-    # Extract clean text from HTML using trafilatura
-    extracted = html_to_text(html)
+    # Extract clean text from HTML using trafilatura (off the event loop)
+    extracted = await extract_html(html)
     if not extracted:
         raise FetchError(url, "Could not extract content from page")
 
-    return extracted
+    return (
+        extracted,
+        response.headers.get("etag"),
+        response.headers.get("last-modified"),
+    )
 
 
 def html_to_text(html: str) -> Optional[str]:
@@ -201,6 +693,116 @@ def html_to_text(html: str) -> Optional[str]:
     return extracted
 
 
+def _timed_html_to_text(html: str) -> Tuple[Optional[str], float]:
+    """Run html_to_text and measure it in the worker (excludes queue wait)."""
+    start = time.perf_counter()
+    extracted = html_to_text(html)
+    return extracted, time.perf_counter() - start
+
+
+def truncate_html(html: str, max_chars: int) -> str:
+    """
+    Cut oversized HTML before extraction.
+
+    Truncates at the last tag boundary before max_chars so trafilatura never
+    sees half a tag. Main content sits near the top of nearly every page, so
+    the tail is the cheapest part to lose.
+
+    Args:
+        html: Raw HTML content
+        max_chars: Maximum characters to keep
+
+    Returns:
+        HTML of at most max_chars characters
+    """
+    if len(html) <= max_chars:
+        return html
+    cut = html.rfind(">", 0, max_chars)
+    return html[: cut + 1] if cut > 0 else html[:max_chars]
+
+
+def get_html_executor(settings: Optional[FetchSettings] = None) -> Optional[Executor]:
+    """
+    Get the shared executor for HTML extraction, creating it on first use.
+
+    The executor is rebuilt if [fetch] html_executor or html_workers change.
+
+    Args:
+        settings: Result of get_fetch_settings() (loaded if omitted)
+
+    Returns:
+        ThreadPoolExecutor or ProcessPoolExecutor, or None for "inline"
+
+    Raises:
+        ValueError: If html_executor is not thread/process/inline
+    """
+    global _html_executor
+    settings = settings or get_fetch_settings()
+    kind = settings["html_executor"]
+    workers = settings["html_workers"]
+
+    if kind == "inline":
+        return None
+    if kind not in ("thread", "process"):
+        raise ValueError(f"Unknown html_executor: {kind}")
+
+    if _html_executor is not None:
+        current_kind, current_workers, executor = _html_executor
+        if (current_kind, current_workers) == (kind, workers):
+            return executor
+        executor.shutdown(wait=False)
+
+    if kind == "process":
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shutter-html")
+    _html_executor = (kind, workers, executor)
+    return executor
+
+
+def shutdown_html_executor() -> None:
+    """Shut down the HTML extraction executor (recreated on next use)."""
+    global _html_executor
+    if _html_executor is not None:
+        _html_executor[2].shutdown(wait=False)
+        _html_executor = None
+
+
+async def extract_html(html: str, settings: Optional[FetchSettings] = None) -> Optional[str]:
+    """
+    Run html_to_text off the event loop with a max input size guard.
+
+    trafilatura parsing is CPU-bound and can take hundreds of milliseconds on
+    large pages; running it in the configured executor keeps other shutter
+    requests making progress. Per-document extraction time is recorded in
+    get_fetch_stats()["html_extract"].
+
+    Args:
+        html: Raw HTML content
+        settings: Result of get_fetch_settings() (loaded if omitted)
+
+    Returns:
+        Extracted text content, or None if extraction fails
+    """
+    global _html_truncated
+    settings = settings or get_fetch_settings()
+
+    if len(html) > settings["max_html_chars"]:
+        html = truncate_html(html, settings["max_html_chars"])
+        _html_truncated += 1
+
+    executor = get_html_executor(settings)
+    if executor is None:
+        extracted, elapsed = _timed_html_to_text(html)
+    else:
+        loop = asyncio.get_running_loop()
+        extracted, elapsed = await loop.run_in_executor(executor, _timed_html_to_text, html)
+
+    _html_times.append(elapsed)
+    metrics.record_phase("parse", elapsed * 1000)
+    return extracted
+
+
 def extract_domain(url: str) -> str:
     """
     Extract domain from URL for offenders list tracking.
@@ -0,0 +1,233 @@
+"""
+Near-duplicate content detection with SimHash.
+
+Mirrors, print views and pages that differ only in a timestamp or session
+token hash to different sha256 values, so the exact-content result cache
+misses on them. A 64-bit SimHash of word 3-shingles maps near-identical
+pages to fingerprints a few bits apart; an in-memory index of pages the
+canary LLM recently passed finds such a neighbour so its canary verdict and extractions
+can be reused (see core.py).
+
+The index is split into max_distance + 1 bands: two fingerprints within
+max_distance bits must agree exactly on at least one band (pigeonhole), so
+a lookup only compares against fingerprints sharing a band. Entries are
+evicted least-recently-used beyond max_entries.
+
+Fingerprints are stable across processes (blake2b word hashes), though
+the index itself lives in memory and is per process.
+"""
+
+import hashlib
+import re
+import sys
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
+from grove_shutter.config import get_cache_settings
+
+
+FINGERPRINT_BITS = 64
+MASK = (1 << FINGERPRINT_BITS) - 1
+
+# Pages shorter than this many words are not fingerprinted (too unstable)
+MIN_WORDS = 50
+
+# Pages longer than this many words are not fingerprinted (bounds the cost;
+# a fingerprint of only the head would miss edits in the tail)
+MAX_WORDS = 20_000
+
+_WORD_RE = re.compile(r"\w+")
+
+# Odd multipliers mixing word hashes into a shingle hash
+_MIX_A = 0x9E3779B97F4A7C15
+_MIX_B = 0xC2B2AE3D27D4EB4F
+
+# _BIT_TABLES[bit] maps a byte value to 1 if that bit is set, else 0
+_BIT_TABLES = [bytes((value >> bit) & 1 for value in range(256)) for bit in range(8)]
+
+# Lazily created index: (max_entries, max_distance, index)
+_index: Optional[tuple[int, int, "FingerprintIndex"]] = None
+
+
+def simhash(content: str) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash of content from its word 3-shingles.
+
+    Args:
+        content: Page content
+
+    Returns:
+        Fingerprint, or None if the content has fewer than MIN_WORDS or more
+        than MAX_WORDS words
+    """
+    words = _WORD_RE.findall(content.lower())
+    if not MIN_WORDS <= len(words) <= MAX_WORDS:
+        return None
+
+    # Stable 64-bit hash per distinct word, combined per shingle
+    word_hashes = {
+        word: int.from_bytes(
+            hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        for word in set(words)
+    }
+    h = [word_hashes[word] for word in words]
+    shingles = {
+        (a * _MIX_A + b * _MIX_B + c) & MASK
+        for a, b, c in zip(h, h[1:], h[2:])
+    }
+    hashes = array("Q", shingles)
+    if sys.byteorder == "big":
+        hashes.byteswap()
+    data = hashes.tobytes()
+
+    # Count set bits per position over byte columns, all in C: translate
+    # maps each byte to 1/0 for the bit, count() tallies the ones
+    threshold = len(shingles) / 2
+    fingerprint = 0
+    for byte in range(8):
+        column = data[byte::8]
+        for bit in range(8):
+            if column.translate(_BIT_TABLES[bit]).count(1) > threshold:
+                fingerprint |= 1 << (byte * 8 + bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+class FingerprintIndex:
+    """
+    Bounded LRU index of fingerprint -> content hash with banded lookup.
+
+    Example:
+        index = FingerprintIndex(max_entries=10000, max_distance=3)
+        index.add(simhash(page), hash_content(page))
+        match = index.find(simhash(mirror_page))
+    """
+
+    def __init__(self, max_entries: int = 10000, max_distance: int = 3):
+        """
+        Args:
+            max_entries: Most fingerprints kept before LRU eviction
+            max_distance: Largest Hamming distance counted as a near duplicate
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.lookups = 0
+        self.hits = 0
+
+        bands = max_distance + 1
+        width = FINGERPRINT_BITS // bands
+        self._bands = [
+            (i * width, (1 << (FINGERPRINT_BITS - i * width if i == bands - 1 else width)) - 1)
+            for i in range(bands)
+        ]
+        self._tables: list[dict[int, set[int]]] = [{} for _ in self._bands]
+        self._entries: OrderedDict[int, str] = OrderedDict()
+
+    def _keys(self, fingerprint: int) -> list[int]:
+        """Band values of a fingerprint."""
+        return [fingerprint >> shift & mask for shift, mask in self._bands]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Find the closest indexed near duplicate.
+
+        Args:
+            fingerprint: SimHash of the page being looked up
+
+        Returns:
+            Content hash of the closest entry within max_distance, or None
+        """
+        self.lookups += 1
+
+        best, best_distance = None, self.max_distance + 1
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            for candidate in table.get(key, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+
+        if best is None:
+            return None
+        self.hits += 1
+        self._entries.move_to_end(best)
+        return self._entries[best]
+
+    def add(self, fingerprint: int, content_hash: str) -> None:
+        """
+        Index a page, evicting the least recently used entry if full.
+
+        Args:
+            fingerprint: SimHash of the page
+            content_hash: sha256 of the page content (see cache.hash_content)
+        """
+        if fingerprint in self._entries:
+            self._entries[fingerprint] = content_hash
+            self._entries.move_to_end(fingerprint)
+            return
+
+        self._entries[fingerprint] = content_hash
+        for table, key in zip(self._tables, self._keys(fingerprint)):
+            table.setdefault(key, set()).add(fingerprint)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            for table, key in zip(self._tables, self._keys(evicted)):
+                bucket = table[key]
+                bucket.discard(evicted)
+                if not bucket:
+                    del table[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Get index counters.
+
+        Returns:
+            Dict with 'entries', 'lookups', 'hits' and 'hit_rate'
+        """
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+        }
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """
+    Get the process-wide index, recreating it if its settings changed.
+
+    Returns:
+        FingerprintIndex sized by [cache] fingerprint_entries / simhash_distance
+    """
+    global _index
+
+    settings = get_cache_settings()
+    config = (settings["fingerprint_entries"], settings["simhash_distance"])
+    if _index is None or _index[:2] != config:
+        _index = (*config, FingerprintIndex(*config))
+    return _index[2]
+
+
+def get_fingerprint_stats() -> dict:
+    """
+    Get near-duplicate index counters for this process.
+
+    Returns:
+        Dict with 'entries', 'lookups', 'hits' and 'hit_rate'
+    """
+    return get_fingerprint_index().stats()
+
+
+def reset_fingerprint_index() -> None:
+    """Drop every indexed fingerprint and reset counters."""
+    global _index
+    _index = None
@@ -0,0 +1,401 @@
+"""
+Per-phase timings and an aggregated metrics registry.
+
+Every shutter() call collects a timings dict (phase -> milliseconds) that is
+attached to its ShutterResponse. The same measurements feed a process-wide
+registry of counters and latency histograms, labelled by phase, fetch
+backend and model tier.
+
+Phases:
+- "offenders"          - offenders list lookup
+- "fetch.<backend>"    - each fetch backend attempt (jina/tavily/basic)
+- "parse"              - trafilatura HTML extraction
+- "canary.heuristics"  - free heuristic checks
+- "canary.llm"         - canary LLM call
+- "extraction"         - full LLM extraction
+
+The CLI merges the registry into ~/.shutter/metrics.json when it exits, and
+`shutter --metrics` prints the accumulated totals as JSON or Prometheus text.
+Work shared between coalesced callers (see singleflight.py) is timed once,
+in the response of the caller that started it.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from grove_shutter.config import ensure_config_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: _locked() uses msvcrt instead
+    fcntl = None  # type: ignore[assignment]
+
+
+METRICS_PATH = Path.home() / ".shutter" / "metrics.json"
+
+# Histogram bucket upper bounds in milliseconds (+Inf is implicit)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Help text for exported metrics
+METRIC_HELP = {
+    "shutter_phase_duration_ms": ("histogram", "Time spent in each pipeline phase"),
+    "shutter_request_duration_ms": ("histogram", "Total shutter() request time"),
+    "shutter_requests_total": ("counter", "shutter() requests by model tier and outcome"),
+    "shutter_fetch_attempts_total": ("counter", "Fetch backend attempts by outcome"),
+    "shutter_breaker_transitions_total": ("counter", "Circuit breaker state changes by upstream"),
+    "shutter_breaker_rejections_total": (
+        "counter", "Calls rejected by an open circuit or rate limit"
+    ),
+    "shutter_rate_limit_wait_ms": (
+        "histogram", "Time spent waiting for an upstream rate limit token"
+    ),
+    "shutter_reputation_checks_total": (
+        "counter", "Canary LLM checks run or skipped on domain reputation"
+    ),
+    "shutter_near_duplicate_hits_total": (
+        "counter", "Canary verdicts and extractions reused from near-duplicate pages"
+    ),
+}
+
+# name -> {label tuple -> value}
+_counters: dict[str, dict[tuple, float]] = {}
+
+# name -> {label tuple -> {"buckets": [...], "sum": float, "count": int}}
+_histograms: dict[str, dict[tuple, dict[str, Any]]] = {}
+
+# Timings dict of the shutter() call running in this context
+_request_timings: ContextVar[Optional[dict]] = ContextVar("shutter_request_timings", default=None)
+
+
+def _label_key(labels: dict) -> tuple:
+    """Canonical, hashable form of a label set."""
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    """
+    Increment a counter.
+
+    Args:
+        name: Metric name
+        value: Amount to add
+        **labels: Label values (None values are dropped)
+    """
+    series = _counters.setdefault(name, {})
+    key = _label_key(labels)
+    series[key] = series.get(key, 0) + value
+
+
+def observe(name: str, value_ms: float, **labels: Any) -> None:
+    """
+    Record one latency observation in a histogram.
+
+    Args:
+        name: Metric name
+        value_ms: Observed duration in milliseconds
+        **labels: Label values (None values are dropped)
+    """
+    series = _histograms.setdefault(name, {})
+    key = _label_key(labels)
+    histogram = series.get(key)
+    if histogram is None:
+        histogram = series[key] = {
+            "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            "sum": 0.0,
+            "count": 0,
+        }
+
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if value_ms <= bound:
+            histogram["buckets"][i] += 1
+            break
+    else:
+        histogram["buckets"][-1] += 1
+    histogram["sum"] += value_ms
+    histogram["count"] += 1
+
+
+def record_phase(phase: str, elapsed_ms: float, **labels: Any) -> None:
+    """
+    Record a phase duration in the registry and the current request's timings.
+
+    Repeated phases within one request (e.g. retries) are summed.
+
+    Args:
+        phase: Phase name (see module docstring)
+        elapsed_ms: Duration in milliseconds
+        **labels: Extra labels such as backend or tier
+    """
+    observe("shutter_phase_duration_ms", elapsed_ms, phase=phase, **labels)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + elapsed_ms
+
+
+@contextmanager
+def phase_timer(phase: str, **labels: Any) -> Iterator[None]:
+    """
+    Time a block as one phase (recorded even if the block raises).
+
+    Example:
+        with phase_timer("canary.llm"):
+            outcome, details = await run_canary_llm(content, query)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, (time.perf_counter() - start) * 1000, **labels)
+
+
+@contextmanager
+def request_timings() -> Iterator[dict]:
+    """
+    Collect phase timings for one request.
+
+    Yields:
+        Dict of phase -> milliseconds, filled in as phases complete
+    """
+    timings: dict = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def get_metrics() -> dict:
+    """
+    Get a JSON-serializable snapshot of the in-process registry.
+
+    Returns:
+        Dict with 'counters' and 'histograms', each name -> list of series
+        ({labels, value} or {labels, buckets, sum, count})
+    """
+    return {
+        "bucket_bounds_ms": list(LATENCY_BUCKETS_MS),
+        "counters": {
+            name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+            for name, series in _counters.items()
+        },
+        "histograms": {
+            name: [
+                {
+                    "labels": dict(key),
+                    "buckets": list(h["buckets"]),
+                    "sum": h["sum"],
+                    "count": h["count"],
+                }
+                for key, h in series.items()
+            ]
+            for name, series in _histograms.items()
+        },
+    }
+
+
+def reset_metrics() -> None:
+    """Clear the in-process registry."""
+    _counters.clear()
+    _histograms.clear()
+
+
+def merge_metrics(base: dict, extra: dict) -> dict:
+    """
+    Add one metrics snapshot into another (counters and histograms summed).
+
+    Args:
+        base: Snapshot from get_metrics() or load_metrics()
+        extra: Snapshot to add
+
+    Returns:
+        Merged snapshot
+    """
+    merged: dict[str, Any] = {
+        "bucket_bounds_ms": list(LATENCY_BUCKETS_MS),
+        "counters": {},
+        "histograms": {},
+    }
+
+    counters: dict[str, dict[tuple, float]] = {}
+    histograms: dict[str, dict[tuple, dict[str, Any]]] = {}
+    for snapshot in (base, extra):
+        for name, series in snapshot.get("counters", {}).items():
+            counter_series = counters.setdefault(name, {})
+            for entry in series:
+                key = _label_key(entry["labels"])
+                counter_series[key] = counter_series.get(key, 0) + entry["value"]
+        for name, series in snapshot.get("histograms", {}).items():
+            histogram_series = histograms.setdefault(name, {})
+            for entry in series:
+                key = _label_key(entry["labels"])
+                existing = histogram_series.get(key)
+                if existing is None:
+                    histogram_series[key] = {
+                        "buckets": list(entry["buckets"]),
+                        "sum": entry["sum"],
+                        "count": entry["count"],
+                    }
+                else:
+                    existing["buckets"] = [
+                        a + b for a, b in zip(existing["buckets"], entry["buckets"])
+                    ]
+                    existing["sum"] += entry["sum"]
+                    existing["count"] += entry["count"]
+
+    for name, series in counters.items():
+        merged["counters"][name] = [
+            {"labels": dict(key), "value": value} for key, value in series.items()
+        ]
+    for name, series in histograms.items():
+        merged["histograms"][name] = [{"labels": dict(key), **h} for key, h in series.items()]
+    return merged
+
+
+def load_metrics(path: Optional[Path] = None) -> dict:
+    """
+    Load accumulated metrics saved by save_metrics().
+
+    Args:
+        path: Metrics file (defaults to METRICS_PATH)
+
+    Returns:
+        Snapshot dict (empty if the file does not exist or is unreadable)
+    """
+    path = path or METRICS_PATH
+    try:
+        with open(path) as f:
+            snapshot: dict = json.load(f)
+        return snapshot
+    except (OSError, ValueError):
+        return {"bucket_bounds_ms": list(LATENCY_BUCKETS_MS), "counters": {}, "histograms": {}}
+
+
+@contextmanager
+def _locked(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a lock file for the duration of the block.
+
+    Uses flock() where fcntl exists and msvcrt.locking() on Windows; with
+    neither the block runs unlocked.
+    """
+    with open(lock_path, "a+") as lock:
+        if sys.platform == "win32":
+            import msvcrt
+
+            lock.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 seconds
+                    continue
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield  # Closing the file releases the flock
+
+
+def save_metrics(path: Optional[Path] = None) -> None:
+    """
+    Merge the in-process registry into the metrics file and reset it.
+
+    Concurrent CLI processes serialize on a lock file next to the metrics
+    file (see _locked()), held across load, merge and replace, so no run's
+    counts are lost. Each writer uses its own temp file.
+
+    Args:
+        path: Metrics file (defaults to METRICS_PATH)
+    """
+    path = path or METRICS_PATH
+    if not _counters and not _histograms:
+        return
+
+    if path == METRICS_PATH:
+        ensure_config_dir()
+
+    with _locked(path.with_suffix(".lock")):
+        merged = merge_metrics(load_metrics(path), get_metrics())
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            json.dump(merged, f)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    reset_metrics()
+
+
+def clear_saved_metrics(path: Optional[Path] = None) -> None:
+    """Delete the accumulated metrics file."""
+    path = path or METRICS_PATH
+    if path.exists():
+        path.unlink()
+
+
+def _format_labels(labels: dict, extra: Optional[tuple] = None) -> str:
+    """Render a Prometheus label set."""
+    items = sorted(labels.items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    rendered = ",".join(f'{k}="{_escape_label(v)}"' for k, v in items)
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: object) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: Optional[dict] = None) -> str:
+    """
+    Render a metrics snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Snapshot to render (defaults to the in-process registry)
+
+    Returns:
+        Prometheus text format
+    """
+    snapshot = snapshot or get_metrics()
+    bounds = snapshot.get("bucket_bounds_ms", list(LATENCY_BUCKETS_MS))
+    lines = []
+
+    for name, series in sorted(snapshot.get("counters", {}).items()):
+        metric_type, help_text = METRIC_HELP.get(name, ("counter", name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for entry in series:
+            lines.append(f"{name}{_format_labels(entry['labels'])} {entry['value']:g}")
+
+    for name, series in sorted(snapshot.get("histograms", {}).items()):
+        metric_type, help_text = METRIC_HELP.get(name, ("histogram", name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for entry in series:
+            cumulative = 0
+            for bound, count in zip(list(bounds) + ["+Inf"], entry["buckets"]):
+                cumulative += count
+                le = ("le", bound if bound == "+Inf" else f"{bound:g}")
+                lines.append(f"{name}_bucket{_format_labels(entry['labels'], le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(entry['labels'])} {entry['sum']:.3f}")
+            lines.append(f"{name}_count{_format_labels(entry['labels'])} {entry['count']}")
+
+    return "\n".join(lines) + "\n"
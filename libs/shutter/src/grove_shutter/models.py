@@ -38,6 +38,13 @@ class ShutterResponse:
     tokens_output: int
     model_used: str
     prompt_injection: Optional[PromptInjectionDetails] = None
+    cached: bool = False  # Extraction served from the result cache (no tokens billed)
+    fetch_ms: Optional[float] = None  # Time spent fetching the page
+    # Extraction request to first streamed token (shutter_stream only)
+    ttft_ms: Optional[float] = None
+    latency_ms: Optional[float] = None  # Total time for the request
+    # Phase -> milliseconds (see metrics.py)
+    timings: dict[str, float] = field(default_factory=dict)
 
 
 @dataclass
@@ -50,3 +57,39 @@ class Offender:
     injection_types: list[str]
     avg_confidence: float = 0.0  # Running average of detection confidence
     max_confidence: float = 0.0  # Maximum confidence seen for this domain
+
+
+@dataclass
+class DomainReputation:
+    """Clean canary history of a domain (the positive counterpart of Offender)"""
+    domain: str
+    first_seen: datetime
+    last_seen: datetime  # Most recent clean verdict
+    clean_count: int  # Clean canary LLM verdicts
+    content_hashes: list[str]  # Distinct content seen (hash prefixes, bounded)
+
+    @property
+    def distinct_content(self) -> int:
+        """Number of distinct pages behind the clean verdicts (saturating)."""
+        return len(self.content_hashes)
+
+
+@dataclass
+class CachedFetch:
+    """Fetched page content in the fetch cache"""
+    url: str
+    content: str
+    backend: str  # Fetch backend that produced the content (jina/tavily/basic)
+    fetched_at: float  # Unix timestamp of last fetch or successful revalidation
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class CachedExtraction:
+    """LLM extraction result in the result cache"""
+    extracted: str
+    tokens_input: int
+    tokens_output: int
+    model_used: str
+    created_at: float  # Unix timestamp
@@ -0,0 +1,153 @@
+"""
+Shared HTTP connection pools for upstream services.
+
+By default every fetch/LLM call opens a short-lived httpx.AsyncClient, which is
+fine for one-off CLI use. Batch workloads (shutter_many) activate a ClientPool
+instead, so all calls to the same upstream reuse one keep-alive client and skip
+repeated TCP+TLS handshakes.
+
+Upstreams:
+- "jina"       - r.jina.ai reader
+- "openrouter" - openrouter.ai chat completions (canary + extraction)
+- "tavily"     - api.tavily.com extract
+- "basic"      - direct page fetches (arbitrary hosts)
+"""
+
+import importlib.util
+import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+from typing import AsyncIterator, Optional
+
+import httpx
+
+
+USER_AGENT = "Shutter/0.1 (Web Content Distillation Service)"
+
+# Connection limits per upstream client
+# Format: upstream -> (max_connections, max_keepalive_connections)
+UPSTREAM_LIMITS = {
+    "jina": (64, 32),
+    "openrouter": (64, 32),
+    "tavily": (16, 8),
+    "basic": (128, 32),
+}
+
+# Base URL per upstream. SHUTTER_<UPSTREAM>_URL overrides one (e.g. a proxy,
+# a self-hosted reader, or the offline stand-in in benchmarks/)
+UPSTREAM_URLS = {
+    "jina": "https://r.jina.ai",
+    "openrouter": "https://openrouter.ai/api/v1",
+    "tavily": "https://api.tavily.com",
+}
+
+# Pool active for the current task tree (set by ClientPool.__aenter__)
+_active_pool: ContextVar[Optional["ClientPool"]] = ContextVar("shutter_client_pool", default=None)
+
+
+def http2_available() -> bool:
+    """Check whether the optional h2 package is installed (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ClientPool:
+    """
+    One pooled keep-alive httpx.AsyncClient per upstream.
+
+    Clients are created lazily on first use and closed together when the pool
+    exits. Use as an async context manager to make the pool visible to every
+    fetch/canary/extraction call made inside the block:
+
+        async with ClientPool():
+            await shutter(url, query)  # reuses pooled connections
+    """
+
+    def __init__(self, http2: Optional[bool] = None):
+        """
+        Args:
+            http2: Enable HTTP/2. Defaults to True when h2 is installed.
+        """
+        self.http2 = http2_available() if http2 is None else http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._token: Optional[Token[Optional["ClientPool"]]] = None
+
+    def client(self, upstream: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the shared client for an upstream."""
+        client = self._clients.get(upstream)
+        if client is None:
+            max_conn, max_keepalive = UPSTREAM_LIMITS.get(upstream, UPSTREAM_LIMITS["basic"])
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=max_conn,
+                    max_keepalive_connections=max_keepalive,
+                ),
+            )
+            self._clients[upstream] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all upstream clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self) -> "ClientPool":
+        self._token = _active_pool.set(self)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._token is not None:
+            _active_pool.reset(self._token)
+            self._token = None
+        await self.aclose()
+
+
+def upstream_url(upstream: str, path: str = "") -> str:
+    """
+    Build a URL on an upstream service.
+
+    Args:
+        upstream: Upstream name ("jina", "openrouter", "tavily")
+        path: Path (or, for Jina, the target URL) appended after a "/"
+
+    Returns:
+        Full URL, using SHUTTER_<UPSTREAM>_URL as the base when set
+    """
+    base = os.getenv(f"SHUTTER_{upstream.upper()}_URL") or UPSTREAM_URLS[upstream]
+    return f"{base.rstrip('/')}/{path}"
+
+
+def get_active_pool() -> Optional[ClientPool]:
+    """Return the ClientPool active in the current context, if any."""
+    return _active_pool.get()
+
+
+@asynccontextmanager
+async def upstream_client(upstream: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield an httpx client for an upstream.
+
+    Inside an active ClientPool this is the shared pooled client (left open).
+    Otherwise a one-shot client is created and closed on exit, matching the
+    original per-call behavior.
+
+    Timeouts and headers are per-request, so callers should pass them to
+    client.get()/client.post() rather than relying on client defaults.
+
+    Args:
+        upstream: Upstream name ("jina", "openrouter", "tavily", "basic")
+    """
+    pool = _active_pool.get()
+    if pool is not None:
+        yield pool.client(upstream)
+        return
+
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+        yield client
@@ -0,0 +1,127 @@
+"""
+In-process request coalescing (single-flight).
+
+When several callers ask for the same work at the same time, the first caller
+(the leader) starts it and every concurrent caller with the same key (a
+follower) awaits the leader's result instead of repeating the upstream call.
+Keys are forgotten as soon as the work finishes, so this never serves stale
+results - persistent reuse is the result cache's job (see cache.py).
+
+The shared work runs in its own task, so a cancelled caller never cancels
+it for the others. Once every caller waiting on a key has been cancelled
+(e.g. a discarded speculative extraction), the work itself is cancelled so
+no upstream spend is wasted on a result nobody wants.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+# All SingleFlight groups by name, for get_coalescing_stats()
+_groups: dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+
+    Example:
+        fetches = SingleFlight("fetch")
+        content = await fetches.do(url_key, lambda: fetch_url(url))
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Group name reported by get_coalescing_stats()
+        """
+        self.name = name
+        self.leaders = 0
+        self.followers = 0
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        _groups[name] = self
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run work() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the work (callers with equal keys share it)
+            work: Zero-argument coroutine function started by the leader
+
+        Returns:
+            The shared result. Exceptions are raised in every caller.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.followers += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Last interested caller gone - stop the shared work too
+            if self._waiters.get(key) == 1 and self._inflight.get(key) is task:
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters.get(key, 1) - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                self._waiters.pop(key, None)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a completed task and mark its exception as retrieved."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being worked on."""
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        """
+        Get coalescing counters for this group.
+
+        Returns:
+            Dict with 'leaders', 'followers' and 'ratio' (callers per
+            upstream call; 1.0 means nothing was coalesced)
+        """
+        calls = self.leaders + self.followers
+        return {
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "ratio": calls / self.leaders if self.leaders else 1.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Reset counters (in-flight work is unaffected)."""
+        self.leaders = 0
+        self.followers = 0
+
+
+def get_coalescing_stats() -> dict:
+    """
+    Get counters for every single-flight group in this process.
+
+    Returns:
+        Dict of group name -> {leaders, followers, ratio}
+    """
+    return {name: group.stats() for name, group in _groups.items()}
+
+
+def reset_coalescing_stats() -> None:
+    """Reset counters for every single-flight group."""
+    for group in _groups.values():
+        group.reset_stats()
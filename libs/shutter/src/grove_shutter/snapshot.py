@@ -0,0 +1,299 @@
+"""
+Memory-mapped offenders snapshot shared by many worker processes.
+
+A snapshot is a compact, read-only binary file of hashed domains and their
+verdicts, sorted by hash so lookups are a binary search over the mmap'd
+file - no SQLite connection, no locking, a few microseconds per check.
+
+Workers map ~/.shutter/offenders.snap and check at most once a second
+whether it has been replaced. import_snapshot() and write_snapshot() swap
+files atomically (write to a temp file, then os.replace), so a worker sees
+either the old snapshot or the new one, never a partial file.
+
+File layout (big-endian):
+- Header (24 bytes): magic "SHOF", version u16, flags u16, record count u32,
+  created_at u64 (unix seconds), CRC32 of the records u32
+- Records (12 bytes each, sorted by hash): domain hash u64 (blake2b-64 of
+  the lowercased domain), flags u8 (bit 0 = blocked), detection count u8
+  (saturating), max confidence u8 and avg confidence u8 (0-255 scaled)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+
+SNAPSHOT_PATH = Path.home() / ".shutter" / "offenders.snap"
+
+MAGIC = b"SHOF"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct(">4sHHIQI")
+RECORD = struct.Struct(">QBBBB")
+
+FLAG_BLOCKED = 0x01
+
+# Seconds between checks for a replaced snapshot file
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Active snapshot: (file signature, snapshot or None if absent/invalid)
+_active: Optional[Tuple[Optional[tuple], Optional["OffenderSnapshot"]]] = None
+_active_path: Optional[Path] = None
+_checked_at = 0.0
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or corrupt."""
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    """Verdict for one domain as stored in a snapshot."""
+
+    blocked: bool
+    detection_count: int
+    max_confidence: float
+    avg_confidence: float
+
+
+def domain_hash(domain: str) -> int:
+    """
+    Hash a domain to the 64-bit key used in snapshots.
+
+    Args:
+        domain: Domain name (case-insensitive)
+
+    Returns:
+        Unsigned 64-bit hash
+    """
+    digest = hashlib.blake2b(domain.lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _to_byte(confidence: float) -> int:
+    """Scale a 0.0-1.0 confidence to 0-255."""
+    return max(0, min(255, round(confidence * 255)))
+
+
+def write_snapshot(
+    entries: Iterable[Tuple[str, SnapshotEntry]], path: Optional[Path] = None
+) -> int:
+    """
+    Write a snapshot file atomically.
+
+    Args:
+        entries: (domain, SnapshotEntry) pairs; a domain listed twice keeps
+            its last entry
+        path: Destination (defaults to SNAPSHOT_PATH)
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path or SNAPSHOT_PATH)
+
+    records = {}
+    for domain, entry in entries:
+        key = domain_hash(domain)
+        records[key] = RECORD.pack(
+            key,
+            FLAG_BLOCKED if entry.blocked else 0,
+            min(255, max(0, entry.detection_count)),
+            _to_byte(entry.max_confidence),
+            _to_byte(entry.avg_confidence),
+        )
+    body = b"".join(records[key] for key in sorted(records))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records), int(time.time()), zlib.crc32(body))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class OffenderSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Example:
+        snapshot = OffenderSnapshot(path)
+        entry = snapshot.lookup("evil.example.com")
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Snapshot file to map
+
+        Raises:
+            SnapshotError: If the file is missing, truncated or corrupt
+        """
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size:
+                    raise SnapshotError(f"{self.path}: truncated header")
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            raise SnapshotError(f"{self.path}: {e}")
+
+        magic, version, _, count, created_at, crc = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path}: not an offenders snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path}: unsupported snapshot version {version}")
+        if size != HEADER.size + count * RECORD.size:
+            raise SnapshotError(f"{self.path}: expected {count} records, size is {size}")
+        if zlib.crc32(self._map[HEADER.size:]) != crc:
+            raise SnapshotError(f"{self.path}: checksum mismatch")
+
+        self.count: int = count
+        self.created_at = created_at
+
+    def __len__(self) -> int:
+        return self.count
+
+    def lookup(self, domain: str) -> Optional[SnapshotEntry]:
+        """
+        Binary-search the snapshot for a domain.
+
+        Args:
+            domain: Domain name (case-insensitive)
+
+        Returns:
+            SnapshotEntry, or None if the domain is not in the snapshot
+        """
+        key = domain_hash(domain)
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * RECORD.size
+            mid_key = RECORD.unpack_from(data, offset)[0]
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                _, flags, count, max_conf, avg_conf = RECORD.unpack_from(data, offset)
+                return SnapshotEntry(
+                    blocked=bool(flags & FLAG_BLOCKED),
+                    detection_count=count,
+                    max_confidence=max_conf / 255,
+                    avg_confidence=avg_conf / 255,
+                )
+        return None
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """(inode, mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def get_snapshot() -> Optional[OffenderSnapshot]:
+    """
+    Get the active snapshot, remapping it if the file was replaced.
+
+    The file is stat'ed at most once per RELOAD_CHECK_INTERVAL. A replaced
+    snapshot that fails validation is ignored (the previous one is dropped
+    too, so a bad deploy can't keep stale verdicts alive).
+
+    Returns:
+        The mapped snapshot, or None if there is no valid snapshot
+    """
+    global _active, _active_path, _checked_at
+
+    now = time.monotonic()
+    if (
+        _active is not None
+        and _active_path == SNAPSHOT_PATH
+        and now - _checked_at < RELOAD_CHECK_INTERVAL
+    ):
+        return _active[1]
+
+    _checked_at = now
+    signature = _file_signature(SNAPSHOT_PATH)
+    if _active is not None and _active_path == SNAPSHOT_PATH and _active[0] == signature:
+        return _active[1]
+
+    snapshot = None
+    if signature is not None:
+        try:
+            snapshot = OffenderSnapshot(SNAPSHOT_PATH)
+        except SnapshotError:
+            snapshot = None
+
+    # Old mapping is released once in-flight lookups drop their reference
+    _active = (signature, snapshot)
+    _active_path = SNAPSHOT_PATH
+    return snapshot
+
+
+def snapshot_lookup(domain: str) -> Optional[SnapshotEntry]:
+    """
+    Look a domain up in the active snapshot.
+
+    Args:
+        domain: Domain name
+
+    Returns:
+        SnapshotEntry, or None if there is no snapshot or the domain isn't in it
+    """
+    snapshot = get_snapshot()
+    return snapshot.lookup(domain) if snapshot is not None else None
+
+
+def import_snapshot(source: Path) -> int:
+    """
+    Validate a snapshot file and install it as the active snapshot.
+
+    Args:
+        source: Snapshot file (e.g. built on another host by export)
+
+    Returns:
+        Number of records in the installed snapshot
+
+    Raises:
+        SnapshotError: If the source is not a valid snapshot
+    """
+    snapshot = OffenderSnapshot(source)
+    try:
+        data = snapshot._map[:]
+    finally:
+        snapshot.close()
+
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH.with_name(f"{SNAPSHOT_PATH.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SNAPSHOT_PATH)
+    reset_snapshot()
+    return snapshot.count
+
+
+def reset_snapshot() -> None:
+    """Forget the active snapshot so the next lookup rereads the file."""
+    global _active, _active_path
+    _active = None
+    _active_path = None
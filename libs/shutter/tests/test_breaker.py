@@ -0,0 +1,301 @@
+"""
+Tests for per-upstream rate limiting and circuit breaking.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+
+import pytest
+
+from grove_shutter import breaker, config, fetch, metrics
+from grove_shutter.breaker import CircuitBreaker, TokenBucket, UpstreamUnavailableError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clean_state(tmp_path, monkeypatch):
+    """Isolate config and start each test with fresh breakers and stats."""
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+    monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
+    monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+    breaker.reset_breakers()
+    fetch.reset_fetch_stats()
+    metrics.reset_metrics()
+    yield
+    breaker.reset_breakers()
+    metrics.reset_metrics()
+
+
+def make_breaker(clock, **overrides) -> CircuitBreaker:
+    """Breaker with default settings plus overrides."""
+    settings = config.get_breaker_settings()
+    settings.update(overrides)
+    return CircuitBreaker("jina", settings, clock)
+
+
+def status_error(status: int, headers: dict = None) -> httpx.HTTPStatusError:
+    """Build an HTTPStatusError for a response with the given status."""
+    request = httpx.Request("GET", "https://r.jina.ai/x")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestBreakerSettings:
+    """Test suite for get_breaker_settings()."""
+
+    def test_defaults(self):
+        """Test defaults when no config file exists."""
+        settings = config.get_breaker_settings()
+        assert settings["failure_rate"] == 0.5
+        assert settings["open_seconds"] == 30
+        assert settings["rate_limits"]["jina"] == 10
+
+    def test_rate_limit_overrides_merge(self):
+        """Test that [breaker.rate_limits] overrides single upstreams."""
+        config.CONFIG_PATH.write_text(
+            "[breaker]\nopen_seconds = 60\n\n[breaker.rate_limits]\njina = 0.33\n"
+        )
+        settings = config.get_breaker_settings()
+        assert settings["open_seconds"] == 60
+        assert settings["rate_limits"]["jina"] == 0.33
+        assert settings["rate_limits"]["openrouter"] == 20
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        """Test that calls beyond the burst are told to wait in order."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == pytest.approx(0.5)
+        assert bucket.reserve(max_wait=5) == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        """Test that tokens come back at the configured rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=1, clock=clock)
+        bucket.reserve(max_wait=5)
+
+        clock.now += 1
+        assert bucket.reserve(max_wait=5) == 0
+
+    def test_rejects_beyond_max_wait(self):
+        """Test that an over-long wait raises without reserving."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=1, clock=clock)
+        bucket.reserve(max_wait=5)
+
+        with pytest.raises(ValueError):
+            bucket.reserve(max_wait=0.5)
+        assert bucket.reserve(max_wait=5) == pytest.approx(1.0)
+
+    def test_zero_rate_is_unlimited(self):
+        """Test that rate 0 disables limiting."""
+        bucket = TokenBucket(rate=0, burst=0)
+        assert all(bucket.reserve(max_wait=0) == 0 for _ in range(100))
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker state transitions."""
+
+    def test_opens_on_failure_rate(self):
+        """Test that the circuit opens once enough calls fail."""
+        cb = make_breaker(FakeClock(), min_calls=4, failure_rate=0.5)
+        for failed in (False, True, False):
+            cb.before_call()
+            cb.record(failed)
+        assert cb.state == breaker.CLOSED
+
+        cb.before_call()
+        cb.record(True)
+        assert cb.state == breaker.OPEN
+
+        with pytest.raises(UpstreamUnavailableError, match="circuit open"):
+            cb.before_call()
+        assert cb.stats()["rejected"] == 1
+
+    def test_half_open_probe_closes(self):
+        """Test that one successful probe after open_seconds closes the circuit."""
+        clock = FakeClock()
+        cb = make_breaker(clock, min_calls=1, open_seconds=30)
+        cb.before_call()
+        cb.record(True)
+        assert cb.state == breaker.OPEN
+
+        clock.now += 31
+        cb.before_call()
+        assert cb.state == breaker.HALF_OPEN
+        with pytest.raises(UpstreamUnavailableError, match="probe in flight"):
+            cb.before_call()
+
+        cb.record(False)
+        assert cb.state == breaker.CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        """Test that a failed probe reopens the circuit."""
+        clock = FakeClock()
+        cb = make_breaker(clock, min_calls=1, open_seconds=30)
+        cb.before_call()
+        cb.record(True)
+
+        clock.now += 31
+        cb.before_call()
+        cb.record(True)
+
+        assert cb.state == breaker.OPEN
+        assert cb.stats()["retry_in_s"] == pytest.approx(30)
+
+    def test_retry_after_opens_immediately(self):
+        """Test that a 429 Retry-After opens the circuit for that long."""
+        cb = make_breaker(FakeClock())
+        cb.before_call()
+        cb.record(True, retry_after=7)
+
+        assert cb.state == breaker.OPEN
+        assert cb.stats()["retry_in_s"] == pytest.approx(7)
+
+    def test_transitions_are_counted(self):
+        """Test that state changes show up in metrics."""
+        clock = FakeClock()
+        cb = make_breaker(clock, min_calls=1)
+        cb.before_call()
+        cb.record(True)
+        clock.now += 60
+        cb.before_call()
+        cb.record(False)
+
+        states = {
+            entry["labels"]["state"]: entry["value"]
+            for entry in metrics.get_metrics()["counters"]["shutter_breaker_transitions_total"]
+        }
+        assert states == {"open": 1, "half_open": 1, "closed": 1}
+
+
+class TestHotReload:
+    """Test suite for breakers picking up config edits."""
+
+    def test_settings_change_keeps_state(self):
+        """Test that edited [breaker] settings apply to an existing breaker."""
+        cb = breaker.get_breaker("jina")
+        cb.before_call()
+        cb.record(True)
+        assert cb.open_seconds == 30
+
+        config.CONFIG_PATH.write_text(
+            "[breaker]\nopen_seconds = 5\n\n[breaker.rate_limits]\njina = 1\n"
+        )
+
+        assert breaker.get_breaker("jina") is cb
+        assert cb.open_seconds == 5
+        assert cb.bucket.rate == 1
+        assert cb.stats()["calls"] == 1
+
+
+class TestClassification:
+    """Test suite for deciding which errors count against an upstream."""
+
+    def test_server_errors_and_throttling_count(self):
+        """Test that 5xx, 429 and transport errors are failures."""
+        assert breaker.is_failure(status_error(503))
+        assert breaker.is_failure(status_error(429))
+        assert breaker.is_failure(httpx.ConnectTimeout("timed out"))
+
+    def test_client_errors_do_not_count(self):
+        """Test that other 4xx responses are not the upstream's fault."""
+        assert not breaker.is_failure(status_error(404))
+        assert not breaker.is_failure(ValueError("bad json"))
+
+    def test_retry_after_parsing(self):
+        """Test Retry-After extraction from 429 responses."""
+        assert breaker.retry_after_seconds(status_error(429, {"Retry-After": "12"})) == 12
+        too_long = status_error(429, {"Retry-After": "99999"})
+        assert breaker.retry_after_seconds(too_long) == breaker.MAX_RETRY_AFTER
+        assert breaker.retry_after_seconds(status_error(429)) is None
+        assert breaker.retry_after_seconds(status_error(503, {"Retry-After": "5"})) is None
+
+
+class TestFetchIntegration:
+    """Test suite for breaker state feeding fetch_url."""
+
+    @pytest.fixture
+    def jina_down(self, monkeypatch):
+        """Route Jina to a 503 and basic fetches to a working page."""
+        calls = {"jina": 0}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls["jina"] += 1
+            return httpx.Response(503)
+
+        @asynccontextmanager
+        async def mock_client(upstream):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                yield client
+
+        async def basic(url, timeout=30000, etag=None, last_modified=None):
+            return ("Fetched page content. " * 10, None, None)
+
+        monkeypatch.setattr(fetch, "upstream_client", mock_client)
+        monkeypatch.setattr(fetch, "fetch_basic_conditional", basic)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_jina(self, jina_down):
+        """Test that Jina is skipped without a request once its circuit opens."""
+        config.CONFIG_PATH.write_text("[breaker]\nmin_calls = 3\n")
+
+        for _ in range(5):
+            await fetch.fetch_url("https://example.com")
+
+        assert jina_down["jina"] == 3
+        assert breaker.get_breaker_stats()["jina"]["state"] == breaker.OPEN
+
+        stats = fetch.get_fetch_stats()
+        assert stats["jina"]["attempts"] == 3
+        assert stats["basic"]["wins"] == 5
+
+    @pytest.mark.asyncio
+    async def test_guard_rejects_when_open(self):
+        """Test that guard() raises before running the call."""
+        config.CONFIG_PATH.write_text("[breaker]\nmin_calls = 1\n")
+        with pytest.raises(httpx.ConnectError):
+            async with breaker.guard("tavily"):
+                raise httpx.ConnectError("refused")
+
+        ran = False
+        with pytest.raises(UpstreamUnavailableError):
+            async with breaker.guard("tavily"):
+                ran = True
+        assert not ran
+
+    @pytest.mark.asyncio
+    async def test_paused_time_is_not_slow(self):
+        """Test that only unpaused time counts toward slow_call_ms."""
+        config.CONFIG_PATH.write_text("[breaker]\nslow_call_ms = 20\n")
+
+        async with breaker.guard("openrouter") as timer:
+            with timer.paused():
+                await asyncio.sleep(0.05)
+        assert breaker.get_breaker_stats()["openrouter"]["failure_rate"] == 0.0
+
+        async with breaker.guard("openrouter"):
+            await asyncio.sleep(0.05)
+        stats = breaker.get_breaker_stats()["openrouter"]
+        assert stats["calls"] == 2
+        assert stats["failure_rate"] == 0.5
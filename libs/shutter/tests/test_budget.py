@@ -0,0 +1,138 @@
+"""
+Tests for token budgeting and relevance-ranked chunk selection.
+"""
+
+from grove_shutter import budget
+
+
+FILLER = "Unrelated navigation text about site menus and footers. " * 20
+
+
+def make_page(*paragraphs: str) -> str:
+    return "\n\n".join(paragraphs)
+
+
+class TestEstimateTokens:
+    """Test suite for estimate_tokens()."""
+
+    def test_short_words_are_one_token(self):
+        """Test that short words and punctuation count individually."""
+        assert budget.estimate_tokens("the cat sat.") == 4
+
+    def test_long_words_and_numbers_split(self):
+        """Test that long words and digit runs count as several pieces."""
+        assert budget.estimate_tokens("internationalization") == 4
+        assert budget.estimate_tokens("1234567") == 3
+
+    def test_close_to_chars_over_four_for_prose(self):
+        """Test that English prose lands near the usual ~4 chars/token."""
+        text = "The quick brown fox jumps over the lazy dog near the riverbank. " * 50
+        ratio = len(text) / budget.estimate_tokens(text)
+        assert 3.0 < ratio < 6.0
+
+    def test_empty(self):
+        """Test that empty text has zero tokens."""
+        assert budget.estimate_tokens("") == 0
+
+
+class TestSplitChunks:
+    """Test suite for split_chunks()."""
+
+    def test_merges_short_paragraphs(self):
+        """Test that short paragraphs are packed into one chunk."""
+        chunks = budget.split_chunks(make_page("one", "two", "three"), chunk_tokens=50)
+        assert chunks == ["one\n\ntwo\n\nthree"]
+
+    def test_splits_long_paragraph(self):
+        """Test that an oversized paragraph is split on whitespace."""
+        chunks = budget.split_chunks("word " * 100, chunk_tokens=30)
+        assert len(chunks) >= 3
+        assert all(budget.estimate_tokens(c) <= 30 for c in chunks)
+
+
+    def test_splits_text_without_whitespace(self):
+        """Test that a run with no spaces is cut at token boundaries, losing nothing."""
+        content = "abcdefghij" * 500
+        chunks = budget.split_chunks(content, chunk_tokens=100)
+        assert len(chunks) > 1
+        assert all(budget.estimate_tokens(c) <= 100 for c in chunks)
+        assert "".join(chunks) == content
+
+
+class TestBm25:
+    """Test suite for bm25_scores()."""
+
+    def test_matching_chunk_scores_highest(self):
+        """Test that the chunk containing query terms ranks first."""
+        chunks = ["pricing plans start at ten dollars", "about our team", "contact form"]
+        scores = budget.bm25_scores(chunks, "What are the pricing plans?")
+        assert scores[0] > 0
+        assert scores[1] == scores[2] == 0
+
+    def test_empty_query(self):
+        """Test that an empty query scores everything zero."""
+        assert budget.bm25_scores(["a", "b"], "") == [0.0, 0.0]
+
+
+class TestSelectContent:
+    """Test suite for select_content()."""
+
+    def test_within_budget_unchanged(self):
+        """Test that short content is returned as-is."""
+        assert budget.select_content("short page", "query", budget=100) == "short page"
+
+    def test_keeps_lead_and_relevant_chunks_in_order(self):
+        """Test that the lead and the relevant chunk survive, in page order."""
+        page = make_page(
+            "Acme Widgets Homepage",
+            FILLER,
+            "Pricing: the Pro plan costs 49 dollars per month.",
+            FILLER,
+        )
+        selected = budget.select_content(page, "pricing pro plan", budget=60, chunk_tokens=40)
+
+        assert selected.startswith("Acme Widgets Homepage")
+        assert "Pro plan costs 49 dollars" in selected
+        assert budget.GAP_MARKER in selected
+        assert selected.index("Acme") < selected.index("Pricing")
+        assert budget.estimate_tokens(selected) < budget.estimate_tokens(page)
+
+
+    def test_single_long_paragraph_keeps_lead(self):
+        """Test that a page with no paragraph or word breaks isn't reduced to a gap marker."""
+        page = "x" * 20000
+        selected = budget.select_content(page, "anything", budget=300, chunk_tokens=400)
+
+        assert selected.startswith("xxxxxx")
+        assert selected.endswith(budget.GAP_MARKER)
+        assert budget.estimate_tokens(selected) <= 300 + budget.estimate_tokens(budget.GAP_MARKER)
+
+    def test_oversized_lead_truncated(self):
+        """Test that a lead chunk larger than the budget is cut, not skipped."""
+        page = make_page("Lead " * 200, "Pricing: the Pro plan costs 49 dollars.")
+        selected = budget.select_content(page, "pricing", budget=50, chunk_tokens=400)
+
+        assert selected.startswith("Lead Lead")
+        assert selected.count(budget.GAP_MARKER) == 1
+
+
+class TestGroupChunks:
+    """Test suite for group_chunks()."""
+
+    def test_only_relevant_windows_returned(self):
+        """Test that windows without query terms are dropped."""
+        page = make_page(FILLER, "Pricing: 49 dollars.", FILLER, "More pricing details.", FILLER)
+        windows = budget.group_chunks(
+            page, "pricing", window_tokens=60, max_windows=5, chunk_tokens=60
+        )
+
+        assert windows
+        assert all("pricing" in w.lower() for w in windows)
+
+    def test_max_windows_respected(self):
+        """Test that at most max_windows windows are returned."""
+        page = make_page(*(f"pricing section {i} " + "x " * 50 for i in range(10)))
+        windows = budget.group_chunks(
+            page, "pricing", window_tokens=60, max_windows=3, chunk_tokens=60
+        )
+        assert len(windows) == 3
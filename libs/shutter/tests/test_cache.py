@@ -0,0 +1,242 @@
+"""
+Tests for the SQLite fetch and result caches.
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock
+
+from grove_shutter import cache
+from grove_shutter import config
+from grove_shutter import fetch
+
+
+PAGE = "Cached page content. " * 10  # Long enough to pass the 100-char sanity check
+
+
+@pytest.fixture
+def temp_cache(tmp_path, monkeypatch):
+    """Set up a temporary cache database for testing."""
+    monkeypatch.setattr(cache, "CACHE_PATH", tmp_path / "cache.db")
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+    monkeypatch.delenv("SHUTTER_NO_CACHE", raising=False)
+
+    cache.init_cache()
+
+    return tmp_path
+
+
+class TestNormalizeUrl:
+    """Test suite for normalize_url()."""
+
+    def test_lowercases_scheme_and_host(self):
+        """Test that scheme and host are lowercased but path is kept."""
+        assert cache.normalize_url("HTTPS://Example.COM/Path") == "https://example.com/Path"
+
+    def test_drops_fragment_and_default_port(self):
+        """Test that fragments and default ports are removed."""
+        assert cache.normalize_url("https://example.com:443/a#top") == "https://example.com/a"
+        assert cache.normalize_url("http://example.com:8080/a") == "http://example.com:8080/a"
+
+    def test_malformed_url_kept_as_is(self):
+        """Test that an unparseable port or host doesn't raise."""
+        assert cache.normalize_url(" https://example.com:99999/a ") == "https://example.com:99999/a"
+        assert cache.normalize_url("https://example.com:http/a") == "https://example.com:http/a"
+        assert cache.normalize_url("https://[::1/a") == "https://[::1/a"
+
+    def test_empty_path_becomes_slash(self):
+        """Test that an empty path normalizes to '/'."""
+        assert cache.normalize_url("https://example.com") == "https://example.com/"
+
+    def test_strips_tracking_params_and_sorts_query(self):
+        """Test that campaign tags are dropped and parameter order ignored."""
+        assert cache.normalize_url(
+            "https://example.com/a?b=2&utm_source=news&a=1&fbclid=xyz&UTM_Medium=mail"
+        ) == "https://example.com/a?a=1&b=2"
+        assert cache.normalize_url("https://example.com/a?utm_source=x") == "https://example.com/a"
+
+    def test_http_www_and_https_share_key(self):
+        """Test that scheme and www. variants map to one key."""
+        expected = "https://example.com/a"
+        assert cache.normalize_url("http://www.example.com/a") == expected
+        assert cache.normalize_url("https://WWW.example.com:443/a") == expected
+
+
+class TestFetchCacheStorage:
+    """Test suite for store/get/evict."""
+
+    def test_store_and_get(self, temp_cache):
+        """Test round-tripping an entry with its backend and validators."""
+        cache.store_fetch("https://example.com/a", PAGE, "basic", etag='"abc"')
+
+        entry = cache.get_cached_fetch("https://EXAMPLE.com/a#frag")
+        assert entry is not None
+        assert entry.content == PAGE
+        assert entry.backend == "basic"
+        assert entry.etag == '"abc"'
+
+    def test_get_missing_returns_none(self, temp_cache):
+        """Test that uncached URLs return None."""
+        assert cache.get_cached_fetch("https://missing.com") is None
+
+    def test_lru_eviction(self, temp_cache):
+        """Test that least-recently-used entries are evicted first."""
+        cache.store_fetch("https://a.com", "a" * 100, "jina")
+        cache.store_fetch("https://b.com", "b" * 100, "jina")
+        time.sleep(0.01)
+        cache.get_cached_fetch("https://a.com")  # a is now more recent than b
+
+        evicted = cache.evict_fetch_cache(max_bytes=150)
+
+        assert evicted == 1
+        assert cache.get_cached_fetch("https://a.com") is not None
+        assert cache.get_cached_fetch("https://b.com") is None
+        assert cache.fetch_cache_size() == 100
+
+    def test_store_evicts_only_over_budget(self, temp_cache, monkeypatch):
+        """Test that store_fetch tracks size itself and evicts once over budget."""
+        evictions = []
+        evict = cache.evict_fetch_cache
+        monkeypatch.setattr(
+            cache, "evict_fetch_cache", lambda max_bytes: evictions.append(1) or evict(max_bytes)
+        )
+
+        cache.store_fetch("https://a.com", "a" * 100, "jina", max_bytes=250)
+        cache.store_fetch("https://a.com", "a" * 120, "jina", max_bytes=250)  # replaces
+        cache.store_fetch("https://b.com", "b" * 100, "jina", max_bytes=250)
+        assert evictions == []
+
+        cache.store_fetch("https://c.com", "c" * 100, "jina", max_bytes=250)
+        assert evictions == [1]
+        assert cache.get_cached_fetch("https://a.com") is None
+        assert cache.fetch_cache_size() == 200
+
+    def test_reopens_when_path_changes(self, temp_cache, monkeypatch):
+        """Test that pointing CACHE_PATH elsewhere switches databases."""
+        cache.store_fetch("https://a.com", PAGE, "jina")
+        monkeypatch.setattr(cache, "CACHE_PATH", temp_cache / "other.db")
+
+        assert cache.get_cached_fetch("https://a.com") is None
+        assert (temp_cache / "other.db").exists()
+
+    def test_clear(self, temp_cache):
+        """Test that clear_fetch_cache removes everything."""
+        cache.store_fetch("https://a.com", PAGE, "jina")
+        cache.clear_fetch_cache()
+        assert cache.fetch_cache_size() == 0
+
+
+class TestFetchUrlCaching:
+    """Test suite for fetch_url() cache integration."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_fetch_chain(self, temp_cache, monkeypatch):
+        """Test that a fresh cached entry is returned without fetching."""
+        mock_jina = AsyncMock(return_value=PAGE)
+        monkeypatch.setattr(fetch, "fetch_with_jina", mock_jina)
+
+        first = await fetch.fetch_url("https://example.com/page")
+        second = await fetch.fetch_url("https://example.com/page")
+
+        assert first == second == PAGE
+        mock_jina.assert_called_once()
+        assert cache.get_cached_fetch("https://example.com/page").backend == "jina"
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(self, temp_cache, monkeypatch):
+        """Test that use_cache=False always fetches."""
+        mock_jina = AsyncMock(return_value=PAGE)
+        monkeypatch.setattr(fetch, "fetch_with_jina", mock_jina)
+
+        await fetch.fetch_url("https://example.com/page", use_cache=False)
+        await fetch.fetch_url("https://example.com/page", use_cache=False)
+
+        assert mock_jina.call_count == 2
+        assert cache.get_cached_fetch("https://example.com/page") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_basic_entry_revalidated(self, temp_cache, monkeypatch):
+        """Test that a 304 on a stale basic entry reuses cached content."""
+        (temp_cache / "config.toml").write_text("[cache]\nfetch_ttl = 0\n")
+        cache.store_fetch("https://example.com/page", PAGE, "basic", etag='"v1"')
+
+        mock_conditional = AsyncMock(return_value=(None, '"v1"', None))
+        mock_jina = AsyncMock(return_value="should not be used")
+        monkeypatch.setattr(fetch, "fetch_basic_conditional", mock_conditional)
+        monkeypatch.setattr(fetch, "fetch_with_jina", mock_jina)
+
+        result = await fetch.fetch_url("https://example.com/page")
+
+        assert result == PAGE
+        mock_jina.assert_not_called()
+        assert mock_conditional.call_args.kwargs["etag"] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_stale_jina_entry_refetched(self, temp_cache, monkeypatch):
+        """Test that stale non-basic entries go through the full chain."""
+        (temp_cache / "config.toml").write_text("[cache]\nfetch_ttl = 0\n")
+        cache.store_fetch("https://example.com/page", "old " * 50, "jina")
+
+        mock_jina = AsyncMock(return_value=PAGE)
+        monkeypatch.setattr(fetch, "fetch_with_jina", mock_jina)
+
+        result = await fetch.fetch_url("https://example.com/page")
+
+        assert result == PAGE
+        assert cache.get_cached_fetch("https://example.com/page").content == PAGE
+
+
+class TestResultCacheStorage:
+    """Test suite for canary verdict and extraction storage."""
+
+    def test_extraction_key_normalizes_query(self):
+        """Test that query case and whitespace don't change the key."""
+        h = cache.hash_content("page")
+        assert cache.extraction_key(h, "What  is it?", "fast", 500) == \
+            cache.extraction_key(h, "what is it?", "FAST", 500)
+
+    def test_extraction_key_varies_by_tokens_and_content(self):
+        """Test that max_tokens and content hash are part of the key."""
+        h1 = cache.hash_content("page one")
+        h2 = cache.hash_content("page two")
+        key = cache.extraction_key(h1, "q", "fast", 500)
+        assert key != cache.extraction_key(h1, "q", "fast", 800)
+        assert key != cache.extraction_key(h2, "q", "fast", 500)
+
+    def test_clean_verdict_roundtrip(self, temp_cache):
+        """Test that stored clean verdicts are found within the TTL."""
+        cache.reset_cache_stats()
+        h = cache.hash_content("vetted page")
+
+        assert cache.is_content_vetted(h, ttl=60) is False
+        cache.store_clean_verdict(h)
+        assert cache.is_content_vetted(h, ttl=60) is True
+        assert cache.is_content_vetted(h, ttl=0) is False
+
+        stats = cache.get_cache_stats()
+        assert stats["canary_hits"] == 1
+        assert stats["canary_misses"] == 2
+
+    def test_extraction_roundtrip(self, temp_cache):
+        """Test storing and retrieving an extraction result."""
+        key = cache.extraction_key(cache.hash_content("page"), "q", "fast", 500)
+        cache.store_extraction(key, "answer", 100, 5, "openai/gpt-oss-120b")
+
+        entry = cache.get_cached_extraction(key, ttl=60)
+        assert entry is not None
+        assert entry.extracted == "answer"
+        assert entry.tokens_input == 100
+        assert cache.get_cached_extraction(key, ttl=0) is None
+
+    def test_clear_result_cache(self, temp_cache):
+        """Test that clear_result_cache removes verdicts and extractions."""
+        h = cache.hash_content("page")
+        cache.store_clean_verdict(h)
+        cache.store_extraction("k", "answer", 1, 1, "m")
+
+        cache.clear_result_cache()
+
+        assert cache.is_content_vetted(h, ttl=60) is False
+        assert cache.get_cached_extraction("k", ttl=60) is None
@@ -158,6 +158,93 @@ class TestGetApiKey:
         assert config.get_api_key("openrouter") == "sk-test"
 
 
+class TestConfigCache:
+    """Test suite for the mtime-invalidated config cache."""
+
+    @pytest.fixture
+    def parses(self, monkeypatch):
+        """Record every TOML parse."""
+        parses = []
+        original = config._parse_toml
+
+        def counting_parse(p):
+            parses.append(p)
+            return original(p)
+
+        monkeypatch.setattr(config, "_parse_toml", counting_parse)
+        return parses
+
+    @pytest.fixture
+    def config_path(self, tmp_path, monkeypatch):
+        """Point config paths to a temp dir."""
+        path = tmp_path / "config.toml"
+        monkeypatch.setattr(config, "CONFIG_PATH", path)
+        monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
+        return path
+
+    @staticmethod
+    def rewrite(path: Path, text: str) -> None:
+        """Write text and move the mtime forward so the change is visible."""
+        path.write_text(text)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged_file_parsed_once(self, config_path, parses):
+        """Test that repeated lookups reuse the parsed file."""
+        config_path.write_text("[canary]\nblock_threshold = 0.7\n")
+
+        for _ in range(5):
+            assert config.get_canary_settings()["block_threshold"] == 0.7
+            config.get_fetch_settings()
+
+        assert len(parses) == 1
+
+    def test_changed_file_reloaded(self, config_path, parses):
+        """Test that edits are picked up without a restart."""
+        config_path.write_text("[canary]\nblock_threshold = 0.7\n")
+        assert config.get_canary_settings()["block_threshold"] == 0.7
+        version = config.get_config_version()
+
+        self.rewrite(config_path, "[canary]\nblock_threshold = 0.9\n")
+
+        assert config.get_canary_settings()["block_threshold"] == 0.9
+        assert config.get_config_version() != version
+        assert len(parses) == 2
+
+    def test_created_and_deleted_file(self, config_path):
+        """Test that creating or removing the file is noticed."""
+        assert config.get_canary_settings()["block_threshold"] == 0.6
+
+        config_path.write_text("[canary]\nblock_threshold = 0.8\n")
+        assert config.get_canary_settings()["block_threshold"] == 0.8
+
+        config_path.unlink()
+        assert config.get_canary_settings()["block_threshold"] == 0.6
+
+    def test_settings_are_fresh_copies(self, config_path):
+        """Test that mutating returned settings doesn't leak into the cache."""
+        config_path.write_text('[extraction]\nspeculative_tiers = ["fast"]\n')
+
+        config.get_extraction_settings()["speculative_tiers"].append("code")
+
+        assert config.get_extraction_settings()["speculative_tiers"] == ["fast"]
+
+    def test_chunk_tokens_clamped(self, config_path):
+        """Test that a zero chunk size can't reach the chunker."""
+        config_path.write_text("[extraction]\nchunk_tokens = 0\n")
+
+        assert config.get_extraction_settings()["chunk_tokens"] == 1
+
+    def test_clear_config_cache(self, config_path, parses):
+        """Test that clear_config_cache() forces a reparse."""
+        config_path.write_text("[canary]\nblock_threshold = 0.7\n")
+        config.get_canary_settings()
+        config.clear_config_cache()
+        config.get_canary_settings()
+
+        assert len(parses) == 2
+
+
 class TestIsDryRun:
     """Test suite for is_dry_run() mode detection."""
 
@@ -2,15 +2,22 @@
 Tests for core shutter() function.
 """
 
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from grove_shutter import cache
 from grove_shutter import core
 from grove_shutter import config
 from grove_shutter import database
+from grove_shutter.canary import LLM_CLEAN, LLM_NOT_RUN, CanaryVerdict
 from grove_shutter.models import ShutterResponse
 
 
+# Verdict of a canary_verdict() whose LLM ran and found nothing
+CLEAN = CanaryVerdict(llm=LLM_CLEAN)
+
+
 @pytest.fixture
 def mock_env(tmp_path, monkeypatch):
     """Set up mock environment for testing."""
@@ -19,6 +26,7 @@ def mock_env(tmp_path, monkeypatch):
 
     # Point database to temp directory
     monkeypatch.setattr(database, "DB_PATH", tmp_path / "offenders.db")
+    monkeypatch.setattr(cache, "CACHE_PATH", tmp_path / "cache.db")
     monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
     monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
     monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
@@ -206,6 +214,17 @@ class TestFetchErrors:
         assert result.prompt_injection.type == "fetch_error"
         assert "Connection timeout" in result.prompt_injection.snippet
 
+    @pytest.mark.asyncio
+    async def test_bad_fetch_strategy_is_config_error(self, mock_env):
+        """Test that an unknown [fetch] strategy is reported, not raised."""
+        (mock_env / "config.toml").write_text('[fetch]\nstrategy = "parallel"\n')
+
+        result = await core.shutter(url="https://example.com", query="Test")
+
+        assert result.extracted is None
+        assert result.prompt_injection.type == "config_error"
+        assert "parallel" in result.prompt_injection.snippet
+
     @pytest.mark.asyncio
     async def test_empty_content_handled(self, mock_env, monkeypatch):
         """Test that empty content is handled."""
@@ -297,3 +316,560 @@ class TestTokenCounting:
 
         assert result.tokens_input == 0
         assert result.tokens_output == 0
+
+
+class TestShutterMany:
+    """Test suite for batch shutter_many()."""
+
+    @pytest.mark.asyncio
+    async def test_returns_one_response_per_request(self, mock_env, monkeypatch):
+        """Test that every request yields exactly one response."""
+        from grove_shutter.models import ShutterRequest
+
+        mock_fetch = AsyncMock(return_value="Test content")
+        monkeypatch.setattr(core, "fetch_url", mock_fetch)
+
+        requests = [
+            ShutterRequest(url=f"https://site{i}.com/page", query="Test")
+            for i in range(5)
+        ]
+        results = [r async for r in core.shutter_many(requests, concurrency=2)]
+
+        assert len(results) == 5
+        assert {r.url for r in results} == {req.url for req in requests}
+        assert all(r.extracted is not None for r in results)
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self, mock_env, monkeypatch):
+        """Test that fast requests are yielded before slow ones."""
+        import asyncio
+        from grove_shutter.models import ShutterRequest
+
+        async def fake_fetch(url, timeout):
+            await asyncio.sleep(0.05 if "slow" in url else 0)
+            return "Test content"
+
+        monkeypatch.setattr(core, "fetch_url", fake_fetch)
+
+        requests = [
+            ShutterRequest(url="https://slow.com/page", query="Test"),
+            ShutterRequest(url="https://fast.com/page", query="Test"),
+        ]
+        results = [r async for r in core.shutter_many(requests, concurrency=2)]
+
+        assert [r.url for r in results] == ["https://fast.com/page", "https://slow.com/page"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_caps(self, mock_env, monkeypatch):
+        """Test global and per-domain concurrency limits."""
+        import asyncio
+        from grove_shutter.models import ShutterRequest
+
+        in_flight: dict[str, int] = {}
+        peak = {"total": 0, "same.com": 0}
+
+        async def fake_fetch(url, timeout):
+            domain = core.extract_domain(url)
+            in_flight[domain] = in_flight.get(domain, 0) + 1
+            peak["total"] = max(peak["total"], sum(in_flight.values()))
+            peak["same.com"] = max(peak["same.com"], in_flight.get("same.com", 0))
+            await asyncio.sleep(0.01)
+            in_flight[domain] -= 1
+            return "Test content"
+
+        monkeypatch.setattr(core, "fetch_url", fake_fetch)
+
+        requests = [ShutterRequest(url=f"https://same.com/{i}", query="Test") for i in range(6)]
+        requests += [ShutterRequest(url=f"https://other{i}.com/", query="Test") for i in range(6)]
+        results = [r async for r in core.shutter_many(requests, concurrency=4, per_domain=1)]
+
+        assert len(results) == 12
+        assert peak["total"] <= 4
+        assert peak["same.com"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency_rejected(self, mock_env):
+        """Test that non-positive limits raise ValueError."""
+        with pytest.raises(ValueError):
+            async for _ in core.shutter_many([], concurrency=0):
+                pass
+
+
+class TestResultCache:
+    """Test suite for canary verdict and extraction caching in shutter()."""
+
+    @pytest.fixture
+    def live_env(self, mock_env, monkeypatch):
+        """Disable dry-run and stub the LLM calls."""
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.delenv("SHUTTER_NO_CACHE", raising=False)
+        cache.reset_cache_stats()
+
+        mock_fetch = AsyncMock(return_value="A normal page about our pricing plans.")
+        mock_canary = AsyncMock(return_value=CLEAN)
+        mock_extract = AsyncMock(return_value=("Plans: $10/mo", 120, 8, "openai/gpt-oss-120b"))
+        monkeypatch.setattr(core, "fetch_url", mock_fetch)
+        monkeypatch.setattr(core, "canary_verdict", mock_canary)
+        monkeypatch.setattr(core, "extract_content", mock_extract)
+
+        return mock_canary, mock_extract
+
+    @pytest.mark.asyncio
+    async def test_identical_call_served_from_cache(self, live_env):
+        """Test that a repeated call skips both canary and extraction."""
+        mock_canary, mock_extract = live_env
+
+        first = await core.shutter(url="https://example.com", query="What is the pricing?")
+        second = await core.shutter(url="https://example.com", query="  what is the PRICING? ")
+
+        assert first.cached is False
+        assert second.cached is True
+        assert second.extracted == first.extracted
+        mock_canary.assert_called_once()
+        mock_extract.assert_called_once()
+        assert cache.get_cache_stats()["extraction_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_query_skips_canary_on_vetted_content(self, live_env):
+        """Test that vetted content skips the canary for a different query."""
+        mock_canary, mock_extract = live_env
+
+        await core.shutter(url="https://example.com", query="What is the pricing?")
+        result = await core.shutter(url="https://example.com", query="Who founded it?")
+
+        assert result.cached is False
+        mock_canary.assert_called_once()
+        assert mock_extract.call_count == 2
+        assert cache.get_cache_stats()["canary_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unchecked_verdict_not_cached(self, live_env, monkeypatch):
+        """Test that a page the canary LLM couldn't check is checked again next time."""
+        from grove_shutter import canary
+
+        monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+        monkeypatch.setattr(canary, "get_api_key", lambda provider: None)
+        monkeypatch.setattr(core, "canary_verdict", canary.canary_verdict)
+
+        await core.shutter(url="https://example.com", query="What is the pricing?")
+
+        content_hash = cache.hash_content("A normal page about our pricing plans.")
+        assert not cache.is_content_vetted(content_hash, 3600)
+
+        await core.shutter(url="https://example.com", query="Who founded it?")
+        assert cache.get_cache_stats()["canary_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_persists_no_verdict(self, live_env, mock_env, monkeypatch):
+        """Test that a canary skipped by an open circuit is neither cached nor trusted."""
+        from grove_shutter import breaker, canary
+
+        monkeypatch.setenv("OPENROUTER_API_KEY", "sk-test")
+        monkeypatch.setattr(core, "canary_verdict", canary.canary_verdict)
+        (mock_env / "config.toml").write_text("[breaker]\nmin_calls = 1\n")
+        breaker.reset_breakers()
+        with pytest.raises(httpx.ConnectError):
+            async with breaker.guard("openrouter"):
+                raise httpx.ConnectError("refused")
+        assert breaker.get_breaker_stats()["openrouter"]["state"] == breaker.OPEN
+
+        try:
+            result = await core.shutter(url="https://example.com", query="What is the pricing?")
+        finally:
+            breaker.reset_breakers()
+
+        assert result.extracted == "Plans: $10/mo"
+        content_hash = cache.hash_content("A normal page about our pricing plans.")
+        assert not cache.is_content_vetted(content_hash, 3600)
+        assert database.get_reputation("example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_different_tier_not_shared(self, live_env):
+        """Test that extraction results are keyed on model tier."""
+        _, mock_extract = live_env
+
+        await core.shutter(url="https://example.com", query="Pricing?", model="fast")
+        await core.shutter(url="https://example.com", query="Pricing?", model="accurate")
+
+        assert mock_extract.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_cache_env_disables(self, live_env, monkeypatch):
+        """Test that SHUTTER_NO_CACHE bypasses the result cache."""
+        mock_canary, mock_extract = live_env
+        monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+
+        await core.shutter(url="https://example.com", query="Pricing?")
+        await core.shutter(url="https://example.com", query="Pricing?")
+
+        assert mock_canary.call_count == 2
+        assert mock_extract.call_count == 2
+
+
+class TestShutterStream:
+    """Test suite for shutter_stream()."""
+
+    @pytest.mark.asyncio
+    async def test_yields_deltas_then_response(self, mock_env, monkeypatch):
+        """Test that text deltas arrive before the final response."""
+        monkeypatch.setattr(core, "fetch_url", AsyncMock(return_value="Test page content"))
+
+        items = [item async for item in core.shutter_stream("https://example.com", "Pricing?")]
+
+        deltas, final = items[:-1], items[-1]
+        assert deltas and all(isinstance(d, str) for d in deltas)
+        assert isinstance(final, ShutterResponse)
+        assert "".join(deltas).strip() == final.extracted
+        assert final.tokens_output == 50
+        assert final.ttft_ms is not None
+        assert final.fetch_ms is not None
+        assert final.latency_ms >= final.ttft_ms
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_yields_only_response(self, mock_env, monkeypatch):
+        """Test that early exits yield a single response and no text."""
+        from grove_shutter.fetch import FetchError
+        monkeypatch.setattr(
+            core, "fetch_url", AsyncMock(side_effect=FetchError("https://example.com", "HTTP 500"))
+        )
+
+        items = [item async for item in core.shutter_stream("https://example.com", "Pricing?")]
+
+        assert len(items) == 1
+        assert items[0].prompt_injection.type == "fetch_error"
+        assert items[0].ttft_ms is None
+
+    @pytest.mark.asyncio
+    async def test_streamed_result_is_cached(self, mock_env, monkeypatch):
+        """Test that a streamed extraction populates the result cache."""
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.delenv("SHUTTER_NO_CACHE", raising=False)
+        monkeypatch.setattr(core, "fetch_url", AsyncMock(return_value="A page about pricing."))
+        monkeypatch.setattr(core, "canary_verdict", AsyncMock(return_value=CLEAN))
+
+        async def fake_stream(**kwargs):
+            yield "Plans: "
+            yield "$10/mo"
+            yield ("Plans: $10/mo", 120, 8, "openai/gpt-oss-120b")
+
+        monkeypatch.setattr(core, "extract_content_stream", fake_stream)
+
+        items = [item async for item in core.shutter_stream("https://example.com", "Pricing?")]
+        again = await core.shutter("https://example.com", "Pricing?")
+
+        assert items[:2] == ["Plans: ", "$10/mo"]
+        assert items[-1].tokens_input == 120
+        assert again.cached is True
+        assert again.extracted == "Plans: $10/mo"
+
+    @pytest.mark.asyncio
+    async def test_stream_without_result_is_an_error(self, mock_env, monkeypatch):
+        """Test that a stream ending without its final tuple reports an error."""
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+        monkeypatch.setattr(core, "fetch_url", AsyncMock(return_value="A page about pricing."))
+        monkeypatch.setattr(core, "canary_verdict", AsyncMock(return_value=CLEAN))
+
+        async def fake_stream(**kwargs):
+            yield "Plans: "
+
+        monkeypatch.setattr(core, "extract_content_stream", fake_stream)
+
+        items = [item async for item in core.shutter_stream("https://example.com", "Pricing?")]
+
+        assert items[0] == "Plans: "
+        assert items[-1].prompt_injection.type == "extraction_error"
+
+
+class TestCoalescing:
+    """Test suite for single-flight coalescing in shutter()."""
+
+    @pytest.fixture
+    def slow_env(self, mock_env, monkeypatch):
+        """Stub slow fetch/canary/extraction calls outside dry-run."""
+        import asyncio
+
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+
+        def slow(value):
+            async def side_effect(*args, **kwargs):
+                await asyncio.sleep(0.02)
+                return value
+            return side_effect
+
+        mock_fetch = AsyncMock(side_effect=slow("Page about pricing plans."))
+        mock_canary = AsyncMock(side_effect=slow(CLEAN))
+        mock_extract = AsyncMock(side_effect=slow(("$10/mo", 100, 5, "openai/gpt-oss-120b")))
+        monkeypatch.setattr(core, "fetch_url", mock_fetch)
+        monkeypatch.setattr(core, "canary_verdict", mock_canary)
+        monkeypatch.setattr(core, "extract_content", mock_extract)
+
+        from grove_shutter.singleflight import reset_coalescing_stats
+        reset_coalescing_stats()
+
+        return mock_fetch, mock_canary, mock_extract
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_share_everything(self, slow_env):
+        """Test that a burst of identical calls makes one of each upstream call."""
+        import asyncio
+        from grove_shutter.singleflight import get_coalescing_stats
+
+        mock_fetch, mock_canary, mock_extract = slow_env
+
+        results = await asyncio.gather(*(
+            core.shutter("https://Example.com/pricing#plans", "Pricing?") for _ in range(4)
+        ))
+
+        assert all(r.extracted == "$10/mo" for r in results)
+        assert mock_fetch.call_count == 1
+        assert mock_canary.call_count == 1
+        assert mock_extract.call_count == 1
+        assert get_coalescing_stats()["fetch"]["ratio"] == 4.0
+
+    @pytest.mark.asyncio
+    async def test_different_queries_share_fetch_only(self, slow_env):
+        """Test that different queries on one URL share the fetch, not the canary."""
+        import asyncio
+
+        mock_fetch, mock_canary, mock_extract = slow_env
+
+        await asyncio.gather(
+            core.shutter("https://example.com", "Pricing?"),
+            core.shutter("https://example.com", "Who founded it?"),
+            core.shutter("https://example.com", "Pricing?", model="accurate"),
+        )
+
+        assert mock_fetch.call_count == 1
+        assert mock_canary.call_count == 2  # The canary prompt depends on the query
+        assert mock_extract.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_shared_verdict_recorded_for_each_domain(self, slow_env):
+        """Test that mirrors sharing a canary verdict each record it."""
+        import asyncio
+
+        mock_fetch, mock_canary, mock_extract = slow_env
+
+        await asyncio.gather(
+            core.shutter("https://example.com/pricing", "Pricing?"),
+            core.shutter("https://example.com/pricing?ref=a", "Pricing?"),
+            core.shutter("https://mirror.example.net/pricing", "Pricing?"),
+        )
+
+        assert mock_canary.call_count == 1
+        assert database.get_reputation("example.com").clean_count == 1
+        assert database.get_reputation("mirror.example.net").clean_count == 1
+
+
+class TestSpeculativeExtraction:
+    """Test suite for speculative canary + extraction."""
+
+    @pytest.fixture
+    def spec_env(self, mock_env, monkeypatch):
+        """Enable speculation for the fast tier and stub slow LLM calls."""
+        import asyncio
+
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.delenv("SHUTTER_NO_CACHE", raising=False)
+        (mock_env / "config.toml").write_text('[extraction]\nspeculative_tiers = ["fast"]\n')
+        monkeypatch.setattr(
+            core, "fetch_url", AsyncMock(return_value="A page about pricing plans.")
+        )
+        core.reset_speculation_stats()
+
+        events = []
+
+        async def slow_extract(**kwargs):
+            events.append("extract_start")
+            await asyncio.sleep(0.05)
+            events.append("extract_end")
+            return ("$10/mo", 100, 5, "openai/gpt-oss-120b")
+
+        monkeypatch.setattr(core, "extract_content", slow_extract)
+        return events
+
+    def canary(self, monkeypatch, events, result, delay=0.05):
+        """Stub canary_verdict with a delayed verdict."""
+        import asyncio
+
+        async def slow_canary(content, query, heuristics=None):
+            events.append("canary_start")
+            await asyncio.sleep(delay)
+            events.append("canary_end")
+            return result
+
+        monkeypatch.setattr(core, "canary_verdict", slow_canary)
+
+    @pytest.mark.asyncio
+    async def test_clean_page_runs_in_parallel(self, spec_env, monkeypatch):
+        """Test that extraction starts before the canary finishes on a clean page."""
+        events = spec_env
+        self.canary(monkeypatch, events, CLEAN)
+
+        result = await core.shutter("https://example.com", "Pricing?")
+
+        assert result.extracted == "$10/mo"
+        assert events.index("extract_start") < events.index("canary_end")
+        assert core.get_speculation_stats()["used"] == 1
+
+        # Stored only after the clean verdict, so the next call is a cache hit
+        again = await core.shutter("https://example.com", "Pricing?")
+        assert again.cached is True
+
+    @pytest.mark.asyncio
+    async def test_cached_extraction_not_speculated(self, spec_env, monkeypatch):
+        """Test that a page whose extraction is cached doesn't start a new one."""
+        events = spec_env
+        # Unchecked verdicts aren't cached, so the canary runs on every call
+        self.canary(monkeypatch, events, CanaryVerdict(llm=LLM_NOT_RUN))
+
+        await core.shutter("https://example.com", "Pricing?")
+        again = await core.shutter("https://example.com", "Pricing?")
+
+        assert again.cached is True
+        assert events.count("canary_start") == 2
+        assert events.count("extract_start") == 1
+        assert core.get_speculation_stats()["launched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_blocked_page_discards_and_reports_cost(self, spec_env, monkeypatch):
+        """Test that a finished speculative extraction is discarded with its cost reported."""
+        from grove_shutter.models import PromptInjectionDetails
+
+        events = spec_env
+        injection = PromptInjectionDetails(
+            detected=True, type="instruction_override", snippet="...",
+            domain_flagged=True, confidence=0.9,
+        )
+        self.canary(monkeypatch, events, CanaryVerdict(injection), delay=0.1)
+
+        result = await core.shutter("https://example.com", "Pricing?")
+
+        assert result.extracted is None
+        assert result.prompt_injection.type == "instruction_override"
+        assert (result.tokens_input, result.tokens_output) == (100, 5)
+        stats = core.get_speculation_stats()
+        assert stats["discarded"] == 1
+        assert stats["wasted_tokens_input"] == 100
+        content_hash = cache.hash_content("A page about pricing plans.")
+        assert cache.get_cached_extraction(
+            cache.extraction_key(content_hash, "Pricing?", "fast", 500), ttl=60
+        ) is None
+
+    @pytest.mark.asyncio
+    async def test_blocked_page_cancels_inflight_extraction(self, spec_env, monkeypatch):
+        """Test that a still-running speculative extraction is cancelled."""
+        from grove_shutter.models import PromptInjectionDetails
+
+        events = spec_env
+        injection = PromptInjectionDetails(
+            detected=True, type="role_hijack", snippet="...", domain_flagged=False, confidence=0.8,
+        )
+        self.canary(monkeypatch, events, CanaryVerdict(injection), delay=0.01)
+
+        result = await core.shutter("https://example.com", "Pricing?")
+
+        assert "extract_end" not in events
+        assert result.tokens_output == 0
+        assert result.tokens_input > 0  # Estimated input of the abandoned request
+
+    @pytest.mark.asyncio
+    async def test_other_tiers_stay_sequential(self, spec_env, monkeypatch):
+        """Test that tiers not listed in speculative_tiers run after the canary."""
+        events = spec_env
+        self.canary(monkeypatch, events, CLEAN)
+
+        await core.shutter("https://example.com", "Pricing?", model="accurate")
+
+        assert events == ["canary_start", "canary_end", "extract_start", "extract_end"]
+        assert core.get_speculation_stats()["launched"] == 0
+
+
+class TestReputationFastPath:
+    """Test suite for skipping the canary LLM on trusted domains."""
+
+    @pytest.fixture
+    def live_env(self, mock_env, monkeypatch):
+        """Caching disabled so every call reaches the canary; LLM calls stubbed."""
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+        (mock_env / "config.toml").write_text(
+            "[reputation]\nenabled = true\nmin_clean_verdicts = 2\nmin_distinct_content = 2\n"
+        )
+        core.reset_reputation_stats()
+
+        pages = iter(f"Release notes for version {i}." for i in range(100))
+        monkeypatch.setattr(
+            core, "fetch_url", AsyncMock(side_effect=lambda url, timeout: next(pages))
+        )
+        mock_canary = AsyncMock(return_value=CLEAN)
+        monkeypatch.setattr(core, "canary_verdict", mock_canary)
+        monkeypatch.setattr(core, "extract_content", AsyncMock(return_value=("v1", 10, 2, "m")))
+        return mock_canary
+
+    @pytest.mark.asyncio
+    async def test_trusted_domain_skips_llm(self, live_env):
+        """Test that the canary stops running once the domain has clean history."""
+        mock_canary = live_env
+
+        for _ in range(4):
+            result = await core.shutter("https://docs.example.com/notes", "Changes?")
+            assert result.extracted == "v1"
+
+        assert mock_canary.call_count == 2
+        assert core.get_reputation_stats() == {"checks": 4, "skips": 2, "skip_rate": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_heuristic_signal_still_runs_llm(self, live_env, monkeypatch):
+        """Test that any heuristic signal on a trusted domain goes to the LLM."""
+        mock_canary = live_env
+        for _ in range(2):
+            await core.shutter("https://docs.example.com/notes", "Changes?")
+
+        monkeypatch.setattr(core, "canary_heuristics", lambda content: (0.1, None, None, ["weak"]))
+        await core.shutter("https://docs.example.com/notes", "Changes?")
+
+        assert mock_canary.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_config(self, live_env, mock_env):
+        """Test that [reputation] enabled = false always runs the LLM."""
+        mock_canary = live_env
+        (mock_env / "config.toml").write_text("[reputation]\nenabled = false\n")
+
+        for _ in range(4):
+            await core.shutter("https://docs.example.com/notes", "Changes?")
+
+        assert mock_canary.call_count == 4
+        assert core.get_reputation_stats()["checks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_off_by_default(self, live_env, mock_env):
+        """Test that the fast path needs an explicit opt-in."""
+        mock_canary = live_env
+        (mock_env / "config.toml").write_text("")
+
+        for _ in range(4):
+            await core.shutter("https://docs.example.com/notes", "Changes?")
+
+        assert mock_canary.call_count == 4
+        assert core.get_reputation_stats()["checks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_llm_check_earns_no_reputation(self, live_env, monkeypatch):
+        """Test that pages the canary LLM couldn't check don't build trust."""
+        from grove_shutter import canary
+
+        monkeypatch.setattr(core, "canary_verdict", canary.canary_verdict)
+        monkeypatch.setattr(
+            canary, "run_canary_llm", AsyncMock(return_value=(canary.LLM_NOT_RUN, None))
+        )
+
+        for _ in range(4):
+            result = await core.shutter("https://docs.example.com/notes", "Changes?")
+            assert result.extracted == "v1"
+
+        assert database.get_reputation("docs.example.com") is None
+        assert core.get_reputation_stats()["skips"] == 0
@@ -269,3 +269,158 @@ class TestClearOffenders:
         # Should not raise
         database.clear_offenders()
         assert len(database.list_offenders()) == 0
+
+
+class TestConnectionAndCache:
+    """Test suite for the shared connection and in-memory offender cache."""
+
+    def test_connection_reused(self, temp_db):
+        """Test that calls share one long-lived connection in WAL mode."""
+        database.get_offender("a.com")
+        conn = database._conn
+        database.add_offender("a.com", "test")
+        database.list_offenders()
+
+        assert database._conn is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_reopens_when_db_path_changes(self, temp_db, tmp_path, monkeypatch):
+        """Test that a new DB_PATH gets a fresh connection and empty cache."""
+        database.add_offender("old.com", "test")
+        assert database.get_offender("old.com") is not None
+
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "other.db")
+
+        assert database.get_offender("old.com") is None
+
+    def test_lookup_served_from_cache(self, temp_db):
+        """Test that repeated lookups don't hit SQLite."""
+        database.add_offender("cached.com", "test")
+        database.get_offender("cached.com")
+        database.get_offender("clean.com")
+
+        class FailingConnection:
+            def execute(self, *args):
+                raise AssertionError("should be served from cache")
+
+        real_conn = database._conn
+        database._conn = FailingConnection()
+        try:
+            assert database.get_offender("cached.com").detection_count == 1
+            assert database.get_offender("clean.com") is None
+            assert database.should_skip_fetch("clean.com") is False
+        finally:
+            database._conn = real_conn
+
+    def test_add_invalidates_cache(self, temp_db):
+        """Test that add_offender refreshes a cached miss."""
+        assert database.get_offender("new.com") is None
+        database.add_offender("new.com", "test")
+        assert database.get_offender("new.com") is not None
+
+    def test_clear_invalidates_cache(self, temp_db):
+        """Test that clear_offenders drops cached entries."""
+        database.add_offender("gone.com", "test")
+        assert database.get_offender("gone.com") is not None
+        database.clear_offenders()
+        assert database.get_offender("gone.com") is None
+
+    def test_external_write_invalidates_cache(self, temp_db, monkeypatch):
+        """Test that commits from another connection are picked up."""
+        import sqlite3
+
+        monkeypatch.setattr(database, "VERSION_CHECK_INTERVAL", 0)
+        assert database.get_offender("external.com") is None
+
+        other = sqlite3.connect(temp_db)
+        other.execute(
+            "INSERT INTO offenders "
+            "(domain, first_seen, last_seen, detection_count, injection_types) "
+            "VALUES ('external.com', '2025-01-01T00:00:00', '2025-01-01T00:00:00', 3, '[\"test\"]')"
+        )
+        other.commit()
+        other.close()
+
+        offender = database.get_offender("external.com")
+        assert offender is not None
+        assert offender.detection_count == 3
+
+
+class TestReputation:
+    """Test suite for domain reputation (clean verdict history)."""
+
+    def policy(self, **overrides) -> dict:
+        """Default reputation settings plus overrides."""
+        settings = {
+            "enabled": True,
+            "min_clean_verdicts": 3,
+            "min_distinct_content": 2,
+            "max_heuristic_confidence": 0.0,
+            "max_age_days": 30.0,
+        }
+        settings.update(overrides)
+        return settings
+
+    def test_record_counts_verdicts_and_distinct_content(self, temp_db):
+        """Test that clean verdicts accumulate per domain."""
+        database.record_clean_verdict("docs.com", "a" * 64)
+        database.record_clean_verdict("docs.com", "a" * 64)
+        database.record_clean_verdict("docs.com", "b" * 64)
+
+        reputation = database.get_reputation("docs.com")
+        assert reputation.clean_count == 3
+        assert reputation.distinct_content == 2
+        assert database.get_reputation("unknown.com") is None
+
+    def test_distinct_content_is_bounded(self, temp_db):
+        """Test that remembered hashes stop at REPUTATION_HASHES_MAX."""
+        for i in range(database.REPUTATION_HASHES_MAX + 5):
+            database.record_clean_verdict("big.com", f"{i:x}".ljust(64, "0"))
+
+        reputation = database.get_reputation("big.com")
+        assert reputation.clean_count == database.REPUTATION_HASHES_MAX + 5
+        assert reputation.distinct_content == database.REPUTATION_HASHES_MAX
+
+    def test_trust_policy(self, temp_db):
+        """Test the count and diversity requirements."""
+        for content in ("a", "a", "a"):
+            database.record_clean_verdict("same-page.com", content * 64)
+        for content in ("a", "b", "c"):
+            database.record_clean_verdict("docs.com", content * 64)
+
+        docs = database.get_reputation("docs.com")
+        assert database.domain_is_trusted(docs, self.policy())
+        assert not database.domain_is_trusted(
+            database.get_reputation("same-page.com"), self.policy()
+        )
+        assert not database.domain_is_trusted(docs, self.policy(min_clean_verdicts=4))
+        assert not database.domain_is_trusted(docs, self.policy(enabled=False))
+        assert not database.domain_is_trusted(None, self.policy())
+
+    def test_trust_lapses(self, temp_db):
+        """Test that old clean history stops counting."""
+        from datetime import timedelta
+
+        for content in ("a", "b", "c"):
+            database.record_clean_verdict("docs.com", content * 64)
+        reputation = database.get_reputation("docs.com")
+        reputation.last_seen -= timedelta(days=31)
+
+        assert not database.domain_is_trusted(reputation, self.policy())
+
+    def test_detection_wipes_reputation(self, temp_db):
+        """Test that an injection on the domain resets its clean history."""
+        database.record_clean_verdict("docs.com", "a" * 64)
+        assert database.get_reputation("docs.com") is not None
+
+        database.add_offender("docs.com", "instruction_override", 0.5)
+
+        assert database.get_reputation("docs.com") is None
+
+    def test_clear_reputation(self, temp_db):
+        """Test that clear_reputation() forgets every domain."""
+        database.record_clean_verdict("docs.com", "a" * 64)
+        database.clear_reputation()
+
+        assert database.list_reputation() == []
+        assert database.get_reputation("docs.com") is None
@@ -2,7 +2,10 @@
 Tests for full extraction (Phase 2).
 """
 
+import json
+
 import pytest
+from unittest.mock import AsyncMock
 
 from grove_shutter import extraction
 
@@ -181,6 +184,199 @@ class TestExtractContent:
         assert isinstance(result[3], str)  # model_used
 
 
+class TestTokenBudget:
+    """Test suite for content budgeting and map-reduce extraction."""
+
+    @pytest.fixture
+    def live_env(self, monkeypatch, tmp_path):
+        """Run extract_content outside dry-run with a fake API key."""
+        from grove_shutter import config
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.setenv("OPENROUTER_API_KEY", "sk-or-test")
+        monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+        monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
+        return tmp_path
+
+    LONG_PAGE = "\n\n".join(
+        ["Acme Widgets"]
+        + ["Menu and footer links for the site. " * 30] * 5
+        + ["Pricing: the Pro plan costs 49 dollars per month."]
+        + ["Menu and footer links for the site. " * 30] * 5
+    )
+
+    def test_budget_capped_by_context_window(self):
+        """Test that the tier context window caps the configured budget."""
+        settings = {"max_input_tokens": 10_000_000}
+        budget = extraction.get_content_budget("fast", 500, "q", settings=settings)
+        assert budget < extraction.get_context_window_for_tier("fast")
+
+    def test_budget_uses_configured_limit(self):
+        """Test that max_input_tokens applies when smaller than the window."""
+        settings = {"max_input_tokens": 2000}
+        assert extraction.get_content_budget("fast", 500, "q", settings=settings) == 2000
+
+    @pytest.mark.asyncio
+    async def test_select_mode_trims_prompt(self, live_env, monkeypatch):
+        """Test that long content is trimmed to relevant chunks before prompting."""
+        (live_env / "config.toml").write_text(
+            "[extraction]\nmax_input_tokens = 150\nchunk_tokens = 100\n"
+        )
+        mock_call = AsyncMock(return_value=("49 dollars", 150, 3))
+        monkeypatch.setattr(extraction, "_call_openrouter", mock_call)
+
+        result = await extraction.extract_content(self.LONG_PAGE, "pricing pro plan")
+
+        assert result == ("49 dollars", 150, 3, "openai/gpt-oss-120b")
+        prompt = mock_call.call_args.args[2]
+        assert "Pro plan costs 49 dollars" in prompt
+        assert len(prompt) < len(self.LONG_PAGE)
+
+    @pytest.mark.asyncio
+    async def test_map_reduce_merges_partial_answers(self, live_env, monkeypatch):
+        """Test that map-reduce extracts windows concurrently and merges answers."""
+        (live_env / "config.toml").write_text(
+            '[extraction]\nmode = "map_reduce"\nmax_input_tokens = 60\nchunk_tokens = 60\n'
+        )
+        page = "\n\n".join(["pricing tier one costs 10", "pricing tier two costs 20", "about us"])
+        page = "\n\n".join(p + " filler" * 40 for p in page.split("\n\n"))
+
+        async def fake_call(api_key, model_used, prompt, max_tokens):
+            if prompt.startswith("Answers extracted"):
+                return ("10 and 20", 30, 4)
+            if "tier one" in prompt:
+                return ("10", 100, 2)
+            if "tier two" in prompt:
+                return ("20", 100, 2)
+            return ("Not found in page content.", 100, 5)
+
+        monkeypatch.setattr(extraction, "_call_openrouter", fake_call)
+
+        extracted, tokens_in, tokens_out, _ = await extraction.extract_content(page, "pricing")
+
+        assert extracted == "10 and 20"
+        assert tokens_in == 230
+        assert tokens_out == 8
+
+    @pytest.mark.asyncio
+    async def test_map_reduce_all_not_found(self, live_env, monkeypatch):
+        """Test that no reduce call is made when every window finds nothing."""
+        (live_env / "config.toml").write_text(
+            '[extraction]\nmode = "map_reduce"\nmax_input_tokens = 100\n'
+        )
+        mock_call = AsyncMock(return_value=("Not found in page content.", 100, 5))
+        monkeypatch.setattr(extraction, "_call_openrouter", mock_call)
+
+        extracted, _, _, _ = await extraction.extract_content(self.LONG_PAGE, "warranty")
+
+        assert extracted == extraction.NOT_FOUND
+        assert all(not c.args[2].startswith("Answers extracted") for c in mock_call.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_rejected(self, live_env):
+        """Test that an unknown mode raises a configuration error."""
+        (live_env / "config.toml").write_text('[extraction]\nmode = "summarize"\n')
+        with pytest.raises(ValueError, match="Unknown extraction mode"):
+            await extraction.extract_content("content", "query")
+
+
+class TestStreaming:
+    """Test suite for SSE streaming from OpenRouter."""
+
+    @staticmethod
+    def mock_openrouter(monkeypatch, body: str, status: int = 200):
+        """Route the openrouter client to an httpx.MockTransport returning body."""
+        from contextlib import asynccontextmanager
+        import httpx
+
+        seen = {}
+
+        def handler(request):
+            seen["json"] = json.loads(request.content)
+            return httpx.Response(status, text=body, headers={"content-type": "text/event-stream"})
+
+        @asynccontextmanager
+        async def mock_client(upstream):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                yield client
+
+        monkeypatch.setattr(extraction, "upstream_client", mock_client)
+        return seen
+
+    @pytest.mark.asyncio
+    async def test_parses_sse_deltas_and_usage(self, monkeypatch):
+        """Test that deltas are yielded in order and usage is reported at the end."""
+        body = "\n".join([
+            ": OPENROUTER PROCESSING",
+            "",
+            'data: {"choices": [{"delta": {"role": "assistant", "content": ""}}]}',
+            'data: {"choices": [{"delta": {"content": "Plans: "}}]}',
+            'data: {"choices": [{"delta": {"content": "$10/mo"}}]}',
+            'data: {"choices": [], "usage": {"prompt_tokens": 120, "completion_tokens": 4}}',
+            "data: [DONE]",
+            "",
+        ])
+        seen = self.mock_openrouter(monkeypatch, body)
+
+        items = [i async for i in extraction._stream_openrouter("key", "m", "prompt", 100)]
+
+        assert items == ["Plans: ", "$10/mo", ("Plans: $10/mo", 120, 4)]
+        assert seen["json"]["stream"] is True
+        assert seen["json"]["stream_options"] == {"include_usage": True}
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_not_a_slow_call(self, monkeypatch, tmp_path):
+        """Test that time the consumer spends between deltas isn't charged to OpenRouter."""
+        import asyncio
+
+        from grove_shutter import breaker, config
+
+        monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+        config.CONFIG_PATH.write_text("[breaker]\nslow_call_ms = 20\n")
+        breaker.reset_breakers()
+        body = "\n".join([
+            'data: {"choices": [{"delta": {"content": "Plans: "}}]}',
+            'data: {"choices": [{"delta": {"content": "$10/mo"}}]}',
+            "data: [DONE]",
+            "",
+        ])
+        self.mock_openrouter(monkeypatch, body)
+
+        async for _ in extraction._stream_openrouter("key", "m", "prompt", 100):
+            await asyncio.sleep(0.05)
+
+        stats = breaker.get_breaker_stats()["openrouter"]
+        breaker.reset_breakers()
+        assert stats["calls"] == 1
+        assert stats["failure_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_stream_error_event_raises(self, monkeypatch):
+        """Test that a mid-stream error event becomes RuntimeError."""
+        body = 'data: {"error": {"message": "provider overloaded"}}\n\n'
+        self.mock_openrouter(monkeypatch, body)
+
+        with pytest.raises(RuntimeError, match="provider overloaded"):
+            [i async for i in extraction._stream_openrouter("key", "m", "prompt", 100)]
+
+    @pytest.mark.asyncio
+    async def test_http_error_raises(self, monkeypatch):
+        """Test that HTTP errors map to RuntimeError like the non-streaming path."""
+        self.mock_openrouter(monkeypatch, "", status=429)
+
+        with pytest.raises(RuntimeError, match="OpenRouter API error: 429"):
+            [i async for i in extraction._stream_openrouter("key", "m", "prompt", 100)]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_streams_mock(self, monkeypatch):
+        """Test that dry-run yields word deltas and the mock result."""
+        monkeypatch.setenv("SHUTTER_DRY_RUN", "1")
+
+        items = [i async for i in extraction.extract_content_stream("page", "q")]
+
+        assert len(items) > 2
+        assert items[-1][0] == extraction.MOCK_RESPONSE["extracted"]
+
+
 class TestMockResponse:
     """Test suite for mock response structure."""
 
@@ -0,0 +1,467 @@
+"""
+Tests for fetch strategies and per-backend fetch stats.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+
+import pytest
+from unittest.mock import AsyncMock
+
+from grove_shutter import config
+from grove_shutter import fetch
+from grove_shutter.pool import ClientPool
+
+
+PAGE = "Fetched page content. " * 10  # Long enough to pass the 100-char sanity check
+
+
+@pytest.fixture(autouse=True)
+def no_cache(tmp_path, monkeypatch):
+    """Disable the fetch cache and start each test with empty stats."""
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+    monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+    monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
+    fetch.reset_fetch_stats()
+    yield tmp_path
+    fetch.reset_fetch_stats()
+
+
+class TestFetchSettings:
+    """Test suite for get_fetch_settings()."""
+
+    def test_defaults(self):
+        """Test that the sequential strategy is the default."""
+        settings = config.get_fetch_settings()
+        assert settings["strategy"] == "sequential"
+        assert settings["hedge_delay_ms"] == 1500
+        assert settings["adaptive_hedge"] is True
+        assert settings["html_executor"] == "thread"
+        assert settings["max_html_chars"] == 5_000_000
+
+    def test_config_overrides(self, no_cache):
+        """Test reading the [fetch] section."""
+        (no_cache / "config.toml").write_text(
+            '[fetch]\nstrategy = "Hedged"\nhedge_delay_ms = 250\nadaptive_hedge = false\n'
+        )
+        settings = config.get_fetch_settings()
+        assert settings["strategy"] == "hedged"
+        assert settings["hedge_delay_ms"] == 250
+        assert settings["adaptive_hedge"] is False
+
+    def test_unknown_strategy_rejected(self, no_cache):
+        """Test that a misspelled strategy fails when the config is read."""
+        (no_cache / "config.toml").write_text('[fetch]\nstrategy = "hedge"\n')
+        with pytest.raises(ValueError, match="Unknown \\[fetch\\] strategy"):
+            config.get_fetch_settings()
+
+
+class TestHedgedFetch:
+    """Test suite for the hedged fetch strategy."""
+
+    @pytest.mark.asyncio
+    async def test_fast_jina_wins_without_basic(self, monkeypatch):
+        """Test that basic never starts when Jina answers within the hedge delay."""
+        mock_basic = AsyncMock(return_value=(PAGE, None, None))
+        monkeypatch.setattr(fetch, "fetch_with_jina", AsyncMock(return_value=PAGE))
+        monkeypatch.setattr(fetch, "fetch_basic_conditional", mock_basic)
+
+        result = await fetch.fetch_url("https://example.com", strategy="hedged")
+
+        assert result == PAGE
+        mock_basic.assert_not_called()
+        assert fetch.get_fetch_stats()["jina"]["wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_jina_loses_to_basic(self, monkeypatch):
+        """Test that basic wins after the hedge delay and Jina is cancelled."""
+        (config.CONFIG_PATH).write_text('[fetch]\nhedge_delay_ms = 10\n')
+        jina_cancelled = asyncio.Event()
+
+        async def slow_jina(*args, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                jina_cancelled.set()
+                raise
+            return "too late " * 20
+
+        monkeypatch.setattr(fetch, "fetch_with_jina", slow_jina)
+        monkeypatch.setattr(
+            fetch, "fetch_basic_conditional", AsyncMock(return_value=(PAGE, '"v1"', None))
+        )
+
+        result = await asyncio.wait_for(
+            fetch.fetch_url("https://example.com", strategy="hedged"), timeout=2
+        )
+
+        assert result == PAGE
+        assert jina_cancelled.is_set()
+        stats = fetch.get_fetch_stats()
+        assert stats["basic"]["wins"] == 1
+        assert stats["jina"]["wins"] == 0
+        # The cancelled attempt is counted but not sampled
+        assert stats["jina"]["attempts"] == 1
+        assert stats["jina"]["p50_ms"] is None
+
+    @pytest.mark.asyncio
+    async def test_jina_failure_starts_basic_immediately(self, monkeypatch):
+        """Test that a Jina failure skips the rest of the hedge delay."""
+        (config.CONFIG_PATH).write_text('[fetch]\nhedge_delay_ms = 5000\n')
+        monkeypatch.setattr(fetch, "fetch_with_jina", AsyncMock(side_effect=RuntimeError("down")))
+        monkeypatch.setattr(
+            fetch, "fetch_basic_conditional", AsyncMock(return_value=(PAGE, None, None))
+        )
+
+        result = await asyncio.wait_for(
+            fetch.fetch_url("https://example.com", strategy="hedged"), timeout=1
+        )
+
+        assert result == PAGE
+        assert fetch.get_fetch_stats()["jina"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_short_jina_content_is_not_accepted(self, monkeypatch):
+        """Test that Jina content failing the sanity check doesn't win."""
+        monkeypatch.setattr(fetch, "fetch_with_jina", AsyncMock(return_value="tiny"))
+        monkeypatch.setattr(
+            fetch, "fetch_basic_conditional", AsyncMock(return_value=(PAGE, None, None))
+        )
+
+        result = await fetch.fetch_url("https://example.com", strategy="hedged")
+
+        assert result == PAGE
+
+    @pytest.mark.asyncio
+    async def test_all_backends_fail(self, monkeypatch):
+        """Test that FetchError lists every backend's error."""
+        monkeypatch.setattr(
+            fetch, "fetch_with_jina", AsyncMock(side_effect=RuntimeError("jina down"))
+        )
+        monkeypatch.setattr(
+            fetch, "fetch_basic_conditional", AsyncMock(side_effect=RuntimeError("basic down"))
+        )
+
+        with pytest.raises(fetch.FetchError) as exc_info:
+            await fetch.fetch_url("https://example.com", strategy="hedged")
+
+        assert "jina down" in exc_info.value.reason
+        assert "basic down" in exc_info.value.reason
+        assert "Tavily" in exc_info.value.reason
+
+    @pytest.mark.asyncio
+    async def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError, match="Unknown fetch strategy"):
+            await fetch.fetch_url("https://example.com", strategy="parallel-ish")
+
+
+class TestFetchStats:
+    """Test suite for per-backend stats and the adaptive hedge delay."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_records_attempts_and_wins(self, monkeypatch):
+        """Test stats for a Jina failure followed by a basic win."""
+        monkeypatch.setattr(fetch, "fetch_with_jina", AsyncMock(side_effect=RuntimeError("down")))
+        monkeypatch.setattr(
+            fetch, "fetch_basic_conditional", AsyncMock(return_value=(PAGE, None, None))
+        )
+
+        await fetch.fetch_url("https://example.com")
+
+        stats = fetch.get_fetch_stats()
+        assert stats["jina"]["attempts"] == 1
+        assert stats["jina"]["failures"] == 1
+        assert stats["jina"]["p50_ms"] is not None  # Time to fail is recorded
+        assert stats["tavily"]["attempts"] == 0  # No key configured
+        assert stats["basic"]["wins"] == 1
+        assert stats["basic"]["win_rate"] == 1.0
+        assert stats["basic"]["p95_ms"] is not None
+
+    def test_hedge_delay_uses_config_until_enough_samples(self):
+        """Test that the configured delay applies with few samples."""
+        settings = {"hedge_delay_ms": 1500, "adaptive_hedge": True}
+        fetch._latencies["jina"].extend([0.2] * (fetch.HEDGE_MIN_SAMPLES - 1))
+        assert fetch.get_hedge_delay(settings) == 1.5
+
+    def test_hedge_delay_adapts_to_jina_p95(self):
+        """Test that the delay tracks Jina's p95 within bounds."""
+        settings = {"hedge_delay_ms": 1500, "adaptive_hedge": True}
+        fetch._latencies["jina"].extend([0.3] * 50)
+        assert fetch.get_hedge_delay(settings) == pytest.approx(0.3)
+
+        fetch.reset_fetch_stats()
+        fetch._latencies["jina"].extend([0.01] * 50)
+        assert fetch.get_hedge_delay(settings) == fetch.HEDGE_MIN_DELAY_MS / 1000
+
+        fetch.reset_fetch_stats()
+        fetch._latencies["jina"].extend([2.0] * 50)
+        assert fetch.get_hedge_delay(settings) == pytest.approx(2.0)
+
+        fetch.reset_fetch_stats()
+        fetch._latencies["jina"].extend([10.0] * 50)
+        assert fetch.get_hedge_delay(settings) == 1.5 * fetch.HEDGE_MAX_DELAY_FACTOR
+
+    def test_hedge_delay_fixed_when_not_adaptive(self):
+        """Test that adaptive_hedge = false keeps the configured delay."""
+        fetch._latencies["jina"].extend([0.3] * 50)
+        assert fetch.get_hedge_delay({"hedge_delay_ms": 800, "adaptive_hedge": False}) == 0.8
+
+
+class TestHtmlExtraction:
+    """Test suite for the off-loop trafilatura stage."""
+
+    HTML = (
+        "<html><body><article><p>"
+        + "Readable paragraph text. " * 20
+        + "</p></article></body></html>"
+    )
+
+    @pytest.fixture(autouse=True)
+    def fresh_executor(self):
+        """Give each test its own executor."""
+        fetch.shutdown_html_executor()
+        yield
+        fetch.shutdown_html_executor()
+
+    def test_truncate_html_cuts_at_tag_boundary(self):
+        """Test that truncation never splits a tag."""
+        html = "<p>one</p><p>two</p><p>three</p>"
+        assert fetch.truncate_html(html, 15) == "<p>one</p><p>"
+        assert fetch.truncate_html(html, 100) == html
+
+    @pytest.mark.asyncio
+    async def test_runs_in_thread_pool_and_records_time(self, monkeypatch):
+        """Test that extraction runs off the event loop thread and is timed."""
+        import threading
+
+        seen = {}
+
+        def fake_html_to_text(html):
+            seen["thread"] = threading.current_thread().name
+            return "text"
+
+        monkeypatch.setattr(fetch, "html_to_text", fake_html_to_text)
+
+        assert await fetch.extract_html(self.HTML) == "text"
+        assert seen["thread"].startswith("shutter-html")
+        stats = fetch.get_fetch_stats()["html_extract"]
+        assert stats["documents"] == 1
+        assert stats["max_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_event_loop_progresses_during_extraction(self, monkeypatch):
+        """Test that a slow parse doesn't stall other coroutines."""
+        import time as time_module
+
+        def slow_html_to_text(html):
+            time_module.sleep(0.2)
+            return "text"
+
+        monkeypatch.setattr(fetch, "html_to_text", slow_html_to_text)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await fetch.extract_html(self.HTML)
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_oversized_html_truncated(self, monkeypatch):
+        """Test the max input size guard."""
+        (config.CONFIG_PATH).write_text('[fetch]\nmax_html_chars = 50\nhtml_executor = "inline"\n')
+        seen = {}
+
+        def fake_html_to_text(html):
+            seen["len"] = len(html)
+            return "text"
+
+        monkeypatch.setattr(fetch, "html_to_text", fake_html_to_text)
+
+        await fetch.extract_html(self.HTML)
+
+        assert seen["len"] <= 50
+        assert fetch.get_fetch_stats()["html_extract"]["truncated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_pool_extracts_real_html(self):
+        """Test trafilatura running in a process pool."""
+        settings = dict(config.get_fetch_settings(), html_executor="process", html_workers=1)
+
+        result = await fetch.extract_html(self.HTML, settings)
+
+        assert "Readable paragraph text" in result
+        assert isinstance(fetch.get_html_executor(settings), fetch.ProcessPoolExecutor)
+
+    def test_unknown_executor(self):
+        """Test that an unknown executor kind is rejected."""
+        settings = dict(config.get_fetch_settings(), html_executor="gpu")
+        with pytest.raises(ValueError, match="Unknown html_executor"):
+            fetch.get_html_executor(settings)
+
+
+class TestTavily:
+    """Test suite for the async Tavily extract path and batching."""
+
+    @pytest.mark.asyncio
+    async def test_extract_posts_urls_without_blocking(self, monkeypatch):
+        """Test that tavily_extract POSTs the URL list and maps results by URL."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["auth"] = request.headers["Authorization"]
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json={
+                "results": [{"url": "https://a.com/", "raw_content": PAGE}],
+                "failed_results": [{"url": "https://b.com/", "error": "blocked"}],
+            })
+
+        @asynccontextmanager
+        async def mock_client(upstream):
+            assert upstream == "tavily"
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                yield client
+
+        monkeypatch.setattr(fetch, "upstream_client", mock_client)
+
+        results = await fetch.tavily_extract(["https://a.com", "https://b.com"], "tvly-key")
+
+        assert seen["auth"] == "Bearer tvly-key"
+        assert seen["body"] == {"urls": ["https://a.com", "https://b.com"]}
+        assert results == {"https://a.com/": PAGE}
+
+    @pytest.mark.asyncio
+    async def test_redirected_result_matched_to_request(self, monkeypatch):
+        """Test that a result reported under its redirect target reaches the requested URL."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={
+                "results": [
+                    {"url": "https://a.com/", "raw_content": "A" * 200},
+                    {"url": "https://www.b.org/landing", "raw_content": "B" * 200},
+                ],
+                "failed_results": [{"url": "https://c.com", "error": "blocked"}],
+            })
+
+        @asynccontextmanager
+        async def mock_client(upstream):
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                yield client
+
+        monkeypatch.setattr(fetch, "upstream_client", mock_client)
+
+        results = await fetch.tavily_extract(
+            ["https://a.com", "https://b.com", "https://c.com"], "tvly-key"
+        )
+
+        assert results == {"https://a.com/": "A" * 200, "https://b.com/": "B" * 200}
+
+    @pytest.mark.asyncio
+    async def test_single_fetch_outside_pool(self, monkeypatch):
+        """Test that one-off fetches send a single-URL request."""
+        monkeypatch.setenv("TAVILY_API_KEY", "tvly-key")
+        mock_extract = AsyncMock(return_value={"https://a.com/": PAGE})
+        monkeypatch.setattr(fetch, "tavily_extract", mock_extract)
+
+        assert await fetch.fetch_with_tavily("https://a.com") == PAGE
+        assert mock_extract.call_args.args[0] == ["https://a.com"]
+
+    @pytest.mark.asyncio
+    async def test_missing_content_raises(self, monkeypatch):
+        """Test that a URL Tavily failed on raises."""
+        monkeypatch.setenv("TAVILY_API_KEY", "tvly-key")
+        monkeypatch.setattr(fetch, "tavily_extract", AsyncMock(return_value={}))
+
+        with pytest.raises(ValueError, match="no content"):
+            await fetch.fetch_with_tavily("https://a.com")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_batched_in_pool(self, monkeypatch):
+        """Test that concurrent fetches inside a ClientPool share one extract call."""
+        monkeypatch.setenv("TAVILY_API_KEY", "tvly-key")
+        mock_extract = AsyncMock(return_value={
+            "https://a.com/": "A" * 200,
+            "https://b.com/": "B" * 200,
+        })
+        monkeypatch.setattr(fetch, "tavily_extract", mock_extract)
+
+        async with ClientPool():
+            a, b, c = await asyncio.gather(
+                fetch.fetch_with_tavily("https://a.com"),
+                fetch.fetch_with_tavily("https://b.com"),
+                fetch.fetch_with_tavily("https://c.com"),
+                return_exceptions=True,
+            )
+
+        mock_extract.assert_called_once()
+        assert sorted(mock_extract.call_args.args[0]) == [
+            "https://a.com/", "https://b.com/", "https://c.com/",
+        ]
+        assert a == "A" * 200
+        assert b == "B" * 200
+        assert isinstance(c, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_batch_split_at_max_size(self, monkeypatch):
+        """Test that a full batch is sent without waiting for the window."""
+        monkeypatch.setenv("TAVILY_API_KEY", "tvly-key")
+
+        async def extract(urls, api_key, timeout):
+            return {url: PAGE for url in urls}
+
+        mock_extract = AsyncMock(side_effect=extract)
+        monkeypatch.setattr(fetch, "tavily_extract", mock_extract)
+
+        async with ClientPool():
+            batcher = fetch.TavilyBatcher("tvly-key", max_batch=2)
+            results = await asyncio.gather(
+                *(batcher.extract(f"https://{n}.com") for n in "abc")
+            )
+
+        assert results == [PAGE] * 3
+        assert [len(call.args[0]) for call in mock_extract.call_args_list] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_longest_timeout(self, monkeypatch):
+        """Test that a batch is sent with the longest timeout of its callers."""
+
+        async def extract(urls, api_key, timeout):
+            return {url: PAGE for url in urls}
+
+        mock_extract = AsyncMock(side_effect=extract)
+        monkeypatch.setattr(fetch, "tavily_extract", mock_extract)
+
+        batcher = fetch.TavilyBatcher("tvly-key", timeout=30000)
+        await asyncio.gather(
+            batcher.extract("https://a.com", 5000),
+            batcher.extract("https://b.com", 60000),
+        )
+        await batcher.extract("https://c.com", 5000)
+
+        assert [call.args[2] for call in mock_extract.call_args_list] == [60000, 5000]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_reaches_every_caller(self, monkeypatch):
+        """Test that a failed extract request fails each waiting fetch."""
+        monkeypatch.setattr(fetch, "tavily_extract", AsyncMock(side_effect=RuntimeError("429")))
+
+        batcher = fetch.TavilyBatcher("tvly-key")
+        results = await asyncio.gather(
+            batcher.extract("https://a.com"),
+            batcher.extract("https://b.com"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,208 @@
+"""
+Tests for near-duplicate detection and its use in shutter().
+"""
+
+import random
+
+import pytest
+from unittest.mock import AsyncMock
+
+from grove_shutter import cache, config, core, database, fingerprint, metrics
+from grove_shutter.canary import LLM_CLEAN, LLM_NOT_RUN, CanaryVerdict
+from grove_shutter.fingerprint import FingerprintIndex, hamming_distance, simhash
+
+
+# Verdict of a canary_verdict() whose LLM ran and found nothing
+CLEAN = CanaryVerdict(llm=LLM_CLEAN)
+
+WORDS = [f"word{i}" for i in range(3000)]
+
+
+def page(seed: int, words: int = 1000) -> str:
+    """Deterministic pseudo-random page text."""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+@pytest.fixture(autouse=True)
+def clean_index(tmp_path, monkeypatch):
+    """Isolate config and start each test with an empty index."""
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+    fingerprint.reset_fingerprint_index()
+    yield tmp_path
+    fingerprint.reset_fingerprint_index()
+
+
+class TestSimhash:
+    """Test suite for simhash()."""
+
+    def test_identical_content_same_fingerprint(self):
+        """Test that fingerprints are deterministic."""
+        assert simhash(page(1)) == simhash(page(1))
+
+    def test_small_edit_stays_close(self):
+        """Test that a timestamp-sized change moves only a few bits."""
+        original = page(1)
+        edited = original + " updated 2026 10 16 12 30"
+
+        assert hamming_distance(simhash(original), simhash(edited)) <= 3
+
+    def test_different_pages_are_far_apart(self):
+        """Test that unrelated pages are not near duplicates."""
+        assert hamming_distance(simhash(page(1)), simhash(page(2))) > 10
+
+    def test_short_content_not_fingerprinted(self):
+        """Test that pages under MIN_WORDS words get no fingerprint."""
+        assert simhash("too short to fingerprint") is None
+
+    def test_long_content_not_fingerprinted(self, monkeypatch):
+        """Test that pages over MAX_WORDS words get no fingerprint, not a partial one."""
+        monkeypatch.setattr(fingerprint, "MAX_WORDS", 500)
+        assert simhash(page(1, words=500)) is not None
+        assert simhash(page(1, words=501)) is None
+
+
+class TestFingerprintIndex:
+    """Test suite for FingerprintIndex."""
+
+    def test_finds_within_distance(self):
+        """Test lookups at and beyond max_distance."""
+        index = FingerprintIndex(max_entries=10, max_distance=3)
+        index.add(0b1111, "a")
+
+        assert index.find(0b1111) == "a"
+        assert index.find(0b1000) == "a"  # 3 bits off
+        assert index.find(0) is None  # 4 bits off
+
+    def test_prefers_closest_match(self):
+        """Test that the nearest of several candidates wins."""
+        index = FingerprintIndex(max_entries=10, max_distance=3)
+        index.add(0b111, "far")
+        index.add(0b001, "near")
+
+        assert index.find(0) == "near"
+
+    def test_lru_eviction_bounds_size(self):
+        """Test that the least recently used entry is evicted."""
+        index = FingerprintIndex(max_entries=2, max_distance=0)
+        index.add(1 << 10, "a")
+        index.add(1 << 20, "b")
+        index.find(1 << 10)  # a is now most recent
+        index.add(1 << 30, "c")
+
+        assert len(index) == 2
+        assert index.find(1 << 20) is None
+        assert index.find(1 << 10) == "a"
+
+    def test_stats(self):
+        """Test lookup and hit counters."""
+        index = FingerprintIndex()
+        index.add(42, "a")
+        index.find(42)
+        index.find(1 << 40)
+
+        assert index.stats() == {"entries": 1, "lookups": 2, "hits": 1, "hit_rate": 0.5}
+
+    def test_settings_resize_index(self):
+        """Test that [cache] settings size the process-wide index."""
+        config.CONFIG_PATH.write_text("[cache]\nfingerprint_entries = 5\nsimhash_distance = 1\n")
+
+        index = fingerprint.get_fingerprint_index()
+        assert (index.max_entries, index.max_distance) == (5, 1)
+
+
+class TestShutterNearDuplicates:
+    """Test suite for near-duplicate reuse in shutter()."""
+
+    @pytest.fixture
+    def live_env(self, clean_index, monkeypatch):
+        """Caching enabled with stubbed fetch, canary and extraction."""
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.delenv("SHUTTER_NO_CACHE", raising=False)
+        monkeypatch.setattr(database, "DB_PATH", clean_index / "offenders.db")
+        monkeypatch.setattr(cache, "CACHE_PATH", clean_index / "cache.db")
+        monkeypatch.setattr(config, "SECRETS_PATH", clean_index / "secrets.json")
+        database.init_db()
+        metrics.reset_metrics()
+
+        pages = {
+            "https://example.com/a": page(1),
+            "https://mirror.example.net/a": page(1) + " mirrored 2026 10 16",
+            "https://example.com/b": page(2),
+        }
+        monkeypatch.setattr(
+            core, "fetch_url", AsyncMock(side_effect=lambda url, timeout: pages[url])
+        )
+        mock_canary = AsyncMock(return_value=CLEAN)
+        mock_extract = AsyncMock(return_value=("Plans: $10/mo", 120, 8, "openai/gpt-oss-120b"))
+        monkeypatch.setattr(core, "canary_verdict", mock_canary)
+        monkeypatch.setattr(core, "extract_content", mock_extract)
+        return mock_canary, mock_extract
+
+    @pytest.mark.asyncio
+    async def test_mirror_reuses_verdict_and_extraction(self, live_env):
+        """Test that a near-identical page skips the canary LLM and extraction."""
+        mock_canary, mock_extract = live_env
+
+        await core.shutter(url="https://example.com/a", query="Pricing?")
+        mirror = await core.shutter(url="https://mirror.example.net/a", query="Pricing?")
+
+        assert mirror.cached is True
+        assert mirror.extracted == "Plans: $10/mo"
+        mock_canary.assert_called_once()
+        mock_extract.assert_called_once()
+
+        hits = {
+            entry["labels"]["reuse"]: entry["value"]
+            for entry in metrics.get_metrics()["counters"]["shutter_near_duplicate_hits_total"]
+        }
+        assert hits == {"canary": 1, "extraction": 1}
+        assert fingerprint.get_fingerprint_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_borrowed_verdict_not_persisted(self, live_env):
+        """Test that a verdict reused from a near duplicate is not cached for the mirror."""
+        await core.shutter(url="https://example.com/a", query="Pricing?")
+        await core.shutter(url="https://mirror.example.net/a", query="Pricing?")
+
+        mirror_hash = cache.hash_content(page(1) + " mirrored 2026 10 16")
+        assert not cache.is_content_vetted(mirror_hash, 3600)
+        assert database.get_reputation("mirror.example.net") is None
+        assert len(fingerprint.get_fingerprint_index()) == 1
+
+    @pytest.mark.asyncio
+    async def test_unchecked_page_is_no_anchor(self, live_env):
+        """Test that only pages the canary LLM passed are reused."""
+        mock_canary, mock_extract = live_env
+        mock_canary.return_value = CanaryVerdict(llm=LLM_NOT_RUN)
+
+        await core.shutter(url="https://example.com/a", query="Pricing?")
+        await core.shutter(url="https://mirror.example.net/a", query="Pricing?")
+
+        assert mock_canary.call_count == 2
+        assert mock_extract.call_count == 2
+        assert len(fingerprint.get_fingerprint_index()) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_page_runs_full_pipeline(self, live_env):
+        """Test that unrelated content is still checked and extracted."""
+        mock_canary, mock_extract = live_env
+
+        await core.shutter(url="https://example.com/a", query="Pricing?")
+        await core.shutter(url="https://example.com/b", query="Pricing?")
+
+        assert mock_canary.call_count == 2
+        assert mock_extract.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_config(self, live_env):
+        """Test that near_duplicates = false turns reuse off."""
+        mock_canary, mock_extract = live_env
+        config.CONFIG_PATH.write_text("[cache]\nnear_duplicates = false\n")
+
+        await core.shutter(url="https://example.com/a", query="Pricing?")
+        await core.shutter(url="https://mirror.example.net/a", query="Pricing?")
+
+        assert mock_canary.call_count == 2
+        assert mock_extract.call_count == 2
@@ -0,0 +1,214 @@
+"""
+Tests for phase timings and the metrics registry.
+"""
+
+import json
+import multiprocessing
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import AsyncMock
+
+from grove_shutter import cache, config, core, database, metrics
+from grove_shutter.canary import LLM_CLEAN, CanaryVerdict
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics(tmp_path, monkeypatch):
+    """Start each test with an empty registry and a temp metrics file."""
+    monkeypatch.setattr(metrics, "METRICS_PATH", tmp_path / "metrics.json")
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+class TestRegistry:
+    """Test suite for counters and histograms."""
+
+    def test_counter_labels(self):
+        """Test that counters are kept per label set."""
+        metrics.inc("hits", tier="fast")
+        metrics.inc("hits", tier="fast")
+        metrics.inc("hits", tier="accurate", outcome=None)
+
+        series = {
+            entry["labels"]["tier"]: entry["value"]
+            for entry in metrics.get_metrics()["counters"]["hits"]
+        }
+        assert series == {"fast": 2, "accurate": 1}
+
+    def test_histogram_buckets(self):
+        """Test that observations land in the first bucket that fits."""
+        metrics.observe("latency", 3)
+        metrics.observe("latency", 10)
+        metrics.observe("latency", 60000)
+
+        entry = metrics.get_metrics()["histograms"]["latency"][0]
+        assert entry["buckets"][0] == 1  # <= 5
+        assert entry["buckets"][1] == 1  # <= 10
+        assert entry["buckets"][-1] == 1  # +Inf
+        assert entry["count"] == 3
+        assert entry["sum"] == 60013
+
+    def test_phase_timer_fills_request_timings(self):
+        """Test that phase_timer records into the active request's timings."""
+        with metrics.request_timings() as timings:
+            with metrics.phase_timer("offenders"):
+                pass
+            metrics.record_phase("fetch.jina", 12.0, backend="jina")
+            metrics.record_phase("fetch.jina", 8.0, backend="jina")
+
+        assert set(timings) == {"offenders", "fetch.jina"}
+        assert timings["fetch.jina"] == 20.0
+
+    def test_phase_timer_without_request(self):
+        """Test that phases outside a request only feed the registry."""
+        with metrics.phase_timer("parse"):
+            pass
+
+        series = metrics.get_metrics()["histograms"]["shutter_phase_duration_ms"]
+        assert series[0]["labels"] == {"phase": "parse"}
+
+
+class TestExport:
+    """Test suite for persistence and rendering."""
+
+    def test_save_merges_and_resets(self):
+        """Test that save_metrics() accumulates across runs."""
+        metrics.inc("shutter_requests_total", tier="fast", outcome="ok")
+        metrics.observe("shutter_request_duration_ms", 40, tier="fast")
+        metrics.save_metrics()
+        assert metrics.get_metrics()["counters"] == {}
+
+        metrics.inc("shutter_requests_total", tier="fast", outcome="ok")
+        metrics.observe("shutter_request_duration_ms", 60, tier="fast")
+        metrics.save_metrics()
+
+        saved = metrics.load_metrics()
+        assert saved["counters"]["shutter_requests_total"][0]["value"] == 2
+        histogram = saved["histograms"]["shutter_request_duration_ms"][0]
+        assert histogram["count"] == 2
+        assert histogram["sum"] == 100
+
+    def test_concurrent_saves_lose_nothing(self):
+        """Test that processes saving at the same time all get counted."""
+        def save_one(path):
+            for _ in range(20):
+                metrics.inc("hits")
+                metrics.save_metrics(path)
+
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=save_one, args=(metrics.METRICS_PATH,)) for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert metrics.load_metrics()["counters"]["hits"][0]["value"] == 80
+        assert not list(metrics.METRICS_PATH.parent.glob("*.tmp"))
+
+    def test_saves_without_fcntl(self, tmp_path):
+        """Test that the package imports and saves where fcntl doesn't exist."""
+        script = (
+            "import sys; sys.modules['fcntl'] = None\n"
+            "from pathlib import Path\n"
+            "import grove_shutter.core\n"
+            "from grove_shutter import metrics\n"
+            "metrics.inc('hits')\n"
+            f"metrics.save_metrics(Path({str(tmp_path / 'metrics.json')!r}))\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        saved = metrics.load_metrics(tmp_path / "metrics.json")
+        assert saved["counters"]["hits"][0]["value"] == 1
+
+    def test_load_missing_file(self):
+        """Test that a missing metrics file loads as empty."""
+        assert metrics.load_metrics()["counters"] == {}
+
+    def test_clear_saved_metrics(self):
+        """Test that clear_saved_metrics() removes the file."""
+        metrics.inc("hits")
+        metrics.save_metrics()
+        assert metrics.METRICS_PATH.exists()
+
+        metrics.clear_saved_metrics()
+        assert not metrics.METRICS_PATH.exists()
+
+    def test_render_prometheus(self):
+        """Test the Prometheus text format output."""
+        metrics.inc("shutter_requests_total", tier="fast", outcome="ok")
+        metrics.observe("shutter_phase_duration_ms", 7, phase="fetch.jina", backend="jina")
+
+        text = metrics.render_prometheus()
+
+        assert "# TYPE shutter_requests_total counter" in text
+        assert 'shutter_requests_total{outcome="ok",tier="fast"} 1' in text
+        assert "# TYPE shutter_phase_duration_ms histogram" in text
+        bucket = 'shutter_phase_duration_ms_bucket{backend="jina",phase="fetch.jina",le='
+        assert bucket + '"5"} 0' in text
+        assert bucket + '"10"} 1' in text
+        assert bucket + '"+Inf"} 1' in text
+        assert 'shutter_phase_duration_ms_count{backend="jina",phase="fetch.jina"} 1' in text
+
+    def test_snapshot_is_json_serializable(self):
+        """Test that snapshots round-trip through JSON."""
+        metrics.inc("hits", tier="fast")
+        metrics.observe("latency", 12)
+
+        snapshot = metrics.get_metrics()
+        assert json.loads(json.dumps(snapshot)) == snapshot
+
+
+class TestResponseTimings:
+    """Test suite for timings attached to ShutterResponse."""
+
+    @pytest.fixture
+    def live_env(self, tmp_path, monkeypatch):
+        """Stub fetch/canary/extraction outside dry-run."""
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / "offenders.db")
+        monkeypatch.setattr(cache, "CACHE_PATH", tmp_path / "cache.db")
+        monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+        monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+        monkeypatch.setattr(config, "SECRETS_PATH", tmp_path / "secrets.json")
+        monkeypatch.delenv("SHUTTER_DRY_RUN", raising=False)
+        monkeypatch.setenv("SHUTTER_NO_CACHE", "1")
+        database.init_db()
+
+        monkeypatch.setattr(
+            core, "fetch_url", AsyncMock(return_value="A normal page about pricing.")
+        )
+        monkeypatch.setattr(
+            core, "canary_verdict", AsyncMock(return_value=CanaryVerdict(llm=LLM_CLEAN))
+        )
+        monkeypatch.setattr(
+            core,
+            "extract_content",
+            AsyncMock(return_value=("Plans: $10/mo", 120, 8, "openai/gpt-oss-120b")),
+        )
+
+    @pytest.mark.asyncio
+    async def test_response_has_phase_timings(self, live_env):
+        """Test that a successful request reports its phases."""
+        result = await core.shutter(url="https://example.com", query="pricing")
+
+        assert {"offenders", "canary.heuristics", "extraction"} <= set(result.timings)
+        assert all(ms >= 0 for ms in result.timings.values())
+        assert result.latency_ms >= result.timings["extraction"]
+
+    @pytest.mark.asyncio
+    async def test_request_counted_by_outcome(self, live_env, monkeypatch):
+        """Test that requests are counted by tier and outcome."""
+        await core.shutter(url="https://example.com", query="pricing")
+        down = core.FetchError("https://example.org", "down")
+        monkeypatch.setattr(core, "fetch_url", AsyncMock(side_effect=down))
+        await core.shutter(url="https://example.org", query="pricing")
+
+        counts = {
+            entry["labels"]["outcome"]: entry["value"]
+            for entry in metrics.get_metrics()["counters"]["shutter_requests_total"]
+        }
+        assert counts == {"ok": 1, "fetch_error": 1}
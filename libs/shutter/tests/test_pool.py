@@ -0,0 +1,70 @@
+"""
+Tests for shared HTTP client pools.
+"""
+
+import pytest
+
+from grove_shutter import pool
+
+
+class TestClientPool:
+    """Test suite for ClientPool."""
+
+    @pytest.mark.asyncio
+    async def test_same_client_per_upstream(self):
+        """Test that each upstream gets one shared client."""
+        async with pool.ClientPool(http2=False) as client_pool:
+            jina = client_pool.client("jina")
+            assert client_pool.client("jina") is jina
+            assert client_pool.client("openrouter") is not jina
+
+    @pytest.mark.asyncio
+    async def test_clients_closed_on_exit(self):
+        """Test that pooled clients are closed when the pool exits."""
+        async with pool.ClientPool(http2=False) as client_pool:
+            client = client_pool.client("basic")
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_pool_active_only_inside_block(self):
+        """Test that the active pool is scoped to the async with block."""
+        assert pool.get_active_pool() is None
+        async with pool.ClientPool(http2=False) as client_pool:
+            assert pool.get_active_pool() is client_pool
+        assert pool.get_active_pool() is None
+
+
+class TestUpstreamUrl:
+    """Test suite for upstream_url()."""
+
+    def test_default_base(self, monkeypatch):
+        """Test the public service URLs."""
+        monkeypatch.delenv("SHUTTER_JINA_URL", raising=False)
+        assert pool.upstream_url("jina", "https://example.com/a") == "https://r.jina.ai/https://example.com/a"
+        assert pool.upstream_url("tavily", "extract") == "https://api.tavily.com/extract"
+
+    def test_env_override(self, monkeypatch):
+        """Test that SHUTTER_<UPSTREAM>_URL replaces the base."""
+        monkeypatch.setenv("SHUTTER_OPENROUTER_URL", "http://127.0.0.1:9000/openrouter/")
+        assert pool.upstream_url("openrouter", "chat/completions") == (
+            "http://127.0.0.1:9000/openrouter/chat/completions"
+        )
+
+
+class TestUpstreamClient:
+    """Test suite for upstream_client()."""
+
+    @pytest.mark.asyncio
+    async def test_uses_pooled_client_when_active(self):
+        """Test that upstream_client reuses the pooled client and leaves it open."""
+        async with pool.ClientPool(http2=False) as client_pool:
+            async with pool.upstream_client("jina") as client:
+                assert client is client_pool.client("jina")
+            assert not client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_one_shot_client_without_pool(self):
+        """Test that upstream_client falls back to a one-shot client."""
+        async with pool.upstream_client("jina") as client:
+            assert not client.is_closed
+        assert client.is_closed
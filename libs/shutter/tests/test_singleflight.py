@@ -0,0 +1,122 @@
+"""
+Tests for in-process request coalescing.
+"""
+
+import asyncio
+
+import pytest
+
+from grove_shutter.singleflight import SingleFlight, get_coalescing_stats
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test that concurrent callers with one key run the work once."""
+        flight = SingleFlight("test-share")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.stats() == {"leaders": 1, "followers": 4, "ratio": 5.0}
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_not_shared(self):
+        """Test that distinct keys run independently."""
+        flight = SingleFlight("test-keys")
+
+        async def work():
+            await asyncio.sleep(0)
+            return object()
+
+        a, b = await asyncio.gather(flight.do("a", work), flight.do("b", work))
+
+        assert a is not b
+        assert flight.stats()["leaders"] == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_shared(self):
+        """Test that finished work is not reused by later calls."""
+        flight = SingleFlight("test-sequential")
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("k", work) == 1
+        assert await flight.do("k", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller(self):
+        """Test that a failure is raised in the leader and all followers."""
+        flight = SingleFlight("test-error")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            *(flight.do("k", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that the shared work survives its starter being cancelled."""
+        flight = SingleFlight("test-cancel")
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "done"
+
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_every_caller_cancelled(self):
+        """Test that abandoned work is cancelled once nobody waits for it."""
+        flight = SingleFlight("test-abandon")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flight.do("k", work)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert cancelled.is_set()
+        assert flight.in_flight() == 0
+
+    def test_registered_in_global_stats(self):
+        """Test that groups appear in get_coalescing_stats()."""
+        SingleFlight("test-registry")
+        assert get_coalescing_stats()["test-registry"]["ratio"] == 1.0
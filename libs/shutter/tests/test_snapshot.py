@@ -0,0 +1,180 @@
+"""
+Tests for the memory-mapped offenders snapshot.
+"""
+
+import json
+
+import pytest
+
+from grove_shutter import config, database, snapshot
+from grove_shutter.snapshot import OffenderSnapshot, SnapshotEntry, SnapshotError
+
+
+@pytest.fixture(autouse=True)
+def temp_paths(tmp_path, monkeypatch):
+    """Point the database, config and snapshot to a temp directory."""
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "offenders.db")
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_PATH", tmp_path / "config.toml")
+    monkeypatch.setattr(snapshot, "SNAPSHOT_PATH", tmp_path / "offenders.snap")
+    monkeypatch.setattr(snapshot, "RELOAD_CHECK_INTERVAL", 0.0)
+    database.close_db()
+    snapshot.reset_snapshot()
+    yield tmp_path
+    database.close_db()
+    snapshot.reset_snapshot()
+
+
+def entry(blocked=True, count=3, max_conf=0.9, avg_conf=0.8) -> SnapshotEntry:
+    """Build a SnapshotEntry."""
+    return SnapshotEntry(blocked, count, max_conf, avg_conf)
+
+
+class TestSnapshotFile:
+    """Test suite for writing and reading snapshot files."""
+
+    def test_round_trip(self, temp_paths):
+        """Test that every written domain is found with its verdict."""
+        path = temp_paths / "test.snap"
+        domains = [f"site{i}.example.com" for i in range(500)]
+        count = snapshot.write_snapshot(
+            [(d, entry(blocked=i % 2 == 0, count=i % 7)) for i, d in enumerate(domains)], path
+        )
+
+        snap = OffenderSnapshot(path)
+        assert count == len(snap) == 500
+        for i, domain in enumerate(domains):
+            found = snap.lookup(domain)
+            assert found.blocked == (i % 2 == 0)
+            assert found.detection_count == i % 7
+        assert snap.lookup("clean.example.com") is None
+
+    def test_compact_size(self, temp_paths):
+        """Test that records are fixed-size and the file has no slack."""
+        path = temp_paths / "test.snap"
+        snapshot.write_snapshot([("a.com", entry()), ("b.com", entry())], path)
+
+        assert path.stat().st_size == snapshot.HEADER.size + 2 * snapshot.RECORD.size
+
+    def test_lookup_case_insensitive(self, temp_paths):
+        """Test that domains are matched case-insensitively."""
+        path = temp_paths / "test.snap"
+        snapshot.write_snapshot([("Evil.Example.com", entry())], path)
+
+        assert OffenderSnapshot(path).lookup("evil.example.COM") is not None
+
+    def test_confidence_and_count_are_clamped(self, temp_paths):
+        """Test byte encoding of counts and confidences."""
+        path = temp_paths / "test.snap"
+        snapshot.write_snapshot([("a.com", entry(count=1000, max_conf=1.0, avg_conf=0.5))], path)
+
+        found = OffenderSnapshot(path).lookup("a.com")
+        assert found.detection_count == 255
+        assert found.max_confidence == 1.0
+        assert found.avg_confidence == pytest.approx(0.5, abs=0.01)
+
+    def test_empty_snapshot(self, temp_paths):
+        """Test that an empty snapshot is valid."""
+        path = temp_paths / "test.snap"
+        snapshot.write_snapshot([], path)
+
+        assert OffenderSnapshot(path).lookup("a.com") is None
+
+    def test_corrupt_file_rejected(self, temp_paths):
+        """Test that damaged files raise SnapshotError."""
+        path = temp_paths / "test.snap"
+        snapshot.write_snapshot([("a.com", entry())], path)
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="checksum"):
+            OffenderSnapshot(path)
+
+        path.write_bytes(b"nope")
+        with pytest.raises(SnapshotError):
+            OffenderSnapshot(path)
+
+
+class TestActiveSnapshot:
+    """Test suite for the process-wide active snapshot."""
+
+    def test_no_snapshot(self):
+        """Test lookups without an installed snapshot."""
+        assert snapshot.get_snapshot() is None
+        assert snapshot.snapshot_lookup("a.com") is None
+
+    def test_swap_is_picked_up(self, temp_paths):
+        """Test that replacing the file swaps the mapped snapshot."""
+        snapshot.write_snapshot([("a.com", entry())])
+        assert snapshot.snapshot_lookup("a.com") is not None
+
+        snapshot.write_snapshot([("b.com", entry())])
+        assert snapshot.snapshot_lookup("a.com") is None
+        assert snapshot.snapshot_lookup("b.com") is not None
+
+    def test_import_validates_and_installs(self, temp_paths):
+        """Test import_snapshot() copies a valid file into place."""
+        source = temp_paths / "from-elsewhere.snap"
+        snapshot.write_snapshot([("a.com", entry())], source)
+
+        assert snapshot.import_snapshot(source) == 1
+        assert snapshot.snapshot_lookup("a.com").blocked
+
+        bad = temp_paths / "bad.snap"
+        bad.write_bytes(b"garbage" * 10)
+        with pytest.raises(SnapshotError):
+            snapshot.import_snapshot(bad)
+        assert snapshot.snapshot_lookup("a.com") is not None  # Old snapshot untouched
+
+
+class TestOffendersIntegration:
+    """Test suite for snapshot export and should_skip_fetch()."""
+
+    def test_export_from_database(self, temp_paths):
+        """Test that export applies the skip thresholds per domain."""
+        for _ in range(3):
+            database.add_offender("repeat.com", "instruction_override", 0.5)
+        database.add_offender("once.com", "role_hijack", 0.5)
+
+        assert database.export_offenders_snapshot() == 2
+        assert snapshot.snapshot_lookup("repeat.com").blocked
+        assert not snapshot.snapshot_lookup("once.com").blocked
+
+    def test_export_merges_d1_rows(self, temp_paths):
+        """Test merging rows exported from the Cloudflare table."""
+        database.add_offender("local.com", "role_hijack", 0.5)
+        rows = [{
+            "domain": "local.com",
+            "first_seen": "2024-01-01T00:00:00+00:00",
+            "last_seen": "2024-01-02T00:00:00+00:00",
+            "detection_count": 4,
+            "injection_types": json.dumps(["instruction_override"]),
+            "avg_confidence": 0.6,
+            "max_confidence": 0.7,
+        }]
+
+        database.export_offenders_snapshot(extra=database.offenders_from_rows(rows))
+
+        found = snapshot.snapshot_lookup("local.com")
+        assert found.blocked
+        assert found.detection_count == 4
+
+    def test_snapshot_blocks_without_database_row(self, temp_paths):
+        """Test that a snapshot verdict blocks a domain the local DB doesn't know."""
+        snapshot.write_snapshot([("shared.com", entry())])
+
+        assert database.should_skip_fetch("shared.com")
+        assert not database.should_skip_fetch("clean.com")
+
+    def test_snapshot_only_skips_sqlite(self, temp_paths):
+        """Test that snapshot_only ignores local database verdicts."""
+        for _ in range(3):
+            database.add_offender("local.com", "instruction_override", 0.5)
+        snapshot.write_snapshot([("shared.com", entry())])
+        assert database.should_skip_fetch("local.com")
+
+        config.CONFIG_PATH.write_text("[offenders]\nsnapshot_only = true\n")
+
+        assert not database.should_skip_fetch("local.com")
+        assert database.should_skip_fetch("shared.com")
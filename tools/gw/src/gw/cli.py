@@ -1,36 +1,93 @@
 """Main CLI entry point for Grove Wrap."""
 
+import importlib
+
 import click
 
-from .commands import auth, bindings, cache, db, health, secret, status, tenant
-from .commands import backup, deploy, do, email, export, flag, kv, logs, r2, packages, social
-from .commands.doctor import doctor
-from .commands.whoami import whoami
-from .commands.history import history
-from .commands.completion import completion
-from .commands.mcp import mcp
-from .commands.metrics import metrics
-from .commands.config_validate import config_validate
-from .commands.env_audit import env_audit
-from .commands.monorepo_size import monorepo_size
-from .commands.context import context
-from .commands.git import git
-from .commands.gh import gh
-from .commands.warden import warden
-from .commands.dev import dev
-from .commands.dev.test import test
-from .commands.dev.build import build
-from .commands.dev.check import check
-from .commands.dev.lint import lint
-from .commands.dev.ci import ci
-from .commands.publish import publish
 from .config import GWConfig
 from .tracking import TrackedGroup
-from .help_formatter import show_categorized_help
+
+
+# Command name -> (module, attribute). Modules are imported only when their
+# command is invoked, so `gw git status` doesn't pay for mcp, cryptography
+# or rich tables pulled in by unrelated commands.
+LAZY_COMMANDS: dict[str, tuple[str, str]] = {
+    "status": ("gw.commands.status", "status"),
+    "health": ("gw.commands.health", "health"),
+    "auth": ("gw.commands.auth", "auth"),
+    "bindings": ("gw.commands.bindings", "bindings"),
+    "d1": ("gw.commands.db", "d1"),
+    "tenant": ("gw.commands.tenant", "tenant"),
+    "secret": ("gw.commands.secret", "secret"),
+    "cache": ("gw.commands.cache", "cache"),
+    "git": ("gw.commands.git", "git"),
+    "gh": ("gw.commands.gh", "gh"),
+    # Cloudflare Phase 4-6.5 commands
+    "kv": ("gw.commands.kv", "kv"),
+    "r2": ("gw.commands.r2", "r2"),
+    "logs": ("gw.commands.logs", "logs"),
+    "deploy": ("gw.commands.deploy", "deploy"),
+    "do": ("gw.commands.do", "do"),
+    "flag": ("gw.commands.flag", "flag"),
+    "backup": ("gw.commands.backup", "backup"),
+    "export": ("gw.commands.export", "export"),
+    "email": ("gw.commands.email", "email"),
+    "social": ("gw.commands.social", "social"),
+    "warden": ("gw.commands.warden", "warden"),
+    # Dev Tools Phase 15-18 commands
+    "dev": ("gw.commands.dev", "dev"),
+    "test": ("gw.commands.dev.test", "test"),
+    "build": ("gw.commands.dev.build", "build"),
+    "check": ("gw.commands.dev.check", "check"),
+    "lint": ("gw.commands.dev.lint", "lint"),
+    "ci": ("gw.commands.dev.ci", "ci"),
+    "packages": ("gw.commands.packages", "packages"),
+    "publish": ("gw.commands.publish", "publish"),
+    # Phase 7.5 Quality of Life commands
+    "doctor": ("gw.commands.doctor", "doctor"),
+    "whoami": ("gw.commands.whoami", "whoami"),
+    "history": ("gw.commands.history", "history"),
+    "completion": ("gw.commands.completion", "completion"),
+    "daemon": ("gw.commands.daemon", "daemon"),
+    # Phase 7 MCP Server
+    "mcp": ("gw.commands.mcp", "mcp"),
+    # Metrics
+    "metrics": ("gw.commands.metrics", "metrics"),
+    # Infrastructure audit commands
+    "config-validate": ("gw.commands.config_validate", "config_validate"),
+    "env-audit": ("gw.commands.env_audit", "env_audit"),
+    "monorepo-size": ("gw.commands.monorepo_size", "monorepo_size"),
+    # Agent-optimized commands
+    "context": ("gw.commands.context", "context"),
+}
+
+
+def show_categorized_help() -> None:
+    """Show the categorized help screen (rich is only imported when asked for)."""
+    from .help_formatter import show_categorized_help as show
+
+    show()
 
 
 class GWGroup(TrackedGroup):
-    """Custom Click group that overrides help display."""
+    """Custom Click group that overrides help display and loads commands lazily."""
+
+    def __init__(self, *args, lazy_commands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List every command name without importing any command module."""
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """Return a command, importing its module on first use."""
+        cmd = super().get_command(ctx, cmd_name)
+        if cmd is None and cmd_name in self.lazy_commands:
+            module_path, attribute = self.lazy_commands[cmd_name]
+            cmd = getattr(importlib.import_module(module_path), attribute)
+            self.add_command(cmd, cmd_name)
+        return cmd
 
     def get_help(self, ctx: click.Context) -> str:
         """Override to show our custom categorized help."""
@@ -56,7 +113,7 @@ class GWGroup(TrackedGroup):
         return super().add_command(cmd, name)
 
 
-@click.group(cls=GWGroup, invoke_without_command=True)
+@click.group(cls=GWGroup, lazy_commands=LAZY_COMMANDS, invoke_without_command=True)
 @click.option(
     "--json",
     "output_json",
@@ -117,61 +174,5 @@ def help_cmd(ctx: click.Context, command_name: str) -> None:
         show_categorized_help()
 
 
-# Register command groups
-main.add_command(status.status)
-main.add_command(health.health)
-main.add_command(auth.auth)
-main.add_command(bindings.bindings)
-main.add_command(db.d1)
-main.add_command(tenant.tenant)
-main.add_command(secret.secret)
-main.add_command(cache.cache)
-main.add_command(git)
-main.add_command(gh)
-
-# Cloudflare Phase 4-6.5 commands
-main.add_command(kv.kv)
-main.add_command(r2.r2)
-main.add_command(logs.logs)
-main.add_command(deploy.deploy)
-main.add_command(do.do)
-main.add_command(flag.flag)
-main.add_command(backup.backup)
-main.add_command(export.export)
-main.add_command(email.email)
-main.add_command(social.social)
-main.add_command(warden)
-
-# Dev Tools Phase 15-18 commands
-main.add_command(dev)
-main.add_command(test)
-main.add_command(build)
-main.add_command(check)
-main.add_command(lint)
-main.add_command(ci)
-main.add_command(packages.packages)
-main.add_command(publish)
-
-# Phase 7.5 Quality of Life commands
-main.add_command(doctor)
-main.add_command(whoami)
-main.add_command(history)
-main.add_command(completion)
-
-# Phase 7 MCP Server
-main.add_command(mcp)
-
-# Metrics
-main.add_command(metrics)
-
-# Infrastructure audit commands
-main.add_command(config_validate)
-main.add_command(env_audit)
-main.add_command(monorepo_size)
-
-# Agent-optimized commands
-main.add_command(context)
-
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,181 @@
+"""Thin client for the gw daemon.
+
+Forwards argv, environment and working directory to a running ``gw daemon``
+over a Unix socket and hands over this process's stdin/stdout/stderr file
+descriptors, so the command (and anything it spawns) reads and writes this
+terminal directly. Only the exit code comes back over the socket. When no
+daemon is listening, gw runs in-process as usual.
+
+Only the standard library is imported here so the client starts in a few
+milliseconds. Installed as ``gwd``:
+
+    gwd git status
+"""
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from . import __version__
+
+# Overrides the default socket path (~/.grove/gw.sock)
+SOCKET_ENV = "GW_DAEMON_SOCKET"
+
+# Every message is a 4-byte big-endian length followed by that much JSON
+HEADER = struct.Struct("!I")
+
+# Signals the client relays to the process running its command
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def source_fingerprint() -> str:
+    """Latest modification time of the gw sources.
+
+    gw is installed editable, so edits don't change __version__. The daemon
+    takes this when it warms and refuses to run commands for a client that
+    sees newer sources.
+    """
+    package = Path(__file__).parent
+    return str(max(path.stat().st_mtime_ns for path in package.rglob("*.py")))
+
+
+def socket_path() -> Path:
+    """Path of the daemon's Unix socket."""
+    override = os.environ.get(SOCKET_ENV)
+    return Path(override) if override else Path.home() / ".grove" / "gw.sock"
+
+
+def send_message(sock: socket.socket, message: dict[str, Any], fds: tuple[int, ...] = ()) -> None:
+    """Send one framed JSON message, optionally passing file descriptors.
+
+    Args:
+        sock: Connected Unix socket
+        message: JSON-serializable message
+        fds: File descriptors to pass along (SCM_RIGHTS)
+    """
+    data = json.dumps(message).encode()
+    payload = HEADER.pack(len(data)) + data
+    if fds:
+        sent = socket.send_fds(sock, [payload], list(fds))
+        payload = payload[sent:]
+    if payload:
+        # Sending nothing to a peer that already replied and closed is EPIPE
+        sock.sendall(payload)
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any]:
+    """Read one framed JSON message.
+
+    Args:
+        stream: Buffered reader over the socket (``sock.makefile("rb")``)
+
+    Raises:
+        ConnectionError: If the connection closes mid-message
+    """
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ConnectionError("gw daemon closed the connection")
+    (length,) = HEADER.unpack(header)
+    body = stream.read(length)
+    if len(body) < length:
+        raise ConnectionError("gw daemon closed the connection")
+    return json.loads(body)
+
+
+def connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(message: dict[str, Any], path: Optional[Path] = None) -> Optional[dict[str, Any]]:
+    """Send a control message ("ping", "stop") and return the reply.
+
+    Returns:
+        The daemon's reply, or None if no daemon is listening
+    """
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rb") as stream:
+        send_message(sock, {"version": __version__, **message})
+        return read_message(stream)
+
+
+def forward(
+    argv: list[str], fds: tuple[int, int, int] = (0, 1, 2), path: Optional[Path] = None
+) -> Optional[int]:
+    """Run a gw command in the daemon.
+
+    Args:
+        argv: Arguments after ``gw``
+        fds: stdin, stdout and stderr for the command
+        path: Socket path (default: socket_path())
+
+    Returns:
+        The command's exit code, or None if no compatible daemon is listening
+    """
+    sock = connect(path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rb") as stream:
+        send_message(
+            sock,
+            {
+                "op": "run",
+                "version": __version__,
+                "source": source_fingerprint(),
+                "argv": argv,
+                "env": dict(os.environ),
+                "cwd": os.getcwd(),
+            },
+            fds=fds,
+        )
+        started = read_message(stream)
+        if "error" in started:
+            # e.g. a daemon left running from an older gw version or source
+            print(f"gwd: {started['error']}; running gw directly", file=sys.stderr)
+            return None
+
+        pid = started["pid"]
+
+        def relay(signum: int, frame: Any) -> None:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+        for signum in FORWARDED_SIGNALS:
+            signal.signal(signum, relay)
+
+        try:
+            return read_message(stream)["exit_code"]
+        except ConnectionError:
+            # The command died without reporting (killed by a signal)
+            return 1
+
+
+def main() -> None:
+    """Entry point for ``gwd``: forward to the daemon, else run gw directly."""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is None:
+        from .cli import main as gw_main
+
+        gw_main(prog_name="gw")
+        return
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
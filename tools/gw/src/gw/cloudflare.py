@@ -0,0 +1,476 @@
+"""Direct Cloudflare v4 REST API backend for D1, KV and R2.
+
+Spawning ``wrangler`` costs about a second of Node startup per call, and
+commands like ``gw tenant stats`` or ``gw cache purge`` make dozens of
+calls. With ``[cloudflare] backend = "api"`` in gw.toml, Wrangler.execute()
+hands the operations below to this module instead, which talks HTTPS to
+the API over shared keep-alive connections:
+
+- ``d1 execute <db> --remote --command <sql>``
+- ``kv key list|get|put|delete`` and ``kv bulk delete`` (also ``kv:key``)
+- ``r2 object list|get|put|delete``
+
+Output matches what wrangler prints for the same arguments, so callers
+don't change. Anything else (backups, deploys, tail, --local, KV metadata)
+returns None from execute_wrangler_args() and runs through wrangler.
+"""
+
+import http.client
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import quote, urlencode, urlsplit
+
+from .wrangler import WranglerError
+
+DEFAULT_API_URL = "https://api.cloudflare.com/client/v4"
+
+# Environment variable holding the API token (the same one wrangler reads)
+API_TOKEN_ENV = "CLOUDFLARE_API_TOKEN"
+
+# Keys per KV list page and per bulk delete request (API maximums)
+KV_LIST_PAGE = 1000
+KV_BULK_DELETE_MAX = 10_000
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_CONNECTIONS = 16
+
+
+class CloudflareAPIError(WranglerError):
+    """Raised when a Cloudflare API call fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, shared across threads."""
+
+    def __init__(self, scheme: str, netloc: str, timeout: float = 30.0):
+        """
+        Args:
+            scheme: "https" or "http"
+            netloc: host[:port]
+            timeout: Socket timeout per request (seconds)
+        """
+        self.scheme = scheme
+        self.netloc = netloc
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        conn_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return conn_class(self.netloc, timeout=self.timeout)
+
+    def request(
+        self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[dict[str, str]] = None
+    ) -> tuple[int, bytes]:
+        """Send a request, reusing an idle connection when there is one.
+
+        A reused connection the server already closed is retried once on a
+        fresh connection.
+
+        Returns:
+            (status, body)
+        """
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        reused = conn is not None
+
+        while True:
+            if conn is None:
+                conn = self._connect()
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if not reused:
+                    raise
+                conn, reused = None, False
+                continue
+            except BaseException:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                with self._lock:
+                    if len(self._idle) < MAX_IDLE_CONNECTIONS:
+                        self._idle.append(conn)
+                        conn = None
+                if conn is not None:
+                    conn.close()
+            return response.status, data
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+# (scheme, netloc) -> pool, shared by every CloudflareAPI in the process
+_pools: dict[tuple[str, str], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(api_url: str) -> ConnectionPool:
+    """Get the shared connection pool for an API base URL."""
+    parts = urlsplit(api_url)
+    key = (parts.scheme, parts.netloc)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(*key)
+        return _pools[key]
+
+
+def _forget_pools() -> None:
+    """Drop pools inherited by a forked child (gw daemon requests).
+
+    Two processes must never share a connection.
+    """
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pools)
+
+
+class CloudflareAPI:
+    """Client for the D1, KV and R2 parts of the Cloudflare v4 API.
+
+    Example:
+        api = CloudflareAPI(account_id, os.environ["CLOUDFLARE_API_TOKEN"])
+        rows = api.d1_query(database_id, "SELECT 1")[0]["results"]
+    """
+
+    def __init__(self, account_id: str, api_token: str, api_url: str = DEFAULT_API_URL):
+        """
+        Args:
+            account_id: Cloudflare account ID
+            api_token: API token with D1/KV/R2 permissions
+            api_url: API base URL
+        """
+        self.account_id = account_id
+        self.pool = get_pool(api_url)
+        self._base = f"{urlsplit(api_url).path.rstrip('/')}/accounts/{account_id}"
+        self._headers = {"Authorization": f"Bearer {api_token}"}
+        self._database_ids: dict[str, str] = {}
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        body: Any = None,
+        content_type: Optional[str] = None,
+        raw: bool = False,
+    ) -> Any:
+        """Make one API call.
+
+        Args:
+            method: HTTP method
+            path: Path below /accounts/<id>
+            params: Query parameters (None values dropped)
+            body: dict/list (sent as JSON), bytes or str
+            content_type: Content-Type for a bytes/str body
+            raw: Return the response body instead of the JSON envelope
+
+        Raises:
+            CloudflareAPIError: On network errors and non-success responses
+        """
+        url = self._base + path
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        if query:
+            url += "?" + urlencode(query)
+
+        headers = dict(self._headers)
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        elif isinstance(body, str):
+            body = body.encode()
+        if content_type:
+            headers["Content-Type"] = content_type
+
+        try:
+            status, data = self.pool.request(method, url, body, headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise CloudflareAPIError(f"Cloudflare API request failed: {e}") from e
+
+        if raw and status < 300:
+            return data
+
+        try:
+            envelope = json.loads(data) if data else {}
+        except json.JSONDecodeError:
+            envelope = {}
+        if status >= 300 or not envelope.get("success", raw):
+            messages = "; ".join(
+                f"{err.get('message', '')} ({err.get('code')})" for err in envelope.get("errors", [])
+            )
+            raise CloudflareAPIError(
+                f"Cloudflare API {method} {path} failed with HTTP {status}" + (f": {messages}" if messages else ""),
+                status=status,
+            )
+        return envelope
+
+    def _paginate(self, path: str, params: dict[str, Any], limit: Optional[int] = None) -> list[Any]:
+        """Follow result_info.cursor until exhausted or limit items are read."""
+        items: list[Any] = []
+        cursor = None
+        while True:
+            envelope = self._call("GET", path, params={**params, "cursor": cursor})
+            items.extend(envelope.get("result") or [])
+            cursor = (envelope.get("result_info") or {}).get("cursor")
+            if not cursor or (limit is not None and len(items) >= limit):
+                return items[:limit] if limit is not None else items
+
+    # ── D1 ──────────────────────────────────────────────────────────────
+
+    def d1_database_id(self, name: str) -> str:
+        """Look up a D1 database ID by name.
+
+        Raises:
+            CloudflareAPIError: If no database has that name
+        """
+        if name not in self._database_ids:
+            for db in self._call("GET", "/d1/database", params={"name": name}).get("result") or []:
+                if db.get("name") == name:
+                    self._database_ids[name] = db["uuid"]
+                    break
+            else:
+                raise CloudflareAPIError(f"D1 database not found: {name}", status=404)
+        return self._database_ids[name]
+
+    def d1_query(self, database_id: str, sql: str, params: Optional[list[Any]] = None) -> list[dict[str, Any]]:
+        """Run SQL against a D1 database.
+
+        Returns:
+            One {"results", "success", "meta"} entry per statement, the same
+            shape ``wrangler d1 execute --json`` prints
+        """
+        body: dict[str, Any] = {"sql": sql}
+        if params:
+            body["params"] = params
+        database = quote(database_id, safe="")
+        return self._call("POST", f"/d1/database/{database}/query", body=body).get("result") or []
+
+    # ── KV ──────────────────────────────────────────────────────────────
+
+    def _kv_path(self, namespace_id: str, suffix: str = "") -> str:
+        return f"/storage/kv/namespaces/{quote(namespace_id, safe='')}{suffix}"
+
+    def kv_list(self, namespace_id: str, prefix: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+        """List keys ({"name", "expiration"?, "metadata"?}), following pagination."""
+        return self._paginate(
+            self._kv_path(namespace_id, "/keys"),
+            {"prefix": prefix or None, "limit": KV_LIST_PAGE},
+            limit=limit,
+        )
+
+    def kv_get(self, namespace_id: str, key: str) -> bytes:
+        """Read a value.
+
+        Raises:
+            CloudflareAPIError: With status 404 if the key doesn't exist
+        """
+        return self._call("GET", self._kv_path(namespace_id, f"/values/{quote(key, safe='')}"), raw=True)
+
+    def kv_put(
+        self,
+        namespace_id: str,
+        key: str,
+        value: str | bytes,
+        ttl: Optional[int] = None,
+        expiration: Optional[int] = None,
+    ) -> None:
+        """Write a value, optionally expiring after ttl seconds or at an epoch time."""
+        self._call(
+            "PUT",
+            self._kv_path(namespace_id, f"/values/{quote(key, safe='')}"),
+            params={"expiration_ttl": ttl, "expiration": expiration},
+            body=value,
+            content_type="text/plain",
+        )
+
+    def kv_delete(self, namespace_id: str, key: str) -> None:
+        """Delete a key (deleting a missing key succeeds)."""
+        self._call("DELETE", self._kv_path(namespace_id, f"/values/{quote(key, safe='')}"))
+
+    def kv_bulk_delete(self, namespace_id: str, keys: list[str]) -> int:
+        """Delete many keys, KV_BULK_DELETE_MAX per request.
+
+        Returns:
+            Number of keys deleted
+        """
+        for start in range(0, len(keys), KV_BULK_DELETE_MAX):
+            self._call("POST", self._kv_path(namespace_id, "/bulk/delete"), body=keys[start:start + KV_BULK_DELETE_MAX])
+        return len(keys)
+
+    # ── R2 ──────────────────────────────────────────────────────────────
+
+    def _r2_path(self, bucket: str, key: Optional[str] = None) -> str:
+        path = f"/r2/buckets/{quote(bucket, safe='')}/objects"
+        return path if key is None else f"{path}/{quote(key, safe='')}"
+
+    def r2_list(self, bucket: str, prefix: Optional[str] = None, limit: Optional[int] = None) -> list[dict]:
+        """List objects ({"key", "size", "etag", "last_modified", ...})."""
+        return self._paginate(self._r2_path(bucket), {"prefix": prefix or None, "per_page": 1000}, limit=limit)
+
+    def r2_get(self, bucket: str, key: str) -> bytes:
+        """Download an object."""
+        return self._call("GET", self._r2_path(bucket, key), raw=True)
+
+    def r2_put(self, bucket: str, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        """Upload an object."""
+        self._call("PUT", self._r2_path(bucket, key), body=data, content_type=content_type or "application/octet-stream")
+
+    def r2_delete(self, bucket: str, key: str) -> None:
+        """Delete an object."""
+        self._call("DELETE", self._r2_path(bucket, key))
+
+
+# ── wrangler argv translation ───────────────────────────────────────────
+
+
+def _parse(args: list[str], value_flags: set[str], bool_flags: set[str]) -> Optional[tuple[list[str], dict[str, Any]]]:
+    """Split wrangler args into positionals and options.
+
+    Returns:
+        (positionals, options), or None if an unknown flag is present
+    """
+    positionals: list[str] = []
+    options: dict[str, Any] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--"):
+            name, _, inline = arg[2:].partition("=")
+            if name in bool_flags:
+                options[name] = True
+            elif name in value_flags:
+                if inline:
+                    options[name] = inline
+                elif i + 1 < len(args):
+                    i += 1
+                    options[name] = args[i]
+                else:
+                    return None
+            else:
+                return None
+        else:
+            positionals.append(arg)
+        i += 1
+    return positionals, options
+
+
+def execute_wrangler_args(
+    api: CloudflareAPI,
+    args: list[str],
+    database_id: Callable[[str], str],
+) -> Optional[str]:
+    """Run a wrangler command through the API, if it is one this backend covers.
+
+    Args:
+        api: API client
+        args: Wrangler arguments (as passed to Wrangler.execute, incl. --json)
+        database_id: Resolves a D1 database name to its ID
+
+    Returns:
+        What wrangler would have printed, or None if unsupported
+
+    Raises:
+        CloudflareAPIError: If the API call fails
+    """
+    if not args:
+        return None
+
+    # "kv:key list" (wrangler 3) and "kv key list" (wrangler 4) are the same
+    head = args[0].split(":") + args[1:]
+    group = head[0]
+
+    if group == "d1" and len(head) > 1 and head[1] == "execute":
+        parsed = _parse(head[2:], {"command"}, {"remote", "json", "yes", "y"})
+        if parsed is None or not parsed[1].get("remote") or "command" not in parsed[1] or len(parsed[0]) != 1:
+            return None
+        return json.dumps(api.d1_query(database_id(parsed[0][0]), parsed[1]["command"]))
+
+    if group == "kv" and len(head) > 2 and head[1] == "key":
+        parsed = _parse(head[3:], {"namespace-id", "prefix", "ttl", "expiration"}, {"remote", "json", "preview"})
+        if parsed is None or "namespace-id" not in parsed[1] or parsed[1].get("preview"):
+            return None
+        positionals, options = parsed
+        ns = options["namespace-id"]
+        action = head[2]
+
+        if action == "list" and not positionals:
+            return json.dumps(api.kv_list(ns, prefix=options.get("prefix")))
+        if action == "get" and len(positionals) == 1:
+            try:
+                return api.kv_get(ns, positionals[0]).decode("utf-8", errors="replace")
+            except CloudflareAPIError as e:
+                if e.status == 404:
+                    raise CloudflareAPIError(f"Key not found: {positionals[0]}", status=404) from e
+                raise
+        if action == "put" and len(positionals) == 2:
+            api.kv_put(
+                ns,
+                positionals[0],
+                positionals[1],
+                ttl=int(options["ttl"]) if "ttl" in options else None,
+                expiration=int(options["expiration"]) if "expiration" in options else None,
+            )
+            return f"Writing the value \"{positionals[1]}\" to key \"{positionals[0]}\".\n"
+        if action == "delete" and len(positionals) == 1:
+            api.kv_delete(ns, positionals[0])
+            return f"Deleting the key \"{positionals[0]}\".\n"
+        return None
+
+    if group == "kv" and len(head) > 2 and head[1] == "bulk" and head[2] == "delete":
+        parsed = _parse(head[3:], {"namespace-id"}, {"remote", "force", "f"})
+        if parsed is None or "namespace-id" not in parsed[1] or len(parsed[0]) != 1:
+            return None
+        entries = json.loads(Path(parsed[0][0]).read_text())
+        keys = [entry["name"] if isinstance(entry, dict) else entry for entry in entries]
+        deleted = api.kv_bulk_delete(parsed[1]["namespace-id"], keys)
+        return f"Deleted {deleted} key-value pairs.\n"
+
+    if group == "r2" and len(head) > 2 and head[1] == "object":
+        parsed = _parse(head[3:], {"prefix", "file", "content-type"}, {"remote", "json"})
+        if parsed is None:
+            return None
+        positionals, options = parsed
+        action = head[2]
+
+        if action == "list" and len(positionals) == 1:
+            return json.dumps(api.r2_list(positionals[0], prefix=options.get("prefix")))
+        if len(positionals) != 2 and not (len(positionals) == 1 and "/" in positionals[0]):
+            return None
+        # wrangler also accepts "<bucket>/<key>" as a single argument
+        bucket, key = positionals if len(positionals) == 2 else positionals[0].split("/", 1)
+
+        if action == "get" and "file" in options:
+            Path(options["file"]).write_bytes(api.r2_get(bucket, key))
+            return f"Downloading \"{key}\" from \"{bucket}\".\nDownload complete.\n"
+        if action == "put" and "file" in options:
+            api.r2_put(bucket, key, Path(options["file"]).read_bytes(), content_type=options.get("content-type"))
+            return f"Creating object \"{key}\" in bucket \"{bucket}\".\nUpload complete.\n"
+        if action == "delete":
+            api.r2_delete(bucket, key)
+            return f"Deleting object \"{key}\" from bucket \"{bucket}\".\nDelete complete.\n"
+        return None
+
+    return None
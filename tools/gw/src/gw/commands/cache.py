@@ -4,9 +4,12 @@ Provides commands to list and purge cache entries from KV namespaces
 and Cloudflare CDN.
 """
 
+import hashlib
 import json
 import os
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable
 
 import click
 
@@ -33,6 +36,16 @@ CACHE_CATEGORIES = {
 }
 
 
+# Keys per bulk delete request (the KV bulk API maximum)
+PURGE_CHUNK_SIZE = 10_000
+
+# Bulk delete requests in flight at once, by default
+PURGE_CONCURRENCY = 4
+
+# Remaining keys of interrupted purges, one file per namespace + prefix
+PURGE_CHECKPOINT_DIR = Path.home() / ".grove" / "purge-checkpoints"
+
+
 def parse_wrangler_json(output: str) -> list[dict[str, Any]]:
     """Parse wrangler JSON output."""
     try:
@@ -195,6 +208,20 @@ def cache_list(
     "--all", "-a", "purge_all", is_flag=True, help="Purge all (requires confirmation)"
 )
 @click.option("--yes", "-y", is_flag=True, help="Skip confirmation")
+@click.option(
+    "--concurrency",
+    "-j",
+    type=click.IntRange(1, 16),
+    default=PURGE_CONCURRENCY,
+    help=f"Bulk delete requests in flight (default: {PURGE_CONCURRENCY})",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(1, PURGE_CHUNK_SIZE),
+    default=PURGE_CHUNK_SIZE,
+    help=f"Keys per bulk delete (default: {PURGE_CHUNK_SIZE})",
+)
+@click.option("--resume", is_flag=True, help="Continue an interrupted purge from its checkpoint")
 @click.pass_context
 def cache_purge(
     ctx: click.Context,
@@ -204,15 +231,27 @@ def cache_purge(
     cdn: bool,
     purge_all: bool,
     yes: bool,
+    concurrency: int,
+    chunk_size: int,
+    resume: bool,
 ) -> None:
     """Purge cache entries.
 
+    Keys are deleted with KV bulk deletes, several chunks at a time. An
+    interrupted or partly failed purge leaves a checkpoint; running the
+    same command with --resume picks up the keys that are left. Without
+    --resume the keys are listed again.
+
     Examples:
 
         gw cache purge "cache:autumn:homepage"   # Purge specific key
 
         gw cache purge --tenant autumn           # Purge all tenant keys
 
+        gw cache purge --prefix page: -j 8       # 8 bulk deletes at a time
+
+        gw cache purge --tenant autumn --resume  # Finish an interrupted purge
+
         gw cache purge --cdn autumn.grove.place  # Purge CDN for domain
 
         gw cache purge --cdn --all               # Full CDN purge (dangerous!)
@@ -228,22 +267,47 @@ def cache_purge(
 
     # KV purge
     if key:
-        keys_to_purge = [key]
+        key_prefix = None
     elif tenant:
-        # List all keys for tenant first
-        keys_to_purge = _list_keys_by_prefix(wrangler, config, f"cache:{tenant}:")
+        key_prefix = f"cache:{tenant}:"
     elif prefix:
-        keys_to_purge = _list_keys_by_prefix(wrangler, config, prefix)
+        key_prefix = prefix
     elif purge_all:
         if not yes:
             error("Purging all cache requires --yes flag")
             ctx.exit(1)
-        keys_to_purge = _list_keys_by_prefix(wrangler, config, "")
+        key_prefix = ""
     else:
         error("Specify a key, --tenant, --prefix, or --all")
         ctx.exit(1)
 
+    # Get namespace ID
+    ns_config = config.kv_namespaces.get("cache")
+    if not ns_config:
+        error("Cache KV namespace not configured")
+        ctx.exit(1)
+
+    ns_id = ns_config.id
+    checkpoint = None if key_prefix is None else _checkpoint_path(ns_id, key_prefix)
+
+    saved_keys = _load_checkpoint(checkpoint) if checkpoint and resume else None
+    if key_prefix is None:
+        keys_to_purge = [key]
+    elif saved_keys is not None:
+        keys_to_purge = saved_keys
+        if not output_json:
+            info(f"Resuming purge from checkpoint: {len(keys_to_purge)} keys left")
+    else:
+        if not output_json:
+            if resume:
+                warning("No readable checkpoint for this purge; listing keys again")
+            elif checkpoint.exists():
+                info("Listing keys again; pass --resume to continue the interrupted purge")
+        keys_to_purge = _list_keys_by_prefix(wrangler, config, key_prefix)
+
     if not keys_to_purge:
+        if checkpoint:
+            checkpoint.unlink(missing_ok=True)
         if output_json:
             console.print(json.dumps({"purged": 0}))
         else:
@@ -256,34 +320,58 @@ def cache_purge(
             info("Cancelled")
             return
 
-    # Get namespace ID
-    ns_config = config.kv_namespaces.get("cache")
-    if not ns_config:
-        error("Cache KV namespace not configured")
-        ctx.exit(1)
+    remaining = dict.fromkeys(keys_to_purge)
+    if checkpoint:
+        _save_checkpoint(checkpoint, list(remaining))
 
-    ns_id = ns_config.id
-    purged = 0
-    errors = []
+    if output_json:
+        errors = _bulk_purge(
+            wrangler, ns_id, keys_to_purge, chunk_size, concurrency,
+            lambda chunk: _mark_purged(checkpoint, remaining, chunk),
+        )
+    else:
+        from rich.progress import (
+            BarColumn,
+            MofNCompleteColumn,
+            Progress,
+            TextColumn,
+            TimeElapsedColumn,
+        )
 
-    for k in keys_to_purge:
-        try:
-            wrangler.execute(["kv:key", "delete", "--namespace-id", ns_id, k])
-            purged += 1
-            if not output_json:
-                success(f"Purged: {k}")
-        except WranglerError as e:
-            errors.append({"key": k, "error": str(e)})
-            if not output_json:
-                error(f"Failed to purge {k}: {e}")
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Purging keys", total=len(keys_to_purge))
+
+            def on_chunk(chunk: list[str]) -> None:
+                _mark_purged(checkpoint, remaining, chunk)
+                progress.advance(task, len(chunk))
+
+            errors = _bulk_purge(wrangler, ns_id, keys_to_purge, chunk_size, concurrency, on_chunk)
+
+    purged = len(keys_to_purge) - len(remaining)
+    if checkpoint and not remaining:
+        checkpoint.unlink(missing_ok=True)
 
     if output_json:
-        console.print(json.dumps({"purged": purged, "errors": errors}, indent=2))
-    else:
-        console.print()
-        success(f"Purged {purged} keys")
-        if errors:
-            warning(f"{len(errors)} errors occurred")
+        console.print(
+            json.dumps({"purged": purged, "remaining": len(remaining), "errors": errors}, indent=2)
+        )
+        return
+
+    console.print()
+    success(f"Purged {purged} keys")
+    for chunk_error in errors:
+        error(
+            f"Failed to purge {chunk_error['keys']} keys from {chunk_error['first_key']}: "
+            f"{chunk_error['error']}"
+        )
+    if remaining and checkpoint:
+        warning(f"{len(remaining)} keys left; run the same command with --resume to continue")
 
 
 @cache.command("stats")
@@ -354,6 +442,73 @@ def _list_keys_by_prefix(
         return []
 
 
+def _bulk_purge(
+    wrangler: Wrangler,
+    ns_id: str,
+    keys: list[str],
+    chunk_size: int,
+    concurrency: int,
+    on_chunk: Callable[[list[str]], None],
+) -> list[dict[str, Any]]:
+    """Delete keys in bulk chunks, up to `concurrency` requests at a time.
+
+    on_chunk is called from this thread as each chunk finishes, so it can
+    update progress and checkpoints without locking.
+
+    Returns:
+        One error entry per failed chunk
+    """
+    chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+    # Resolve the backend once so worker threads share one API client
+    wrangler.api()
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+        futures = {pool.submit(wrangler.kv_bulk_delete, ns_id, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                future.result()
+            except WranglerError as e:
+                errors.append({"first_key": chunk[0], "keys": len(chunk), "error": str(e)})
+                continue
+            on_chunk(chunk)
+    return errors
+
+
+def _checkpoint_path(ns_id: str, prefix: str) -> Path:
+    """Checkpoint file for purging a prefix from a namespace."""
+    digest = hashlib.sha256(f"{ns_id}\0{prefix}".encode()).hexdigest()[:16]
+    return PURGE_CHECKPOINT_DIR / f"{digest}.json"
+
+
+def _load_checkpoint(path: Path) -> list[str] | None:
+    """Keys a previous purge didn't get to (None if missing or unreadable)."""
+    try:
+        keys = json.loads(path.read_text())["keys"]
+    except (OSError, json.JSONDecodeError, KeyError, TypeError):
+        return None
+    if not isinstance(keys, list):
+        return None
+    return keys
+
+
+def _save_checkpoint(path: Path, keys: list[str]) -> None:
+    """Atomically record the keys still to purge."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"keys": keys}))
+    os.replace(tmp, path)
+
+
+def _mark_purged(checkpoint: Path | None, remaining: dict[str, None], chunk: list[str]) -> None:
+    """Drop a finished chunk from the remaining keys and its checkpoint."""
+    for k in chunk:
+        remaining.pop(k, None)
+    if checkpoint:
+        _save_checkpoint(checkpoint, list(remaining))
+
+
 def _purge_cdn(ctx: click.Context, url: str | None, purge_all: bool, yes: bool) -> None:
     """Purge Cloudflare CDN cache."""
     import subprocess
@@ -0,0 +1,166 @@
+"""Daemon commands - keep a warm gw in the background for fast agent calls."""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from ..ui import GROVE_COLORS, CozyGroup, console, create_table, error, info, success, warning
+
+
+DAEMON_CATEGORIES = {
+    "control": (
+        "\U0001f527 Control",
+        GROVE_COLORS["bark_brown"],
+        [
+            ("start", "Start the daemon in the background"),
+            ("stop", "Stop the running daemon"),
+        ],
+    ),
+    "read": (
+        "\U0001f4d6 Read (Always Safe)",
+        GROVE_COLORS["forest_green"],
+        [
+            ("status", "Show daemon status"),
+        ],
+    ),
+}
+
+# How long `gw daemon start` waits for the daemon to answer (seconds)
+START_TIMEOUT = 30.0
+
+
+@click.group(cls=CozyGroup, cozy_categories=DAEMON_CATEGORIES, cozy_show_safety=False)
+def daemon() -> None:
+    """Persistent gw daemon for near-instant commands.
+
+    The daemon keeps a warm interpreter with config, Cloudflare identity and
+    the monorepo index loaded. Run commands through it with `gwd` instead of
+    `gw` (falls back to plain gw when no daemon is running).
+    """
+    pass
+
+
+@daemon.command("start")
+@click.option("--foreground", is_flag=True, help="Run in this terminal instead of the background")
+@click.option("--socket", "sock", type=click.Path(path_type=Path), help="Unix socket path")
+@click.pass_context
+def daemon_start(ctx: click.Context, foreground: bool, sock: Path | None) -> None:
+    """Start the gw daemon.
+
+    \b
+    Examples:
+        gw daemon start              # Background, socket in ~/.grove
+        gw daemon start --foreground # Log to this terminal
+        alias gw=gwd                 # Route every call through it
+    """
+    from ..client import request, socket_path
+    from ..daemon import GWDaemon, log_path
+
+    output_json = ctx.obj.get("output_json", False)
+    sock_path = sock or socket_path()
+
+    running = request({"op": "ping"}, sock_path)
+    if running is not None:
+        if output_json:
+            console.print(json.dumps({"started": False, **running}))
+        else:
+            info(f"gw daemon already running (pid {running.get('pid', '?')})")
+        return
+
+    if foreground:
+        try:
+            GWDaemon(sock_path).serve_forever()
+        except RuntimeError as e:
+            error(str(e))
+            raise SystemExit(1)
+        return
+
+    sock_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    with open(log_path(sock_path), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "gw.daemon", "--socket", str(sock_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + START_TIMEOUT
+    status = None
+    while status is None and time.monotonic() < deadline:
+        time.sleep(0.1)
+        status = request({"op": "ping"}, sock_path)
+
+    if status is None:
+        error(f"gw daemon didn't start; see {log_path(sock_path)}")
+        raise SystemExit(1)
+
+    if output_json:
+        console.print(json.dumps({"started": True, **status}))
+    else:
+        success(f"gw daemon started (pid {status['pid']})")
+        info("Run commands through it with: gwd <command>")
+
+
+@daemon.command("stop")
+@click.option("--socket", "sock", type=click.Path(path_type=Path), help="Unix socket path")
+@click.pass_context
+def daemon_stop(ctx: click.Context, sock: Path | None) -> None:
+    """Stop the gw daemon.
+
+    Commands already running in it finish on their own.
+    """
+    from ..client import request, socket_path
+
+    output_json = ctx.obj.get("output_json", False)
+    reply = request({"op": "stop"}, sock or socket_path())
+
+    if output_json:
+        console.print(json.dumps({"stopped": reply is not None}))
+    elif reply is None:
+        warning("No gw daemon running")
+    else:
+        success(f"gw daemon stopped (pid {reply.get('pid', '?')})")
+
+
+@daemon.command("status")
+@click.option("--socket", "sock", type=click.Path(path_type=Path), help="Unix socket path")
+@click.pass_context
+def daemon_status(ctx: click.Context, sock: Path | None) -> None:
+    """Show whether the daemon is running and how busy it has been."""
+    from ..client import request, socket_path, source_fingerprint
+
+    output_json = ctx.obj.get("output_json", False)
+    sock_path = sock or socket_path()
+    status = request({"op": "ping"}, sock_path)
+
+    if output_json:
+        console.print(json.dumps({"running": status is not None, **(status or {})}))
+        return
+
+    if status is None:
+        info(f"No gw daemon running on {sock_path}")
+        info("Start one with: gw daemon start")
+        return
+    if "error" in status:
+        warning(f"A different gw version is listening ({status['error']}); restart it")
+        return
+    if status.get("source") != source_fingerprint():
+        warning(
+            "gw sources changed since the daemon started; "
+            "gwd runs gw directly until you restart it"
+        )
+
+    table = create_table(title="gw daemon")
+    table.add_column("Field", style="cyan")
+    table.add_column("Value")
+    fields = (
+        "pid", "version", "socket", "uptime_seconds", "requests_served", "running_commands"
+    )
+    for key in fields:
+        table.add_row(key.replace("_", " "), str(status[key]))
+    console.print(table)
@@ -36,6 +36,16 @@ TENANT_CATEGORIES = {
 }
 
 
+# (counts key, table, extra aggregate columns) gathered by `tenant stats`.
+# gallery_images is the primary image store — image_hashes only tracks dedup.
+STAT_TABLES = (
+    ("posts", "posts", ""),
+    ("pages", "pages", ""),
+    ("images", "gallery_images", ", COALESCE(SUM(COALESCE(file_size, 0)), 0) as total_bytes"),
+    ("sessions", "sessions", ""),
+)
+
+
 def parse_wrangler_json(output: str) -> list[dict[str, Any]]:
     """Parse wrangler JSON output, extracting results."""
     try:
@@ -134,10 +144,7 @@ def tenant_lookup(
         ctx.exit(1)
 
     try:
-        result = wrangler.execute(
-            ["d1", "execute", db_name, "--remote", "--json", "--command", query]
-        )
-        rows = parse_wrangler_json(result)
+        rows = wrangler.d1_batch(db_name, [query])[0]
     except WranglerError as e:
         if output_json:
             console.print(json.dumps({"error": str(e)}))
@@ -163,7 +170,8 @@ def tenant_lookup(
 
 
 @tenant.command("stats")
-@click.argument("subdomain")
+@click.argument("subdomain", required=False)
+@click.option("--all", "all_tenants", is_flag=True, help="Show statistics for every tenant")
 @click.option(
     "--db",
     "-d",
@@ -172,17 +180,28 @@ def tenant_lookup(
     help="Database alias (default: lattice)",
 )
 @click.pass_context
-def tenant_stats(ctx: click.Context, subdomain: str, database: str) -> None:
+def tenant_stats(ctx: click.Context, subdomain: str | None, all_tenants: bool, database: str) -> None:
     """Show detailed statistics for a tenant.
 
+    The tenant row and every count are fetched in a single D1 request.
+
     Examples:
 
         gw tenant stats autumn
+
+        gw tenant stats --all            # Every tenant, one query batch
     """
     config: GWConfig = ctx.obj["config"]
     output_json: bool = ctx.obj.get("output_json", False)
     wrangler = Wrangler(config)
 
+    if bool(subdomain) == all_tenants:
+        if output_json:
+            console.print(json.dumps({"error": "Provide a subdomain or --all"}))
+        else:
+            error("Please provide a subdomain or --all")
+        ctx.exit(1)
+
     # Resolve database
     db_name = config.databases.get(database)
     if db_name:
@@ -190,20 +209,18 @@ def tenant_stats(ctx: click.Context, subdomain: str, database: str) -> None:
     else:
         db_name = database
 
-    # Get tenant info
+    if all_tenants:
+        tenant_query = "SELECT * FROM tenants ORDER BY created_at DESC"
+        tenant_filter = ""
+    else:
+        safe_subdomain = _escape_sql(subdomain)
+        tenant_query = f"SELECT * FROM tenants WHERE subdomain = '{safe_subdomain}'"
+        tenant_filter = f" WHERE tenant_id = (SELECT id FROM tenants WHERE subdomain = '{safe_subdomain}')"
+
     try:
-        result = wrangler.execute(
-            [
-                "d1",
-                "execute",
-                db_name,
-                "--remote",
-                "--json",
-                "--command",
-                f"SELECT * FROM tenants WHERE subdomain = '{_escape_sql(subdomain)}'",
-            ]
+        tenant_rows, *count_sets = _query_batch(
+            wrangler, db_name, [tenant_query, *_count_statements(tenant_filter)]
         )
-        tenant_rows = parse_wrangler_json(result)
     except WranglerError as e:
         if output_json:
             console.print(json.dumps({"error": str(e)}))
@@ -211,97 +228,24 @@ def tenant_stats(ctx: click.Context, subdomain: str, database: str) -> None:
             error(f"Query failed: {e}")
         ctx.exit(1)
 
-    if not tenant_rows:
+    all_stats = _collect_stats(tenant_rows, count_sets)
+
+    if all_tenants:
+        if output_json:
+            console.print(json.dumps({"tenants": all_stats}, indent=2))
+        else:
+            _display_all_stats(all_stats)
+        return
+
+    if not all_stats:
         if output_json:
             console.print(json.dumps({"error": "Tenant not found"}))
         else:
             warning(f"Tenant '{subdomain}' not found")
         ctx.exit(1)
 
-    tenant_data = tenant_rows[0]
-    tenant_id = tenant_data.get("id")
-
-    # Gather stats
-    stats = {"tenant": tenant_data, "counts": {}}
-
-    # Count posts
-    try:
-        result = wrangler.execute(
-            [
-                "d1",
-                "execute",
-                db_name,
-                "--remote",
-                "--json",
-                "--command",
-                f"SELECT COUNT(*) as count FROM posts WHERE tenant_id = '{tenant_id}'",
-            ]
-        )
-        count_rows = parse_wrangler_json(result)
-        stats["counts"]["posts"] = count_rows[0].get("count", 0) if count_rows else 0
-    except WranglerError:
-        stats["counts"]["posts"] = "?"
-
-    # Count pages
-    try:
-        result = wrangler.execute(
-            [
-                "d1",
-                "execute",
-                db_name,
-                "--remote",
-                "--json",
-                "--command",
-                f"SELECT COUNT(*) as count FROM pages WHERE tenant_id = '{tenant_id}'",
-            ]
-        )
-        count_rows = parse_wrangler_json(result)
-        stats["counts"]["pages"] = count_rows[0].get("count", 0) if count_rows else 0
-    except WranglerError:
-        stats["counts"]["pages"] = "?"
-
-    # Count images and calculate actual storage from gallery_images
-    # (gallery_images is the primary image store — image_hashes only tracks dedup)
-    try:
-        result = wrangler.execute(
-            [
-                "d1",
-                "execute",
-                db_name,
-                "--remote",
-                "--json",
-                "--command",
-                f"SELECT COUNT(*) as count, COALESCE(SUM(COALESCE(file_size, 0)), 0) as total_bytes FROM gallery_images WHERE tenant_id = '{tenant_id}'",
-            ]
-        )
-        count_rows = parse_wrangler_json(result)
-        if count_rows:
-            stats["counts"]["images"] = count_rows[0].get("count", 0)
-            stats["storage_used_bytes"] = count_rows[0].get("total_bytes", 0)
-        else:
-            stats["counts"]["images"] = 0
-            stats["storage_used_bytes"] = 0
-    except WranglerError:
-        stats["counts"]["images"] = "?"
-        stats["storage_used_bytes"] = 0
-
-    # Count sessions
-    try:
-        result = wrangler.execute(
-            [
-                "d1",
-                "execute",
-                db_name,
-                "--remote",
-                "--json",
-                "--command",
-                f"SELECT COUNT(*) as count FROM sessions WHERE tenant_id = '{tenant_id}'",
-            ]
-        )
-        count_rows = parse_wrangler_json(result)
-        stats["counts"]["sessions"] = count_rows[0].get("count", 0) if count_rows else 0
-    except WranglerError:
-        stats["counts"]["sessions"] = "?"
+    stats = all_stats[0]
+    tenant_data = stats["tenant"]
 
     if output_json:
         console.print(json.dumps(stats, indent=2))
@@ -333,7 +277,7 @@ Created: {format_timestamp(tenant_data.get('created_at'))}"""
     console.print(stats_table)
     console.print()
 
-    # Storage panel — use actual storage from image_hashes, not stale tenants.storage_used_bytes
+    # Storage panel — use actual storage from gallery_images, not stale tenants.storage_used_bytes
     actual_storage = stats.get("storage_used_bytes", 0) or 0
     storage_limit = tenant_data.get("storage_limit_bytes", 0) or 0
 
@@ -389,10 +333,7 @@ def tenant_list(
     query += f" ORDER BY created_at DESC LIMIT {limit}"
 
     try:
-        result = wrangler.execute(
-            ["d1", "execute", db_name, "--remote", "--json", "--command", query]
-        )
-        rows = parse_wrangler_json(result)
+        rows = wrangler.d1_batch(db_name, [query])[0]
     except WranglerError as e:
         if output_json:
             console.print(json.dumps({"error": str(e)}))
@@ -473,6 +414,99 @@ def _escape_sql(value: str) -> str:
     return value.replace("'", "''")
 
 
+def _count_statements(tenant_filter: str) -> list[str]:
+    """Per-tenant count queries for STAT_TABLES, grouped by tenant_id."""
+    return [
+        f"SELECT tenant_id, COUNT(*) as count{extra} FROM {table}{tenant_filter} GROUP BY tenant_id"
+        for _, table, extra in STAT_TABLES
+    ]
+
+
+def _query_batch(
+    wrangler: Wrangler, db_name: str, statements: list[str]
+) -> list[list[dict[str, Any]] | None]:
+    """Run statements as one D1 batch, isolating failures if the batch fails.
+
+    One bad statement (e.g. a table missing in an older schema) fails the
+    whole batch, so on error each statement is retried on its own and the
+    failing ones come back as None. A failure of the first statement is
+    raised.
+    """
+    try:
+        return wrangler.d1_batch(db_name, statements)
+    except WranglerError:
+        if len(statements) == 1:
+            raise
+
+    results: list[list[dict[str, Any]] | None] = [wrangler.d1_batch(db_name, statements[:1])[0]]
+    for statement in statements[1:]:
+        try:
+            results.append(wrangler.d1_batch(db_name, [statement])[0])
+        except WranglerError:
+            results.append(None)
+    return results
+
+
+def _collect_stats(
+    tenants: list[dict[str, Any]], count_sets: list[list[dict[str, Any]] | None]
+) -> list[dict[str, Any]]:
+    """Join grouped count rows onto each tenant.
+
+    Tables whose query failed report "?" for every tenant.
+    """
+    indexes = [
+        None if rows is None else {row.get("tenant_id"): row for row in rows}
+        for rows in count_sets
+    ]
+
+    all_stats = []
+    for tenant_data in tenants:
+        stats: dict[str, Any] = {"tenant": tenant_data, "counts": {}, "storage_used_bytes": 0}
+        for (key, _, _), index in zip(STAT_TABLES, indexes):
+            if index is None:
+                stats["counts"][key] = "?"
+                continue
+            row = index.get(tenant_data.get("id"), {})
+            stats["counts"][key] = row.get("count", 0)
+            if "total_bytes" in row:
+                stats["storage_used_bytes"] = row["total_bytes"] or 0
+        all_stats.append(stats)
+    return all_stats
+
+
+def _display_all_stats(all_stats: list[dict[str, Any]]) -> None:
+    """Display statistics for many tenants as one table."""
+    console.print(f"\n[bold green]Tenant Statistics[/bold green] ({len(all_stats)} tenants)\n")
+
+    if not all_stats:
+        info("No tenants found")
+        return
+
+    stats_table = create_table()
+    stats_table.add_column("Subdomain", style="cyan")
+    stats_table.add_column("Plan", style="magenta")
+    stats_table.add_column("Posts", style="green", justify="right")
+    stats_table.add_column("Pages", style="green", justify="right")
+    stats_table.add_column("Images", style="green", justify="right")
+    stats_table.add_column("Sessions", style="green", justify="right")
+    stats_table.add_column("Storage", style="yellow", justify="right")
+
+    for stats in all_stats:
+        tenant_data = stats["tenant"]
+        counts = stats["counts"]
+        stats_table.add_row(
+            tenant_data.get("subdomain", "-"),
+            tenant_data.get("plan", "-"),
+            str(counts["posts"]),
+            str(counts["pages"]),
+            str(counts["images"]),
+            str(counts["sessions"]),
+            format_bytes(stats["storage_used_bytes"]),
+        )
+
+    console.print(stats_table)
+
+
 @tenant.command("create")
 @click.option("--write", is_flag=True, required=True, help="Confirm write operation")
 @click.option("--subdomain", "-s", help="Subdomain for the tenant")
@@ -1,5 +1,6 @@
 """Configuration loading and management for Grove Wrap."""
 
+import copy
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -7,6 +8,10 @@ import tomli
 import tomli_w
 
 
+# ((path, mtime_ns, size), parsed TOML) of the last gw.toml read
+_parsed_config: Optional[tuple[tuple[Path, int, int], dict]] = None
+
+
 @dataclass
 class DatabaseAlias:
     """Database alias configuration."""
@@ -111,6 +116,22 @@ class GitHubConfig:
     project_values: dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class CloudflareConfig:
+    """How gw talks to Cloudflare for D1, KV and R2."""
+
+    # "wrangler" (spawn the wrangler CLI) or "api" (call the v4 REST API
+    # directly, falling back to wrangler for operations it doesn't cover).
+    # The API backend needs CLOUDFLARE_API_TOKEN in the environment.
+    backend: str = "wrangler"
+
+    # Account for API calls (default: CLOUDFLARE_ACCOUNT_ID, then wrangler whoami)
+    account_id: Optional[str] = None
+
+    # API base URL (override to point at a stand-in server)
+    api_url: str = "https://api.cloudflare.com/client/v4"
+
+
 @dataclass
 class GWConfig:
     """Grove Wrap configuration."""
@@ -121,20 +142,28 @@ class GWConfig:
     safety: SafetyConfig
     git: GitConfig = field(default_factory=GitConfig)
     github: GitHubConfig = field(default_factory=GitHubConfig)
+    cloudflare: CloudflareConfig = field(default_factory=CloudflareConfig)
 
     @classmethod
     def load(cls) -> "GWConfig":
         """Load configuration from ~/.grove/gw.toml or create default."""
+        global _parsed_config
         config_dir = Path.home() / ".grove"
         config_file = config_dir / "gw.toml"
 
-        if config_file.exists():
-            with open(config_file, "rb") as f:
-                data = tomli.load(f)
-                return cls._from_dict(data)
-        else:
+        try:
+            st = config_file.stat()
+        except FileNotFoundError:
             return cls._default()
 
+        # Re-parse only when the file changed (the gw daemon loads config on
+        # every request); each call still gets its own copy to mutate
+        key = (config_file, st.st_mtime_ns, st.st_size)
+        if _parsed_config is None or _parsed_config[0] != key:
+            with open(config_file, "rb") as f:
+                _parsed_config = (key, tomli.load(f))
+        return cls._from_dict(copy.deepcopy(_parsed_config[1]))
+
     @classmethod
     def _default(cls) -> "GWConfig":
         """Create default configuration."""
@@ -159,6 +188,7 @@ class GWConfig:
             safety=SafetyConfig(),
             git=GitConfig(),
             github=GitHubConfig(),
+            cloudflare=CloudflareConfig(),
         )
 
     @classmethod
@@ -221,6 +251,14 @@ class GWConfig:
             project_values=github_data.get("project_values", {}),
         )
 
+        # Parse cloudflare configuration
+        cloudflare_data = data.get("cloudflare", {})
+        cloudflare = CloudflareConfig(
+            backend=cloudflare_data.get("backend", "wrangler"),
+            account_id=cloudflare_data.get("account_id"),
+            api_url=cloudflare_data.get("api_url", "https://api.cloudflare.com/client/v4"),
+        )
+
         return cls(
             databases=databases,
             kv_namespaces=kv_namespaces,
@@ -228,6 +266,7 @@ class GWConfig:
             safety=safety,
             git=git,
             github=github,
+            cloudflare=cloudflare,
         )
 
     def save(self) -> None:
@@ -271,7 +310,13 @@ class GWConfig:
                 "project_fields": self.github.project_fields,
                 "project_values": self.github.project_values,
             },
+            "cloudflare": {
+                "backend": self.cloudflare.backend,
+                "api_url": self.cloudflare.api_url,
+            },
         }
+        if self.cloudflare.account_id:
+            data["cloudflare"]["account_id"] = self.cloudflare.account_id
 
         with open(config_file, "wb") as f:
             tomli_w.dump(data, f)
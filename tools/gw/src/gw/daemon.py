@@ -0,0 +1,407 @@
+"""Persistent gw daemon serving thin clients over a Unix socket.
+
+Each ``gw`` invocation normally pays for interpreter start, imports, config
+parsing, ``wrangler whoami`` and monorepo discovery. The daemon does that
+once: it imports every command module, warms the config, whoami and
+monorepo caches, then forks a child per request. The child takes over the
+client's stdin/stdout/stderr (passed over the socket), working directory,
+environment and argv, runs the gw CLI and reports the exit code. Forking
+keeps requests isolated - os.environ, cwd and sys.argv are process-wide -
+while every child starts from the warm interpreter. A child only reuses the
+daemon's whoami result when its Cloudflare token, account ID and HOME match
+the daemon's; the daemon refreshes that result in the background. Once the
+gw sources change (an editable install being worked on), the daemon refuses
+to run commands and ``gwd`` runs gw directly until the daemon is restarted.
+
+Started with ``gw daemon start``; clients connect with ``gwd`` (client.py).
+The socket lives in ~/.grove (mode 0600), and on Linux connections from
+other users are refused.
+
+Usage:
+    python -m gw.daemon [--socket PATH]
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Optional
+
+from . import __version__
+from .client import HEADER, request, send_message, socket_path, source_fingerprint
+
+# Largest request (argv + environment) the daemon accepts
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Longest the accept loop waits before reaping children and checking caches (seconds)
+IDLE_INTERVAL = 1.0
+
+# Start refreshing whoami this long before the shared result expires (seconds)
+WHOAMI_REFRESH_MARGIN = 30.0
+
+
+def pid_path(sock_path: Path) -> Path:
+    """Pid file kept next to the socket."""
+    return sock_path.with_suffix(".pid")
+
+
+def log_path(sock_path: Path) -> Path:
+    """Log file a backgrounded daemon writes to."""
+    return sock_path.with_suffix(".log")
+
+
+def warm(cwd: Path) -> dict[str, Any]:
+    """Import every command and fill the per-process caches children inherit.
+
+    Args:
+        cwd: Directory to discover the monorepo from
+
+    Returns:
+        What was warmed, for the daemon log
+    """
+    import click
+
+    from .cli import LAZY_COMMANDS, main
+    from .config import GWConfig
+    from .packages import load_monorepo
+    from .wrangler import Wrangler, WranglerError
+
+    ctx = click.Context(main)
+    failed = []
+    for name in LAZY_COMMANDS:
+        try:
+            main.get_command(ctx, name)
+        except Exception:  # A command with missing optional deps fails on use, not here
+            failed.append(name)
+
+    config = GWConfig.load()
+    try:
+        account = Wrangler(config).get_account_name()
+    except WranglerError:
+        account = None
+    monorepo = load_monorepo(cwd)
+
+    return {
+        "commands": len(LAZY_COMMANDS) - len(failed),
+        "failed_commands": failed,
+        "cloudflare_account": account,
+        "monorepo": str(monorepo.root) if monorepo else None,
+    }
+
+
+def _reset_consoles() -> None:
+    """Re-detect the terminal for module-level rich consoles.
+
+    Consoles are created when the daemon imports commands, so they saw its
+    detached stdout. Re-initializing them in the child picks up the client's
+    terminal (color, width) and environment (NO_COLOR, COLUMNS).
+    """
+    from rich.console import Console
+
+    for name, module in list(sys.modules.items()):
+        if name == "gw" or name.startswith("gw."):
+            console = getattr(module, "console", None)
+            if isinstance(console, Console):
+                console.__init__()
+
+
+def _run_child(conn: socket.socket, message: dict[str, Any], fds: list[int]) -> None:
+    """Run one gw command in a forked child, then exit.
+
+    Never returns: the child reports its exit code and calls os._exit().
+    """
+    code = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        sys.stdin = open(0, closefd=False)
+        sys.stdout = open(1, "w", buffering=1 if os.isatty(1) else -1, closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+        os.chdir(message["cwd"])
+        os.environ.clear()
+        os.environ.update(message["env"])
+        sys.argv = ["gw", *message["argv"]]
+        _reset_consoles()
+
+        send_message(conn, {"pid": os.getpid()})
+
+        from .cli import main
+
+        try:
+            main.main(args=message["argv"], prog_name="gw")
+            code = 0
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                code = 1
+        except KeyboardInterrupt:
+            code = 130
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            send_message(conn, {"exit_code": code})
+        except OSError:
+            pass
+        os._exit(code)
+
+
+class GWDaemon:
+    """Accept loop of the gw daemon.
+
+    Example:
+        daemon = GWDaemon(socket_path())
+        daemon.serve_forever()
+    """
+
+    def __init__(self, sock_path: Path):
+        """
+        Args:
+            sock_path: Unix socket to listen on
+        """
+        self.sock_path = sock_path
+        self.started_at = time.time()
+        self.served = 0
+        self.children: set[int] = set()
+        self.stopping = False
+        self._sock: Optional[socket.socket] = None
+        self._warmed_at = 0.0
+        self.source = ""
+        self._refresh: Optional[subprocess.Popen] = None
+        self._refresh_started = 0.0
+
+    def bind(self) -> None:
+        """Create the socket (mode 0600), replacing a stale one.
+
+        Raises:
+            RuntimeError: If another daemon is already listening
+        """
+        self.sock_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.sock_path.exists():
+            if request({"op": "ping"}, self.sock_path) is not None:
+                raise RuntimeError(f"gw daemon already running on {self.sock_path}")
+            self.sock_path.unlink()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(str(self.sock_path))
+        finally:
+            os.umask(old_umask)
+        sock.listen(64)
+        sock.settimeout(IDLE_INTERVAL)
+        self._sock = sock
+        pid_path(self.sock_path).write_text(f"{os.getpid()}\n")
+
+    def warm(self) -> None:
+        """Warm caches in the daemon itself so every child inherits them."""
+        self.source = source_fingerprint()
+        summary = warm(Path.cwd())
+        self._warmed_at = time.monotonic()
+        print(f"gw daemon warmed: {json.dumps(summary)}", flush=True)
+
+    def serve_forever(self) -> None:
+        """Bind, warm and serve until stopped (SIGTERM or a "stop" request)."""
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "stopping", True))
+        self.bind()
+        print(
+            f"gw daemon {__version__} listening on {self.sock_path} (pid {os.getpid()})",
+            flush=True,
+        )
+        self.warm()
+        try:
+            while not self.stopping:
+                try:
+                    conn, _ = self._sock.accept()
+                except (socket.timeout, InterruptedError):
+                    conn = None
+                if conn is not None:
+                    with conn:
+                        self._handle(conn)
+                self._reap()
+                self._refresh_whoami()
+        finally:
+            if self._refresh is not None:
+                self._refresh.kill()
+                self._refresh.wait()
+            self._sock.close()
+            for path in (self.sock_path, pid_path(self.sock_path)):
+                path.unlink(missing_ok=True)
+
+    def _refresh_whoami(self) -> None:
+        """Keep the shared whoami result fresh without holding up clients.
+
+        ``wrangler whoami`` runs as a background process that the accept
+        loop only starts and polls; its result is shared once it exits.
+        """
+        from .wrangler import (
+            WHOAMI_TIMEOUT,
+            WHOAMI_TTL,
+            WranglerError,
+            parse_whoami,
+            share_whoami,
+        )
+
+        now = time.monotonic()
+        if self._refresh is None:
+            if now - self._warmed_at < WHOAMI_TTL - WHOAMI_REFRESH_MARGIN:
+                return
+            self._warmed_at = now
+            try:
+                self._refresh = subprocess.Popen(
+                    ["wrangler", "whoami"],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                )
+            except OSError:
+                share_whoami(None)
+                return
+            self._refresh_started = now
+            return
+
+        if self._refresh.poll() is None:
+            if now - self._refresh_started > WHOAMI_TIMEOUT:
+                self._refresh.kill()
+                self._refresh.wait()
+                self._refresh = None
+                share_whoami(None)
+            return
+
+        output, _ = self._refresh.communicate()
+        self._refresh = None
+        self._warmed_at = now
+        try:
+            share_whoami(parse_whoami(output))
+        except WranglerError:
+            share_whoami(None)
+
+    def _reap(self) -> None:
+        """Collect finished children."""
+        for pid in list(self.children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self.children.discard(pid)
+
+    def _peer_allowed(self, conn: socket.socket) -> bool:
+        """Only serve our own user (Linux; elsewhere the 0600 socket guards it)."""
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", creds)
+        return uid == os.getuid()
+
+    def _receive(self, conn: socket.socket) -> tuple[dict[str, Any], list[int]]:
+        """Read the request and any file descriptors passed with it."""
+        conn.settimeout(5.0)
+        data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+        try:
+            buffer = bytearray(data)
+            while True:
+                if len(buffer) >= HEADER.size:
+                    (length,) = HEADER.unpack_from(buffer)
+                    if length > MAX_REQUEST_BYTES:
+                        raise ValueError("request too large")
+                    if len(buffer) >= HEADER.size + length:
+                        break
+                chunk = conn.recv(65536)
+                if not chunk:
+                    raise ConnectionError("client closed the connection")
+                buffer += chunk
+            message = json.loads(buffer[HEADER.size:HEADER.size + length])
+        except BaseException:
+            for fd in fds:
+                os.close(fd)
+            raise
+        conn.settimeout(None)
+        return message, fds
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Answer a control request or fork a child for a command."""
+        fds: list[int] = []
+        try:
+            if not self._peer_allowed(conn):
+                return
+            message, fds = self._receive(conn)
+
+            if message.get("version") != __version__:
+                send_message(conn, {"error": f"daemon runs gw {__version__}"})
+                return
+
+            op = message.get("op")
+            if op == "ping":
+                send_message(conn, self.status())
+            elif op == "stop":
+                self.stopping = True
+                send_message(conn, {"stopping": True, "pid": os.getpid()})
+            elif op == "run" and message.get("source") != self.source:
+                send_message(
+                    conn,
+                    {"error": "gw sources changed since the daemon started; "
+                              "restart it (gw daemon stop, gw daemon start)"},
+                )
+            elif op == "run" and len(fds) == 3:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    self._sock.close()
+                    _run_child(conn, message, fds)
+                self.children.add(pid)
+                self.served += 1
+            else:
+                send_message(conn, {"error": f"bad request: {op!r}"})
+        except (OSError, ValueError) as e:
+            print(f"gw daemon: dropped request: {e}", file=sys.stderr, flush=True)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def status(self) -> dict[str, Any]:
+        """Daemon state for ``gw daemon status``."""
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "source": self.source,
+            "socket": str(self.sock_path),
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests_served": self.served,
+            "running_commands": len(self.children),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the gw daemon in the foreground.")
+    parser.add_argument("--socket", type=Path, default=None, help="Unix socket path")
+    args = parser.parse_args()
+
+    try:
+        GWDaemon(args.socket or socket_path()).serve_forever()
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
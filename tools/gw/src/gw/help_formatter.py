@@ -85,6 +85,7 @@ CATEGORIES: Dict[str, Tuple[str, str, List[Tuple[str, str]]]] = {
             ("whoami", "Current context"),
             ("history", "Command history"),
             ("completion", "Shell completions"),
+            ("daemon", "Warm background gw (gwd)"),
             ("mcp", "MCP server"),
             ("metrics", "Usage metrics"),
         ],
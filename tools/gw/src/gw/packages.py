@@ -16,6 +16,12 @@ from typing import Optional
 # Both are scanned so gw works before and after the restructure.
 PACKAGE_DIRS = ("packages", "apps", "services", "workers", "libs", "tools")
 
+# Files whose changes alter what load_package() returns
+MANIFEST_FILES = ("package.json", "pyproject.toml", "build.zig", "svelte.config.js", "wrangler.toml")
+
+# Monorepo root -> (tree signature, Monorepo) of the last load_monorepo() call
+_monorepo_cache: dict[Path, tuple[tuple, "Monorepo"]] = {}
+
 
 def extract_package_from_path(filepath: str) -> Optional[str]:
     """Extract a package identifier from a monorepo-relative file path.
@@ -333,6 +339,14 @@ def load_monorepo(start_path: Optional[Path] = None) -> Optional[Monorepo]:
     if not root:
         return None
 
+    # Reuse the last scan while no package directory or manifest changed;
+    # stat calls are much cheaper than re-reading every manifest (and the
+    # gw daemon keeps this cache warm across requests)
+    signature = _tree_signature(root)
+    cached = _monorepo_cache.get(root)
+    if cached and cached[0] == signature:
+        return cached[1]
+
     packages = discover_packages(root)
 
     # Detect package manager
@@ -344,11 +358,43 @@ def load_monorepo(start_path: Optional[Path] = None) -> Optional[Monorepo]:
     elif (root / "package-lock.json").exists():
         package_manager = "npm"
 
-    return Monorepo(
+    monorepo = Monorepo(
         root=root,
         packages=packages,
         package_manager=package_manager,
     )
+    _monorepo_cache[root] = (signature, monorepo)
+    return monorepo
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    """(mtime_ns, size) of a path, or (0, 0) if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _tree_signature(root: Path) -> tuple:
+    """Stat signature of everything discover_packages() reads.
+
+    Directory mtimes catch added or removed packages and manifests;
+    manifest mtimes and sizes catch in-place edits.
+    """
+    entries: list = [_stat_key(root / name) for name in ("pnpm-lock.yaml", "yarn.lock", "package-lock.json")]
+    for category in PACKAGE_DIRS:
+        category_dir = root / category
+        entries.append(_stat_key(category_dir))
+        if not category_dir.is_dir():
+            continue
+        children = [child for child in category_dir.iterdir() if child.is_dir()]
+        if category == "packages":
+            children += [sub for child in children for sub in child.iterdir() if sub.is_dir()]
+        for child in children:
+            entries.append((child.name, *_stat_key(child)))
+            entries.extend(_stat_key(child / name) for name in MANIFEST_FILES)
+    return tuple(entries)
 
 
 def detect_current_package(path: Optional[Path] = None) -> Optional[Package]:
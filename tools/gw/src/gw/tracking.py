@@ -7,8 +7,6 @@ from typing import Any, Optional
 
 import click
 
-from .commands.metrics import record_metric
-
 
 class TrackedGroup(click.Group):
     """A Click Group that automatically tracks command execution metrics."""
@@ -63,7 +61,9 @@ class TrackedGroup(click.Group):
             # Calculate duration
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Record the metric
+            # Record the metric (imported here to keep CLI startup light)
+            from .commands.metrics import record_metric
+
             record_metric(
                 command_group=command_group,
                 command=command,
@@ -125,6 +125,8 @@ class TrackedCommand(click.Command):
 
             # Record the metric (skip metrics commands)
             if command_group != "metrics":
+                from .commands.metrics import record_metric
+
                 record_metric(
                     command_group=command_group,
                     command=command,
@@ -159,6 +161,8 @@ def track_mcp_call(tool_name: str):
             finally:
                 duration_ms = int((time.time() - start_time) * 1000)
 
+                from .commands.metrics import record_metric
+
                 # Parse tool name (e.g., "grove_db_query" -> "db", "query")
                 parts = tool_name.replace("grove_", "").split("_", 1)
                 command_group = parts[0] if parts else "unknown"
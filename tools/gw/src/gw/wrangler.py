@@ -1,12 +1,33 @@
 """Wrapper for Wrangler subprocess operations."""
 
+import json
+import os
 import re
 import subprocess
+import tempfile
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from .config import GWConfig
 
+if TYPE_CHECKING:
+    from .cloudflare import CloudflareAPI
+
+
+# How long a whoami result is shared between Wrangler instances (seconds)
+WHOAMI_TTL = 300.0
+
+# How long `wrangler whoami` may run before it's abandoned (seconds)
+WHOAMI_TIMEOUT = 15.0
+
+# Environment that decides which account `wrangler whoami` reports
+WHOAMI_ENV = ("CLOUDFLARE_API_TOKEN", "CLOUDFLARE_ACCOUNT_ID", "HOME")
+
+# (identity, fetched_at, data) of the last successful `wrangler whoami` in this
+# process; only reused while WHOAMI_ENV still matches identity
+_shared_whoami: Optional[tuple[tuple[Optional[str], ...], float, dict[str, Any]]] = None
+
 
 class WranglerError(Exception):
     """Raised when a Wrangler command fails."""
@@ -14,6 +35,65 @@ class WranglerError(Exception):
     pass
 
 
+def _whoami_identity() -> tuple[Optional[str], ...]:
+    """The WHOAMI_ENV values of this process."""
+    return tuple(os.environ.get(name) for name in WHOAMI_ENV)
+
+
+def share_whoami(data: Optional[dict[str, Any]]) -> None:
+    """Share a whoami result with later Wrangler instances in this process.
+
+    The result is tied to the current WHOAMI_ENV, so a forked child running
+    with another token, account or HOME looks itself up again.
+
+    Args:
+        data: Parsed whoami result, or None to drop the shared one
+    """
+    global _shared_whoami
+    _shared_whoami = None if data is None else (_whoami_identity(), time.monotonic(), data)
+
+
+def parse_whoami(output: str) -> dict[str, Any]:
+    """Parse the text output of ``wrangler whoami``.
+
+    Args:
+        output: Combined stdout and stderr of the command
+
+    Returns:
+        Dictionary with account information, e.g.
+        ``{"account": {"name": "...", "id": "..."}, "email": "..."}``
+
+    Raises:
+        WranglerError: If the user is not logged in
+    """
+    if "You are logged in" not in output:
+        raise WranglerError("Not logged in to Cloudflare. Run: wrangler login")
+
+    # Extract email from "associated with the email <email>" text
+    email_match = re.search(r"associated with the email\s+(\S+?)[\s.]", output)
+    email = email_match.group(1).rstrip(".") if email_match else None
+
+    # Extract account name and ID from the table rows
+    # Format: │ Name │ ID │
+    account_name = None
+    account_id = None
+    for line in output.splitlines():
+        if "│" in line and not line.strip().startswith(("┌", "├", "└")):
+            parts = [p.strip() for p in line.split("│") if p.strip()]
+            if len(parts) == 2 and parts[0] not in ("Account Name",):
+                account_name = parts[0]
+                account_id = parts[1]
+
+    data: dict[str, Any] = {"account": {}}
+    if account_name:
+        data["account"]["name"] = account_name
+    if account_id:
+        data["account"]["id"] = account_id
+    if email:
+        data["email"] = email
+    return data
+
+
 class Wrangler:
     """Wrapper for Wrangler CLI operations."""
 
@@ -25,6 +105,47 @@ class Wrangler:
         """
         self.config = config or GWConfig.load()
         self._whoami_cache: Optional[dict[str, Any]] = None
+        self._api_client: Optional["CloudflareAPI"] = None
+        self._api_checked = False
+
+    def api(self) -> Optional["CloudflareAPI"]:
+        """Get the REST API client, if the "api" backend is configured and usable.
+
+        Needs CLOUDFLARE_API_TOKEN and an account ID (config, then
+        CLOUDFLARE_ACCOUNT_ID, then wrangler whoami).
+
+        Returns:
+            CloudflareAPI, or None to use the wrangler CLI
+        """
+        if self._api_checked:
+            return self._api_client
+        self._api_checked = True
+
+        settings = self.config.cloudflare
+        if settings.backend != "api":
+            return None
+
+        from .cloudflare import API_TOKEN_ENV, CloudflareAPI
+
+        token = os.environ.get(API_TOKEN_ENV)
+        if not token:
+            return None
+        account_id = settings.account_id or os.environ.get("CLOUDFLARE_ACCOUNT_ID")
+        if not account_id:
+            try:
+                account_id = self.get_account_id()
+            except WranglerError:
+                return None
+
+        self._api_client = CloudflareAPI(account_id, token, settings.api_url)
+        return self._api_client
+
+    def _database_id(self, name: str) -> str:
+        """D1 database ID for a name or alias, from config or the API."""
+        for alias, db in self.config.databases.items():
+            if name in (alias, db.name):
+                return db.id
+        return self._api_client.d1_database_id(name)
 
     def is_installed(self) -> bool:
         """Check if Wrangler is installed."""
@@ -61,50 +182,31 @@ class Wrangler:
         """
         if self._whoami_cache is not None:
             return self._whoami_cache
+        if (
+            _shared_whoami is not None
+            and _shared_whoami[0] == _whoami_identity()
+            and time.monotonic() - _shared_whoami[1] < WHOAMI_TTL
+        ):
+            self._whoami_cache = _shared_whoami[2]
+            return self._whoami_cache
 
         try:
             result = subprocess.run(
                 ["wrangler", "whoami"],
                 capture_output=True,
                 text=True,
-                timeout=15,
+                timeout=WHOAMI_TIMEOUT,
             )
-            stdout = result.stdout + result.stderr
-
-            if "You are logged in" not in stdout:
-                raise WranglerError("Not logged in to Cloudflare. Run: wrangler login")
-
-            # Extract email from "associated with the email <email>" text
-            email_match = re.search(r"associated with the email\s+(\S+?)[\s.]", stdout)
-            email = email_match.group(1).rstrip(".") if email_match else None
-
-            # Extract account name and ID from the table rows
-            # Format: │ Name │ ID │
-            account_name = None
-            account_id = None
-            lines = stdout.splitlines()
-            for line in lines:
-                if "│" in line and not line.strip().startswith("┌") and not line.strip().startswith("├") and not line.strip().startswith("└"):
-                    parts = [p.strip() for p in line.split("│") if p.strip()]
-                    if len(parts) == 2 and parts[0] not in ("Account Name",):
-                        account_name = parts[0]
-                        account_id = parts[1]
-
-            data: dict[str, Any] = {"account": {}}
-            if account_name:
-                data["account"]["name"] = account_name
-            if account_id:
-                data["account"]["id"] = account_id
-            if email:
-                data["email"] = email
-
-            self._whoami_cache = data
-            return data
         except FileNotFoundError as e:
             raise WranglerError("Wrangler is not installed. Install with: npm i -g wrangler") from e
         except subprocess.TimeoutExpired as e:
             raise WranglerError("Wrangler whoami timed out") from e
 
+        data = parse_whoami(result.stdout + result.stderr)
+        self._whoami_cache = data
+        share_whoami(data)
+        return data
+
     def execute(self, args: list[str], use_json: bool = False) -> str:
         """Execute a Wrangler command.
 
@@ -122,6 +224,14 @@ class Wrangler:
         if use_json:
             cmd.append("--json")
 
+        api = self.api()
+        if api is not None:
+            from .cloudflare import execute_wrangler_args
+
+            output = execute_wrangler_args(api, cmd[1:], self._database_id)
+            if output is not None:
+                return output
+
         try:
             result = subprocess.run(
                 cmd,
@@ -137,6 +247,70 @@ class Wrangler:
                 f"Wrangler command failed: {' '.join(cmd)}\n{e.stderr}"
             ) from e
 
+    def d1_batch(self, database: str, statements: list[str]) -> list[list[dict[str, Any]]]:
+        """Run several read statements against D1 in a single request.
+
+        D1 executes a multi-statement command in order and returns one
+        result set per statement, so N queries cost one round-trip instead
+        of N wrangler processes.
+
+        Args:
+            database: D1 database name
+            statements: SQL statements, without trailing semicolons
+
+        Returns:
+            Result rows for each statement, in the order given
+
+        Raises:
+            WranglerError: If the request fails or the result sets don't
+                line up with the statements (one failing statement fails
+                the whole batch)
+        """
+        if not statements:
+            return []
+
+        command = ";\n".join(s.strip().rstrip(";") for s in statements)
+        output = self.execute(["d1", "execute", database, "--remote", "--json", "--command", command])
+
+        try:
+            result_sets = json.loads(output)
+        except json.JSONDecodeError as e:
+            raise WranglerError(f"Unexpected D1 output: {output[:200]}") from e
+        if not isinstance(result_sets, list) or len(result_sets) != len(statements):
+            raise WranglerError(
+                f"D1 returned {len(result_sets) if isinstance(result_sets, list) else 0} "
+                f"result sets for {len(statements)} statements"
+            )
+        return [result_set.get("results") or [] for result_set in result_sets]
+
+    def kv_bulk_delete(self, namespace_id: str, keys: list[str]) -> int:
+        """Delete many KV keys in as few requests as possible.
+
+        Args:
+            namespace_id: KV namespace ID
+            keys: Keys to delete
+
+        Returns:
+            Number of keys deleted
+
+        Raises:
+            WranglerError: If a delete request fails
+        """
+        if not keys:
+            return 0
+
+        api = self.api()
+        if api is not None:
+            return api.kv_bulk_delete(namespace_id, keys)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(keys, f)
+        try:
+            self.execute(["kv", "bulk", "delete", f.name, "--namespace-id", namespace_id, "--force"])
+        finally:
+            os.unlink(f.name)
+        return len(keys)
+
     def get_account_id(self) -> str:
         """Get Cloudflare account ID.
 
@@ -178,6 +352,7 @@ class Wrangler:
             )
             # Clear cache after login
             self._whoami_cache = None
+            share_whoami(None)
         except FileNotFoundError as e:
             raise WranglerError("Wrangler is not installed. Install with: npm i -g wrangler") from e
         except subprocess.CalledProcessError as e:
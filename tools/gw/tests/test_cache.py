@@ -0,0 +1,182 @@
+"""Tests for cache commands - bulk, concurrent and resumable KV purges."""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+
+from gw.commands import cache as cache_commands
+from gw.commands.cache import (
+    _bulk_purge,
+    _checkpoint_path,
+    _load_checkpoint,
+    _mark_purged,
+    _save_checkpoint,
+)
+from gw.wrangler import WranglerError
+
+
+@pytest.fixture
+def wrangler() -> MagicMock:
+    """Wrangler stand-in recording every bulk delete."""
+    mock = MagicMock()
+    mock.deleted = []
+    mock.kv_bulk_delete.side_effect = (
+        lambda ns_id, keys: mock.deleted.append(list(keys)) or len(keys)
+    )
+    return mock
+
+
+# ============================================================================
+# Bulk Purge Tests
+# ============================================================================
+
+
+class TestBulkPurge:
+    """Tests for _bulk_purge chunking and concurrency."""
+
+    def test_splits_keys_into_chunks(self, wrangler: MagicMock) -> None:
+        """Test that every key is deleted once, chunk_size at a time."""
+        keys = [f"cache:autumn:{i}" for i in range(25)]
+        done = []
+
+        errors = _bulk_purge(wrangler, "ns1", keys, 10, 2, done.extend)
+
+        assert errors == []
+        assert sorted(len(chunk) for chunk in wrangler.deleted) == [5, 10, 10]
+        assert sorted(done) == sorted(keys)
+
+    def test_runs_chunks_concurrently(self, wrangler: MagicMock) -> None:
+        """Test that up to `concurrency` deletes are in flight together."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_delete(ns_id: str, keys: list[str]) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return len(keys)
+
+        wrangler.kv_bulk_delete.side_effect = slow_delete
+
+        _bulk_purge(wrangler, "ns1", [str(i) for i in range(8)], 1, 4, lambda chunk: None)
+
+        assert peak == 4
+
+    def test_failed_chunk_is_reported_not_marked(self, wrangler: MagicMock) -> None:
+        """Test that a failing chunk doesn't stop the others."""
+        def delete(ns_id: str, keys: list[str]) -> int:
+            if "b" in keys:
+                raise WranglerError("rate limited")
+            return len(keys)
+
+        wrangler.kv_bulk_delete.side_effect = delete
+        done = []
+
+        errors = _bulk_purge(wrangler, "ns1", ["a", "b", "c"], 1, 2, done.extend)
+
+        assert sorted(done) == ["a", "c"]
+        assert errors == [{"first_key": "b", "keys": 1, "error": "rate limited"}]
+
+
+# ============================================================================
+# Checkpoint Tests
+# ============================================================================
+
+
+class TestCheckpoint:
+    """Tests for resumable purge checkpoints."""
+
+    def test_path_depends_on_namespace_and_prefix(self) -> None:
+        """Test that different purges don't share a checkpoint."""
+        assert _checkpoint_path("ns1", "cache:a:") == _checkpoint_path("ns1", "cache:a:")
+        assert _checkpoint_path("ns1", "cache:a:") != _checkpoint_path("ns1", "cache:b:")
+        assert _checkpoint_path("ns1", "") != _checkpoint_path("ns2", "")
+
+    def test_mark_purged_shrinks_checkpoint(self, tmp_path: Path) -> None:
+        """Test that finished chunks are removed from the saved keys."""
+        checkpoint = tmp_path / "purge.json"
+        remaining = dict.fromkeys(["a", "b", "c", "d"])
+        _save_checkpoint(checkpoint, list(remaining))
+
+        _mark_purged(checkpoint, remaining, ["b", "c"])
+
+        assert list(remaining) == ["a", "d"]
+        assert _load_checkpoint(checkpoint) == ["a", "d"]
+
+    def test_unreadable_checkpoint_is_none(self, tmp_path: Path) -> None:
+        """Test that a corrupt checkpoint doesn't pass for an empty one."""
+        checkpoint = tmp_path / "purge.json"
+        checkpoint.write_text("{not json")
+
+        assert _load_checkpoint(checkpoint) is None
+        assert _load_checkpoint(tmp_path / "missing.json") is None
+
+
+# ============================================================================
+# Purge Command Tests
+# ============================================================================
+
+
+class TestPurgeCommand:
+    """Tests for `gw cache purge` choosing between its checkpoint and a fresh listing."""
+
+    LISTED = ["cache:autumn:home", "cache:autumn:about", "cache:autumn:new"]
+
+    @pytest.fixture
+    def purge(
+        self, tmp_path: Path, wrangler: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> Callable[..., list[str]]:
+        """Run the purge command for tenant autumn and return the deleted keys."""
+        monkeypatch.setattr(cache_commands, "PURGE_CHECKPOINT_DIR", tmp_path / "checkpoints")
+        monkeypatch.setattr(cache_commands, "Wrangler", lambda config: wrangler)
+        wrangler.execute.return_value = json.dumps([{"name": key} for key in self.LISTED])
+        config = MagicMock()
+        config.kv_namespaces = {"cache": MagicMock(id="ns1")}
+
+        def run(*args: str) -> list[str]:
+            result = CliRunner().invoke(
+                cache_commands.cache,
+                ["purge", "--tenant", "autumn", "--yes", *args],
+                obj={"config": config, "output_json": True},
+            )
+            assert result.exit_code == 0, result.output
+            return sorted(key for chunk in wrangler.deleted for key in chunk)
+
+        return run
+
+    @staticmethod
+    def checkpoint() -> Path:
+        """Checkpoint file of the tenant purge."""
+        return _checkpoint_path("ns1", "cache:autumn:")
+
+    def test_resume_uses_checkpoint(self, purge: Callable[..., list[str]]) -> None:
+        """Test that --resume deletes the saved keys without listing again."""
+        _save_checkpoint(self.checkpoint(), ["cache:autumn:left"])
+
+        assert purge("--resume") == ["cache:autumn:left"]
+        assert not self.checkpoint().exists()
+
+    def test_corrupt_checkpoint_lists_keys(self, purge: Callable[..., list[str]]) -> None:
+        """Test that an unreadable checkpoint falls back to a fresh listing."""
+        self.checkpoint().parent.mkdir(parents=True)
+        self.checkpoint().write_text("{not json")
+
+        assert purge("--resume") == sorted(self.LISTED)
+
+    def test_checkpoint_ignored_without_resume(self, purge: Callable[..., list[str]]) -> None:
+        """Test that an old checkpoint doesn't hide keys created since."""
+        _save_checkpoint(self.checkpoint(), ["cache:autumn:home"])
+
+        assert purge() == sorted(self.LISTED)
+        assert not self.checkpoint().exists()
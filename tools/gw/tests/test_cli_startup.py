@@ -0,0 +1,111 @@
+"""Tests for CLI startup cost - lazy command loading and import-time budget."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+from gw.cli import LAZY_COMMANDS, main
+from gw.help_formatter import CATEGORIES
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Cumulative `python -X importtime` budget for `import gw.cli`, in microseconds.
+# Eager loading of every command module cost several times this.
+IMPORT_BUDGET_US = 150_000
+
+# Modules that only specific commands need; none may load at startup
+HEAVY_MODULES = (
+    "gw.commands.mcp",
+    "gw.commands.secret",
+    "gw.commands.git",
+    "gw.help_formatter",
+    "mcp",
+    "cryptography",
+    "requests",
+    "rich",
+)
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Run a fresh interpreter with gw's src directory on the path."""
+    pythonpath = os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+# ============================================================================
+# Lazy Loading Tests
+# ============================================================================
+
+
+class TestLazyCommands:
+    """Tests for GWGroup's lazy command registry."""
+
+    def test_import_loads_no_command_modules(self) -> None:
+        """Test that importing gw.cli doesn't import any heavy module."""
+        result = run_python(
+            "-c",
+            "import sys, gw.cli; print('\\n'.join(sorted(sys.modules)))",
+        )
+        loaded = set(result.stdout.split())
+
+        for module in HEAVY_MODULES:
+            assert module not in loaded, f"{module} imported at startup"
+
+    def test_lists_commands_without_importing(self) -> None:
+        """Test that list_commands comes from the static map."""
+        ctx = click.Context(main)
+        names = main.list_commands(ctx)
+
+        assert set(LAZY_COMMANDS) <= set(names)
+        assert "help" in names
+
+    @pytest.mark.parametrize("name", sorted(LAZY_COMMANDS))
+    def test_every_command_resolves(self, name: str) -> None:
+        """Test that every mapped module exposes a command with that name."""
+        cmd = main.get_command(click.Context(main), name)
+
+        assert isinstance(cmd, click.Command)
+        assert cmd.name == name
+
+    def test_unknown_command_returns_none(self) -> None:
+        """Test that unmapped names are still unknown."""
+        assert main.get_command(click.Context(main), "no-such-command") is None
+
+    def test_help_categories_are_mapped(self) -> None:
+        """Test that the static help screen only lists real commands."""
+        for _, _, commands in CATEGORIES.values():
+            for name, _ in commands:
+                assert name == "help" or name in LAZY_COMMANDS
+
+
+# ============================================================================
+# Import-Time Budget Tests
+# ============================================================================
+
+
+class TestImportTime:
+    """Tests that cold start doesn't regrow."""
+
+    def test_import_within_budget(self) -> None:
+        """Test that `import gw.cli` stays under IMPORT_BUDGET_US."""
+        result = run_python("-X", "importtime", "-c", "import gw.cli")
+
+        # Lines look like: "import time:   self [us] | cumulative | package"
+        cumulative = None
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+            if len(parts) == 3 and parts[2] == "gw.cli":
+                cumulative = int(parts[1])
+
+        assert cumulative is not None, result.stderr
+        assert cumulative < IMPORT_BUDGET_US, (
+            f"import gw.cli took {cumulative} us (budget {IMPORT_BUDGET_US} us)"
+        )
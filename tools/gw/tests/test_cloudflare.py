@@ -0,0 +1,326 @@
+"""Tests for the Cloudflare REST API backend, against a local stand-in server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+from gw.cloudflare import CloudflareAPI, CloudflareAPIError, execute_wrangler_args
+from gw.config import CloudflareConfig, GWConfig
+from gw.wrangler import Wrangler, WranglerError
+
+
+ACCOUNT = "acc123"
+TOKEN = "test-token"
+
+
+class StandIn:
+    """In-memory D1/KV/R2 state behind the stand-in server."""
+
+    def __init__(self):
+        self.kv: dict[str, dict[str, bytes]] = {}
+        self.r2: dict[str, dict[str, bytes]] = {}
+        self.queries: list[tuple[str, str]] = []
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.page_size = 1000
+
+
+def make_handler(state: StandIn):
+    """Request handler class serving the subset of the v4 API gw uses."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            state.connections += 1
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _envelope(self, result, status: int = 200, result_info=None, errors=None) -> None:
+            body = {"success": status < 300, "errors": errors or [], "messages": [], "result": result}
+            if result_info:
+                body["result_info"] = result_info
+            self._send(status, json.dumps(body).encode())
+
+        def _page(self, items: list, query: dict) -> None:
+            start = int(query.get("cursor", ["0"])[0])
+            end = start + state.page_size
+            cursor = str(end) if end < len(items) else ""
+            self._envelope(items[start:end], result_info={"cursor": cursor, "count": len(items[start:end])})
+
+        def _handle(self, method: str) -> None:
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            state.requests.append((method, self.path))
+
+            if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+                return self._envelope(None, 403, errors=[{"code": 10000, "message": "Authentication error"}])
+
+            prefix = f"/client/v4/accounts/{ACCOUNT}"
+            parts = [unquote(p) for p in url.path[len(prefix):].strip("/").split("/")]
+
+            if parts[:2] == ["d1", "database"] and len(parts) == 2:
+                return self._envelope([{"uuid": "db-uuid-1", "name": query.get("name", [""])[0]}])
+            if parts[:2] == ["d1", "database"] and parts[3:] == ["query"]:
+                sql = json.loads(body)["sql"]
+                state.queries.append((parts[2], sql))
+                statements = [s.strip() for s in sql.split(";") if s.strip()]
+                return self._envelope([{"results": [{"sql": s}], "success": True, "meta": {}} for s in statements])
+
+            if parts[:3] == ["storage", "kv", "namespaces"]:
+                ns = state.kv.setdefault(parts[3], {})
+                if parts[4:] == ["keys"]:
+                    keys = sorted(k for k in ns if k.startswith(query.get("prefix", [""])[0]))
+                    return self._page([{"name": k} for k in keys], query)
+                if parts[4:] == ["bulk", "delete"]:
+                    for key in json.loads(body):
+                        ns.pop(key, None)
+                    return self._envelope({"successful_key_count": len(json.loads(body))})
+                key = parts[5]
+                if method == "GET":
+                    if key not in ns:
+                        return self._envelope(None, 404, errors=[{"code": 10009, "message": "get: 'key not found'"}])
+                    return self._send(200, ns[key], "application/octet-stream")
+                if method == "PUT":
+                    ns[key] = body
+                    return self._envelope(None)
+                if method == "DELETE":
+                    ns.pop(key, None)
+                    return self._envelope(None)
+
+            if parts[:2] == ["r2", "buckets"] and parts[3] == "objects":
+                bucket = state.r2.setdefault(parts[2], {})
+                if len(parts) == 4:
+                    keys = sorted(k for k in bucket if k.startswith(query.get("prefix", [""])[0]))
+                    return self._page([{"key": k, "size": len(bucket[k])} for k in keys], query)
+                key = parts[4]
+                if method == "GET":
+                    return self._send(200, bucket[key], "application/octet-stream")
+                if method == "PUT":
+                    bucket[key] = body
+                    return self._envelope({"key": key})
+                if method == "DELETE":
+                    bucket.pop(key, None)
+                    return self._envelope({})
+
+            self._envelope(None, 404, errors=[{"code": 7003, "message": "No route"}])
+
+        def do_GET(self) -> None:
+            self._handle("GET")
+
+        def do_PUT(self) -> None:
+            self._handle("PUT")
+
+        def do_POST(self) -> None:
+            self._handle("POST")
+
+        def do_DELETE(self) -> None:
+            self._handle("DELETE")
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in():
+    """A running stand-in server; yields (state, api_url)."""
+    state = StandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield state, f"http://127.0.0.1:{server.server_address[1]}/client/v4"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(stand_in) -> CloudflareAPI:
+    """API client pointed at the stand-in."""
+    _, api_url = stand_in
+    return CloudflareAPI(ACCOUNT, TOKEN, api_url)
+
+
+@pytest.fixture
+def api_wrangler(stand_in, monkeypatch) -> Wrangler:
+    """Wrangler configured for the API backend against the stand-in."""
+    _, api_url = stand_in
+    monkeypatch.setenv("CLOUDFLARE_API_TOKEN", TOKEN)
+    config = GWConfig._default()
+    config.cloudflare = CloudflareConfig(backend="api", account_id=ACCOUNT, api_url=api_url)
+    return Wrangler(config)
+
+
+# ============================================================================
+# API Client Tests
+# ============================================================================
+
+
+class TestCloudflareAPI:
+    """Tests for CloudflareAPI against the stand-in."""
+
+    def test_kv_round_trip(self, api: CloudflareAPI) -> None:
+        """Test put, get, list and delete."""
+        api.kv_put("ns1", "cache:a/b", "hello", ttl=60)
+        assert api.kv_get("ns1", "cache:a/b") == b"hello"
+        assert api.kv_list("ns1", prefix="cache:") == [{"name": "cache:a/b"}]
+
+        api.kv_delete("ns1", "cache:a/b")
+        assert api.kv_list("ns1") == []
+
+    def test_kv_list_follows_cursor(self, stand_in, api: CloudflareAPI) -> None:
+        """Test that pagination collects every page."""
+        state, _ = stand_in
+        state.page_size = 2
+        state.kv["ns1"] = {f"k{i}": b"" for i in range(5)}
+
+        assert [k["name"] for k in api.kv_list("ns1")] == [f"k{i}" for i in range(5)]
+        assert len(api.kv_list("ns1", limit=3)) == 3
+
+    def test_kv_get_missing_raises_404(self, api: CloudflareAPI) -> None:
+        """Test that a missing key surfaces its status."""
+        with pytest.raises(CloudflareAPIError) as exc_info:
+            api.kv_get("ns1", "missing")
+        assert exc_info.value.status == 404
+
+    def test_kv_bulk_delete_batches(self, stand_in, api: CloudflareAPI, monkeypatch) -> None:
+        """Test that bulk deletes are split at KV_BULK_DELETE_MAX."""
+        state, _ = stand_in
+        monkeypatch.setattr("gw.cloudflare.KV_BULK_DELETE_MAX", 2)
+        state.kv["ns1"] = {f"k{i}": b"" for i in range(5)}
+
+        assert api.kv_bulk_delete("ns1", [f"k{i}" for i in range(5)]) == 5
+        assert state.kv["ns1"] == {}
+        assert sum(1 for method, path in state.requests if "bulk/delete" in path) == 3
+
+    def test_r2_round_trip(self, api: CloudflareAPI) -> None:
+        """Test object put, list, get and delete."""
+        api.r2_put("media", "avatars/a.png", b"\x89PNG")
+        assert api.r2_list("media", prefix="avatars/") == [{"key": "avatars/a.png", "size": 4}]
+        assert api.r2_get("media", "avatars/a.png") == b"\x89PNG"
+
+        api.r2_delete("media", "avatars/a.png")
+        assert api.r2_list("media") == []
+
+    def test_connections_are_reused(self, stand_in, api: CloudflareAPI) -> None:
+        """Test that sequential calls share one keep-alive connection."""
+        state, _ = stand_in
+        for i in range(10):
+            api.kv_put("ns1", f"k{i}", "v")
+
+        assert state.connections == 1
+
+    def test_auth_error_is_raised(self, stand_in) -> None:
+        """Test that API errors carry the server's message."""
+        _, api_url = stand_in
+        api = CloudflareAPI(ACCOUNT, "wrong-token", api_url)
+
+        with pytest.raises(CloudflareAPIError, match="Authentication error"):
+            api.kv_list("ns1")
+
+
+# ============================================================================
+# Wrangler Integration Tests
+# ============================================================================
+
+
+class TestWranglerArgs:
+    """Tests for translating wrangler arguments to API calls."""
+
+    def test_d1_execute_uses_configured_id(self, stand_in, api_wrangler: Wrangler) -> None:
+        """Test that D1 queries match wrangler's --json output."""
+        state, _ = stand_in
+        output = api_wrangler.execute(
+            ["d1", "execute", "grove-engine-db", "--remote", "--json", "--command", "SELECT 1"]
+        )
+
+        assert json.loads(output)[0]["results"] == [{"sql": "SELECT 1"}]
+        assert state.queries == [("a6394da2-b7a6-48ce-b7fe-b1eb3e730e68", "SELECT 1")]
+
+    def test_d1_unknown_database_is_looked_up(self, stand_in, api_wrangler: Wrangler) -> None:
+        """Test that databases missing from config are resolved by name."""
+        state, _ = stand_in
+        api_wrangler.execute(["d1", "execute", "other-db", "--remote", "--command", "SELECT 1"])
+
+        assert state.queries == [("db-uuid-1", "SELECT 1")]
+
+    def test_d1_batch_is_one_request(self, stand_in, api_wrangler: Wrangler) -> None:
+        """Test that a statement batch is a single query with split results."""
+        state, _ = stand_in
+        results = api_wrangler.d1_batch("grove-engine-db", ["SELECT 1", "SELECT 2;"])
+
+        assert results == [[{"sql": "SELECT 1"}], [{"sql": "SELECT 2"}]]
+        assert len(state.queries) == 1
+
+    def test_kv_commands_both_syntaxes(self, api_wrangler: Wrangler) -> None:
+        """Test kv:key (wrangler 3) and kv key (wrangler 4) forms."""
+        api_wrangler.execute(["kv:key", "put", "--namespace-id", "ns1", "flag:a", '{"enabled": true}'])
+        assert api_wrangler.execute(["kv", "key", "get", "flag:a", "--namespace-id", "ns1"]) == '{"enabled": true}'
+        assert json.loads(api_wrangler.execute(["kv:key", "list", "--namespace-id", "ns1"], use_json=True)) == [
+            {"name": "flag:a"}
+        ]
+
+    def test_kv_get_missing_message(self, api_wrangler: Wrangler) -> None:
+        """Test that callers' "not found" checks still match."""
+        with pytest.raises(WranglerError, match="(?i)key not found"):
+            api_wrangler.execute(["kv:key", "get", "--namespace-id", "ns1", "missing"])
+
+    def test_r2_file_round_trip(self, api_wrangler: Wrangler, tmp_path: Path) -> None:
+        """Test r2 object put/get with --file."""
+        source = tmp_path / "in.txt"
+        source.write_text("export data")
+        target = tmp_path / "out.txt"
+
+        api_wrangler.execute(["r2", "object", "put", "grove-exports", "a/b.zip", "--file", str(source)])
+        api_wrangler.execute(["r2", "object", "get", "grove-exports", "a/b.zip", "--file", str(target)])
+
+        assert target.read_text() == "export data"
+
+    def test_bulk_delete_uses_api(self, stand_in, api_wrangler: Wrangler) -> None:
+        """Test Wrangler.kv_bulk_delete on the API backend."""
+        state, _ = stand_in
+        state.kv["ns1"] = {"a": b"", "b": b"", "c": b""}
+
+        assert api_wrangler.kv_bulk_delete("ns1", ["a", "b"]) == 2
+        assert state.kv["ns1"] == {"c": b""}
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["d1", "backup", "list", "grove-engine-db"],
+            ["d1", "execute", "grove-engine-db", "--local", "--command", "SELECT 1"],
+            ["kv:key", "put", "--namespace-id", "ns1", "k", "v", "--metadata", "{}"],
+            ["deploy", "--dry-run"],
+        ],
+    )
+    def test_unsupported_falls_back_to_wrangler(self, api_wrangler: Wrangler, args: list[str]) -> None:
+        """Test that anything the API backend doesn't cover spawns wrangler."""
+        with patch("subprocess.run", return_value=MagicMock(stdout="from wrangler")) as mock_run:
+            assert api_wrangler.execute(args) == "from wrangler"
+        assert mock_run.call_args[0][0] == ["wrangler", *args]
+
+    def test_without_token_uses_wrangler(self, stand_in, monkeypatch) -> None:
+        """Test that the API backend needs CLOUDFLARE_API_TOKEN."""
+        _, api_url = stand_in
+        monkeypatch.delenv("CLOUDFLARE_API_TOKEN", raising=False)
+        config = GWConfig._default()
+        config.cloudflare = CloudflareConfig(backend="api", account_id=ACCOUNT, api_url=api_url)
+
+        assert Wrangler(config).api() is None
+
+    def test_unsupported_returns_none(self, api: CloudflareAPI) -> None:
+        """Test execute_wrangler_args() directly for an unknown command."""
+        assert execute_wrangler_args(api, ["tail", "grove-email"], lambda name: name) is None
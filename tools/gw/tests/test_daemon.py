@@ -0,0 +1,226 @@
+"""Tests for the gw daemon and its thin client."""
+
+import io
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from gw import client, wrangler
+from gw.client import forward, read_message, request, send_message
+from gw.daemon import GWDaemon
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+WHOAMI_OUTPUT = """You are logged in with an API Token, associated with the email dev@grove.place.
+┌──────────────┬──────────┐
+│ Account Name │ Account ID │
+├──────────────┼──────────┤
+│ {name} │ {id} │
+└──────────────┴──────────┘
+"""
+
+
+def run_captured(argv: list[str], sock_path: Path) -> tuple[int | None, str]:
+    """Forward a command with stdout/stderr captured through one pipe."""
+    read_fd, write_fd = os.pipe()
+    with open(os.devnull) as devnull:
+        try:
+            code = forward(argv, fds=(devnull.fileno(), write_fd, write_fd), path=sock_path)
+        finally:
+            os.close(write_fd)
+    with os.fdopen(read_fd) as output:
+        return code, output.read()
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    """A daemon running in a subprocess with an isolated HOME."""
+    sock_path = tmp_path / "gw.sock"
+    pythonpath = os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gw.daemon", "--socket", str(sock_path)],
+        env={**os.environ, "HOME": str(tmp_path), "PYTHONPATH": pythonpath},
+        cwd=tmp_path,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while request({"op": "ping"}, sock_path) is None:
+        assert process.poll() is None, "daemon exited during startup"
+        assert time.monotonic() < deadline, "daemon didn't start"
+        time.sleep(0.1)
+
+    yield sock_path
+
+    request({"op": "stop"}, sock_path)
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# ============================================================================
+# Protocol Tests
+# ============================================================================
+
+
+class TestProtocol:
+    """Tests for message framing and file descriptor passing."""
+
+    def test_round_trip_with_fds(self) -> None:
+        """Test that a message and its fds arrive intact."""
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        read_fd, write_fd = os.pipe()
+        with left, right:
+            send_message(left, {"argv": ["git", "status"], "cwd": "/tmp"}, fds=(write_fd,))
+            data, fds, _, _ = socket.recv_fds(right, 65536, 1)
+        os.close(write_fd)
+
+        assert read_message(io.BytesIO(data)) == {"argv": ["git", "status"], "cwd": "/tmp"}
+        assert len(fds) == 1
+        os.write(fds[0], b"ok")
+        os.close(fds[0])
+        assert os.read(read_fd, 2) == b"ok"
+        os.close(read_fd)
+
+    def test_truncated_message_raises(self) -> None:
+        """Test that a connection closed mid-message is an error."""
+        with pytest.raises(ConnectionError):
+            read_message(io.BytesIO(b"\x00\x00\x00\x10{}"))
+
+    def test_no_daemon_returns_none(self, tmp_path: Path) -> None:
+        """Test that the client falls back when nothing is listening."""
+        sock_path = tmp_path / "missing.sock"
+
+        assert forward(["status"], path=sock_path) is None
+        assert request({"op": "ping"}, sock_path) is None
+
+
+# ============================================================================
+# Daemon Tests
+# ============================================================================
+
+
+class TestDaemon:
+    """End-to-end tests against a real daemon process."""
+
+    def test_runs_command_and_streams_output(self, daemon: Path) -> None:
+        """Test that output reaches the client's fds with the exit code."""
+        code, output = run_captured(["--help"], daemon)
+
+        assert code == 0
+        assert "G R O V E" in output
+
+    def test_exit_code_is_forwarded(self, daemon: Path) -> None:
+        """Test that usage errors keep click's exit code."""
+        code, output = run_captured(["no-such-command"], daemon)
+
+        assert code == 2
+        assert "no-such-command" in output
+
+    def test_status_counts_requests(self, daemon: Path) -> None:
+        """Test that ping reports served requests."""
+        run_captured(["--help"], daemon)
+        status = request({"op": "ping"}, daemon)
+
+        assert status["pid"] > 0
+        assert status["requests_served"] == 1
+
+    def test_version_mismatch_is_refused(self, daemon: Path) -> None:
+        """Test that a client from another gw version gets an error."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(daemon))
+        with sock, sock.makefile("rb") as stream:
+            send_message(sock, {"op": "ping", "version": "0.0.0"})
+            reply = read_message(stream)
+
+        assert "error" in reply
+
+    def test_stale_source_is_refused(
+        self, daemon: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that edited gw sources make gwd fall back instead of running old code."""
+        monkeypatch.setattr(client, "source_fingerprint", lambda: "0")
+
+        code, output = run_captured(["--help"], daemon)
+
+        assert code is None
+        assert "sources changed" in capsys.readouterr().err
+        assert request({"op": "ping"}, daemon)["requests_served"] == 0
+
+    def test_stop_removes_socket(self, daemon: Path) -> None:
+        """Test that stop shuts the daemon down cleanly."""
+        assert request({"op": "stop"}, daemon)["stopping"] is True
+
+        deadline = time.monotonic() + 5
+        while daemon.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not daemon.exists()
+
+
+# ============================================================================
+# Whoami Sharing Tests
+# ============================================================================
+
+
+class TestWhoamiSharing:
+    """Tests for the whoami result forked children inherit."""
+
+    @pytest.fixture(autouse=True)
+    def no_shared_whoami(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Start every test without a shared result."""
+        monkeypatch.setattr(wrangler, "_shared_whoami", None)
+
+    def test_shared_only_with_matching_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that another token looks itself up instead of reusing the result."""
+        calls = []
+
+        def run(args: list[str], **kwargs) -> MagicMock:
+            token = os.environ["CLOUDFLARE_API_TOKEN"]
+            calls.append(token)
+            output = WHOAMI_OUTPUT.format(name=f"account-{token}", id=f"id-{token}")
+            return MagicMock(stdout=output, stderr="")
+
+        monkeypatch.setattr(wrangler.subprocess, "run", run)
+        monkeypatch.setenv("CLOUDFLARE_API_TOKEN", "a")
+        assert wrangler.Wrangler(MagicMock()).get_account_name() == "account-a"
+        assert wrangler.Wrangler(MagicMock()).get_account_name() == "account-a"
+
+        monkeypatch.setenv("CLOUDFLARE_API_TOKEN", "b")
+        assert wrangler.Wrangler(MagicMock()).get_account_name() == "account-b"
+        assert calls == ["a", "b"]
+
+    def test_refresh_runs_in_background(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an expired result is refreshed without blocking the accept loop."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        script = bin_dir / "wrangler"
+        output = WHOAMI_OUTPUT.format(name="Grove", id="abc123")
+        script.write_text(f"#!/bin/sh\nsleep 0.5\ncat <<'EOF'\n{output}EOF\n")
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+        daemon = GWDaemon(tmp_path / "gw.sock")
+        daemon._warmed_at = time.monotonic() - wrangler.WHOAMI_TTL
+        started = time.monotonic()
+        daemon._refresh_whoami()
+
+        assert time.monotonic() - started < 0.4
+        assert wrangler._shared_whoami is None
+
+        deadline = time.monotonic() + 10
+        while daemon._refresh is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            daemon._refresh_whoami()
+
+        monkeypatch.setattr(wrangler.subprocess, "run", MagicMock(side_effect=AssertionError))
+        assert wrangler.Wrangler(MagicMock()).get_account_id() == "abc123"
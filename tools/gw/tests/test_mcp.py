@@ -277,8 +277,9 @@ class TestMCPCommand:
 
     def test_mcp_command_exists(self):
         """MCP command should be registered."""
+        import click
         from gw.cli import main
-        assert "mcp" in [cmd.name for cmd in main.commands.values()]
+        assert main.get_command(click.Context(main), "mcp").name == "mcp"
 
     def test_mcp_subcommands_exist(self):
         """MCP subcommands should exist."""
@@ -218,6 +218,51 @@ class TestPackageDiscovery:
         assert packages[0].package_type == PackageType.PYTHON
 
 
+class TestMonorepoCache:
+    """Tests for load_monorepo() reusing unchanged scans."""
+
+    def make_monorepo(self, root: Path) -> Path:
+        """Create a monorepo with one library package."""
+        (root / "pnpm-workspace.yaml").write_text("")
+        lib = root / "libs" / "lib1"
+        lib.mkdir(parents=True)
+        (lib / "package.json").write_text('{"name": "lib1", "scripts": {}}')
+        return lib
+
+    def test_unchanged_tree_is_not_rescanned(self, tmp_path: Path) -> None:
+        """Test that a second load skips discovery."""
+        self.make_monorepo(tmp_path)
+        first = load_monorepo(tmp_path)
+
+        with patch("gw.packages.discover_packages") as mock_discover:
+            second = load_monorepo(tmp_path)
+
+        mock_discover.assert_not_called()
+        assert second is first
+
+    def test_edited_manifest_invalidates(self, tmp_path: Path) -> None:
+        """Test that editing a package.json is picked up."""
+        lib = self.make_monorepo(tmp_path)
+        load_monorepo(tmp_path)
+
+        (lib / "package.json").write_text('{"name": "lib1", "scripts": {"test": "vitest run"}}')
+        monorepo = load_monorepo(tmp_path)
+
+        assert monorepo.find_package("lib1").scripts == {"test": "vitest run"}
+
+    def test_new_package_invalidates(self, tmp_path: Path) -> None:
+        """Test that adding a package directory is picked up."""
+        self.make_monorepo(tmp_path)
+        load_monorepo(tmp_path)
+
+        lib2 = tmp_path / "libs" / "lib2"
+        lib2.mkdir()
+        (lib2 / "package.json").write_text('{"name": "lib2"}')
+        monorepo = load_monorepo(tmp_path)
+
+        assert monorepo.find_package("lib2") is not None
+
+
 # ============================================================================
 # Package Object Tests
 # ============================================================================
@@ -0,0 +1,127 @@
+"""Tests for tenant commands - D1 query batching and stats aggregation."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gw.commands.tenant import STAT_TABLES, _collect_stats, _count_statements, _query_batch
+from gw.config import GWConfig
+from gw.wrangler import Wrangler, WranglerError
+
+
+def d1_output(*result_sets: list[dict]) -> MagicMock:
+    """A completed wrangler process printing `d1 execute --json` output."""
+    return MagicMock(stdout=json.dumps([{"results": rows, "success": True} for rows in result_sets]))
+
+
+@pytest.fixture
+def wrangler() -> Wrangler:
+    """Wrangler on the default (subprocess) backend."""
+    return Wrangler(GWConfig._default())
+
+
+# ============================================================================
+# D1 Batch Tests
+# ============================================================================
+
+
+class TestD1Batch:
+    """Tests for Wrangler.d1_batch."""
+
+    def test_packs_statements_into_one_command(self, wrangler: Wrangler) -> None:
+        """Test that statements share one wrangler call and are split back out."""
+        with patch("subprocess.run", return_value=d1_output([{"a": 1}], [], [{"b": 2}])) as mock_run:
+            results = wrangler.d1_batch("grove-engine-db", ["SELECT 1;", "SELECT 2", " SELECT 3 "])
+
+        assert results == [[{"a": 1}], [], [{"b": 2}]]
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:6] == ["wrangler", "d1", "execute", "grove-engine-db", "--remote", "--json"]
+        assert cmd[-1] == "SELECT 1;\nSELECT 2;\nSELECT 3"
+
+    def test_empty_batch_runs_nothing(self, wrangler: Wrangler) -> None:
+        """Test that no statements means no request."""
+        with patch("subprocess.run") as mock_run:
+            assert wrangler.d1_batch("grove-engine-db", []) == []
+        mock_run.assert_not_called()
+
+    def test_mismatched_result_sets_raise(self, wrangler: Wrangler) -> None:
+        """Test that results that don't line up with statements are an error."""
+        with patch("subprocess.run", return_value=d1_output([{"a": 1}])):
+            with pytest.raises(WranglerError, match="1 result sets for 2 statements"):
+                wrangler.d1_batch("grove-engine-db", ["SELECT 1", "SELECT 2"])
+
+    def test_non_json_output_raises(self, wrangler: Wrangler) -> None:
+        """Test that unparseable output is an error, not an empty result."""
+        with patch("subprocess.run", return_value=MagicMock(stdout="✘ [ERROR] oops")):
+            with pytest.raises(WranglerError, match="Unexpected D1 output"):
+                wrangler.d1_batch("grove-engine-db", ["SELECT 1"])
+
+
+class TestQueryBatch:
+    """Tests for _query_batch's per-statement fallback."""
+
+    def test_failed_batch_isolates_bad_statement(self) -> None:
+        """Test that only the failing statement is lost."""
+        wrangler = MagicMock()
+
+        def d1_batch(db_name: str, statements: list[str]) -> list:
+            if any("missing" in s for s in statements):
+                raise WranglerError("no such table: missing")
+            return [[{"sql": s}] for s in statements]
+
+        wrangler.d1_batch.side_effect = d1_batch
+
+        results = _query_batch(wrangler, "db", ["SELECT tenant", "SELECT missing", "SELECT posts"])
+
+        assert results == [[{"sql": "SELECT tenant"}], None, [{"sql": "SELECT posts"}]]
+
+    def test_failed_first_statement_raises(self) -> None:
+        """Test that the tenant query failing is still an error."""
+        wrangler = MagicMock()
+        wrangler.d1_batch.side_effect = WranglerError("not authenticated")
+
+        with pytest.raises(WranglerError):
+            _query_batch(wrangler, "db", ["SELECT tenant", "SELECT posts"])
+
+
+# ============================================================================
+# Stats Aggregation Tests
+# ============================================================================
+
+
+class TestCollectStats:
+    """Tests for joining grouped counts onto tenants."""
+
+    def test_count_statements_group_by_tenant(self) -> None:
+        """Test that every stat table is counted per tenant_id."""
+        statements = _count_statements("")
+
+        assert len(statements) == len(STAT_TABLES)
+        assert all(s.endswith("GROUP BY tenant_id") for s in statements)
+        assert "SUM(COALESCE(file_size, 0))" in statements[2]
+
+    def test_joins_counts_for_every_tenant(self) -> None:
+        """Test --all style results, including tenants with no rows."""
+        tenants = [{"id": "t1", "subdomain": "autumn"}, {"id": "t2", "subdomain": "river"}]
+        count_sets = [
+            [{"tenant_id": "t1", "count": 3}, {"tenant_id": "t2", "count": 1}],
+            [{"tenant_id": "t1", "count": 2}],
+            [{"tenant_id": "t2", "count": 4, "total_bytes": 2048}],
+            [],
+        ]
+
+        stats = _collect_stats(tenants, count_sets)
+
+        assert stats[0]["counts"] == {"posts": 3, "pages": 2, "images": 0, "sessions": 0}
+        assert stats[0]["storage_used_bytes"] == 0
+        assert stats[1]["counts"] == {"posts": 1, "pages": 0, "images": 4, "sessions": 0}
+        assert stats[1]["storage_used_bytes"] == 2048
+
+    def test_failed_table_reports_unknown(self) -> None:
+        """Test that a failed count shows "?" rather than zero."""
+        stats = _collect_stats([{"id": "t1"}], [[], None, [], []])
+
+        assert stats[0]["counts"]["pages"] == "?"
+        assert stats[0]["counts"]["posts"] == 0